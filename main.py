@@ -0,0 +1,141 @@
+"""
+Entry point of the MyJarvis API.
+
+Creates the FastAPI application, registers the API routers and manages the
+lifetime of process-wide resources such as the Redis client, the chat context
+cache, the pooled LLM provider connections, the tool-call executor, the
+background job queue and the suspended chat turns, the client of the agent
+worker tier, the node-type registry, the Firebase token verifier, the
+Telegram bot and its identity cache, whose invalidations are shared by the API
+workers, and the database connection pools. The resources of the chat turns
+are created by `create_chat_services`, alike in the worker processes.
+"""
+
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+import httpx
+from fastapi import FastAPI
+from redis.asyncio import Redis
+
+from config.settings import get_settings
+from myjarvis.presentation.composition import (
+    create_chat_services,
+    create_job_handlers,
+)
+from myjarvis.domain.services.telegram_identity_service import (
+    TelegramIdentityService,
+)
+from myjarvis.infrastructure.cache.broadcast_cache import BroadcastLocalCache
+from myjarvis.infrastructure.database.session import dispose_engines
+from myjarvis.infrastructure.external.firebase_auth import FirebaseAuthService
+from myjarvis.infrastructure.external.telegram_bot import TelegramBot
+from myjarvis.infrastructure.jobs.agent_turns import (
+    AgentTurnClient,
+    create_agent_turn_queue,
+)
+from myjarvis.infrastructure.jobs.job_worker import JobWorker
+from myjarvis.infrastructure.llm.client_registry import close_client_registry
+from myjarvis.presentation.api.v1 import (
+    agents,
+    chat,
+    nodes,
+    stats,
+    telegram,
+)
+from myjarvis.presentation.middleware.auth_middleware import AuthMiddleware
+
+logger = logging.getLogger(__name__)
+
+TELEGRAM_IDENTITY_CHANNEL = "telegram_identity:invalidate"
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    settings = get_settings()
+    app.state.redis = Redis.from_url(settings.redis_url)
+    services = create_chat_services(app.state.redis)
+    app.state.chat_cache = services.chat_cache
+    app.state.node_service = services.node_service
+    app.state.tool_executor = services.tool_executor
+    app.state.response_cache = services.response_cache
+    app.state.turn_store = services.turn_store
+    app.state.job_worker = None
+    if services.job_queue is not None and settings.jobs_in_process_workers:
+        app.state.job_worker = JobWorker(
+            services.job_queue,
+            create_job_handlers(services.node_service, services.tool_executor),
+            concurrency=settings.jobs_in_process_workers,
+        )
+        await app.state.job_worker.start()
+    app.state.agent_turns = None
+    if settings.agent_workers_enabled:
+        timeout = settings.agent_turn_timeout_seconds
+        app.state.agent_turns = AgentTurnClient(
+            create_agent_turn_queue(app.state.redis, timeout),
+            app.state.redis,
+            timeout_seconds=timeout,
+        )
+    app.state.auth_service = FirebaseAuthService(
+        settings.firebase_project_id,
+        certs_url=settings.firebase_certs_url,
+        max_cached_tokens=settings.auth_token_cache_max_entries,
+    )
+    max_accounts = settings.telegram_identity_cache_max_entries
+    app.state.telegram_identity_cache = BroadcastLocalCache(
+        app.state.redis,
+        TELEGRAM_IDENTITY_CHANNEL,
+        max_entries=max_accounts,
+        max_bytes=max_accounts,
+        ttl_seconds=settings.telegram_identity_ttl_seconds,
+        parse_key=int,
+    )
+    app.state.telegram_identities = TelegramIdentityService(
+        app.state.telegram_identity_cache,
+        unknown_ttl_seconds=settings.telegram_unknown_identity_ttl_seconds,
+    )
+    await services.start()
+    await app.state.telegram_identity_cache.start()
+    await app.state.auth_service.start()
+    app.state.telegram_bot = None
+    if settings.telegram_bot_token:
+        app.state.telegram_bot = TelegramBot(
+            settings.telegram_bot_token,
+            telegram.create_message_handler(app),
+            api_url=settings.telegram_api_url,
+            workers=settings.telegram_workers,
+            max_pending=settings.telegram_max_pending_updates,
+        )
+        await app.state.telegram_bot.start()
+        if settings.telegram_webhook_url:
+            try:
+                await app.state.telegram_bot.set_webhook(
+                    settings.telegram_webhook_url,
+                    secret_token=settings.telegram_webhook_secret,
+                    max_connections=settings.telegram_workers,
+                )
+            except httpx.HTTPError:
+                logger.warning("Failed to set Telegram webhook", exc_info=True)
+    try:
+        yield
+    finally:
+        if app.state.telegram_bot is not None:
+            await app.state.telegram_bot.stop()
+        if app.state.job_worker is not None:
+            await app.state.job_worker.stop()
+        await app.state.auth_service.stop()
+        await app.state.telegram_identity_cache.stop()
+        await services.close()
+        await close_client_registry()
+        await dispose_engines()
+        await app.state.redis.aclose()
+
+
+app = FastAPI(title="MyJarvis", lifespan=lifespan)
+app.add_middleware(AuthMiddleware)
+app.include_router(agents.router, prefix="/api/v1")
+app.include_router(chat.router, prefix="/api/v1")
+app.include_router(nodes.router, prefix="/api/v1")
+app.include_router(stats.router, prefix="/api/v1")
+app.include_router(telegram.router, prefix="/api/v1")
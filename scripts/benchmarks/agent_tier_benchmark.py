@@ -0,0 +1,229 @@
+"""
+Chat turn throughput and API responsiveness with the agent worker tier.
+
+Runs `--turns` streamed chat turns, `--concurrency` at a time, whose CPU work
+is that of a long conversation: the stored context of `--history` messages
+is decoded, its tokens are counted, and it is encoded again with the reply
+of a `FakeLlm`. The turns are run:
+- in process: by the benchmark's event loop, as the API does without the
+  worker tier;
+- on the worker tier: the benchmark relays the turns through the
+  `AgentTurnClient` to `AgentTurnRunner`s in N worker processes, for every N
+  of `--workers`.
+
+For each, the script reports the turns per second, the time to the first
+fragment of a reply, and the lag of the benchmark's event loop (how late a
+5 ms timer fires), which is how long a request arriving at the API would
+wait before being handled. Throughput can only scale up to the number of
+cores of the machine.
+
+Redis is a fakeredis server in a process of its own, or the server at
+`--redis-url`. fakeredis does not block on `BLMOVE`: idle workers poll,
+which adds up to 0.1 s to the time to the first fragment.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.agent_tier_benchmark \\
+        --turns 200 --concurrency 32 --workers 1,2,4
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import statistics
+import time
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from redis.asyncio import Redis
+
+from myjarvis.application.commands.send_message import SendMessageCommand
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.infrastructure.jobs.agent_turns import (
+    AGENT_TURN_JOB,
+    AgentTurnClient,
+    AgentTurnRunner,
+    create_agent_turn_queue,
+)
+from myjarvis.infrastructure.jobs.job_worker import JobWorker
+from myjarvis.infrastructure.llm.fake_llm import FakeLlm
+from myjarvis.infrastructure.llm.token_counter import ApproximateTokenCounter
+
+_TIMEOUT_SECONDS = 120.0
+_TICK_SECONDS = 0.005
+
+
+class _CpuBoundHandler:
+    """
+    Stand-in for `SendMessageHandler` doing the CPU work of a turn of a
+    long conversation, around the reply of a `FakeLlm`.
+    """
+
+    def __init__(self, history: int, llm: FakeLlm):
+        context = ChatContext(agent_id=AgentId.generate())
+        for index in range(history):
+            context.add_message(
+                Message(
+                    content=f"Message {index}: " + "lorem ipsum dolor " * 50,
+                    sender=Sender.USER if index % 2 == 0 else Sender.AGENT,
+                )
+            )
+        self._stored = context.model_dump_json()
+        self._llm = llm
+
+    async def stream(self, command: SendMessageCommand) -> AsyncIterator[str]:
+        context = ChatContext.model_validate_json(self._stored)
+        # A counter of its own per turn, as no message count is cached yet.
+        counter = ApproximateTokenCounter()
+        sum(counter.count_message(message) for message in context.messages)
+        return self._reply(context, command)
+
+    async def _reply(
+        self, context: ChatContext, command: SendMessageCommand
+    ) -> AsyncIterator[str]:
+        chunks = []
+        async for chunk in self._llm.stream_response(command.message_text):
+            chunks.append(chunk)
+            yield chunk
+        context.add_message(
+            Message(content="".join(chunks), sender=Sender.AGENT)
+        )
+        context.model_dump_json()
+
+
+def _llm(args: argparse.Namespace) -> FakeLlm:
+    return FakeLlm(
+        reply="word " * args.tokens,
+        first_token_delay=args.first_token_delay,
+        token_delay=args.token_delay,
+    )
+
+
+def _serve_fake_redis(ports: "multiprocessing.Queue[int]") -> None:
+    import fakeredis
+
+    server = fakeredis.TcpFakeServer(("127.0.0.1", 0))
+    ports.put(server.server_address[1])
+    server.serve_forever()
+
+
+def _run_worker(
+    redis_url: str, args: argparse.Namespace, ready: multiprocessing.Event
+) -> None:
+    async def run() -> None:
+        redis = Redis.from_url(redis_url)
+        handler = _CpuBoundHandler(args.history, _llm(args))
+
+        @asynccontextmanager
+        async def handler_scope() -> AsyncIterator[_CpuBoundHandler]:
+            yield handler
+
+        worker = JobWorker(
+            create_agent_turn_queue(redis, _TIMEOUT_SECONDS),
+            {
+                AGENT_TURN_JOB: AgentTurnRunner(
+                    redis, handler_scope, _TIMEOUT_SECONDS
+                )
+            },
+            concurrency=args.concurrency,
+        )
+        await worker.start()
+        ready.set()
+        await asyncio.Event().wait()
+
+    asyncio.run(run())
+
+
+async def _measure(handler, args: argparse.Namespace) -> None:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    first_chunks: list[float] = []
+    lags: list[float] = []
+    running = True
+
+    async def tick() -> None:
+        while running:
+            started = time.perf_counter()
+            await asyncio.sleep(_TICK_SECONDS)
+            lags.append(time.perf_counter() - started - _TICK_SECONDS)
+
+    async def turn(index: int) -> None:
+        command = SendMessageCommand(
+            agent_id="bench", user_id="bench", message_text=f"Hi {index}"
+        )
+        async with semaphore:
+            started = time.perf_counter()
+            chunks = await handler.stream(command)
+            async for _ in chunks:
+                if started is not None:
+                    first_chunks.append(time.perf_counter() - started)
+                    started = None
+
+    ticker = asyncio.create_task(tick())
+    started = time.perf_counter()
+    await asyncio.gather(*(turn(index) for index in range(args.turns)))
+    elapsed = time.perf_counter() - started
+    running = False
+    await ticker
+    lags.sort()
+    print(
+        f"{args.turns / elapsed:8.1f} turns/s  first fragment p50="
+        f"{statistics.median(first_chunks) * 1000:7.1f} ms  loop lag p50="
+        f"{statistics.median(lags) * 1000:6.1f} ms p99="
+        f"{lags[int(len(lags) * 0.99)] * 1000:6.1f} ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    spawn = multiprocessing.get_context("spawn")
+    server = None
+    redis_url = args.redis_url
+    if redis_url is None:
+        ports = spawn.Queue()
+        server = spawn.Process(target=_serve_fake_redis, args=(ports,))
+        server.start()
+        redis_url = f"redis://127.0.0.1:{ports.get()}"
+    print(
+        f"{args.turns} turns, {args.concurrency} at a time, "
+        f"{args.history} messages of history"
+    )
+    print("in process:  ", end="", flush=True)
+    await _measure(_CpuBoundHandler(args.history, _llm(args)), args)
+    redis = Redis.from_url(redis_url)
+    client = AgentTurnClient(
+        create_agent_turn_queue(redis, _TIMEOUT_SECONDS),
+        redis,
+        timeout_seconds=_TIMEOUT_SECONDS,
+    )
+    for count in (int(value) for value in args.workers.split(",")):
+        ready = [spawn.Event() for _ in range(count)]
+        workers = [
+            spawn.Process(target=_run_worker, args=(redis_url, args, event))
+            for event in ready
+        ]
+        for worker in workers:
+            worker.start()
+        for event in ready:
+            await asyncio.to_thread(event.wait)
+        print(f"{count} worker(s): ", end="", flush=True)
+        await _measure(client, args)
+        for worker in workers:
+            worker.terminate()
+            worker.join()
+    await redis.aclose()
+    if server is not None:
+        server.terminate()
+        server.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--history", type=int, default=2000)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--first-token-delay", type=float, default=0.2)
+    parser.add_argument("--token-delay", type=float, default=0.01)
+    parser.add_argument("--redis-url")
+    asyncio.run(main(parser.parse_args()))
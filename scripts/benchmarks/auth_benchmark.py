@@ -0,0 +1,140 @@
+"""
+Per-request authentication overhead of `FirebaseAuthService.verify_token`.
+
+Generates an RSA key and a self-signed certificate locally, serves the
+certificate from an in-process stub of Google's certificate endpoint (with
+`--certs-latency` of simulated network delay) and signs Firebase-style ID
+tokens with it. Three cases are timed:
+
+- cold: a new service per request, so the certificates are fetched on the
+  request path, as a verifier without a certificate cache does;
+- warm certs: the certificates are cached, every request carries a new token
+  whose signature must be verified;
+- warm: the same token on every request, served from the claims cache.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.auth_benchmark
+"""
+
+import argparse
+import asyncio
+import datetime
+import statistics
+import time
+
+import httpx
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+
+from myjarvis.infrastructure.external.firebase_auth import FirebaseAuthService
+
+PROJECT_ID = "bench-project"
+KEY_ID = "bench-key"
+CERTS_URL = "https://certs.test/securetoken"
+
+
+def _key_and_cert() -> tuple[str, str]:
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, KEY_ID)])
+    now = datetime.datetime.now(datetime.timezone.utc)
+    cert = (
+        x509.CertificateBuilder()
+        .subject_name(name)
+        .issuer_name(name)
+        .public_key(key.public_key())
+        .serial_number(x509.random_serial_number())
+        .not_valid_before(now)
+        .not_valid_after(now + datetime.timedelta(days=1))
+        .sign(key, hashes.SHA256())
+    )
+    key_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    return key_pem, cert.public_bytes(serialization.Encoding.PEM).decode()
+
+
+def _token(signer: crypt.Signer, uid: str) -> str:
+    now = int(time.time())
+    payload = {
+        "iss": f"https://securetoken.google.com/{PROJECT_ID}",
+        "aud": PROJECT_ID,
+        "sub": uid,
+        "auth_time": now,
+        "iat": now,
+        "exp": now + 3600,
+    }
+    return jwt.encode(signer, payload, key_id=KEY_ID).decode()
+
+
+def _client(cert_pem: str, latency: float) -> httpx.AsyncClient:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        return httpx.Response(
+            200,
+            json={KEY_ID: cert_pem},
+            headers={"Cache-Control": "public, max-age=3600"},
+        )
+
+    return httpx.AsyncClient(transport=httpx.MockTransport(handler))
+
+
+def _report(name: str, durations: list[float]) -> None:
+    ordered = sorted(durations)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<11} p50={statistics.median(ordered) * 1e6:9.1f} us  "
+        f"p99={p99 * 1e6:9.1f} us"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    key_pem, cert_pem = _key_and_cert()
+    signer = crypt.RSASigner.from_string(key_pem, KEY_ID)
+    tokens = [
+        _token(signer, f"user-{index}") for index in range(args.requests)
+    ]
+    client = _client(cert_pem, args.certs_latency)
+
+    cold = []
+    for token in tokens[: args.cold_requests]:
+        service = FirebaseAuthService(
+            PROJECT_ID, http_client=client, certs_url=CERTS_URL
+        )
+        started = time.perf_counter()
+        await service.verify_token(token)
+        cold.append(time.perf_counter() - started)
+
+    service = FirebaseAuthService(
+        PROJECT_ID, http_client=client, certs_url=CERTS_URL
+    )
+    await service.start()
+    warm_certs = []
+    for token in tokens:
+        started = time.perf_counter()
+        await service.verify_token(token)
+        warm_certs.append(time.perf_counter() - started)
+    warm = []
+    for _ in tokens:
+        started = time.perf_counter()
+        await service.verify_token(tokens[0])
+        warm.append(time.perf_counter() - started)
+    await service.stop()
+    await client.aclose()
+
+    print(f"certs endpoint latency {args.certs_latency * 1000:.0f} ms")
+    _report("cold", cold)
+    _report("warm certs", warm_certs)
+    _report("warm", warm)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--cold-requests", type=int, default=50)
+    parser.add_argument("--certs-latency", type=float, default=0.05)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,181 @@
+"""
+Per-request overhead of the authentication middleware.
+
+Serves a trivial JSON endpoint and a streaming (SSE-style) endpoint through
+three FastAPI apps: without middleware, with the previous
+`BaseHTTPMiddleware`-based authentication and with the pure-ASGI
+`AuthMiddleware`. Every request carries a bearer token; token verification is
+stubbed out, so only the cost of the middleware itself is measured.
+
+The apps are driven in process through the ASGI interface, without a server
+or sockets, and the script reports:
+
+- requests per second on the trivial endpoint, at `--concurrency` requests
+  in flight;
+- the time until the first chunk of the streaming endpoint reaches the
+  client, which must stay at the endpoint's own first-chunk delay.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.auth_middleware_benchmark
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, AsyncIterator
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from starlette.middleware.base import (
+    BaseHTTPMiddleware,
+    RequestResponseEndpoint,
+)
+from starlette.responses import Response
+
+from myjarvis.infrastructure.external.firebase_auth import InvalidTokenError
+from myjarvis.presentation.middleware.auth_middleware import AuthMiddleware
+
+
+class _StubAuthService:
+    async def verify_token(self, token: str) -> dict[str, Any]:
+        return {"uid": token}
+
+
+class _BaseHttpAuthMiddleware(BaseHTTPMiddleware):
+    """The previous implementation of `AuthMiddleware`."""
+
+    async def dispatch(
+        self, request: Request, call_next: RequestResponseEndpoint
+    ) -> Response:
+        scheme, _, token = request.headers.get("authorization", "").partition(
+            " "
+        )
+        if scheme.lower() == "bearer" and token:
+            try:
+                request.state.user = (
+                    await request.app.state.auth_service.verify_token(token)
+                )
+            except InvalidTokenError as exc:
+                return JSONResponse({"detail": str(exc)}, status_code=401)
+        return await call_next(request)
+
+
+def _app(middleware: type | None, chunk_delay: float) -> FastAPI:
+    app = FastAPI()
+    app.state.auth_service = _StubAuthService()
+    if middleware is not None:
+        app.add_middleware(middleware)
+
+    @app.get("/ping")
+    async def ping(request: Request) -> dict[str, str]:
+        user = getattr(request.state, "user", None)
+        return {"uid": user["uid"] if user else ""}
+
+    @app.get("/stream")
+    async def stream() -> StreamingResponse:
+        async def chunks() -> AsyncIterator[str]:
+            for index in range(5):
+                await asyncio.sleep(chunk_delay)
+                yield f"data: {index}\n\n"
+
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    return app
+
+
+async def _request(app: FastAPI, path: str) -> tuple[float, float]:
+    """
+    Send a GET request and return the times of the first body chunk and of
+    the end of the response, relative to the start of the request.
+    """
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": "GET",
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "query_string": b"",
+        "root_path": "",
+        "headers": [
+            (b"host", b"bench"),
+            (b"authorization", b"Bearer bench-user"),
+        ],
+        "client": ("127.0.0.1", 1234),
+        "server": ("bench", 80),
+    }
+    received = False
+    disconnected = asyncio.Event()
+    started = time.perf_counter()
+    first_chunk = None
+
+    async def receive() -> dict[str, Any]:
+        nonlocal received
+        if not received:
+            received = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        await disconnected.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message: dict[str, Any]) -> None:
+        nonlocal first_chunk
+        if message["type"] == "http.response.start":
+            assert message["status"] == 200, message
+        elif message["type"] == "http.response.body":
+            if first_chunk is None and message.get("body"):
+                first_chunk = time.perf_counter() - started
+
+    await app(scope, receive, send)
+    disconnected.set()
+    return first_chunk or 0.0, time.perf_counter() - started
+
+
+async def _throughput(app: FastAPI, requests: int, concurrency: int) -> float:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with semaphore:
+            await _request(app, "/ping")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def main(args: argparse.Namespace) -> None:
+    variants = {
+        "none": None,
+        "BaseHTTP": _BaseHttpAuthMiddleware,
+        "pure ASGI": AuthMiddleware,
+    }
+    print(
+        f"{args.requests} requests, {args.concurrency} in flight; "
+        f"stream chunks every {args.chunk_delay * 1000:.0f} ms"
+    )
+    for name, middleware in variants.items():
+        app = _app(middleware, args.chunk_delay)
+        await _throughput(app, args.requests // 10, args.concurrency)
+        rps = statistics.median(
+            [
+                await _throughput(app, args.requests, args.concurrency)
+                for _ in range(3)
+            ]
+        )
+        first_chunks = [
+            (await _request(app, "/stream"))[0] for _ in range(args.streams)
+        ]
+        print(
+            f"{name:<10} {rps:8.0f} req/s  stream first chunk "
+            f"p50={statistics.median(first_chunks) * 1000:6.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--streams", type=int, default=20)
+    parser.add_argument("--chunk-delay", type=float, default=0.01)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,108 @@
+"""
+Chat turn cost of whole-blob versus append-only chat history storage.
+
+For conversations of increasing length, measures one chat turn (load the
+context, add a user message and a reply, save the context) with:
+- blob: the whole `ChatContext` serialized with `model_dump_json` and written
+  with a single `SET` on every turn;
+- append: `RedisCache`, which loads the newest `--window` messages and pushes
+  only the two new messages.
+
+Reports the mean turn latency and the bytes sent to Redis per turn. Runs
+against fakeredis by default, or against a real server with `--redis-url`.
+
+Usage:
+    PYTHONPATH=src python -m scripts.benchmarks.chat_history_benchmark
+"""
+
+import argparse
+import asyncio
+import time
+
+from redis.asyncio import Redis
+
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.infrastructure.cache.redis_cache import RedisCache
+
+_MESSAGE = "A typical chat message of a few dozen words. " * 4
+
+
+def _conversation(length: int) -> ChatContext:
+    context = ChatContext(agent_id=AgentId.generate())
+    for index in range(length):
+        sender = Sender.USER if index % 2 == 0 else Sender.AGENT
+        context.add_message(Message(content=_MESSAGE, sender=sender))
+    return context
+
+
+def _add_turn(context: ChatContext) -> None:
+    context.add_message(Message(content=_MESSAGE, sender=Sender.USER))
+    context.add_message(Message(content=_MESSAGE, sender=Sender.AGENT))
+
+
+async def _blob_turns(
+    client: Redis, length: int, turns: int
+) -> tuple[float, int]:
+    context = _conversation(length)
+    key = f"bench:blob:{context.agent_id}"
+    await client.set(key, context.model_dump_json())
+    sent = 0
+    started = time.perf_counter()
+    for _ in range(turns):
+        context = ChatContext.model_validate_json(await client.get(key))
+        _add_turn(context)
+        payload = context.model_dump_json()
+        sent += len(payload)
+        await client.set(key, payload, ex=3600)
+    return (time.perf_counter() - started) / turns, sent // turns
+
+
+async def _append_turns(
+    client: Redis, length: int, turns: int, window: int
+) -> tuple[float, int]:
+    cache = RedisCache(client, max_messages=window)
+    context = _conversation(length)
+    agent_id = str(context.agent_id)
+    await cache.set_chat_context(context)
+    sent = 0
+    started = time.perf_counter()
+    for _ in range(turns):
+        context = await cache.get_chat_context(agent_id, tail=window)
+        _add_turn(context)
+        sent += sum(
+            len(message.model_dump_json())
+            for message in context.pending_messages()
+        )
+        await cache.set_chat_context(context)
+    return (time.perf_counter() - started) / turns, sent // turns
+
+
+async def main(args: argparse.Namespace) -> None:
+    if args.redis_url:
+        client = Redis.from_url(args.redis_url)
+    else:
+        import fakeredis
+
+        client = fakeredis.FakeAsyncRedis()
+    print(f"{'messages':>8} {'storage':<7} {'turn ms':>9} {'bytes/turn':>11}")
+    for length in args.lengths:
+        for name, run in (
+            ("blob", _blob_turns(client, length, args.turns)),
+            ("append", _append_turns(client, length, args.turns, args.window)),
+        ):
+            latency, sent = await run
+            print(f"{length:>8} {name:<7} {latency * 1000:>9.3f} {sent:>11}")
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument(
+        "--lengths", type=int, nargs="+", default=[10, 100, 1000]
+    )
+    parser.add_argument("--turns", type=int, default=50)
+    parser.add_argument("--window", type=int, default=50)
+    parser.add_argument("--redis-url")
+    asyncio.run(main(parser.parse_args()))
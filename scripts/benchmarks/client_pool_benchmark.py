@@ -0,0 +1,98 @@
+"""
+Latency benchmark for pooled versus per-request LLM provider clients.
+
+Sends the same chat completion through `OpenAiLlm` against a local stub
+server twice: once with a fresh SDK client per request (a new connection per
+chat turn) and once with the shared client from `LlmClientRegistry` (pooled
+keep-alive connections). Reports p50/p99 latency and how many connections the
+server accepted. The stub speaks plain HTTP, so the difference shown excludes
+the TLS handshake that pooling also saves against the real providers.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.client_pool_benchmark
+"""
+
+import argparse
+import asyncio
+import time
+
+from openai import AsyncOpenAI
+
+from config.settings import Settings
+from myjarvis.infrastructure.llm.client_registry import LlmClientRegistry
+from myjarvis.infrastructure.llm.openai_llm import OpenAiLlm
+from scripts.benchmarks.stub_llm_server import StubLlmServer
+
+
+async def _timed(llm: OpenAiLlm) -> float:
+    started = time.perf_counter()
+    await llm.generate_response("Hello")
+    return time.perf_counter() - started
+
+
+async def _run_unpooled(
+    base_url: str, args: argparse.Namespace
+) -> list[float]:
+    async def one() -> float:
+        client = AsyncOpenAI(api_key="stub", base_url=base_url)
+        try:
+            return await _timed(OpenAiLlm(api_key="stub", client=client))
+        finally:
+            await client.close()
+
+    return await _run_batches(one, args)
+
+
+async def _run_pooled(base_url: str, args: argparse.Namespace) -> list[float]:
+    registry = LlmClientRegistry(
+        Settings(
+            llm_http2=False,
+            llm_max_concurrency={"openai": args.concurrency},
+        )
+    )
+    client = AsyncOpenAI(
+        api_key="stub",
+        base_url=base_url,
+        http_client=registry.http_client("openai"),
+    )
+    llm = OpenAiLlm(
+        api_key="stub", client=client, scheduler=registry.scheduler("openai")
+    )
+    try:
+        return await _run_batches(lambda: _timed(llm), args)
+    finally:
+        await registry.aclose()
+
+
+async def _run_batches(one, args: argparse.Namespace) -> list[float]:
+    samples = []
+    for _ in range(args.requests // args.concurrency):
+        samples += await asyncio.gather(
+            *(one() for _ in range(args.concurrency))
+        )
+    return samples
+
+
+def _report(name: str, samples: list[float], connections: int) -> None:
+    ordered = sorted(samples)
+    p50 = ordered[len(ordered) // 2]
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<10} p50={p50 * 1000:7.2f} ms  p99={p99 * 1000:7.2f} ms  "
+        f"connections={connections}"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    for name, run in (("unpooled", _run_unpooled), ("pooled", _run_pooled)):
+        async with StubLlmServer(delay=args.server_delay) as server:
+            samples = await run(server.base_url + "/v1", args)
+            _report(name, samples, server.connections)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--server-delay", type=float, default=0.0)
+    asyncio.run(main(parser.parse_args()))
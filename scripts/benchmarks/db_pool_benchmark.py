@@ -0,0 +1,160 @@
+"""
+Load benchmark of the database read path.
+
+Seeds users with agents and attached nodes, then runs `GetUserAgentsHandler`
+from many concurrent workers for a fixed duration, each request on its own
+session as in the API. Reports the throughput, the request latency and the
+connection pool statistics (checkout wait time, connections in use).
+
+The engine is built by `create_engine` from `session.py` with the pool
+configured on the command line, so pool sizing can be compared directly.
+Runs against a temporary SQLite database by default; pass `--database-url`
+to run against Postgres, e.g. a local container:
+
+    docker run -d -p 5432:5432 -e POSTGRES_PASSWORD=postgres postgres:16
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.db_pool_benchmark
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+from config.settings import get_settings
+from myjarvis.application.handlers.query_handlers import GetUserAgentsHandler
+from myjarvis.application.queries.get_user_agents import GetUserAgentsQuery
+from myjarvis.domain.services.node_service import NodeService
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.node_id import NodeId
+from myjarvis.infrastructure.cache.local_cache import LruTtlCache
+from myjarvis.infrastructure.database.models.agent_model import AgentModel
+from myjarvis.infrastructure.database.models.base import Base
+from myjarvis.infrastructure.database.models.node_model import NodeModel
+from myjarvis.infrastructure.database.models.user_model import UserModel
+from myjarvis.infrastructure.database.pool_metrics import pool_stats
+from myjarvis.infrastructure.database.read_models.sqlalchemy_agent_read_model import (  # noqa: E501
+    SQLAlchemyAgentReadModel,
+)
+from myjarvis.infrastructure.database.session import create_engine
+from myjarvis.infrastructure.nodes.node_registry import NodeTypeRegistry
+
+
+async def _seed(engine: AsyncEngine, args: argparse.Namespace) -> list[str]:
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.drop_all)
+        await connection.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    user_ids = [f"bench-user-{index}" for index in range(args.users)]
+    async with sessions.begin() as session:
+        nodes = [
+            NodeModel(
+                node_id=NodeId.generate().value,
+                name=node_type,
+                description="",
+                node_type=node_type,
+            )
+            for node_type in NodeTypeRegistry().get_node_types()
+        ]
+        session.add_all(nodes)
+        for user_id in user_ids:
+            session.add(UserModel(user_id=user_id, email=f"{user_id}@bench"))
+            for index in range(args.agents):
+                session.add(
+                    AgentModel(
+                        agent_id=AgentId.generate().value,
+                        user_id=user_id,
+                        name=f"agent {index}",
+                        base_prompt="You are a helpful assistant.",
+                        llm_model="fake",
+                        nodes=random.sample(nodes, k=2),
+                    )
+                )
+    return user_ids
+
+
+async def _worker(
+    sessions: async_sessionmaker,
+    node_service: NodeService,
+    user_ids: list[str],
+    deadline: float,
+    latencies: list[float],
+) -> None:
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        async with sessions() as session:
+            handler = GetUserAgentsHandler(
+                agent_read_model=SQLAlchemyAgentReadModel(
+                    session, node_service.get_command_names
+                )
+            )
+            await handler.handle(
+                GetUserAgentsQuery(user_id=random.choice(user_ids))
+            )
+        latencies.append(time.perf_counter() - started)
+
+
+async def main(args: argparse.Namespace) -> None:
+    settings = get_settings().model_copy(
+        update={
+            "db_pool_size": args.pool_size,
+            "db_max_overflow": args.max_overflow,
+        }
+    )
+    with tempfile.TemporaryDirectory() as directory:
+        url = args.database_url or (
+            f"sqlite+aiosqlite:///{Path(directory) / 'bench.db'}"
+        )
+        engine = create_engine(url, settings)
+        user_ids = await _seed(engine, args)
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        node_service = NodeService(
+            NodeTypeRegistry(),
+            LruTtlCache(max_entries=4096, max_bytes=4096, ttl_seconds=3600),
+        )
+        latencies: list[float] = []
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(
+            *(
+                _worker(sessions, node_service, user_ids, deadline, latencies)
+                for _ in range(args.concurrency)
+            )
+        )
+        stats = pool_stats(engine)
+        await engine.dispose()
+
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{args.concurrency} workers, pool {args.pool_size}"
+        f"+{args.max_overflow}, {args.users} users x {args.agents} agents"
+    )
+    print(
+        f"throughput {len(ordered) / args.duration:8.1f} req/s  "
+        f"p50={statistics.median(ordered) * 1000:7.2f} ms  "
+        f"p99={p99 * 1000:7.2f} ms"
+    )
+    if stats is not None:
+        print(
+            f"pool: checkouts={stats.checkouts} timeouts={stats.timeouts} "
+            f"wait mean={stats.wait_seconds_mean * 1000:.3f} ms "
+            f"max={stats.wait_seconds_max * 1000:.2f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--database-url")
+    parser.add_argument("--users", type=int, default=100)
+    parser.add_argument("--agents", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--duration", type=float, default=5.0)
+    parser.add_argument("--pool-size", type=int, default=10)
+    parser.add_argument("--max-overflow", type=int, default=20)
+    asyncio.run(main(parser.parse_args()))
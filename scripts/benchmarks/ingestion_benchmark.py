@@ -0,0 +1,152 @@
+"""
+Embedding requests and time taken to ingest documents into the vector store.
+
+Generates `--documents` synthetic email threads: every email quotes the
+previous ones below its body and its sender's signature, so many paragraphs
+repeat, as in a real mailbox. They are embedded by the deterministic
+`HashingEmbedder`, behind a simulated API taking `--latency` seconds per
+request plus `--per-text` seconds per text. The threads are ingested three
+ways:
+- one chunk per request, sequentially and without a cache;
+- through the `IngestionPipeline` with an empty embedding cache;
+- through the pipeline again, into another agent's collection, with the
+  cache filled by the previous run.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.ingestion_benchmark \\
+        --documents 500 --batch-size 64 --concurrency 4
+"""
+
+import argparse
+import asyncio
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from myjarvis.infrastructure.llm.embedder import BaseEmbedder, HashingEmbedder
+from myjarvis.infrastructure.vector_store.embedding_cache import (
+    EmbeddingCache,
+)
+from myjarvis.infrastructure.vector_store.ingestion import (
+    IngestionPipeline,
+    SourceDocument,
+    chunk_text,
+)
+from myjarvis.infrastructure.vector_store.vector_store import (
+    VectorRecord,
+    VectorStore,
+)
+
+_WORDS = (
+    "meeting budget report deadline review project client invoice draft "
+    "schedule update proposal contract team launch design feedback budget "
+    "quarter numbers slides agenda call notes travel hiring roadmap"
+).split()
+
+
+class SimulatedApiEmbedder(BaseEmbedder):
+    """
+    `HashingEmbedder` behind the latency of a remote API, counting requests.
+    """
+
+    def __init__(self, latency: float, per_text: float):
+        self._embedder = HashingEmbedder()
+        self.model = self._embedder.model
+        self.latency = latency
+        self.per_text = per_text
+        self.requests = 0
+        self.texts = 0
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        self.requests += 1
+        self.texts += len(texts)
+        await asyncio.sleep(self.latency + self.per_text * len(texts))
+        return await self._embedder.embed(texts)
+
+
+def _threads(count: int) -> list[SourceDocument]:
+    randomness = random.Random(0)
+    signatures = [
+        f"Best regards, Sender {sender}. "
+        + " ".join(randomness.choices(_WORDS, k=30))
+        for sender in range(20)
+    ]
+    documents, thread = [], ""
+    for index in range(count):
+        if index % 5 == 0:
+            thread = ""
+        body = " ".join(randomness.choices(_WORDS, k=120))
+        thread = (
+            f"{body}\n\n{randomness.choice(signatures)}\n\n"
+            f"On day {index}, sender {index % 20} wrote:\n\n{thread}"
+        ).strip()
+        documents.append(SourceDocument(f"email:{index}", thread))
+    return documents
+
+
+async def _naive(
+    documents: list[SourceDocument], embedder: SimulatedApiEmbedder, store
+) -> None:
+    collection = store.collection("naive")
+    for document in documents:
+        for index, chunk in enumerate(chunk_text(document.text)):
+            (vector,) = await embedder.embed([chunk])
+            collection.upsert(
+                [VectorRecord(f"{document.id}#{index}", vector, chunk)]
+            )
+
+
+def _report(name: str, embedder: SimulatedApiEmbedder, elapsed: float):
+    print(
+        f"{name:<22} {embedder.requests:6} requests "
+        f"{embedder.texts:7} texts  {elapsed:7.2f} s"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    documents = _threads(args.documents)
+    chunks = sum(len(chunk_text(document.text)) for document in documents)
+    print(f"{len(documents)} documents, {chunks} chunks")
+    with tempfile.TemporaryDirectory() as directory:
+        store = VectorStore(Path(directory) / "store")
+        cache_root = Path(directory) / "cache"
+
+        embedder = SimulatedApiEmbedder(args.latency, args.per_text)
+        started = time.perf_counter()
+        await _naive(documents, embedder, store)
+        _report(
+            "one chunk per request", embedder, time.perf_counter() - started
+        )
+
+        for name, namespace in (
+            ("pipeline, cold cache", "agent-1"),
+            ("pipeline, warm cache", "agent-2"),
+        ):
+            embedder = SimulatedApiEmbedder(args.latency, args.per_text)
+            pipeline = IngestionPipeline(
+                embedder,
+                store,
+                EmbeddingCache(cache_root, embedder.model),
+                batch_size=args.batch_size,
+                max_concurrency=args.concurrency,
+            )
+            started = time.perf_counter()
+            stats = await pipeline.ingest(namespace, documents)
+            _report(name, embedder, time.perf_counter() - started)
+            print(
+                f"{'':<22} cache hits {stats.cache_hits}, duplicates "
+                f"{stats.duplicates}, written {stats.written}"
+            )
+            pipeline.cache.close()
+        store.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--documents", type=int, default=500)
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--per-text", type=float, default=0.0005)
+    asyncio.run(main(parser.parse_args()))
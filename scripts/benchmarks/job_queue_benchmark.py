@@ -0,0 +1,204 @@
+"""
+Request hold time and throughput of node commands run as background jobs.
+
+`--requests` concurrent chat requests each call a long node command (taking
+`--node-delay` seconds, like searching a large mailbox). The command runs:
+- inline: within the request, through the `ToolExecutor` alone;
+- as a job: the executor enqueues it in the `RedisJobQueue` and the request
+  returns at once with a pending result; `--workers` in-process
+  `JobWorker`s of `--concurrency` tasks each run the jobs.
+
+For each, the time a request is held and the time until every result is
+available are reported. Two more checks follow: the same command enqueued by
+all requests at once runs only once (idempotency keys), and a job claimed by
+a worker that dies is run again by another once its lease expires.
+
+Redis is simulated with fakeredis, whose blocking commands do not block:
+idle workers poll instead, which adds up to 0.1 s to the job latency.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.job_queue_benchmark \\
+        --requests 100 --node-delay 5.0 --workers 4 --concurrency 16
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any, Dict, List
+
+import fakeredis
+
+from myjarvis.domain.services.tool_executor import (
+    NODE_COMMAND_JOB,
+    ToolExecutor,
+)
+from myjarvis.domain.value_objects.tool_call import ToolCall, ToolResult
+from myjarvis.infrastructure.jobs.job_queue import RedisJobQueue
+from myjarvis.infrastructure.jobs.job_worker import JobWorker
+from myjarvis.infrastructure.nodes.base_node import (
+    AsyncBaseNode,
+    current_agent_id,
+)
+
+# Every request and worker task may hold a connection of the pool at once.
+_MAX_CONNECTIONS = 10_000
+
+
+class _SlowNode(AsyncBaseNode):
+    background_commands = frozenset({"search"})
+
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.calls = 0
+
+    async def execute_command(
+        self, command: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        self.calls += 1
+        await asyncio.sleep(self.delay)
+        return {"query": params["query"], "matches": 3}
+
+    def get_available_commands(self) -> List[str]:
+        return ["search"]
+
+
+def _call(query: str) -> ToolCall:
+    return ToolCall(
+        call_id=query, node="slow", command="search", params={"query": query}
+    )
+
+
+async def _request(
+    executor: ToolExecutor, node: _SlowNode, query: str
+) -> tuple[float, ToolResult]:
+    token = current_agent_id.set("bench")
+    started = time.perf_counter()
+    try:
+        [result] = await executor.execute(
+            [_call(query)], {"slow": node}, user_id="bench"
+        )
+    finally:
+        current_agent_id.reset(token)
+    return time.perf_counter() - started, result
+
+
+def _workers(
+    queue: RedisJobQueue,
+    executor: ToolExecutor,
+    node: _SlowNode,
+    args: argparse.Namespace,
+    requeue_interval: float = 30.0,
+) -> list[JobWorker]:
+    async def run_node_command(payload: dict[str, Any]) -> dict[str, Any]:
+        return await executor.run_job(payload, node)
+
+    return [
+        JobWorker(
+            queue,
+            {NODE_COMMAND_JOB: run_node_command},
+            concurrency=args.concurrency,
+            requeue_interval=requeue_interval,
+        )
+        for _ in range(args.workers)
+    ]
+
+
+def _report(name: str, held: list[float], total: float) -> None:
+    ordered = sorted(held)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<8} request held p50={statistics.median(ordered) * 1000:8.1f}"
+        f" ms  p99={p99 * 1000:8.1f} ms  all results after {total:6.2f} s"
+    )
+
+
+async def _inline(args: argparse.Namespace) -> None:
+    node = _SlowNode(args.node_delay)
+    executor = ToolExecutor(default_timeout=args.node_delay * 2)
+    started = time.perf_counter()
+    held = await asyncio.gather(
+        *(_request(executor, node, f"q{i}") for i in range(args.requests))
+    )
+    _report("inline", [t for t, _ in held], time.perf_counter() - started)
+
+
+async def _jobs(args: argparse.Namespace) -> None:
+    redis = fakeredis.FakeAsyncRedis(max_connections=_MAX_CONNECTIONS)
+    node = _SlowNode(args.node_delay)
+    queue = RedisJobQueue(redis)
+    executor = ToolExecutor(job_queue=queue)
+    workers = _workers(queue, executor, node, args)
+    for worker in workers:
+        await worker.start()
+    started = time.perf_counter()
+    held = await asyncio.gather(
+        *(_request(executor, node, f"q{i}") for i in range(args.requests))
+    )
+    results = await executor.collect([r for _, r in held], None)
+    total = time.perf_counter() - started
+    assert all(r.output is not None for r in results), results
+    _report("jobs", [t for t, _ in held], total)
+    print(
+        f"         {args.requests / total:.1f} jobs/s with "
+        f"{args.workers * args.concurrency} worker tasks"
+    )
+
+    # The same command, requested by every request at once.
+    node.calls = 0
+    held = await asyncio.gather(
+        *(_request(executor, node, "same") for _ in range(args.requests))
+    )
+    jobs = {result.job_id for _, result in held}
+    await executor.collect([r for _, r in held], None)
+    print(
+        f"same command x{args.requests}: {len(jobs)} job(s), "
+        f"{node.calls} node call(s)"
+    )
+    for worker in workers:
+        await worker.stop()
+    await redis.aclose()
+
+
+async def _abandoned(args: argparse.Namespace) -> None:
+    redis = fakeredis.FakeAsyncRedis(max_connections=_MAX_CONNECTIONS)
+    node = _SlowNode(0.01)
+    queue = RedisJobQueue(redis, lease_seconds=args.lease)
+    executor = ToolExecutor(job_queue=queue)
+    _, result = await _request(executor, node, "abandoned")
+    # A worker claims the job and dies before completing it.
+    await queue.claim(0)
+    started = time.perf_counter()
+    workers = _workers(queue, executor, node, args, requeue_interval=0.1)
+    for worker in workers:
+        await worker.start()
+    [result] = await executor.collect([result], None)
+    job = await queue.get(result.job_id)
+    print(
+        f"abandoned job: {job.status.value} after "
+        f"{time.perf_counter() - started:.2f} s (lease {args.lease:g} s), "
+        f"{job.attempts} attempts"
+    )
+    for worker in workers:
+        await worker.stop()
+    await redis.aclose()
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(
+        f"{args.requests} concurrent requests, node command of "
+        f"{args.node_delay * 1000:.0f} ms"
+    )
+    await _inline(args)
+    await _jobs(args)
+    await _abandoned(args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--node-delay", type=float, default=5.0)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--lease", type=float, default=0.5)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,186 @@
+"""
+Tail latency of LLM requests with hedging and fallback across providers.
+
+Two in-process fake providers stand in for the primary and the secondary
+model. The primary usually answers in `--latency` seconds, but one request in
+`--slow-every` takes `--slow-factor` times longer; the secondary always takes
+`--secondary-latency` seconds.
+
+`--requests` requests are sent, `--concurrency` at a time, to the primary
+alone and then through a `RoutingLlm`, for `generate_response` and for the
+first chunk of `stream_response`. For each, the script reports the p50, p99
+and maximum latency, and for the `RoutingLlm` the hedge and fallback
+counters and the number of hedged requests still running afterwards (they
+must all have been cancelled). Finally, the primary fails every request: the
+script reports how many requests still reached it once its circuit opened.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.llm_hedging_benchmark
+"""
+
+import argparse
+import asyncio
+import itertools
+import statistics
+import time
+from typing import Any, AsyncIterator
+
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.infrastructure.llm.base_llm import BaseLlm
+from myjarvis.infrastructure.llm.routing_llm import LlmRouter, RoutingLlm
+
+REPLY = "This is a reply from a fake provider."
+
+
+class _FakeProvider(BaseLlm):
+    """
+    A provider whose every `slow_every`-th request is `slow_factor` times
+    slower, and which fails every request if `failing` is set.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        latency: float,
+        slow_every: int = 0,
+        slow_factor: float = 1.0,
+    ):
+        self.provider = provider
+        self.latency = latency
+        self.slow_every = slow_every
+        self.slow_factor = slow_factor
+        self.failing = False
+        self.calls = 0
+        self.running = 0
+        self._counter = itertools.count(1)
+
+    async def _wait(self) -> None:
+        self.calls += 1
+        index = next(self._counter)
+        slow = self.slow_every and index % self.slow_every == 0
+        self.running += 1
+        try:
+            await asyncio.sleep(
+                self.latency * (self.slow_factor if slow else 1)
+            )
+        finally:
+            self.running -= 1
+        if self.failing:
+            raise ConnectionError(f"{self.provider} is down")
+
+    async def generate_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> str:
+        await self._wait()
+        return REPLY
+
+    async def stream_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        await self._wait()
+        for word in REPLY.split(" "):
+            yield word + " "
+
+
+async def _first_chunk(llm: BaseLlm) -> str:
+    stream = llm.stream_response("Hello")
+    try:
+        return await anext(stream)
+    finally:
+        await stream.aclose()
+
+
+async def _measure(send, args: argparse.Namespace) -> list[float]:
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+
+    async def one() -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await send()
+            latencies.append(time.perf_counter() - started)
+
+    await asyncio.gather(*(one() for _ in range(args.requests)))
+    return latencies
+
+
+def _report(name: str, latencies: list[float], extra: str = "") -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<26} p50={statistics.median(ordered) * 1000:6.0f} ms "
+        f"p99={p99 * 1000:6.0f} ms max={ordered[-1] * 1000:6.0f} ms{extra}"
+    )
+
+
+def _providers(args: argparse.Namespace) -> tuple[_FakeProvider, ...]:
+    return (
+        _FakeProvider(
+            "primary", args.latency, args.slow_every, args.slow_factor
+        ),
+        _FakeProvider("secondary", args.secondary_latency),
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(
+        f"{args.requests} requests, {args.concurrency} at a time; primary "
+        f"{args.latency * 1000:.0f} ms, 1 in {args.slow_every} "
+        f"{args.slow_factor:.0f}x slower; secondary "
+        f"{args.secondary_latency * 1000:.0f} ms"
+    )
+    for method, send in (
+        ("generate", lambda llm: llm.generate_response("Hello")),
+        ("first chunk", _first_chunk),
+    ):
+        primary, _ = _providers(args)
+        _report(
+            f"{method}, primary only",
+            await _measure(lambda: send(primary), args),
+        )
+        primary, secondary = _providers(args)
+        router = LlmRouter(hedge_delay=args.latency * 2)
+        routing = RoutingLlm(primary, secondary, router, "primary")
+        # Warm up the latency samples of the primary.
+        for _ in range(50):
+            await send(routing)
+        before = router.stats
+        latencies = await _measure(lambda: send(routing), args)
+        await asyncio.sleep(0)
+        stats = router.stats
+        _report(
+            f"{method}, routed",
+            latencies,
+            f"  hedges={stats.hedges - before.hedges} "
+            f"wins={stats.hedge_wins - before.hedge_wins} "
+            f"still running={primary.running + secondary.running}",
+        )
+
+    primary, secondary = _providers(args)
+    primary.failing = True
+    router = LlmRouter(failure_threshold=5, reset_timeout=60)
+    routing = RoutingLlm(primary, secondary, router, "primary")
+    await _measure(lambda: routing.generate_response("Hello"), args)
+    stats = router.stats
+    print(
+        f"primary down: {primary.calls} of {args.requests} requests reached "
+        f"it, fallbacks={stats.fallbacks} circuit opens={stats.circuit_opens}"
+        f" circuit {router.breaker('primary').state}"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--slow-every", type=int, default=20)
+    parser.add_argument("--slow-factor", type=float, default=25.0)
+    parser.add_argument("--secondary-latency", type=float, default=0.03)
+    asyncio.run(main(parser.parse_args()))
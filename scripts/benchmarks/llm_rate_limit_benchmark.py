@@ -0,0 +1,254 @@
+"""
+Behaviour of LLM requests under a provider rate limit.
+
+A local stub of the OpenAI API allows `--limit` requests per `--window`
+seconds. It reports the remaining budget in `x-ratelimit-*` headers and
+answers 429 with `retry-after-ms` once the budget is spent. One heavy user
+sends `--heavy` requests at once, then `--light-users` users send
+`--light` requests each.
+
+The load is sent twice: straight to the provider with the SDK's own retries,
+as chat turns did before, and through `OpenAiLlm` with the `LlmScheduler` of
+an `LlmClientRegistry`. For each, the script reports the 429 responses the
+provider had to send, the failed requests and the latency of the heavy and the
+light users' requests. Finally, with the budget spent for longer than the
+queue deadline, it measures how quickly a request fails.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.llm_rate_limit_benchmark
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import statistics
+import time
+
+import httpx
+import openai
+from openai import AsyncOpenAI
+
+from config.settings import Settings
+from myjarvis.infrastructure.llm.client_registry import LlmClientRegistry
+from myjarvis.infrastructure.llm.openai_llm import OpenAiLlm
+from myjarvis.infrastructure.llm.scheduler import (
+    LlmOverloadedError,
+    llm_caller,
+)
+from scripts.benchmarks.stub_llm_server import (
+    COMPLETION,
+    Response,
+    StubLlmServer,
+)
+
+RATE_LIMIT_ERROR = {
+    "error": {
+        "message": "Rate limit reached for requests",
+        "type": "requests",
+        "code": "rate_limit_exceeded",
+    }
+}
+
+
+class _RateLimitedApi:
+    """
+    Chat completions limited to `limit` requests per `window` seconds.
+
+    Like the real providers, the budget refills continuously (a token bucket)
+    and a request counts against it when it arrives.
+    """
+
+    def __init__(self, limit: int, window: float, delay: float = 0.0):
+        self.limit = limit
+        self.window = window
+        self.delay = delay
+        self.rejected = 0
+        self._budget = float(limit)
+        self._updated = time.monotonic()
+
+    async def __call__(self, method: str, path: str, body: bytes) -> Response:
+        now = time.monotonic()
+        rate = self.limit / self.window
+        self._budget = min(
+            self.limit, self._budget + (now - self._updated) * rate
+        )
+        self._updated = now
+        accepted = self._budget >= 1
+        if accepted:
+            self._budget -= 1
+        headers = {
+            "Content-Type": "application/json",
+            "x-ratelimit-limit-requests": str(self.limit),
+            "x-ratelimit-remaining-requests": str(int(self._budget)),
+            "x-ratelimit-reset-requests": (
+                f"{(self.limit - self._budget) / rate:.3f}s"
+            ),
+        }
+        if not accepted:
+            self.rejected += 1
+            headers["retry-after-ms"] = str(
+                math.ceil((1 - self._budget) / rate * 1000)
+            )
+            return 429, headers, json.dumps(RATE_LIMIT_ERROR).encode()
+        await asyncio.sleep(self.delay)
+        return 200, headers, json.dumps(COMPLETION).encode()
+
+
+async def _load(send, args: argparse.Namespace) -> dict[str, list]:
+    """
+    Send the load and return the latencies of the successful requests and
+    the errors of the failed ones, by user class.
+    """
+    results: dict[str, list] = {
+        "heavy": [],
+        "light": [],
+        "failed": [],
+    }
+
+    async def one(user: str, kind: str) -> None:
+        llm_caller.set(user)
+        started = time.perf_counter()
+        try:
+            await send()
+        except (openai.RateLimitError, LlmOverloadedError) as exc:
+            results["failed"].append(type(exc).__name__)
+            return
+        results[kind].append(time.perf_counter() - started)
+
+    async def light_users() -> None:
+        await asyncio.sleep(args.light_delay)
+        await asyncio.gather(
+            *(
+                one(f"light-{user}", "light")
+                for user in range(args.light_users)
+                for _ in range(args.light)
+            )
+        )
+
+    await asyncio.gather(
+        *(one("heavy", "heavy") for _ in range(args.heavy)), light_users()
+    )
+    return results
+
+
+def _report(name: str, api: _RateLimitedApi, results: dict) -> None:
+    def latency(samples: list[float]) -> str:
+        if not samples:
+            return "      -"
+        return (
+            f"p50={statistics.median(samples) * 1000:6.0f} ms "
+            f"max={max(samples) * 1000:6.0f} ms"
+        )
+
+    print(
+        f"{name:<10} 429s={api.rejected:4d} failed={len(results['failed']):3d}"
+        f"  heavy {latency(results['heavy'])}"
+        f"  light {latency(results['light'])}"
+    )
+
+
+async def _unscheduled(args: argparse.Namespace) -> None:
+    api = _RateLimitedApi(args.limit, args.window, args.server_delay)
+    async with StubLlmServer(api) as server:
+        async with httpx.AsyncClient() as http_client:
+            client = AsyncOpenAI(
+                api_key="stub",
+                base_url=server.base_url + "/v1",
+                http_client=http_client,
+            )
+
+            async def send() -> None:
+                await client.chat.completions.create(
+                    model="gpt-4",
+                    messages=[{"role": "user", "content": "Hello"}],
+                )
+
+            await send()
+            await asyncio.sleep(args.window)
+            api.rejected = 0
+            _report("SDK retry", api, await _load(send, args))
+
+
+def _registry(args: argparse.Namespace) -> LlmClientRegistry:
+    return LlmClientRegistry(
+        Settings(
+            llm_http2=False,
+            llm_queue_timeout_seconds=args.deadline,
+        )
+    )
+
+
+def _scheduled_llm(registry: LlmClientRegistry, base_url: str) -> OpenAiLlm:
+    client = AsyncOpenAI(
+        api_key="stub",
+        base_url=base_url + "/v1",
+        http_client=registry.http_client("openai"),
+        max_retries=0,
+    )
+    return OpenAiLlm(
+        api_key="stub", client=client, scheduler=registry.scheduler("openai")
+    )
+
+
+async def _scheduled(args: argparse.Namespace) -> None:
+    api = _RateLimitedApi(args.limit, args.window, args.server_delay)
+    registry = _registry(args)
+    async with StubLlmServer(api) as server:
+        llm = _scheduled_llm(registry, server.base_url)
+        try:
+            await llm.generate_response("Hello")
+            await asyncio.sleep(args.window)
+            api.rejected = 0
+            results = await _load(lambda: llm.generate_response("Hello"), args)
+            _report("scheduler", api, results)
+        finally:
+            await registry.aclose()
+
+
+async def _fail_fast(args: argparse.Namespace) -> None:
+    # One request's share of the window is ten times the deadline.
+    window = args.deadline * args.limit * 10
+    api = _RateLimitedApi(args.limit, window)
+    registry = _registry(args)
+    async with StubLlmServer(api) as server:
+        llm = _scheduled_llm(registry, server.base_url)
+        try:
+            for _ in range(args.limit):
+                await llm.generate_response("Hello")
+            started = time.perf_counter()
+            try:
+                await llm.generate_response("Hello")
+            except LlmOverloadedError as exc:
+                print(
+                    f"budget spent for {window:.0f}s, deadline "
+                    f"{args.deadline:.0f}s: failed after "
+                    f"{(time.perf_counter() - started) * 1000:.2f} ms, "
+                    f"retry after {exc.retry_after:.1f}s ({exc})"
+                )
+        finally:
+            await registry.aclose()
+
+
+async def main(args: argparse.Namespace) -> None:
+    print(
+        f"limit {args.limit} requests per {args.window:.1f}s; heavy user: "
+        f"{args.heavy} requests, {args.light_users} light users: "
+        f"{args.light} requests each"
+    )
+    await _unscheduled(args)
+    await _scheduled(args)
+    await _fail_fast(args)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--limit", type=int, default=10)
+    parser.add_argument("--window", type=float, default=0.5)
+    parser.add_argument("--heavy", type=int, default=40)
+    parser.add_argument("--light-users", type=int, default=4)
+    parser.add_argument("--light", type=int, default=2)
+    parser.add_argument("--light-delay", type=float, default=0.05)
+    parser.add_argument("--server-delay", type=float, default=0.02)
+    parser.add_argument("--deadline", type=float, default=10.0)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,224 @@
+"""
+Time, memory and bytes read of `get_page_content` on a corpus of pages.
+
+Writes a corpus of fixture pages to a temporary directory: `--articles`
+articles of about `--article-kb` KB each, surrounded by navigation, scripts
+and footers, one page of `--huge-mb` MB, and pages exercising the
+decoding (gzip-compressed, windows-1252 declared in a `<meta>` tag, UTF-8
+with a byte order mark, plain text). The pages are served from the
+directory by an `httpx.MockTransport`, in 16 KB chunks, with an `ETag`.
+
+Every page is read:
+- by the baseline: the whole body downloaded, decoded at once and parsed by
+  `HtmlTextExtractor` without a budget, as a reader without streaming would;
+- by `PageReader` with a budget of `--max-tokens` tokens;
+- by a `PageReader` which already read every page, revalidating its cache
+  (`304 Not Modified`).
+
+For each, the script reports the total time and bytes read, and the peak of
+the memory allocated while reading the huge page (`tracemalloc`), with a
+reader of its own. It also
+prints the title, encoding and first characters of the special pages.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.page_content_benchmark \\
+        --articles 50 --huge-mb 8 --max-tokens 4000
+"""
+
+import argparse
+import asyncio
+import codecs
+import gzip
+import random
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import AsyncIterator, Callable
+
+import httpx
+
+from myjarvis.infrastructure.external.html_text import HtmlTextExtractor
+from myjarvis.infrastructure.external.page_reader import PageReader
+
+_CHUNK_BYTES = 16 * 1024
+_WORDS = (
+    "the agent reads pages and keeps only their main text within a budget "
+    "of tokens while the rest of the page is never downloaded at all"
+).split()
+_SPECIAL = ("gzip", "latin", "bom", "plain")
+
+
+def _paragraphs(rng: random.Random, size: int) -> str:
+    parts = []
+    total = 0
+    while total < size:
+        words = " ".join(
+            rng.choice(_WORDS) for _ in range(rng.randint(40, 90))
+        )
+        parts.append(f"<p>{words.capitalize()}.</p>\n")
+        total += len(parts[-1])
+    return "".join(parts)
+
+
+def _page(rng: random.Random, title: str, size: int) -> str:
+    links = "".join(f'<li><a href="/{i}">Link {i}</a></li>' for i in range(60))
+    script = "var data = " + repr(list(range(2000))) + ";"
+    return (
+        f'<!DOCTYPE html><html><head><meta charset="utf-8">'
+        f"<title>{title}</title><script>{script}</script>"
+        f"<style>body {{ margin: 0 }}</style></head><body>"
+        f"<header><nav><ul>{links}</ul></nav></header>"
+        f"<main><article><h1>{title}</h1>{_paragraphs(rng, size)}"
+        f"</article></main><aside>{links}</aside>"
+        f"<footer>Copyright</footer></body></html>"
+    )
+
+
+def _write_corpus(directory: Path, args: argparse.Namespace) -> list[str]:
+    rng = random.Random(0)
+    names = []
+    for index in range(args.articles):
+        name = f"article-{index}.html"
+        text = _page(rng, f"Article {index}", args.article_kb * 1024)
+        (directory / name).write_text(text, encoding="utf-8")
+        names.append(name)
+    huge = _page(rng, "Huge page", args.huge_mb * 1024 * 1024)
+    (directory / "huge.html").write_text(huge, encoding="utf-8")
+    names.append("huge.html")
+    article = _page(rng, "Compressed page", args.article_kb * 1024)
+    (directory / "gzip.html").write_bytes(gzip.compress(article.encode()))
+    latin = _page(rng, "Café crème", 4096).replace(
+        'charset="utf-8"', 'charset="iso-8859-1"'
+    )
+    (directory / "latin.html").write_bytes(latin.encode("cp1252"))
+    bom = _page(rng, "Naïve résumé", 4096)
+    (directory / "bom.html").write_bytes(codecs.BOM_UTF8 + bom.encode("utf-8"))
+    (directory / "plain.txt").write_text(
+        _paragraphs(rng, 64 * 1024).replace("<p>", "").replace("</p>", "")
+    )
+    return names + ["gzip.html", "latin.html", "bom.html", "plain.txt"]
+
+
+class _Server:
+    """
+    Serves the files of a directory, streamed from disk, counting the bytes
+    sent.
+    """
+
+    def __init__(self, directory: Path):
+        self._directory = directory
+        self.bytes_sent = 0
+
+    async def _body(self, path: Path) -> AsyncIterator[bytes]:
+        with path.open("rb") as file:
+            while chunk := file.read(_CHUNK_BYTES):
+                self.bytes_sent += len(chunk)
+                yield chunk
+                await asyncio.sleep(0)
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        path = self._directory / request.url.path.lstrip("/")
+        stat = path.stat()
+        etag = f'"{stat.st_mtime_ns:x}-{stat.st_size:x}"'
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        headers = {"ETag": etag, "Content-Type": "text/html"}
+        if path.suffix == ".txt":
+            headers["Content-Type"] = "text/plain"
+        if path.name == "gzip.html":
+            headers["Content-Encoding"] = "gzip"
+        return httpx.Response(200, headers=headers, content=self._body(path))
+
+
+async def _baseline(client: httpx.AsyncClient, url: str) -> str:
+    response = await client.get(url)
+    extractor = HtmlTextExtractor(max_tokens=10**9)
+    extractor.feed(response.text)
+    extractor.close()
+    return extractor.text
+
+
+async def _run(
+    name: str, server: _Server, make_read: Callable, urls: list[str]
+) -> None:
+    """
+    Read all pages with a reader from `make_read`, then the huge page with
+    another, tracing its allocations.
+    """
+    read = make_read()
+    server.bytes_sent = 0
+    started = time.perf_counter()
+    for url in urls:
+        await read(url)
+    elapsed = time.perf_counter() - started
+    bytes_sent = server.bytes_sent
+    read = make_read()
+    tracemalloc.start()
+    await read(next(url for url in urls if "huge" in url))
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    print(
+        f"{name:<12} {elapsed * 1000:9.1f} ms  "
+        f"{bytes_sent / 2**20:8.2f} MiB read  "
+        f"huge page peak {peak / 2**20:7.2f} MiB"
+    )
+
+
+async def _resolve(host: str, port: int) -> list[str]:
+    # The mock transport serves every host; they pass as public hosts.
+    return ["93.184.215.14"]
+
+
+async def main(args: argparse.Namespace) -> None:
+    with tempfile.TemporaryDirectory() as name:
+        directory = Path(name)
+        files = _write_corpus(directory, args)
+        server = _Server(directory)
+        client = httpx.AsyncClient(
+            transport=httpx.MockTransport(server), base_url="http://fixtures"
+        )
+        urls = [f"http://fixtures/{file}" for file in files]
+        size = sum((directory / file).stat().st_size for file in files)
+        print(f"{len(urls)} pages, {size / 2**20:.1f} MiB on disk")
+
+        def reader_read() -> Callable:
+            reader = PageReader(
+                client, max_bytes=args.max_bytes, resolver=_resolve
+            )
+            return lambda url: reader.read(url, args.max_tokens)
+
+        warm = PageReader(client, max_bytes=args.max_bytes, resolver=_resolve)
+        for url in urls:
+            await warm.read(url, args.max_tokens)
+        await _run(
+            "baseline",
+            server,
+            lambda: lambda url: _baseline(client, url),
+            urls,
+        )
+        await _run("page reader", server, reader_read, urls)
+        await _run(
+            "revalidated",
+            server,
+            lambda: lambda url: warm.read(url, args.max_tokens),
+            urls,
+        )
+        for special in _SPECIAL:
+            url = next(url for url in urls if f"/{special}." in url)
+            page = await warm.read(url, args.max_tokens)
+            print(
+                f"{special:<6} {page.charset:<8} title={page.title!r} "
+                f"text={page.text[:40]!r} truncated={page.truncated}"
+            )
+        await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--articles", type=int, default=50)
+    parser.add_argument("--article-kb", type=int, default=60)
+    parser.add_argument("--huge-mb", type=int, default=8)
+    parser.add_argument("--max-tokens", type=int, default=4000)
+    parser.add_argument("--max-bytes", type=int, default=2 * 1024 * 1024)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,171 @@
+"""
+LLM calls and latency of FAQ-style turns with the response cache.
+
+`--users` users, each starting one LLM latency after the previous one, ask
+an agent without nodes `--questions` questions each, drawn from a small set
+of FAQs, each in one of several wordings that differ in case, spacing,
+punctuation and word order, through `AgentService.process_message`.
+The LLM is a `FakeLlm` answering after `--llm-latency` seconds, counting its
+calls.
+
+The load is run without a cache, with the exact-match tier only, and with
+the similarity tier on top (using the `HashingEmbedder`). For each, the
+script reports the LLM calls and the p50 latency of a turn. It then checks
+that changing the agent's prompt invalidates its cached replies, and that a
+streamed turn is answered from the cache. It exits with an error if a check
+fails.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.response_cache_benchmark
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import sys
+import time
+from typing import Any, AsyncIterator
+
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.services.agent_service import AgentService
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.domain.value_objects.user_id import UserId
+from myjarvis.infrastructure.cache.response_cache import ResponseCache
+from myjarvis.infrastructure.llm.embedder import HashingEmbedder
+from myjarvis.infrastructure.llm.fake_llm import FakeLlm
+
+FAQS = [
+    [
+        "What are your opening hours?",
+        "what are your  opening hours?",
+        "What are your opening hours",
+        "Your opening hours, what are they?",
+    ],
+    [
+        "How do I reset my password?",
+        "how do i reset my password?",
+        "How do I reset my password please?",
+        "Reset my password, how do I do it?",
+    ],
+    [
+        "Do you ship to Canada?",
+        "do you ship to canada",
+        "Do you ship orders to Canada?",
+        "To Canada, do you ship?",
+    ],
+]
+
+
+class _CountingLlm(FakeLlm):
+    def __init__(self, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.calls = 0
+
+    async def stream_response(
+        self, prompt: str, history: list[Message] | None = None, **kwargs: Any
+    ) -> AsyncIterator[str]:
+        self.calls += 1
+        async for chunk in super().stream_response(prompt, history, **kwargs):
+            yield chunk
+
+
+async def _turn(service: AgentService, agent: AIAgent, text: str) -> float:
+    context = ChatContext(agent_id=agent.agent_id)
+    started = time.perf_counter()
+    await service.process_message(
+        agent, context, Message(content=text, sender=Sender.USER)
+    )
+    return time.perf_counter() - started
+
+
+async def _load(
+    service: AgentService, agent: AIAgent, args: argparse.Namespace
+) -> list[float]:
+    randomness = random.Random(0)
+
+    async def user(index: int) -> list[float]:
+        await asyncio.sleep(index * args.llm_latency)
+        return [
+            await _turn(
+                service, agent, randomness.choice(randomness.choice(FAQS))
+            )
+            for _ in range(args.questions)
+        ]
+
+    results = await asyncio.gather(
+        *(user(index) for index in range(args.users))
+    )
+    return [latency for latencies in results for latency in latencies]
+
+
+async def main(args: argparse.Namespace) -> int:
+    agent = AIAgent(
+        user_id=UserId(value="bench"),
+        name="faq",
+        base_prompt="You answer questions about our shop.",
+        llm_model="fake",
+        cache_replies=True,
+    )
+    turns = args.users * args.questions
+    print(
+        f"{args.users} users x {args.questions} questions from "
+        f"{len(FAQS)} FAQs, LLM latency {args.llm_latency * 1000:.0f} ms"
+    )
+    failures = []
+    for name, cache in (
+        ("no cache", None),
+        ("exact", ResponseCache()),
+        (
+            "similar",
+            ResponseCache(
+                embedder=HashingEmbedder(),
+                similarity_threshold=args.threshold,
+            ),
+        ),
+    ):
+        llm = _CountingLlm(first_token_delay=args.llm_latency)
+        service = AgentService(llm_factory=lambda _: llm, response_cache=cache)
+        latencies = await _load(service, agent, args)
+        print(
+            f"{name:<9} LLM calls={llm.calls:4d} of {turns} turns  "
+            f"p50={statistics.median(latencies) * 1000:6.1f} ms"
+        )
+
+    llm = _CountingLlm(first_token_delay=args.llm_latency)
+    service = AgentService(
+        llm_factory=lambda _: llm, response_cache=ResponseCache()
+    )
+    question = FAQS[0][0]
+    await _turn(service, agent, question)
+    await _turn(service, agent, question)
+    agent.update_prompt("You answer questions about our shop, politely.")
+    await _turn(service, agent, question)
+    print(f"prompt change: {llm.calls} LLM calls for 3 turns (expected 2)")
+    if llm.calls != 2:
+        failures.append("prompt change")
+
+    context = ChatContext(agent_id=agent.agent_id)
+    chunks = [
+        chunk
+        async for chunk in service.stream_message(
+            agent, context, Message(content=question, sender=Sender.USER)
+        )
+    ]
+    print(f"streamed turn: {llm.calls - 2} LLM calls, {len(chunks)} chunk")
+    if llm.calls != 2 or "".join(chunks) != llm.reply:
+        failures.append("streamed turn")
+    if failures:
+        print(f"failed: {', '.join(failures)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--users", type=int, default=20)
+    parser.add_argument("--questions", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.2)
+    parser.add_argument("--threshold", type=float, default=0.8)
+    sys.exit(asyncio.run(main(parser.parse_args())))
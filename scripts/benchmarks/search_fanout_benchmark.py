@@ -0,0 +1,204 @@
+"""
+Latency and result merging of `search_many` against a fake search provider.
+
+Builds a `FakeSearchProvider` over `--pages` pages about a few topics,
+answering every search after `--latency` seconds; some pages are listed
+twice, under URLs differing only by tracking parameters, letter case or a
+trailing slash. Pages are served by an `httpx.MockTransport`, each after
+`--page-latency` seconds.
+
+For `--queries` related queries, the script compares:
+- the queries searched one after the other with `search_web`, as an agent
+  issuing one tool call per query would;
+- the same queries with one `search_many` call, fanned out at most
+  `--concurrency` at a time;
+- `search_many` reading the top `--prefetch` pages ahead;
+- `search_many` with one query failing.
+
+It reports the time of each and, for `search_many`, the number of results,
+of distinct URLs and of distinct pages, and the top results with their
+reciprocal rank fusion score and the queries that found them.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.search_fanout_benchmark \\
+        --queries 5 --latency 0.3 --concurrency 4 --prefetch 3
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+import httpx
+
+from config.settings import get_settings
+from myjarvis.infrastructure.external.page_reader import PageReader
+from myjarvis.infrastructure.external.web_search import (
+    FakeSearchProvider,
+    SearchResult,
+    canonical_url,
+)
+from myjarvis.infrastructure.nodes.search_node import SearchNode
+
+_TOPICS = (
+    "python asyncio event loop",
+    "python concurrency threads",
+    "asyncio semaphore limits",
+    "event loop latency tuning",
+    "http client connection pooling",
+    "rank fusion search results",
+)
+_QUERIES = (
+    "python asyncio",
+    "asyncio event loop",
+    "python concurrency",
+    "asyncio semaphore",
+    "event loop latency",
+    "connection pooling",
+    "search rank fusion",
+    "python threads",
+)
+_VARIANTS = (
+    "{url}?utm_source=news&utm_medium=feed",
+    "{url}/",
+    "{url}#comments",
+)
+
+
+class _FailingProvider(FakeSearchProvider):
+    """
+    Fake provider failing the searches of one query.
+    """
+
+    def __init__(self, failing: str, **kwargs):
+        super().__init__(**kwargs)
+        self._failing = failing
+
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        if query == self._failing:
+            await asyncio.sleep(self.latency)
+            raise RuntimeError("Search provider unavailable.")
+        return await super().search(query, max_results)
+
+
+def _pages(count: int) -> list[SearchResult]:
+    rng = random.Random(0)
+    pages = []
+    for index in range(count):
+        topic = rng.choice(_TOPICS)
+        url = f"https://Docs.Example.com/{topic.replace(' ', '-')}/{index}"
+        page = SearchResult(
+            title=f"{topic.title()} ({index})",
+            url=url,
+            snippet=f"Notes on {topic}, part {index}.",
+        )
+        pages.append(page)
+        if index % 4 == 0:
+            variant = rng.choice(_VARIANTS).format(url=url.lower())
+            pages.append(
+                SearchResult(page.title, variant.replace("Docs", "docs"), "")
+            )
+    return pages
+
+
+def _transport(latency: float) -> httpx.MockTransport:
+    async def serve(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        title = request.url.path.strip("/").replace("-", " ")
+        body = (
+            f"<html><head><title>{title}</title></head><body>"
+            f"<nav>Menu</nav><main><h1>{title}</h1>"
+            f"<p>{'Text about ' + title + '. ' * 50}</p></main></body></html>"
+        )
+        return httpx.Response(
+            200, headers={"Content-Type": "text/html"}, text=body
+        )
+
+    return httpx.MockTransport(serve)
+
+
+async def _resolve(host: str, port: int) -> list[str]:
+    # The mock transport serves every host; they pass as public hosts.
+    return ["93.184.215.14"]
+
+
+async def _timed(name: str, call) -> dict:
+    started = time.perf_counter()
+    result = await call()
+    print(f"{name:<28} {(time.perf_counter() - started) * 1000:8.1f} ms")
+    return result
+
+
+async def main(args: argparse.Namespace) -> None:
+    get_settings().search_max_concurrency = args.concurrency
+    queries = list(_QUERIES[: args.queries])
+    client = httpx.AsyncClient(transport=_transport(args.page_latency))
+    provider = FakeSearchProvider(
+        pages=_pages(args.pages), latency=args.latency
+    )
+    node = SearchNode(
+        provider=provider, page_reader=PageReader(client, resolver=_resolve)
+    )
+    print(
+        f"{len(queries)} queries, {args.latency * 1000:.0f} ms per search, "
+        f"{args.concurrency} at a time"
+    )
+
+    async def sequential() -> list[dict]:
+        return [
+            await node.execute_command("search_web", {"query": query})
+            for query in queries
+        ]
+
+    replies = await _timed("search_web, one by one", sequential)
+    found = sum(len(reply["results"]) for reply in replies)
+    merged = await _timed(
+        "search_many",
+        lambda: node.execute_command("search_many", {"queries": queries}),
+    )
+    distinct = {
+        result["url"] for reply in replies for result in reply["results"]
+    }
+    pages = {canonical_url(url) for url in distinct}
+    print(
+        f"  {found} results, {len(distinct)} distinct URLs, {len(pages)} "
+        f"distinct pages; top {len(merged['results'])} returned"
+    )
+    for result in merged["results"][:5]:
+        print(
+            f"  {result['score']:.4f} {result['url']:<60} "
+            f"{result['queries']}"
+        )
+    prefetched = await _timed(
+        f"search_many, prefetch {args.prefetch}",
+        lambda: node.execute_command(
+            "search_many",
+            {"queries": queries, "prefetch_top_k": args.prefetch},
+        ),
+    )
+    for result in prefetched["results"][: args.prefetch]:
+        content = result.get("content") or result.get("content_error", "")
+        print(f"  {result['url']:<60} {content[:40]!r}")
+    failing = SearchNode(
+        provider=_FailingProvider(
+            queries[0], pages=provider.pages, latency=args.latency
+        ),
+        page_reader=node.page_reader,
+    )
+    partial = await _timed(
+        "search_many, 1 query failing",
+        lambda: failing.execute_command("search_many", {"queries": queries}),
+    )
+    print(f"  {len(partial['results'])} results, errors={partial['errors']}")
+    await client.aclose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--queries", type=int, default=5)
+    parser.add_argument("--pages", type=int, default=60)
+    parser.add_argument("--latency", type=float, default=0.3)
+    parser.add_argument("--page-latency", type=float, default=0.2)
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--prefetch", type=int, default=3)
+    asyncio.run(main(parser.parse_args()))
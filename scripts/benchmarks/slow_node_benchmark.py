@@ -0,0 +1,136 @@
+"""
+Slow-node isolation benchmark.
+
+Runs concurrent chat turns through `AgentService.stream_message` against
+`FakeLlm` while another request executes a command on a slow synchronous node
+(one that blocks for `--node-delay` seconds, like a blocking Google API
+call). The node is executed two ways:
+
+- inline: `execute_command` is called directly on the event loop, as a plain
+  synchronous node would be;
+- adapted: the command goes through the `ToolExecutor`, the node wrapped in
+  a `SyncNodeAdapter` running it on a thread pool, as the node registry
+  does.
+
+The latency of the chat turns is reported for each. With the adapter it stays
+at the baseline (no slow node at all); inline, every concurrent turn is
+delayed by the node.
+
+Usage:
+    PYTHONPATH=src python -m scripts.benchmarks.slow_node_benchmark
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List
+
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.services.agent_service import AgentService
+from myjarvis.domain.services.tool_executor import ToolExecutor
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.domain.value_objects.tool_call import ToolCall
+from myjarvis.domain.value_objects.user_id import UserId
+from myjarvis.infrastructure.llm.fake_llm import FakeLlm
+from myjarvis.infrastructure.nodes.base_node import BaseNode
+from myjarvis.infrastructure.nodes.sync_adapter import SyncNodeAdapter
+
+
+class _SlowNode(BaseNode):
+    def __init__(self, delay: float):
+        self.delay = delay
+
+    def execute_command(
+        self, command: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        time.sleep(self.delay)
+        return {"command": command}
+
+    def get_available_commands(self) -> List[str]:
+        return ["wait"]
+
+
+async def _chat_turn(service: AgentService, agent: AIAgent) -> float:
+    context = ChatContext(agent_id=agent.agent_id)
+    started = time.perf_counter()
+    async for _ in service.stream_message(
+        agent, context, Message(content="Hi", sender=Sender.USER)
+    ):
+        pass
+    return time.perf_counter() - started
+
+
+async def _run_node(
+    mode: str,
+    node: _SlowNode,
+    service: AgentService,
+    agent: AIAgent,
+    pool: ThreadPoolExecutor,
+) -> None:
+    # Give the chat turns a head start so that the node runs mid-stream.
+    await asyncio.sleep(0.01)
+    if mode == "inline":
+        node.execute_command("wait", {})
+    elif mode == "adapted":
+        await service.execute_tool_calls(
+            agent,
+            [ToolCall(call_id="1", node="slow", command="wait")],
+            {"slow": SyncNodeAdapter(node, pool)},
+        )
+
+
+async def _measure(
+    mode: str,
+    args: argparse.Namespace,
+    service: AgentService,
+    pool: ThreadPoolExecutor,
+) -> list[float]:
+    agent = AIAgent(
+        user_id=UserId(value="bench"), name="bench", llm_model="fake"
+    )
+    node = _SlowNode(args.node_delay)
+    turns = [_chat_turn(service, agent) for _ in range(args.concurrency)]
+    *latencies, _ = await asyncio.gather(
+        *turns, _run_node(mode, node, service, agent, pool)
+    )
+    return latencies
+
+
+def _report(name: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<10} p50={statistics.median(ordered) * 1000:8.1f} ms  "
+        f"p99={p99 * 1000:8.1f} ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    llm = FakeLlm(
+        reply="word " * args.tokens,
+        first_token_delay=args.first_token_delay,
+        token_delay=args.token_delay,
+    )
+    executor = ToolExecutor(default_timeout=args.node_delay * 2)
+    service = AgentService(llm_factory=lambda _: llm, tool_executor=executor)
+    pool = ThreadPoolExecutor(max_workers=4, thread_name_prefix="node")
+    print(
+        f"{args.concurrency} concurrent chat turns, "
+        f"one {args.node_delay * 1000:.0f} ms synchronous node call"
+    )
+    for mode in ("baseline", "inline", "adapted"):
+        _report(mode, await _measure(mode, args, service, pool))
+    pool.shutdown()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--tokens", type=int, default=20)
+    parser.add_argument("--first-token-delay", type=float, default=0.05)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    parser.add_argument("--node-delay", type=float, default=1.0)
+    asyncio.run(main(parser.parse_args()))
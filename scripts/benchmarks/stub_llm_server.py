@@ -0,0 +1,114 @@
+"""
+Minimal local HTTP server imitating an LLM provider API.
+
+Answers every request with a fixed OpenAI-style chat completion after an
+optional delay and keeps connections alive, so benchmarks can measure the
+client side of the provider integration without network noise or API costs.
+Responses can be customised per request by passing a `responder` callable.
+"""
+
+import asyncio
+import json
+from typing import Awaitable, Callable
+
+Response = tuple[int, dict[str, str], bytes]
+Responder = Callable[[str, str, bytes], Awaitable[Response]]
+
+_REASONS = {200: "OK", 429: "Too Many Requests", 500: "Internal Server Error"}
+
+COMPLETION = {
+    "id": "chatcmpl-stub",
+    "object": "chat.completion",
+    "created": 0,
+    "model": "gpt-4",
+    "choices": [
+        {
+            "index": 0,
+            "message": {"role": "assistant", "content": "Hello from stub."},
+            "finish_reason": "stop",
+        }
+    ],
+    "usage": {"prompt_tokens": 1, "completion_tokens": 4, "total_tokens": 5},
+}
+
+
+async def completion_responder(
+    method: str, path: str, body: bytes
+) -> Response:
+    return (
+        200,
+        {"Content-Type": "application/json"},
+        json.dumps(COMPLETION).encode(),
+    )
+
+
+class StubLlmServer:
+    """
+    Asyncio HTTP/1.1 server with keep-alive support.
+
+    Args:
+        responder: Coroutine producing `(status, headers, body)` for a
+            request given its method, path and body.
+        delay: Seconds to wait before answering each request.
+    """
+
+    def __init__(
+        self,
+        responder: Responder = completion_responder,
+        delay: float = 0.0,
+    ):
+        self.responder = responder
+        self.delay = delay
+        self.connections = 0
+        self.requests = 0
+        self._server: asyncio.Server | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def __aenter__(self) -> "StubLlmServer":
+        self._server = await asyncio.start_server(self._serve, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _serve(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self.connections += 1
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode().split(" ", 2)
+                headers = {}
+                while (line := await reader.readline()) not in (b"\r\n", b""):
+                    name, _, value = line.decode().partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                body = await reader.readexactly(
+                    int(headers.get("content-length", 0))
+                )
+                self.requests += 1
+                if self.delay:
+                    await asyncio.sleep(self.delay)
+                status, response_headers, payload = await self.responder(
+                    method, path, body
+                )
+                head = [f"HTTP/1.1 {status} {_REASONS.get(status, '')}"]
+                response_headers = {
+                    **response_headers,
+                    "Content-Length": str(len(payload)),
+                }
+                head += [f"{k}: {v}" for k, v in response_headers.items()]
+                writer.write(("\r\n".join(head) + "\r\n\r\n").encode())
+                writer.write(payload)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,135 @@
+"""
+Query count of the Telegram identity lookup.
+
+Seeds a user with a linked Telegram account and two agents, then resolves the
+account through `TelegramIdentityService` `--messages` times, as the bot does
+for every message, counting the SQL statements issued. Only the first lookup
+may query the database. The user then selects the other agent with
+`SelectAgentHandler`; the next lookup must query the database once and return
+the new agent. A Telegram account linked to no user is looked up too. The
+script exits with an error if any check fails.
+
+Usage:
+    DATABASE_URL=sqlite+aiosqlite:///:memory: PYTHONPATH=src:. \\
+        python -m scripts.benchmarks.telegram_identity_queries
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from myjarvis.application.commands.select_agent import SelectAgentCommand
+from myjarvis.application.handlers.command_handlers import SelectAgentHandler
+from myjarvis.domain.services.telegram_identity_service import (
+    TelegramIdentityService,
+)
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.infrastructure.cache.local_cache import LruTtlCache
+from myjarvis.infrastructure.database.models.agent_model import AgentModel
+from myjarvis.infrastructure.database.models.base import Base
+from myjarvis.infrastructure.database.models.user_model import UserModel
+from myjarvis.infrastructure.database.repositories.sqlalchemy_agent_repository import (  # noqa: E501
+    SQLAlchemyAgentRepository,
+)
+from myjarvis.infrastructure.database.repositories.sqlalchemy_user_repository import (  # noqa: E501
+    SQLAlchemyUserRepository,
+)
+
+TELEGRAM_ID = 5_000_000_001
+STRANGER_TELEGRAM_ID = 5_000_000_002
+
+
+async def main(args: argparse.Namespace) -> int:
+    engine = create_async_engine("sqlite+aiosqlite:///:memory:")
+    statements = 0
+
+    def count(*_) -> None:
+        nonlocal statements
+        statements += 1
+
+    async with engine.begin() as connection:
+        await connection.run_sync(Base.metadata.create_all)
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    first, second = AgentId.generate(), AgentId.generate()
+    async with sessions.begin() as session:
+        session.add(
+            UserModel(
+                user_id="user",
+                email="user@bench",
+                telegram_id=TELEGRAM_ID,
+                active_agent_id=first.value,
+            )
+        )
+        session.add_all(
+            AgentModel(
+                agent_id=agent_id.value,
+                user_id="user",
+                name=name,
+                llm_model="fake",
+            )
+            for agent_id, name in ((first, "first"), (second, "second"))
+        )
+
+    identities = TelegramIdentityService(
+        LruTtlCache(max_entries=1024, max_bytes=1024, ttl_seconds=300)
+    )
+    event.listen(engine.sync_engine, "before_cursor_execute", count)
+
+    async def resolve_all(telegram_id: int) -> tuple[set, int, float]:
+        nonlocal statements
+        statements = 0
+        resolved = set()
+        started = time.perf_counter()
+        for _ in range(args.messages):
+            async with sessions() as session:
+                resolved.add(
+                    await identities.resolve(
+                        telegram_id, SQLAlchemyUserRepository(session)
+                    )
+                )
+        return resolved, statements, time.perf_counter() - started
+
+    failures = []
+    for label, telegram_id, expected in (
+        ("linked account", TELEGRAM_ID, first),
+        ("stranger", STRANGER_TELEGRAM_ID, None),
+    ):
+        resolved, queries, elapsed = await resolve_all(telegram_id)
+        (identity,) = resolved
+        agent_id = identity.agent_id if identity else None
+        print(
+            f"{label:<15} {args.messages} messages: {queries} queries, "
+            f"{elapsed / args.messages * 1e6:6.1f} us per lookup"
+        )
+        if queries != 1 or agent_id != expected:
+            failures.append(label)
+
+    async with sessions.begin() as session:
+        await SelectAgentHandler(
+            SQLAlchemyUserRepository(session),
+            SQLAlchemyAgentRepository(session),
+            identities,
+        ).handle(SelectAgentCommand(agent_id=str(second), user_id="user"))
+    resolved, queries, _ = await resolve_all(TELEGRAM_ID)
+    (identity,) = resolved
+    print(
+        f"after switching agents: {queries} queries, new agent selected: "
+        f"{identity.agent_id == second}"
+    )
+    if queries != 1 or identity.agent_id != second:
+        failures.append("agent switch")
+    await engine.dispose()
+    if failures:
+        print(f"failed: {', '.join(failures)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--messages", type=int, default=1000)
+    sys.exit(asyncio.run(main(parser.parse_args())))
@@ -0,0 +1,148 @@
+"""
+Telegram webhook throughput, per-chat ordering and backpressure.
+
+Posts updates from `--chats` chats, `--messages` each, to the
+`/telegram/webhook` endpoint, with a fake Telegram Bot API recording the
+replies the bot sends. The agent turn is simulated by a delay
+(`--turn-latency`); one chat is ten times slower than the others, like a turn
+running several tools.
+
+The same load is run with a single worker, which processes updates one after
+the other like the previous polling bot, and with `--workers` workers. For
+each, the script reports when the last reply of the normal chats was sent,
+and checks that every chat received its replies in order. Finally it posts a
+burst larger than `--max-pending` and counts the updates refused with 503.
+
+Usage:
+    DATABASE_URL=sqlite+aiosqlite:///:memory: PYTHONPATH=src:. \\
+        python -m scripts.benchmarks.telegram_webhook_benchmark
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from myjarvis.infrastructure.external.telegram_bot import (
+    TelegramBot,
+    TelegramMessage,
+)
+from myjarvis.presentation.api.v1 import telegram
+
+SLOW_CHAT_ID = 0
+
+
+class _FakeTelegramApi:
+    """Records the messages sent through the Bot API."""
+
+    def __init__(self) -> None:
+        self.sent: list[tuple[float, int, str]] = []
+        self.client = httpx.AsyncClient(
+            transport=httpx.MockTransport(self._handle)
+        )
+
+    def _handle(self, request: httpx.Request) -> httpx.Response:
+        if request.url.path.endswith("/sendMessage"):
+            payload = json.loads(request.content)
+            self.sent.append(
+                (time.perf_counter(), payload["chat_id"], payload["text"])
+            )
+        return httpx.Response(200, json={"ok": True, "result": True})
+
+
+def _update(update_id: int, chat_id: int, text: str) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "message_id": update_id,
+            "chat": {"id": chat_id, "type": "private"},
+            "from": {"id": chat_id, "is_bot": False, "first_name": "U"},
+            "text": text,
+        },
+    }
+
+
+async def _run(
+    args: argparse.Namespace, workers: int, max_pending: int
+) -> tuple[_FakeTelegramApi, list[int], float]:
+    async def on_message(message: TelegramMessage) -> str:
+        slow = message.chat_id == SLOW_CHAT_ID
+        await asyncio.sleep(args.turn_latency * (10 if slow else 1))
+        return f"re: {message.text}"
+
+    api = _FakeTelegramApi()
+    app = FastAPI()
+    app.include_router(telegram.router)
+    app.state.telegram_bot = TelegramBot(
+        "bench-token",
+        on_message,
+        http_client=api.client,
+        workers=workers,
+        max_pending=max_pending,
+    )
+    await app.state.telegram_bot.start()
+    update_ids = itertools.count(1)
+    statuses = []
+    started = time.perf_counter()
+    async with httpx.AsyncClient(
+        transport=httpx.ASGITransport(app), base_url="http://bench"
+    ) as client:
+        for index in range(args.messages):
+            for chat_id in range(args.chats):
+                response = await client.post(
+                    "/telegram/webhook",
+                    json=_update(next(update_ids), chat_id, str(index)),
+                )
+                statuses.append(response.status_code)
+        expected = statuses.count(200)
+        while len(api.sent) < expected:
+            await asyncio.sleep(0.005)
+    await app.state.telegram_bot.stop()
+    return api, statuses, started
+
+
+def _check_order(api: _FakeTelegramApi) -> bool:
+    replies: dict[int, list[int]] = {}
+    for _, chat_id, text in api.sent:
+        replies.setdefault(chat_id, []).append(int(text.removeprefix("re: ")))
+    return all(texts == sorted(texts) for texts in replies.values())
+
+
+async def main(args: argparse.Namespace) -> None:
+    total = args.chats * args.messages
+    print(
+        f"{args.chats} chats x {args.messages} messages, turn "
+        f"{args.turn_latency * 1000:.0f} ms (chat {SLOW_CHAT_ID}: 10x)"
+    )
+    for workers in (1, args.workers):
+        api, _, started = await _run(args, workers, total)
+        last_normal = max(
+            sent_at
+            for sent_at, chat_id, _ in api.sent
+            if chat_id != SLOW_CHAT_ID
+        )
+        print(
+            f"{workers:3d} workers: normal chats done after "
+            f"{(last_normal - started) * 1000:8.0f} ms, all replies in "
+            f"order: {_check_order(api)}"
+        )
+
+    _, statuses, _ = await _run(args, args.workers, args.max_pending)
+    print(
+        f"burst of {total} updates, max {args.max_pending} pending: "
+        f"{statuses.count(200)} accepted, {statuses.count(503)} refused (503)"
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--chats", type=int, default=20)
+    parser.add_argument("--messages", type=int, default=5)
+    parser.add_argument("--turn-latency", type=float, default=0.02)
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--max-pending", type=int, default=50)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,84 @@
+"""
+Time-to-first-token benchmark for the chat path.
+
+Runs the same conversation turn through `AgentService.process_message` (the
+reply is delivered once the LLM has finished) and `AgentService.stream_message`
+(the reply is delivered fragment by fragment) against `FakeLlm`, and reports
+how long it takes until the caller receives the first byte of the reply.
+
+Usage:
+    PYTHONPATH=src python -m scripts.benchmarks.ttft_benchmark
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.services.agent_service import AgentService
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.domain.value_objects.user_id import UserId
+from myjarvis.infrastructure.llm.fake_llm import FakeLlm
+
+
+async def _measure_blocking(service: AgentService, agent: AIAgent) -> float:
+    context = ChatContext(agent_id=agent.agent_id)
+    started = time.perf_counter()
+    await service.process_message(
+        agent, context, Message(content="Hi", sender=Sender.USER)
+    )
+    return time.perf_counter() - started
+
+
+async def _measure_streaming(service: AgentService, agent: AIAgent) -> float:
+    context = ChatContext(agent_id=agent.agent_id)
+    started = time.perf_counter()
+    first_token = None
+    async for _ in service.stream_message(
+        agent, context, Message(content="Hi", sender=Sender.USER)
+    ):
+        if first_token is None:
+            first_token = time.perf_counter() - started
+    return first_token or 0.0
+
+
+def _report(name: str, samples: list[float]) -> None:
+    ordered = sorted(samples)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    print(
+        f"{name:<10} p50={statistics.median(ordered) * 1000:8.1f} ms  "
+        f"p99={p99 * 1000:8.1f} ms"
+    )
+
+
+async def main(args: argparse.Namespace) -> None:
+    llm = FakeLlm(
+        reply="word " * args.tokens,
+        first_token_delay=args.first_token_delay,
+        token_delay=args.token_delay,
+    )
+    service = AgentService(llm_factory=lambda _: llm)
+    agent = AIAgent(
+        user_id=UserId(value="bench"), name="bench", llm_model="fake"
+    )
+
+    blocking = [
+        await _measure_blocking(service, agent) for _ in range(args.runs)
+    ]
+    streaming = [
+        await _measure_streaming(service, agent) for _ in range(args.runs)
+    ]
+    print(f"time to first byte over {args.runs} runs, {args.tokens} tokens")
+    _report("blocking", blocking)
+    _report("streaming", streaming)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    parser.add_argument("--tokens", type=int, default=200)
+    parser.add_argument("--first-token-delay", type=float, default=0.2)
+    parser.add_argument("--token-delay", type=float, default=0.005)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,112 @@
+"""
+Recall, query latency and memory of the local vector store.
+
+Inserts `--vectors` synthetic embeddings of `--dimensions` dimensions, drawn
+around `--clusters` topics like real text embeddings, into a
+`VectorCollection` in a temporary directory, `--batch` at a time. Then, for
+`--queries` new vectors drawn the same way, it compares the top 10 of the IVF
+index, for several `nprobe` values, with the exact top 10 of a brute-force
+scan, and reports the recall@10 and the query latency of both. The resident
+memory of the process is reported after the inserts and after the queries;
+the vectors themselves are memory-mapped from the collection's file.
+
+Usage:
+    PYTHONPATH=src:. python -m scripts.benchmarks.vector_store_benchmark \\
+        --vectors 1000000
+"""
+
+import argparse
+import statistics
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+from myjarvis.infrastructure.vector_store.vector_store import (
+    VectorCollection,
+    VectorRecord,
+)
+
+
+def _rss_mb() -> float:
+    for line in Path("/proc/self/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    return float("nan")
+
+
+def _report(name: str, latencies: list[float], recall: float | None) -> None:
+    ordered = sorted(latencies)
+    p99 = ordered[min(len(ordered) - 1, int(len(ordered) * 0.99))]
+    recall_text = "" if recall is None else f"recall@10={recall:.3f}  "
+    print(
+        f"{name:<12} {recall_text}p50={statistics.median(ordered) * 1000:7.2f}"
+        f" ms  p99={p99 * 1000:7.2f} ms"
+    )
+
+
+def main(args: argparse.Namespace) -> None:
+    randomness = np.random.default_rng(0)
+    topics = randomness.normal(size=(args.clusters, args.dimensions))
+
+    def sample(size: int) -> np.ndarray:
+        return topics[
+            randomness.integers(args.clusters, size=size)
+        ] + randomness.normal(scale=args.spread, size=(size, args.dimensions))
+
+    with tempfile.TemporaryDirectory() as directory:
+        collection = VectorCollection(Path(directory), train_size=10_000)
+        started = time.perf_counter()
+        for start in range(0, args.vectors, args.batch):
+            size = min(args.batch, args.vectors - start)
+            vectors = sample(size)
+            collection.upsert(
+                [
+                    VectorRecord(str(start + offset), vector)
+                    for offset, vector in enumerate(vectors)
+                ]
+            )
+        elapsed = time.perf_counter() - started
+        print(
+            f"{args.vectors} vectors x {args.dimensions} dimensions: "
+            f"inserted in {elapsed:.1f}s ({args.vectors / elapsed:,.0f}/s), "
+            f"RSS {_rss_mb():.0f} MB"
+        )
+
+        queries = sample(args.queries)
+        exact, latencies = [], []
+        for query in queries:
+            started = time.perf_counter()
+            exact.append(set(collection.exact_query(query, 10)))
+            latencies.append(time.perf_counter() - started)
+        _report("brute force", latencies, None)
+        for nprobe in args.nprobe:
+            collection.nprobe = nprobe
+            found, latencies = 0, []
+            for query, expected in zip(queries, exact):
+                started = time.perf_counter()
+                matches = collection.query(query, 10)
+                latencies.append(time.perf_counter() - started)
+                found += len(expected & {match.id for match in matches})
+            _report(
+                f"nprobe={nprobe}",
+                latencies,
+                found / (10 * len(queries)),
+            )
+        print(f"RSS after queries {_rss_mb():.0f} MB")
+        collection.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--vectors", type=int, default=100_000)
+    parser.add_argument("--dimensions", type=int, default=128)
+    parser.add_argument("--clusters", type=int, default=1000)
+    parser.add_argument("--spread", type=float, default=1.0)
+    parser.add_argument("--batch", type=int, default=10_000)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument(
+        "--nprobe", type=int, nargs="+", default=[4, 16, 64, 256]
+    )
+    main(parser.parse_args())
@@ -13,6 +13,8 @@ that encapsulates the data required to create a new agent.
 - `name`: The name of the new agent.
 - `base_prompt`: The initial system prompt for the agent.
 - `llm_model`: The identifier for the Language Model to be used (e.g., 'openai-gpt-4').
+- `cache_replies`: Whether the agent's replies may be reused for repeated
+  questions (off by default).
 
 The handler for this command, `CreateAgentHandler`, will be located in the
 `application.handlers.command_handlers` module. It will receive this command object,
@@ -0,0 +1,34 @@
+"""Resume Turn Command.
+
+This module defines the command for resuming a chat turn that was suspended
+while a node command ran as a background job. The client that sent the
+message polls with this command until the agent's reply is available.
+
+The handler, `SendMessageHandler.resume`, collects the results of the turn's
+jobs, waiting up to `wait_seconds` for them. Once all of them are available,
+it sends them to the LLM, which either answers or requests more commands,
+and the turn is finished or suspended again. The reply of a finished turn is
+kept for a while, so a repeated poll returns it again.
+"""
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class ResumeTurnCommand(BaseModel):
+    """
+    Command to resume a suspended chat turn.
+
+    Attributes:
+        agent_id: The ID of the agent answering the message.
+        user_id: The ID of the user who sent the message.
+        turn_id: The ID of the suspended turn.
+        wait_seconds: How long to wait for the turn's jobs before reporting
+            the turn as still pending.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    agent_id: str
+    user_id: str
+    turn_id: str
+    wait_seconds: float = Field(default=0.0, ge=0.0)
@@ -0,0 +1,29 @@
+"""Select Agent Command.
+
+This module defines the command for selecting the agent that answers a user's
+Telegram messages. This command is part of the Application layer and follows
+the CQRS pattern.
+
+The handler for this command, `SelectAgentHandler`, is located in the
+`application.handlers.command_handlers` module. It checks that the user owns
+the agent, records it as the user's active agent and drops the user's cached
+Telegram identity, so the next message is answered by the new agent.
+"""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class SelectAgentCommand(BaseModel):
+    """
+    Command to make an agent the user's active agent.
+
+    Attributes:
+        agent_id: The ID of the agent to select.
+        user_id: The ID of the user performing the action, for authorization
+            purposes.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    agent_id: str
+    user_id: str
@@ -3,27 +3,38 @@
 This module defines the command for sending a message to an AI agent and getting a
 response. This is a primary interaction command within the system.
 
-Implementation Details:
------------------------
-This file should contain a Pydantic model or a dataclass named `SendMessageCommand`
-that encapsulates the data required for the interaction.
-
-`SendMessageCommand` should include:
-- `agent_id`: The ID of the agent to which the message is sent.
-- `user_id`: The ID of the user sending the message.
-- `message_text`: The content of the user's message.
-- `chat_context_id`: (Optional) The ID of an existing chat context to continue a
-  conversation. If not provided, a new context might be created.
-
-The handler, `SendMessageHandler`, will be complex. It will:
-1.  Retrieve the agent, its nodes, and the chat context.
+The handler, `SendMessageHandler`, will:
+1.  Retrieve the agent and the chat context.
 2.  Use the `AgentService` from the domain layer to process the message.
 3.  The service will interact with the configured LLM, providing the base prompt,
     chat history, and available tools (from the attached nodes).
-4.  The LLM's response will be processed and returned.
+4.  The LLM's response will be processed and returned, either at once or as a
+    stream of text fragments.
 5.  The chat context will be updated with the new messages.
 
 Note: While this command causes a change (updating chat context), it also needs to
 return a value (the AI's response). This is a common exception to the "commands
 don't return data" rule in CQRS for practical reasons.
 """
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class SendMessageCommand(BaseModel):
+    """
+    Command to send a user message to an AI agent.
+
+    Attributes:
+        agent_id: The ID of the agent to which the message is sent.
+        user_id: The ID of the user sending the message.
+        message_text: The content of the user's message.
+        chat_context_id: The ID of an existing chat context to continue a
+            conversation, if any.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    agent_id: str
+    user_id: str
+    message_text: str = Field(..., min_length=1)
+    chat_context_id: str | None = None
@@ -6,21 +6,41 @@ DTOs are used to transfer data between the application layer and the
 presentation layer, providing a decoupled and serializable representation of
 domain entities.
 
-Implementation Details:
------------------------
-This file should contain a Pydantic model named `AgentDTO`. It should represent
-the state of an `AIAgent` entity that is safe to expose to external clients (like a
-web frontend or an API consumer).
-
-The `AgentDTO` should include fields such as:
-- `id`: The unique identifier of the agent.
-- `name`: The name of the agent.
-- `base_prompt`: The system prompt of the agent.
-- `llm_model`: The identifier of the language model used.
-- `created_at`: The timestamp of when the agent was created.
-- `attached_nodes`: A list of `NodeDTO` objects representing the tools
-  connected to this agent.
-
-This DTO will be constructed by query handlers in the `application.handlers.query_handlers`
+`AgentDTO` represents the state of an `AIAgent` entity that is safe to expose
+to external clients (like a web frontend or an API consumer). It is
+constructed by query handlers in the `application.handlers.query_handlers`
 module and returned to the presentation layer.
+
+List queries may select a subset of the fields (a projection); the fields
+left out are None. `id` and `created_at` are always present.
 """
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+from .node_dto import NodeDTO
+
+
+class AgentDTO(BaseModel):
+    """
+    Public representation of an AI agent.
+
+    Attributes:
+        id: The unique identifier of the agent.
+        created_at: When the agent was created.
+        name: The name of the agent.
+        base_prompt: The system prompt of the agent.
+        llm_model: The identifier of the language model used.
+        attached_nodes: The nodes connected to this agent.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    id: UUID
+    created_at: datetime
+    name: str | None = None
+    base_prompt: str | None = None
+    llm_model: str | None = None
+    attached_nodes: list[NodeDTO] | None = None
@@ -3,18 +3,34 @@
 This module defines the Data Transfer Object (DTO) for a Node.
 Nodes represent the tools and services that can be attached to an AI agent.
 
-Implementation Details:
------------------------
-This file should contain a Pydantic model named `NodeDTO`. It provides a public
-representation of a `Node` entity.
-
-The `NodeDTO` should include fields such as:
-- `id`: The unique identifier of the node.
-- `name`: The human-readable name of the node (e.g., "Google Calendar").
-- `description`: A text explaining what the node does, which can be used by the
-  LLM to understand its capabilities.
-- `available_commands`: A list of commands the node can execute.
-
-This DTO will be used within `AgentDTO` to show which nodes are attached, and it
+`NodeDTO` is used within `AgentDTO` to show which nodes are attached, and it
 can also be returned by queries that list all available nodes in the system.
+
+List queries may select a subset of the fields (a projection); the fields
+left out are None. `id` and `name` are always present.
 """
+
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class NodeDTO(BaseModel):
+    """
+    Public representation of a Node.
+
+    Attributes:
+        id: The unique identifier of the node.
+        name: The human-readable name of the node (e.g., "Google Calendar").
+        description: A text explaining what the node does.
+        node_type: The type of the node, e.g. 'calendar'.
+        available_commands: The commands the node can execute.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    id: UUID
+    name: str
+    description: str | None = None
+    node_type: str | None = None
+    available_commands: list[str] | None = None
@@ -0,0 +1,27 @@
+"""Page Data Transfer Object.
+
+This module defines `PageDTO`, one page of the result of a list query, together
+with the cursor of the following page.
+"""
+
+from typing import Generic, TypeVar
+
+from pydantic import BaseModel, ConfigDict
+
+T = TypeVar("T")
+
+
+class PageDTO(BaseModel, Generic[T]):
+    """
+    One page of a list.
+
+    Attributes:
+        items: The items of the page.
+        next_cursor: The cursor of the next page, or None if this page is
+            the last one.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    items: list[T]
+    next_cursor: str | None = None
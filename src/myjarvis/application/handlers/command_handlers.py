@@ -23,16 +23,415 @@ Handlers to be implemented here include:
   - Uses `AgentRepository` to find the agent.
   - Uses `NodeRepository` to find the node.
   - Validates that the user in the command owns the agent.
-  - Invokes a domain service or an agent method (e.g., `agent.attach_node(node)`).
+  - Invokes `agent.attach_node(node_id)`.
   - Uses `AgentRepository` to save the updated agent state.
+  - Drops the agent's cached toolset from the `NodeService`.
+
+- `SelectAgentHandler`:
+  - Receives `SelectAgentCommand`.
+  - Uses `UserRepository` to find the user and `AgentRepository` to find the
+    agent.
+  - Invokes `user.select_agent(agent)`, which checks that the user owns it.
+  - Uses `UserRepository` to save the updated user.
+  - Drops the user's cached Telegram identity from the
+    `TelegramIdentityService`.
 
 - `SendMessageHandler`:
   - Receives `SendMessageCommand`.
-  - This is the most complex handler. It will retrieve the agent, nodes, and chat
-    context using repositories.
-  - It will then call a `ChatService` or `AgentService` in the domain layer,
-    passing the necessary information.
-  - The domain service will be responsible for the core logic of interacting with
-    the LLM and processing the response.
-  - The handler will persist the updated chat context.
+  - Retrieves the agent and its chat context (from the cache, falling back to
+    the database), and the agent's toolset from the `NodeService`.
+  - Calls the `AgentService` in the domain layer, which interacts with the LLM
+    and processes the response.
+  - Appends the new messages to the database and to the cache.
+  - Sends the LLM requests of the turn on behalf of the user (`llm_caller`),
+    so the users' requests take turns when a provider's rate limit is
+    reached.
+  - When a tool call runs as a background job, saves the `SuspendedTurn` in
+    the `TurnStore` and returns it instead of the reply. `resume`
+    (a `ResumeTurnCommand`) finishes the turn once the jobs have completed.
+    Without a turn store, the turn waits for its jobs.
 """
+
+from typing import AsyncIterator
+
+from pydantic import ValidationError
+
+from myjarvis.application.commands.attach_node import AttachNodeCommand
+from myjarvis.application.commands.resume_turn import ResumeTurnCommand
+from myjarvis.application.commands.select_agent import SelectAgentCommand
+from myjarvis.application.commands.send_message import SendMessageCommand
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.exceptions.domain_exceptions import (
+    AgentNotFoundException,
+    InvalidActionException,
+    NodeNotFoundException,
+    TurnNotFoundException,
+    UserNotFoundException,
+)
+from myjarvis.domain.interfaces.cache import ChatContextCache
+from myjarvis.domain.interfaces.jobs import TurnStore
+from myjarvis.domain.interfaces.llm import llm_caller
+from myjarvis.domain.repositories.agent_repository import AgentRepository
+from myjarvis.domain.repositories.chat_context_repository import (
+    ChatContextRepository,
+)
+from myjarvis.domain.repositories.node_repository import NodeRepository
+from myjarvis.domain.repositories.user_repository import UserRepository
+from myjarvis.domain.services.agent_service import AgentService
+from myjarvis.domain.services.node_service import NodeService, Toolset
+from myjarvis.domain.services.telegram_identity_service import (
+    TelegramIdentityService,
+)
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.node_id import NodeId
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.domain.value_objects.suspended_turn import SuspendedTurn
+from myjarvis.domain.value_objects.user_id import UserId
+
+
+class SendMessageHandler:
+    """
+    Handles `SendMessageCommand`.
+
+    Args:
+        agent_repository: Repository used to load the agent.
+        chat_repository: Durable storage of the agent's chat context.
+        chat_cache: Cache in front of `chat_repository`.
+        agent_service: Domain service that runs the conversation turn.
+        history_window: Maximum number of past messages loaded for a turn,
+            or None to load the whole conversation.
+        node_repository: Repository used to load the agent's nodes.
+        node_service: Service providing the agent's toolset. Without it (or
+            without `node_repository`), the agent answers without tools.
+        turn_store: Storage of the turns suspended by background jobs.
+            Without it, a turn waits for its jobs before `handle` returns.
+    """
+
+    def __init__(
+        self,
+        agent_repository: AgentRepository,
+        chat_repository: ChatContextRepository,
+        chat_cache: ChatContextCache,
+        agent_service: AgentService,
+        history_window: int | None = None,
+        node_repository: NodeRepository | None = None,
+        node_service: NodeService | None = None,
+        turn_store: TurnStore | None = None,
+    ):
+        self._agent_repository = agent_repository
+        self._chat_repository = chat_repository
+        self._chat_cache = chat_cache
+        self._agent_service = agent_service
+        self._history_window = history_window
+        self._node_repository = node_repository
+        self._node_service = node_service
+        self._turn_store = turn_store
+
+    async def handle(
+        self, command: SendMessageCommand
+    ) -> Message | SuspendedTurn:
+        """
+        Send a message to an agent and wait for the complete reply.
+
+        Args:
+            command: The message to send.
+
+        Returns:
+            The agent's reply, or the suspended turn to resume once its
+            background jobs have completed.
+
+        Raises:
+            AgentNotFoundException: If the agent does not exist or is not
+                owned by the user.
+            LlmOverloadedError: If the LLM provider's rate limit does not
+                let the request through in time.
+        """
+        llm_caller.set(command.user_id)
+        agent = await self._get_agent(command.agent_id, command.user_id)
+        context = await self._get_context(agent)
+        toolset = await self._get_toolset(agent)
+        reply = await self._agent_service.process_message(
+            agent, context, self._user_message(command), toolset=toolset
+        )
+        if isinstance(reply, SuspendedTurn) and self._turn_store is not None:
+            await self._turn_store.save(reply)
+            return reply
+        while isinstance(reply, SuspendedTurn):
+            turn = await self._agent_service.await_jobs(reply, None)
+            reply = await self._agent_service.resume_turn(
+                agent, context, turn, toolset
+            )
+        await self._save_context(context)
+        return reply
+
+    async def resume(
+        self, command: ResumeTurnCommand
+    ) -> Message | SuspendedTurn:
+        """
+        Resume a suspended turn once its background jobs have completed.
+
+        The jobs are waited for before the agent and the conversation are
+        loaded, so a poll does not use the database while it waits.
+
+        Args:
+            command: The turn to resume.
+
+        Returns:
+            The agent's reply, or the turn, still suspended.
+
+        Raises:
+            TurnNotFoundException: If the turn does not exist, has expired
+                or is not the user's.
+            AgentNotFoundException: If the agent no longer exists.
+            InvalidActionException: If the agent no longer has nodes.
+        """
+        if self._turn_store is None:
+            raise TurnNotFoundException(f"Turn {command.turn_id} not found.")
+        finished = await self._turn_store.get_reply(command.turn_id)
+        if finished is not None:
+            self._check_turn(finished[0], command)
+            return finished[1]
+        turn = await self._turn_store.get(command.turn_id)
+        self._check_turn(turn, command)
+        turn = await self._agent_service.await_jobs(turn, command.wait_seconds)
+        if turn.job_ids:
+            return turn
+        token = await self._turn_store.lock(turn.turn_id)
+        if token is None:
+            # Another poll is resuming the turn.
+            return turn
+        try:
+            return await self._resume_locked(turn, command.user_id)
+        finally:
+            await self._turn_store.unlock(turn.turn_id, token)
+
+    async def _resume_locked(
+        self, turn: SuspendedTurn, user_id: str
+    ) -> Message | SuspendedTurn:
+        current = await self._turn_store.get(turn.turn_id)
+        if current is None or current.tool_calls != turn.tool_calls:
+            # Resumed by another poll since it was read.
+            finished = await self._turn_store.get_reply(turn.turn_id)
+            return finished[1] if finished is not None else current or turn
+        llm_caller.set(user_id)
+        agent = await self._get_agent(turn.agent_id, user_id)
+        toolset = await self._get_toolset(agent)
+        if toolset is None:
+            await self._turn_store.delete(turn.turn_id)
+            raise InvalidActionException(
+                f"Agent {turn.agent_id} no longer has the nodes of the turn."
+            )
+        context = await self._get_context(agent)
+        reply = await self._agent_service.resume_turn(
+            agent, context, turn, toolset
+        )
+        if isinstance(reply, SuspendedTurn):
+            await self._turn_store.save(reply)
+            return reply
+        await self._save_context(context)
+        await self._turn_store.finish(turn, reply)
+        return reply
+
+    async def stream(self, command: SendMessageCommand) -> AsyncIterator[str]:
+        """
+        Send a message to an agent and stream the reply.
+
+        The agent and the chat context are resolved before this method
+        returns, so lookup errors are raised here rather than in the middle of
+        the stream. The chat context is persisted once the stream has been
+        consumed to the end.
+
+        Args:
+            command: The message to send.
+
+        Returns:
+            An async iterator over the text fragments of the reply.
+
+        Raises:
+            AgentNotFoundException: If the agent does not exist or is not
+                owned by the user.
+        """
+        llm_caller.set(command.user_id)
+        agent = await self._get_agent(command.agent_id, command.user_id)
+        context = await self._get_context(agent)
+        toolset = await self._get_toolset(agent)
+        return self._stream_reply(
+            agent, context, self._user_message(command), toolset
+        )
+
+    async def _stream_reply(
+        self,
+        agent: AIAgent,
+        context: ChatContext,
+        user_message: Message,
+        toolset: Toolset | None,
+    ) -> AsyncIterator[str]:
+        async for chunk in self._agent_service.stream_message(
+            agent, context, user_message, toolset=toolset
+        ):
+            yield chunk
+        await self._save_context(context)
+
+    async def _get_agent(self, agent_id: str, user_id: str) -> AIAgent:
+        try:
+            key = AgentId(value=agent_id)
+        except ValidationError:
+            raise AgentNotFoundException(
+                f"Agent {agent_id} not found."
+            ) from None
+        agent = await self._agent_repository.get_by_id(key)
+        if agent is None or not agent.is_owned_by(UserId(value=user_id)):
+            raise AgentNotFoundException(f"Agent {agent_id} not found.")
+        return agent
+
+    @staticmethod
+    def _check_turn(
+        turn: SuspendedTurn | None, command: ResumeTurnCommand
+    ) -> None:
+        if (
+            turn is None
+            or turn.user_id != command.user_id
+            or turn.agent_id != command.agent_id
+        ):
+            raise TurnNotFoundException(f"Turn {command.turn_id} not found.")
+
+    async def _get_context(self, agent: AIAgent) -> ChatContext:
+        context = await self._chat_cache.get_chat_context(
+            str(agent.agent_id), tail=self._history_window
+        )
+        if context is None:
+            context = await self._chat_repository.get_by_agent_id(
+                agent.agent_id, tail=self._history_window
+            )
+        return context or ChatContext(agent_id=agent.agent_id)
+
+    async def _get_toolset(self, agent: AIAgent) -> Toolset | None:
+        if self._node_service is None or self._node_repository is None:
+            return None
+        return await self._node_service.get_toolset(
+            agent, self._node_repository
+        )
+
+    async def _save_context(self, context: ChatContext) -> None:
+        await self._chat_repository.append(context)
+        await self._chat_cache.set_chat_context(context)
+        context.mark_persisted()
+
+    @staticmethod
+    def _user_message(command: SendMessageCommand) -> Message:
+        return Message(content=command.message_text, sender=Sender.USER)
+
+
+class AttachNodeHandler:
+    """
+    Handles `AttachNodeCommand`.
+
+    Args:
+        agent_repository: Repository used to load and save the agent.
+        node_repository: Repository used to load the node.
+        node_service: Service whose cached toolset of the agent is dropped.
+    """
+
+    def __init__(
+        self,
+        agent_repository: AgentRepository,
+        node_repository: NodeRepository,
+        node_service: NodeService,
+    ):
+        self._agent_repository = agent_repository
+        self._node_repository = node_repository
+        self._node_service = node_service
+
+    async def handle(self, command: AttachNodeCommand) -> None:
+        """
+        Attach a node to an agent.
+
+        Args:
+            command: The node and the agent to attach it to.
+
+        Raises:
+            AgentNotFoundException: If the agent does not exist or is not
+                owned by the user.
+            NodeNotFoundException: If the node does not exist.
+            InvalidActionException: If the node is already attached.
+        """
+        try:
+            agent_id = AgentId(value=command.agent_id)
+        except ValidationError:
+            raise AgentNotFoundException(
+                f"Agent {command.agent_id} not found."
+            ) from None
+        agent = await self._agent_repository.get_by_id(agent_id)
+        if agent is None or not agent.is_owned_by(
+            UserId(value=command.user_id)
+        ):
+            raise AgentNotFoundException(
+                f"Agent {command.agent_id} not found."
+            )
+        try:
+            node_id = NodeId(value=command.node_id)
+        except ValidationError:
+            raise NodeNotFoundException(
+                f"Node {command.node_id} not found."
+            ) from None
+        node = await self._node_repository.get_by_id(node_id)
+        if node is None:
+            raise NodeNotFoundException(f"Node {command.node_id} not found.")
+        agent.attach_node(node.node_id)
+        await self._agent_repository.update(agent)
+        self._node_service.invalidate_agent(agent.agent_id)
+
+
+class SelectAgentHandler:
+    """
+    Handles `SelectAgentCommand`.
+
+    Args:
+        user_repository: Repository used to load and save the user.
+        agent_repository: Repository used to load the agent.
+        identity_service: Service whose cached Telegram identity of the user
+            is dropped.
+    """
+
+    def __init__(
+        self,
+        user_repository: UserRepository,
+        agent_repository: AgentRepository,
+        identity_service: TelegramIdentityService,
+    ):
+        self._user_repository = user_repository
+        self._agent_repository = agent_repository
+        self._identity_service = identity_service
+
+    async def handle(self, command: SelectAgentCommand) -> None:
+        """
+        Make an agent the user's active agent.
+
+        Args:
+            command: The agent and the user selecting it.
+
+        Raises:
+            UserNotFoundException: If the user does not exist.
+            AgentNotFoundException: If the agent does not exist or is not
+                owned by the user.
+        """
+        user_id = UserId(value=command.user_id)
+        user = await self._user_repository.get_by_id(user_id)
+        if user is None:
+            raise UserNotFoundException(f"User {command.user_id} not found.")
+        try:
+            agent_id = AgentId(value=command.agent_id)
+        except ValidationError:
+            raise AgentNotFoundException(
+                f"Agent {command.agent_id} not found."
+            ) from None
+        agent = await self._agent_repository.get_by_id(agent_id)
+        if agent is None or not agent.is_owned_by(user_id):
+            raise AgentNotFoundException(
+                f"Agent {command.agent_id} not found."
+            )
+        user.select_agent(agent)
+        await self._user_repository.update(user)
+        if user.telegram_id is not None:
+            self._identity_service.invalidate(user.telegram_id)
@@ -1,29 +1,200 @@
 """Query Handlers.
 
-This module contains the handler classes responsible for executing queries. Each handler
-is specific to one query. Query handlers are responsible for fetching data from a
-persistence mechanism (via repositories) and mapping it to Data Transfer Objects (DTOs).
+This module contains the handler classes responsible for executing queries.
+Each handler is specific to one query. Query handlers are responsible for
+fetching data from a persistence mechanism (via repositories) and mapping it
+to Data Transfer Objects (DTOs).
 
-Query handlers should not have any side effects and must not modify system state.
+Query handlers should not have any side effects and must not modify system
+state.
 
 Implementation Details:
 -----------------------
-Similar to command handlers, a query bus or dependency injection will map queries to
-their respective handlers.
+Similar to command handlers, a query bus or dependency injection will map
+queries to their respective handlers.
 
-Handlers to be implemented here include:
+Handlers implemented here:
 
 - `GetAgentHandler`:
   - Receives `GetAgentQuery`.
-  - Uses a read-only method on `AgentRepository` to fetch the agent data by its ID.
-  - Verifies that the `user_id` from the query matches the agent's owner.
-  - Maps the retrieved data to an `AgentDTO`.
-  - Returns the `AgentDTO`.
+  - Fetches the agent through the `AgentReadModel`, restricted to agents
+    owned by the `user_id` of the query.
+  - Returns the `AgentDTO`, or raises `AgentNotFoundException`.
 
 - `GetUserAgentsHandler`:
   - Receives `GetUserAgentsQuery`.
-  - Uses a read-only method on `AgentRepository` to fetch all agents for a given
-    `user_id`.
-  - Maps the list of retrieved data to a list of `AgentDTO` objects (`list[AgentDTO]`).
-  - Returns the list of DTOs.
+  - Fetches one page of the agents of the `user_id` through the
+    `AgentReadModel`, with the fields requested by the query.
+  - Returns the page (`PageDTO[AgentDTO]`).
+
+- `GetNodesHandler`:
+  - Receives `GetNodesQuery`.
+  - Fetches one page of the node catalog through the `NodeReadModel`.
+  - Returns the page (`PageDTO[NodeDTO]`).
+
+Query handlers read through read models rather than the repositories: they
+return DTOs, with their nested objects, in a fixed number of queries, without
+building domain entities. They are bound to a read session, which goes to the
+read replica when one is configured.
+
+Lists are paginated by keyset: the cursor of the next page encodes the sort
+key of the last item of the page, and the read model selects the items after
+it. One item more than the page size is fetched to know whether a next page
+exists.
 """
+
+from datetime import datetime
+from uuid import UUID
+
+from pydantic import ValidationError
+
+from myjarvis.application.dto.agent_dto import AgentDTO
+from myjarvis.application.dto.node_dto import NodeDTO
+from myjarvis.application.dto.page_dto import PageDTO
+from myjarvis.application.queries.get_agent import GetAgentQuery
+from myjarvis.application.queries.get_nodes import GetNodesQuery
+from myjarvis.application.queries.get_user_agents import GetUserAgentsQuery
+from myjarvis.application.queries.pagination import (
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+)
+from myjarvis.application.read_models.agent_read_model import AgentReadModel
+from myjarvis.application.read_models.node_read_model import NodeReadModel
+from myjarvis.domain.exceptions.domain_exceptions import (
+    AgentNotFoundException,
+)
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.user_id import UserId
+
+
+class GetAgentHandler:
+    """
+    Handles `GetAgentQuery`.
+
+    Args:
+        agent_read_model: Read model used to load the agent.
+    """
+
+    def __init__(self, agent_read_model: AgentReadModel):
+        self._agent_read_model = agent_read_model
+
+    async def handle(self, query: GetAgentQuery) -> AgentDTO:
+        """
+        Return an agent of the requesting user.
+
+        Args:
+            query: The agent requested and the user requesting it.
+
+        Returns:
+            The agent.
+
+        Raises:
+            AgentNotFoundException: If the agent does not exist or belongs
+                to another user.
+        """
+        try:
+            agent_id = AgentId(value=query.agent_id)
+        except ValidationError:
+            raise AgentNotFoundException(
+                f"Agent {query.agent_id} not found."
+            ) from None
+        agent = await self._agent_read_model.get_agent(
+            agent_id, UserId(value=query.user_id)
+        )
+        if agent is None:
+            raise AgentNotFoundException(f"Agent {query.agent_id} not found.")
+        return agent
+
+
+class GetUserAgentsHandler:
+    """
+    Handles `GetUserAgentsQuery`.
+
+    Args:
+        agent_read_model: Read model used to load the agents.
+    """
+
+    def __init__(self, agent_read_model: AgentReadModel):
+        self._agent_read_model = agent_read_model
+
+    async def handle(self, query: GetUserAgentsQuery) -> PageDTO[AgentDTO]:
+        """
+        Return a page of the agents of a user.
+
+        Args:
+            query: The user whose agents are requested, and the page.
+
+        Returns:
+            The page of the user's agents, oldest first.
+
+        Raises:
+            InvalidCursorError: If the cursor of the query is malformed.
+        """
+        after = None
+        if query.cursor is not None:
+            created_at, agent_id = decode_cursor(query.cursor, 2)
+            try:
+                after = (datetime.fromisoformat(created_at), UUID(agent_id))
+            except (AttributeError, TypeError, ValueError):
+                raise InvalidCursorError(
+                    f"Invalid cursor {query.cursor!r}."
+                ) from None
+        agents = await self._agent_read_model.get_agents_of_user(
+            UserId(value=query.user_id),
+            limit=query.limit + 1,
+            after=after,
+            fields=query.fields,
+        )
+        if len(agents) <= query.limit:
+            return PageDTO(items=agents)
+        last = agents[query.limit - 1]
+        return PageDTO(
+            items=agents[: query.limit],
+            next_cursor=encode_cursor(last.created_at.isoformat(), last.id),
+        )
+
+
+class GetNodesHandler:
+    """
+    Handles `GetNodesQuery`.
+
+    Args:
+        node_read_model: Read model used to load the nodes.
+    """
+
+    def __init__(self, node_read_model: NodeReadModel):
+        self._node_read_model = node_read_model
+
+    async def handle(self, query: GetNodesQuery) -> PageDTO[NodeDTO]:
+        """
+        Return a page of the node catalog.
+
+        Args:
+            query: The page requested.
+
+        Returns:
+            The page of nodes, ordered by name.
+
+        Raises:
+            InvalidCursorError: If the cursor of the query is malformed.
+        """
+        after = None
+        if query.cursor is not None:
+            name, node_id = decode_cursor(query.cursor, 2)
+            try:
+                after = (str(name), UUID(node_id))
+            except (AttributeError, TypeError, ValueError):
+                raise InvalidCursorError(
+                    f"Invalid cursor {query.cursor!r}."
+                ) from None
+        nodes = await self._node_read_model.list_nodes(
+            limit=query.limit + 1, after=after, fields=query.fields
+        )
+        if len(nodes) <= query.limit:
+            return PageDTO(items=nodes)
+        last = nodes[query.limit - 1]
+        return PageDTO(
+            items=nodes[: query.limit],
+            next_cursor=encode_cursor(last.name, last.id),
+        )
@@ -0,0 +1,43 @@
+"""Get Nodes Query.
+
+This module defines the query for listing the nodes available in the system,
+one page at a time. This query is part of the Application layer and follows
+the CQRS pattern.
+
+The handler for this query, `GetNodesHandler`, is located in the
+`application.handlers.query_handlers` module. It receives this query object,
+fetches the data through the `NodeReadModel`, and returns a page of `NodeDTO`
+objects (`PageDTO[NodeDTO]`).
+"""
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from myjarvis.application.dto.node_dto import NodeDTO
+
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+class GetNodesQuery(BaseModel):
+    """
+    Query for the node catalog.
+
+    Attributes:
+        limit: Maximum number of nodes in the page.
+        cursor: The cursor of the page, as returned with the previous page,
+            or None for the first page.
+        fields: The `NodeDTO` fields to return, or None for all.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: str | None = None
+    fields: frozenset[str] | None = None
+
+    @field_validator("fields")
+    @classmethod
+    def _check_fields(cls, fields: frozenset[str] | None):
+        unknown = (fields or frozenset()) - NodeDTO.model_fields.keys()
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return fields
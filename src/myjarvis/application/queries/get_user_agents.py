@@ -1,19 +1,47 @@
 """Get User Agents Query.
 
-This module defines the query for retrieving a list of all AI agents belonging to a
-specific user. This query is part of the Application layer and follows the CQRS pattern.
-
-Implementation Details:
------------------------
-This file should contain a Pydantic model or a dataclass named `GetUserAgentsQuery`
-that encapsulates the parameters needed to fetch the agents.
-
-`GetUserAgentsQuery` should include:
-- `user_id`: The unique identifier for the user whose agents are to be retrieved.
-
-The handler for this query, `GetUserAgentsHandler`, will be located in the
-`application.handlers.query_handlers` module. It will receive this query object,
-use a read-only repository to fetch the data, and return a list of `AgentDTO`
-objects (`list[AgentDTO]`). The data returned should be concise, perhaps omitting
-details like the full base prompt, suitable for a list view.
+This module defines the query for retrieving the AI agents belonging to a
+specific user, one page at a time. This query is part of the Application
+layer and follows the CQRS pattern.
+
+The handler for this query, `GetUserAgentsHandler`, is located in the
+`application.handlers.query_handlers` module. It receives this query object,
+fetches the data through the `AgentReadModel`, and returns a page of `AgentDTO`
+objects (`PageDTO[AgentDTO]`).
 """
+
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+from myjarvis.application.dto.agent_dto import AgentDTO
+
+from .pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE
+
+
+class GetUserAgentsQuery(BaseModel):
+    """
+    Query for the agents of a user.
+
+    Attributes:
+        user_id: The unique identifier for the user whose agents are to be
+            retrieved.
+        limit: Maximum number of agents in the page.
+        cursor: The cursor of the page, as returned with the previous page,
+            or None for the first page.
+        fields: The `AgentDTO` fields to return, or None for all. Leaving
+            out `base_prompt` and `attached_nodes` avoids loading them.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    user_id: str
+    limit: int = Field(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE)
+    cursor: str | None = None
+    fields: frozenset[str] | None = None
+
+    @field_validator("fields")
+    @classmethod
+    def _check_fields(cls, fields: frozenset[str] | None):
+        unknown = (fields or frozenset()) - AgentDTO.model_fields.keys()
+        if unknown:
+            raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}")
+        return fields
@@ -0,0 +1,55 @@
+"""Pagination of list queries.
+
+List queries return one page at a time, as a `PageDTO`. The position of the
+next page is an opaque cursor string: the URL-safe base64 encoding of the sort
+key of the last item returned. Clients pass it back unchanged to get the next
+page; they must not build or inspect it.
+"""
+
+import base64
+import binascii
+import json
+from typing import Any
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+
+class InvalidCursorError(ValueError):
+    """
+    Raised when a cursor was not issued by a list query.
+    """
+
+
+def encode_cursor(*key: Any) -> str:
+    """
+    Encode the sort key of the last item of a page as a cursor.
+
+    Args:
+        key: The values of the sort key. They must be serializable to JSON,
+            or be converted to strings.
+    """
+    raw = json.dumps(key, separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, length: int) -> list[Any]:
+    """
+    Decode a cursor into the values of a sort key.
+
+    Args:
+        cursor: The cursor returned with the previous page.
+        length: The number of values of the sort key.
+
+    Raises:
+        InvalidCursorError: If the cursor is malformed.
+    """
+    try:
+        key = json.loads(
+            base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        )
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise InvalidCursorError(f"Invalid cursor {cursor!r}.") from None
+    if not isinstance(key, list) or len(key) != length:
+        raise InvalidCursorError(f"Invalid cursor {cursor!r}.")
+    return key
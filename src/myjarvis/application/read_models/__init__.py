@@ -0,0 +1,12 @@
+"""Read Models Package.
+
+This package contains the interfaces of the read models used by query handlers.
+
+A read model fetches the data of a query and returns DTOs directly, without
+building domain entities, so that reads can be shaped for what the client
+needs (e.g. loading a user's agents and their nodes in a fixed number of
+queries). The write side keeps using the repositories of the
+`domain.repositories` package.
+
+The concrete implementations live in `infrastructure.database.read_models`.
+"""
@@ -0,0 +1,62 @@
+"""Agent Read Model.
+
+This module defines the `AgentReadModel` interface, the read-only query path of
+`GetAgentHandler` and `GetUserAgentsHandler`. It returns `AgentDTO`s, including
+their attached nodes, in a number of database round trips that does not depend
+on the number of agents or nodes.
+"""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from uuid import UUID
+
+from myjarvis.application.dto.agent_dto import AgentDTO
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.user_id import UserId
+
+
+class AgentReadModel(ABC):
+    """
+    Read-only access to agents, as DTOs.
+    """
+
+    @abstractmethod
+    async def get_agent(
+        self, agent_id: AgentId, user_id: UserId
+    ) -> AgentDTO | None:
+        """
+        Return an agent of a user.
+
+        Args:
+            agent_id: The agent to return.
+            user_id: The user who must own the agent.
+
+        Returns:
+            The agent, or None if it does not exist or belongs to another
+            user.
+        """
+        pass
+
+    @abstractmethod
+    async def get_agents_of_user(
+        self,
+        user_id: UserId,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> list[AgentDTO]:
+        """
+        Return the agents of a user, ordered by `(created_at, id)`.
+
+        Args:
+            user_id: The user whose agents are returned.
+            limit: Maximum number of agents returned, or None for all.
+            after: The `(created_at, id)` of the last agent of the previous
+                page; only the agents after it are returned.
+            fields: The `AgentDTO` fields to load, or None for all. The
+                fields left out are not selected from the database.
+
+        Returns:
+            The user's agents, oldest first.
+        """
+        pass
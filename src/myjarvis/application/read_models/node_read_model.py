@@ -0,0 +1,38 @@
+"""Node Read Model.
+
+This module defines the `NodeReadModel` interface, the read-only query path of
+`GetNodesHandler`. It returns pages of the node catalog as `NodeDTO`s.
+"""
+
+from abc import ABC, abstractmethod
+from uuid import UUID
+
+from myjarvis.application.dto.node_dto import NodeDTO
+
+
+class NodeReadModel(ABC):
+    """
+    Read-only access to the node catalog, as DTOs.
+    """
+
+    @abstractmethod
+    async def list_nodes(
+        self,
+        limit: int | None = None,
+        after: tuple[str, UUID] | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> list[NodeDTO]:
+        """
+        Return the nodes of the system, ordered by `(name, id)`.
+
+        Args:
+            limit: Maximum number of nodes returned, or None for all.
+            after: The `(name, id)` of the last node of the previous page;
+                only the nodes after it are returned.
+            fields: The `NodeDTO` fields to load, or None for all. The
+                fields left out are not selected from the database.
+
+        Returns:
+            The nodes of the system.
+        """
+        pass
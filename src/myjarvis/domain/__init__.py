@@ -7,6 +7,7 @@ It is divided into the following sub-packages:
 - value_objects: Immutable objects that represent a descriptive aspect of the
   domain.
 - repositories: Interfaces for data persistence.
+- interfaces: Interfaces of the other services the domain relies on.
 - services: Domain services that orchestrate complex business logic.
 - exceptions: Custom exceptions specific to the domain.
 """
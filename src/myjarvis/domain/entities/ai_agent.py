@@ -6,12 +6,100 @@ be created by a User. Each agent has a specific configuration, including a base
 prompt, a selected LLM model, and a set of connected Nodes (tools) that it can
 use.
 
-Implementation details:
-- The class should be a Pydantic BaseModel for data validation.
-- It should include fields like `agent_id`, `user_id`, `name`, `base_prompt`,
-  `llm_model`, `created_at`, and a list of `node_ids`.
-- It should contain business logic methods such as `attach_node`,
-  `detach_node`, `update_prompt`, etc.
-- The entity should ensure its invariants, for example, an agent cannot have
-  duplicate nodes.
+The entity ensures its invariants, for example, an agent cannot have
+duplicate nodes.
 """
+
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field
+
+from myjarvis.domain.exceptions.domain_exceptions import (
+    InvalidActionException,
+)
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.node_id import NodeId
+from myjarvis.domain.value_objects.user_id import UserId
+
+
+class AIAgent(BaseModel):
+    """
+    An AI agent configured by a user.
+
+    Attributes:
+        agent_id: Unique identifier of the agent.
+        user_id: The owner of the agent.
+        name: Human-readable name of the agent.
+        base_prompt: The system prompt sent with every conversation.
+        llm_model: Identifier of the language model, e.g. 'openai-gpt-4'.
+        created_at: When the agent was created (UTC).
+        node_ids: Identifiers of the nodes attached to the agent.
+        cache_replies: Whether the agent's replies generated without tools
+            may be reused for repeated questions. Only suitable for agents
+            answering deterministically, e.g. FAQ agents.
+    """
+
+    agent_id: AgentId = Field(default_factory=AgentId.generate)
+    user_id: UserId
+    name: str = Field(..., min_length=1, max_length=100)
+    base_prompt: str = ""
+    llm_model: str
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    node_ids: list[NodeId] = Field(default_factory=list)
+    cache_replies: bool = False
+
+    def is_owned_by(self, user_id: UserId) -> bool:
+        """
+        Check whether the given user owns this agent.
+
+        Args:
+            user_id: The user to check.
+
+        Returns:
+            True if the user is the owner of the agent.
+        """
+        return self.user_id == user_id
+
+    def attach_node(self, node_id: NodeId) -> None:
+        """
+        Attach a node to the agent.
+
+        Args:
+            node_id: The node to attach.
+
+        Raises:
+            InvalidActionException: If the node is already attached.
+        """
+        if node_id in self.node_ids:
+            raise InvalidActionException(
+                f"Node {node_id} is already attached to agent "
+                f"{self.agent_id}."
+            )
+        self.node_ids.append(node_id)
+
+    def detach_node(self, node_id: NodeId) -> None:
+        """
+        Detach a node from the agent.
+
+        Args:
+            node_id: The node to detach.
+
+        Raises:
+            InvalidActionException: If the node is not attached.
+        """
+        if node_id not in self.node_ids:
+            raise InvalidActionException(
+                f"Node {node_id} is not attached to agent {self.agent_id}."
+            )
+        self.node_ids.remove(node_id)
+
+    def update_prompt(self, base_prompt: str) -> None:
+        """
+        Replace the agent's base prompt.
+
+        Args:
+            base_prompt: The new system prompt.
+        """
+        self.base_prompt = base_prompt
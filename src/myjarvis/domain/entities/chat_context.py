@@ -5,13 +5,161 @@ The ChatContext entity is responsible for storing the history of a conversation
 between a user and an AI agent. It maintains a list of messages, allowing the
 agent to have a memory of previous interactions.
 
-Implementation details:
-- The class can be a Pydantic BaseModel.
-- It should contain fields like `context_id`, `agent_id`, `messages`, and
-  `created_at`.
-- The `messages` field should be a list of `Message` value objects.
-- It should have methods to manage the conversation, such as `add_message` and
-  `clear_context`.
-- It might also include logic for truncating the context to fit within the
-  LLM's context window size.
+A conversation is stored as an append-only log: every message has a sequence
+number, and only the messages added since the context was loaded need to be
+written back. A loaded context may hold only the tail of a long conversation;
+`first_sequence` records where that tail starts.
+
+Messages that no longer fit into the LLM's context window are folded into a
+rolling `summary` that is stored with the context; `summarized_through`
+records which messages the summary already covers.
 """
+
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, Field, PrivateAttr
+
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.message import Message
+
+
+class ChatContext(BaseModel):
+    """
+    The conversation history between a user and one AI agent.
+
+    Attributes:
+        context_id: Unique identifier of the conversation.
+        agent_id: The agent this conversation belongs to.
+        messages: Messages in chronological order.
+        first_sequence: Sequence number of the first message in `messages`.
+            Non-zero when only the tail of the conversation was loaded.
+        summary: Rolling summary of the messages evicted from the LLM's
+            context window.
+        summarized_through: Sequence number of the first message not covered
+            by `summary`.
+        created_at: When the conversation was started (UTC).
+    """
+
+    context_id: UUID = Field(default_factory=uuid4)
+    agent_id: AgentId
+    messages: list[Message] = Field(default_factory=list)
+    first_sequence: int = Field(default=0, ge=0)
+    summary: str = ""
+    summarized_through: int = Field(default=0, ge=0)
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+
+    _persisted_count: int = PrivateAttr(default=0)
+    _summary_changed: bool = PrivateAttr(default=False)
+
+    @property
+    def next_sequence(self) -> int:
+        """
+        Sequence number the next appended message will get.
+        """
+        return self.first_sequence + len(self.messages)
+
+    @property
+    def summary_changed(self) -> bool:
+        """
+        Whether the summary changed since the context was last persisted.
+        """
+        return self._summary_changed
+
+    @property
+    def is_new(self) -> bool:
+        """
+        Whether nothing of this conversation has been persisted yet.
+        """
+        return self.first_sequence == 0 and self._persisted_count == 0
+
+    def add_message(self, message: Message) -> None:
+        """
+        Append a message to the end of the conversation.
+
+        Args:
+            message: The message to append.
+        """
+        self.messages.append(message)
+
+    def clear_context(self) -> None:
+        """
+        Remove all messages and start a new conversation.
+
+        The stored log of the previous conversation is append-only, so the
+        cleared context gets a new identity instead of rewriting it.
+        """
+        self.context_id = uuid4()
+        self.created_at = datetime.now(timezone.utc)
+        self.messages.clear()
+        self.first_sequence = 0
+        self.summary = ""
+        self.summarized_through = 0
+        self._persisted_count = 0
+        self._summary_changed = False
+
+    def update_summary(self, summary: str, summarized_through: int) -> None:
+        """
+        Replace the rolling summary.
+
+        Args:
+            summary: The new summary.
+            summarized_through: Sequence number of the first message not
+                covered by the new summary.
+        """
+        self.summary = summary
+        self.summarized_through = summarized_through
+        self._summary_changed = True
+
+    def pending_messages(self) -> list[Message]:
+        """
+        Return the messages added since the context was last persisted.
+        """
+        return self.messages[self._persisted_count :]
+
+    def insert_persisted(self, messages: list[Message]) -> None:
+        """
+        Insert messages persisted by another writer before the pending ones.
+
+        Used when another turn appended to the conversation after this
+        context was loaded: its messages take the sequence numbers the
+        pending messages were meant to get, and the pending messages follow.
+
+        Args:
+            messages: The messages stored since the context was loaded, in
+                sequence order.
+        """
+        self.messages[self._persisted_count : self._persisted_count] = messages
+        self._persisted_count += len(messages)
+
+    def mark_persisted(self) -> None:
+        """
+        Record that all current messages and the summary have been persisted.
+
+        Storage implementations call this after loading a context and once
+        every store has appended the pending messages.
+        """
+        self._persisted_count = len(self.messages)
+        self._summary_changed = False
+
+    def tail(self, size: int | None) -> "ChatContext":
+        """
+        Return a copy holding at most the newest `size` messages.
+
+        Args:
+            size: Maximum number of messages to keep, or None for all.
+
+        Returns:
+            A copy of the context. Pending messages stay pending.
+        """
+        dropped = 0 if size is None else max(len(self.messages) - size, 0)
+        copy = self.model_copy(
+            update={
+                "messages": self.messages[dropped:],
+                "first_sequence": self.first_sequence + dropped,
+            }
+        )
+        copy._persisted_count = max(self._persisted_count - dropped, 0)
+        return copy
@@ -6,11 +6,30 @@ with, such as Google Docs, a database, or a search engine. Each Node has a
 description of its capabilities and a set of commands it can execute. This
 information helps the LLM decide which tool to use for a given task.
 
-Implementation details:
-- The class should be a Pydantic BaseModel.
-- It should have fields like `node_id`, `name`, `description`, a list of
-  `commands`, and `node_type` (e.g., 'API', 'Database').
-- The `commands` should be well-defined, perhaps as a list of objects, each
-  with a name, description, and parameter schema.
-- The entity should have methods to validate its configuration.
+The commands of a node, with their descriptions and parameter schemas, are
+the same for every node of a type. They are declared by the node
+implementation and looked up through the node-type registry of the
+`NodeService`, so the entity only records which type a node is.
 """
+
+from pydantic import BaseModel, Field
+
+from myjarvis.domain.value_objects.node_id import NodeId
+
+
+class Node(BaseModel):
+    """
+    A tool or service that can be attached to agents.
+
+    Attributes:
+        node_id: Unique identifier of the node.
+        name: Human-readable name of the node, e.g. 'Google Calendar'.
+        description: What the node does, shown to users and to the LLM.
+        node_type: Key of the node's implementation in the node-type
+            registry, e.g. 'calendar'.
+    """
+
+    node_id: NodeId = Field(default_factory=NodeId.generate)
+    name: str = Field(..., min_length=1, max_length=100)
+    description: str = ""
+    node_type: str = Field(..., min_length=1, max_length=50)
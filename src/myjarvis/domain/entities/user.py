@@ -4,12 +4,56 @@ This module defines the User entity.
 The User entity represents a user of the system. Each user can create and manage
 multiple AI agents. The user is the root aggregate for the agents they own.
 
-Implementation details:
-- The class should be a Pydantic BaseModel for validation.
-- It should contain fields like `user_id`, `email`, `created_at`, and an
-  optional `telegram_id` for integrations.
-- It should have methods for validation, e.g., ensuring the email format is
-  correct.
-- Business logic related to the user, such as creating an agent, could be
-  initiated from this entity or a dedicated domain service.
+A user may link a Telegram account (`telegram_id`) and selects the agent that
+answers their Telegram messages (`active_agent_id`).
 """
+
+from datetime import datetime, timezone
+
+from pydantic import BaseModel, Field
+
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.exceptions.domain_exceptions import (
+    InvalidActionException,
+)
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.user_id import UserId
+
+
+class User(BaseModel):
+    """
+    A user of the system.
+
+    Attributes:
+        user_id: Unique identifier of the user, as issued by Firebase Auth.
+        email: The user's email address.
+        created_at: When the user was created (UTC).
+        telegram_id: The user's Telegram account, if linked.
+        active_agent_id: The agent answering the user's Telegram messages,
+            if one was selected.
+    """
+
+    user_id: UserId
+    email: str = Field(..., max_length=320, pattern=r"^[^@\s]+@[^@\s]+$")
+    created_at: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
+    telegram_id: int | None = None
+    active_agent_id: AgentId | None = None
+
+    def select_agent(self, agent: AIAgent) -> None:
+        """
+        Make an agent the user's active agent.
+
+        Args:
+            agent: The agent to select.
+
+        Raises:
+            InvalidActionException: If the agent is owned by another user.
+        """
+        if not agent.is_owned_by(self.user_id):
+            raise InvalidActionException(
+                f"Agent {agent.agent_id} is not owned by user "
+                f"{self.user_id}."
+            )
+        self.active_agent_id = agent.agent_id
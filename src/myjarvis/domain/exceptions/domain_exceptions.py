@@ -3,13 +3,41 @@ This module contains all custom exceptions for the domain layer.
 
 These exceptions are raised when a business rule is violated or an expected
 condition is not met within the domain logic.
-
-Implementation details:
-- A base exception class, e.g., `DomainException`, should be created.
-- Specific exceptions should inherit from this base class.
-- Examples of specific exceptions include:
-  - `UserNotFoundException`
-  - `AgentNotFoundException`
-  - `NodeNotFoundException`
-  - `InvalidActionException`
 """
+
+
+class DomainException(Exception):
+    """
+    Base class for all domain-specific errors.
+    """
+
+
+class UserNotFoundException(DomainException):
+    """
+    Raised when a user cannot be found.
+    """
+
+
+class AgentNotFoundException(DomainException):
+    """
+    Raised when an agent cannot be found or is not visible to the caller.
+    """
+
+
+class NodeNotFoundException(DomainException):
+    """
+    Raised when a node cannot be found.
+    """
+
+
+class TurnNotFoundException(DomainException):
+    """
+    Raised when a suspended chat turn cannot be found or is not visible to
+    the caller.
+    """
+
+
+class InvalidActionException(DomainException):
+    """
+    Raised when an action would violate a business rule.
+    """
@@ -0,0 +1,8 @@
+"""
+This package contains the interfaces of the services the domain relies on.
+
+Like the repository interfaces, they are implemented in the infrastructure
+layer and injected into the domain services, so the domain does not depend
+on the LLM providers, caches or queues behind them. They are `Protocol`s:
+an implementation conforms by having the members, without subclassing.
+"""
@@ -0,0 +1,150 @@
+"""
+This module defines the interfaces of the caches the domain services rely
+on: the bounded in-process caches they keep their derived data in, the
+cache of the results of node commands, the cache of the agents' replies and
+the cache of the chat contexts.
+"""
+
+from typing import Any, Awaitable, Callable, Dict, Hashable, Protocol, TypeVar
+
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.interfaces.node import CommandCachePolicy
+from myjarvis.domain.value_objects.message import Message
+
+K = TypeVar("K", bound=Hashable, contravariant=True)
+V = TypeVar("V")
+ReplyKey = TypeVar("ReplyKey")
+
+
+class LocalCache(Protocol[K, V]):
+    """
+    A bounded cache whose entries expire after a time to live.
+
+    The size of an entry is supplied by the caller; the cache evicts entries
+    once the total size exceeds its limit.
+    """
+
+    def get(self, key: K) -> V | None:
+        """
+        Return the value of a key, or None if it is missing or expired.
+        """
+        ...
+
+    def set(
+        self, key: K, value: V, size: int, ttl_seconds: float | None = None
+    ) -> None:
+        """
+        Store the value of a key, for `ttl_seconds` or the cache's default
+        time to live.
+        """
+        ...
+
+    def delete(self, key: K) -> None:
+        """
+        Drop the value of a key, if any.
+        """
+        ...
+
+
+class CommandResultCache(Protocol):
+    """
+    Cache of the results of idempotent node commands.
+    """
+
+    async def get_or_execute(
+        self,
+        node_type: str,
+        command: str,
+        params: Dict[str, Any],
+        policy: CommandCachePolicy,
+        user_id: str | None,
+        execute: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Return the cached result of a command, or run `execute` and cache
+        its result under `policy`.
+
+        Args:
+            node_type: The node the command runs on.
+            command: The name of the command.
+            params: The parameters of the command.
+            policy: How the result is cached.
+            user_id: The user the command runs for; scopes the results of
+                commands not shared by all users.
+            execute: Runs the command.
+        """
+        ...
+
+
+class ReplyCache(Protocol[ReplyKey]):
+    """
+    Cache of the replies of the agents to the questions asked to them.
+
+    A question is identified by a key built by the cache itself with `key`;
+    the key is opaque to the callers.
+    """
+
+    def key(
+        self,
+        agent_id: str,
+        llm_model: str,
+        system_prompt: str | None,
+        history: list[Message],
+        message: str,
+    ) -> ReplyKey:
+        """
+        Return the key of a question asked to an agent.
+
+        Args:
+            agent_id: The agent answering the question.
+            llm_model: The agent's model identifier.
+            system_prompt: The system prompt sent with the question.
+            history: The history sent with the question.
+            message: The user message.
+        """
+        ...
+
+    async def get(self, key: ReplyKey) -> str | None:
+        """
+        Return the cached reply to a question, if any.
+        """
+        ...
+
+    async def set(self, key: ReplyKey, reply: str) -> None:
+        """
+        Cache the reply to a question.
+        """
+        ...
+
+    async def get_or_generate(
+        self, key: ReplyKey, generate: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Return the cached reply to a question, generating it on a miss.
+        """
+        ...
+
+
+class ChatContextCache(Protocol):
+    """
+    Cache of the chat contexts, in front of the `ChatContextRepository`.
+    """
+
+    async def get_chat_context(
+        self, agent_id: str, tail: int | None = None
+    ) -> ChatContext | None:
+        """
+        Return the cached chat context of an agent, if any.
+
+        Args:
+            agent_id: The agent whose context is returned.
+            tail: Maximum number of newest messages loaded, or None for all
+                cached messages.
+        """
+        ...
+
+    async def set_chat_context(self, context: ChatContext) -> None:
+        """
+        Cache the pending messages and the summary of a chat context.
+        """
+        ...
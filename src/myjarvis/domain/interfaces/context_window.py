@@ -0,0 +1,75 @@
+"""
+This module defines the interfaces used to fit chat history into a model's
+context window: counting tokens, the budget of a model, and summarizing the
+messages that do not fit.
+"""
+
+from typing import Protocol
+
+from myjarvis.domain.value_objects.message import Message
+
+
+class TokenCounter(Protocol):
+    """
+    Counts tokens the way a particular model's tokenizer does.
+    """
+
+    def count(self, text: str) -> int:
+        """
+        Count the tokens of a text.
+        """
+        ...
+
+    def count_message(self, message: Message) -> int:
+        """
+        Count the tokens of a chat message, its formatting included.
+        """
+        ...
+
+
+class ContextWindowPolicy(Protocol):
+    """
+    How much chat history may be sent to a model.
+
+    Attributes:
+        token_counter: Counter matching the model's tokenizer.
+        max_tokens: Tokens available for the system prompt, the summary, the
+            history and the new message together.
+        summary_max_tokens: Tokens reserved for the rolling summary.
+    """
+
+    @property
+    def token_counter(self) -> TokenCounter: ...
+
+    @property
+    def max_tokens(self) -> int: ...
+
+    @property
+    def summary_max_tokens(self) -> int: ...
+
+
+class Summarizer(Protocol):
+    """
+    Folds chat messages into a rolling summary of the conversation.
+    """
+
+    async def summarize(
+        self,
+        agent_llm_model: str,
+        previous_summary: str,
+        messages: list[Message],
+        max_tokens: int,
+    ) -> str:
+        """
+        Fold messages into the previous summary.
+
+        Args:
+            agent_llm_model: The model of the agent owning the conversation.
+            previous_summary: The summary so far; empty for the first one.
+            messages: Messages to add to the summary, oldest first.
+            max_tokens: Upper bound on the length of the new summary.
+
+        Returns:
+            The updated summary.
+        """
+        ...
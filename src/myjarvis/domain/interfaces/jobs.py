@@ -0,0 +1,142 @@
+"""
+This module defines the interface of the queue of background jobs.
+
+Commands that take tens of seconds are not run within the request but
+enqueued as jobs, which worker processes execute; the caller waits for the
+job's result, or resumes its work once the job has finished. A chat turn
+waiting for its jobs is kept in a `TurnStore` meanwhile.
+"""
+
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Protocol
+
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.domain.value_objects.suspended_turn import SuspendedTurn
+
+
+class JobStatus(str, Enum):
+    """
+    The stage of a job.
+    """
+
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+
+    @property
+    def finished(self) -> bool:
+        return self in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+
+
+@dataclass(frozen=True, slots=True)
+class Job:
+    """
+    A background job and its outcome.
+
+    Attributes:
+        job_id: Identifier of the job.
+        name: The kind of job, selecting the worker's handler.
+        payload: The input of the handler.
+        status: The stage of the job.
+        attempts: Number of times a worker claimed the job.
+        result: The handler's result, once the job succeeded.
+        error: Description of the failure, once the job failed.
+    """
+
+    job_id: str
+    name: str
+    payload: dict[str, Any]
+    status: JobStatus
+    attempts: int = 0
+    result: dict[str, Any] | None = None
+    error: str | None = None
+
+
+class JobQueue(Protocol):
+    """
+    Queue of background jobs.
+    """
+
+    async def enqueue(
+        self,
+        name: str,
+        payload: dict[str, Any],
+        idempotency_key: str | None = None,
+        idempotency_ttl_seconds: float | None = None,
+    ) -> Job:
+        """
+        Create a job, or return the job created with the same key.
+
+        Args:
+            name: The kind of job.
+            payload: The input of the job's handler; must be JSON
+                serializable.
+            idempotency_key: Key identifying the work, if retries or
+                duplicate requests must not create another job.
+            idempotency_ttl_seconds: How long the key is kept.
+
+        Returns:
+            The new or existing job.
+        """
+        ...
+
+    async def wait(
+        self, job_ids: list[str], timeout: float | None = None
+    ) -> dict[str, Job | None]:
+        """
+        Wait until jobs have finished or `timeout` seconds have passed.
+
+        Args:
+            job_ids: The jobs to wait for.
+            timeout: Maximum time to wait, or None to wait until all jobs
+                have finished, up to a deadline set by the queue.
+
+        Returns:
+            The jobs by id, finished or not; None for expired jobs.
+        """
+        ...
+
+
+class TurnStore(Protocol):
+    """
+    Storage of the chat turns suspended while their jobs run, keyed by turn
+    id. A turn is locked while it is resumed, so that it is resumed once.
+    """
+
+    async def save(self, turn: SuspendedTurn) -> None: ...
+
+    async def get(self, turn_id: str) -> SuspendedTurn | None: ...
+
+    async def delete(self, turn_id: str) -> None: ...
+
+    async def finish(self, turn: SuspendedTurn, reply: Message) -> None:
+        """
+        Replace a suspended turn with its reply.
+        """
+        ...
+
+    async def get_reply(
+        self, turn_id: str
+    ) -> tuple[SuspendedTurn, Message] | None:
+        """
+        Return a finished turn and its reply, or None if the turn is not
+        finished or has expired.
+        """
+        ...
+
+    async def lock(self, turn_id: str) -> str | None:
+        """
+        Take the lock of a turn.
+
+        Returns:
+            The token releasing the lock, or None if the turn is locked.
+        """
+        ...
+
+    async def unlock(self, turn_id: str, token: str) -> None:
+        """
+        Release the lock of a turn.
+        """
+        ...
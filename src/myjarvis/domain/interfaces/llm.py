@@ -0,0 +1,104 @@
+"""
+This module defines the interface of the LLM providers the agents talk to.
+
+A provider generates a reply to a prompt, at once or streamed, and, for
+agents with nodes, a reply that may request tool calls. The tools are
+offered in the provider's own format: their definitions are formatted with
+`format_tool`, combined with `build_tool_block`, and the resulting block is
+reused for every instance of the same `provider`.
+
+Providers may queue requests per caller when their rate limit is reached:
+the caller on whose behalf a request is sent is read from `llm_caller`.
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Mapping, Protocol
+
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.domain.value_objects.tool_call import ToolCall, ToolResult
+
+# The caller on whose behalf LLM requests are sent, e.g. the user's id. Set
+# by the application layer for the requests of a chat turn.
+llm_caller: ContextVar[str] = ContextVar("llm_caller", default="")
+
+# The calls requested by the LLM in one response, with their results.
+ToolRound = list[tuple[ToolCall, ToolResult]]
+
+
+@dataclass(frozen=True, slots=True)
+class LlmReply:
+    """
+    A complete LLM response that may request tool calls.
+
+    Attributes:
+        content: The text of the response.
+        tool_calls: The tool calls requested by the LLM, if any.
+    """
+
+    content: str
+    tool_calls: list[ToolCall] = field(default_factory=list)
+
+
+class Llm(Protocol):
+    """
+    A large language model, reached through its provider's API.
+
+    Attributes:
+        provider: Name of the provider's API dialect; tool blocks built for
+            one provider can be reused by every instance of the same
+            provider.
+    """
+
+    @property
+    def provider(self) -> str: ...
+
+    async def generate_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> str:
+        """
+        Generate the whole reply to a prompt.
+        """
+        ...
+
+    def stream_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """
+        Yield the reply to a prompt as it is generated.
+        """
+        ...
+
+    async def generate_with_tools(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        tools: Any = None,
+        tool_rounds: list[ToolRound] | None = None,
+        **kwargs: Any,
+    ) -> LlmReply:
+        """
+        Generate a reply that may request calls of the offered tools.
+        """
+        ...
+
+    def format_tool(
+        self, name: str, description: str, parameters: Mapping[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Format the definition of one tool for the provider's API.
+        """
+        ...
+
+    def build_tool_block(self, tools: list[dict[str, Any]]) -> Any:
+        """
+        Combine formatted tool definitions into the `tools` argument of
+        `generate_with_tools`.
+        """
+        ...
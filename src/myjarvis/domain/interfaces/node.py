@@ -0,0 +1,122 @@
+"""
+This module defines the interface of the nodes the agents use as tools, and
+of the registry of node types.
+
+A node declares the commands it supports as `CommandSpec`s, which carry what
+the LLM needs to call them. Read-only commands whose result can be reused
+declare a `CommandCachePolicy`, and long-running commands are listed in
+`background_commands`. The implementations live in the infrastructure layer
+and are looked up by node type in the `NodeRegistry`.
+
+Nodes keeping data per agent read the agent a command runs for from
+`current_agent_id`, which is set while the agent's tool calls are executed.
+"""
+
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Mapping, Protocol, Tuple
+
+# The agent whose tool calls are being executed.
+current_agent_id: ContextVar[str | None] = ContextVar(
+    "current_agent_id", default=None
+)
+
+
+@dataclass(frozen=True, slots=True)
+class CommandSpec:
+    """
+    Description of a node command, as presented to the LLM.
+
+    Attributes:
+        name: The name of the command.
+        description: What the command does and when to use it.
+        parameters: JSON schema of the command's parameters object.
+    """
+
+    name: str
+    description: str
+    parameters: Mapping[str, Any]
+
+
+@dataclass(frozen=True, slots=True)
+class CommandCachePolicy:
+    """
+    How the result of a cacheable node command is cached.
+
+    Attributes:
+        ttl_seconds: How long a result is reused.
+        shared: Whether a result is shared by all users. Commands reading a
+            user's private data (documents, calendar) must keep the default,
+            which caches results per user.
+        case_insensitive_params: Parameters whose string value is compared
+            ignoring case when building the cache key (e.g. a search query).
+    """
+
+    ttl_seconds: float
+    shared: bool = False
+    case_insensitive_params: FrozenSet[str] = frozenset()
+
+
+class Node(Protocol):
+    """
+    An external service an agent can run commands on.
+
+    Attributes:
+        timeout_seconds: Maximum duration of a command, or None to use the
+            executor's default.
+        commands: The commands supported by the node.
+        cacheable_commands: Cache policies of the node's idempotent commands,
+            by command name.
+        background_commands: Names of the long-running commands.
+    """
+
+    @property
+    def timeout_seconds(self) -> float | None: ...
+
+    @property
+    def commands(self) -> Tuple[CommandSpec, ...]: ...
+
+    @property
+    def cacheable_commands(self) -> Mapping[str, CommandCachePolicy]: ...
+
+    @property
+    def background_commands(self) -> FrozenSet[str]: ...
+
+    async def execute_command(
+        self, command: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Execute a command on the node and return its result.
+        """
+        ...
+
+
+class NodeRegistry(Protocol):
+    """
+    The node types that can be attached to agents, and their
+    implementations.
+    """
+
+    def get_node_types(self) -> list[str]:
+        """
+        Return the registered node types, sorted.
+        """
+        ...
+
+    def get_commands(self, node_type: str) -> Tuple[CommandSpec, ...]:
+        """
+        Return the commands supported by a node type.
+
+        Raises:
+            KeyError: If the node type is not registered.
+        """
+        ...
+
+    def get_node(self, node_type: str) -> Node:
+        """
+        Return the implementation of a node type, shared by all agents.
+
+        Raises:
+            KeyError: If the node type is not registered.
+        """
+        ...
@@ -2,15 +2,84 @@
 This module defines the repository interface for the AIAgent entity.
 
 This interface provides a contract for persistence operations related to AI
-agents, abstracting the underlying data storage mechanism.
-
-Implementation details:
-- The interface should be an abstract base class (ABC).
-- It should define asynchronous methods for CRUD operations, such as:
-  - `add(agent: AIAgent) -> None`
-  - `get_by_id(agent_id: AgentId) -> AIAgent | None`
-  - `get_all_by_user_id(user_id: UserId) -> list[AIAgent]`
-  - `update(agent: AIAgent) -> None`
-  - `delete(agent_id: AgentId) -> None`
-- Implementations of this interface will reside in the infrastructure layer.
+agents, abstracting the underlying data storage mechanism. Implementations of
+this interface reside in the infrastructure layer.
 """
+
+from abc import ABC, abstractmethod
+
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.user_id import UserId
+
+
+class AgentRepository(ABC):
+    """
+    Abstract persistence contract for AIAgent entities.
+    """
+
+    @abstractmethod
+    async def add(self, agent: AIAgent) -> None:
+        """
+        Persist a new agent.
+
+        Args:
+            agent: The agent to persist.
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, agent_id: AgentId) -> AIAgent | None:
+        """
+        Fetch an agent by its identifier.
+
+        Args:
+            agent_id: The identifier of the agent.
+
+        Returns:
+            The agent, or None if it does not exist.
+        """
+        pass
+
+    @abstractmethod
+    async def get_all_by_user_id(
+        self,
+        user_id: UserId,
+        limit: int | None = None,
+        after: AIAgent | None = None,
+    ) -> list[AIAgent]:
+        """
+        Fetch the agents owned by a user, oldest first.
+
+        Pages are read by keyset: the next page starts after the last agent
+        of the previous one, without counting the agents before it.
+
+        Args:
+            user_id: The owner of the agents.
+            limit: Maximum number of agents returned, or None for all.
+            after: The last agent of the previous page, if any.
+
+        Returns:
+            The user's agents.
+        """
+        pass
+
+    @abstractmethod
+    async def update(self, agent: AIAgent) -> None:
+        """
+        Persist changes to an existing agent.
+
+        Args:
+            agent: The agent to update.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, agent_id: AgentId) -> None:
+        """
+        Delete an agent.
+
+        Args:
+            agent_id: The identifier of the agent to delete.
+        """
+        pass
@@ -0,0 +1,63 @@
+"""
+This module defines the repository interface for the ChatContext entity.
+
+Chat contexts are persisted as append-only logs of messages keyed by the
+conversation and the message sequence number, so saving a context after a
+turn writes only the messages added during that turn, and loading can fetch
+just the newest part of a long conversation.
+"""
+
+from abc import ABC, abstractmethod
+
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.value_objects.agent_id import AgentId
+
+
+class ChatContextRepository(ABC):
+    """
+    Abstract persistence contract for ChatContext entities.
+    """
+
+    @abstractmethod
+    async def get_by_agent_id(
+        self, agent_id: AgentId, tail: int | None = None
+    ) -> ChatContext | None:
+        """
+        Fetch the conversation of an agent.
+
+        Args:
+            agent_id: The agent whose conversation to fetch.
+            tail: Maximum number of newest messages to load, or None for the
+                whole conversation.
+
+        Returns:
+            The conversation with all loaded messages marked as persisted, or
+            None if the agent has no conversation yet.
+        """
+        pass
+
+    @abstractmethod
+    async def append(self, context: ChatContext) -> None:
+        """
+        Persist the context's pending messages.
+
+        Creates the conversation on first use. Does not mark the messages as
+        persisted, so several stores can append the same context.
+        If another writer appended to the conversation since the context was
+        loaded, its messages are inserted into the context before the
+        pending ones, which are stored after them.
+
+        Args:
+            context: The conversation to persist.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, agent_id: AgentId) -> None:
+        """
+        Delete the conversation of an agent.
+
+        Args:
+            agent_id: The agent whose conversation to delete.
+        """
+        pass
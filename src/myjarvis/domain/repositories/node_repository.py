@@ -2,15 +2,92 @@
 This module defines the repository interface for the Node entity.
 
 This interface provides a contract for persistence operations related to nodes,
-abstracting the underlying data storage mechanism.
-
-Implementation details:
-- The interface should be an abstract base class (ABC).
-- It should define asynchronous methods for managing nodes, such as:
-  - `add(node: Node) -> None`
-  - `get_by_id(node_id: NodeId) -> Node | None`
-  - `list_all() -> list[Node]`
-  - `update(node: Node) -> None`
-  - `delete(node_id: NodeId) -> None`
-- Implementations of this interface will reside in the infrastructure layer.
+abstracting the underlying data storage mechanism. Implementations of this
+interface reside in the infrastructure layer.
 """
+
+from abc import ABC, abstractmethod
+
+from myjarvis.domain.entities.node import Node
+from myjarvis.domain.value_objects.node_id import NodeId
+
+
+class NodeRepository(ABC):
+    """
+    Abstract persistence contract for Node entities.
+    """
+
+    @abstractmethod
+    async def add(self, node: Node) -> None:
+        """
+        Persist a new node.
+
+        Args:
+            node: The node to persist.
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, node_id: NodeId) -> Node | None:
+        """
+        Fetch a node by its identifier.
+
+        Args:
+            node_id: The identifier of the node.
+
+        Returns:
+            The node, or None if it does not exist.
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_ids(self, node_ids: list[NodeId]) -> list[Node]:
+        """
+        Fetch several nodes in one query.
+
+        Args:
+            node_ids: The identifiers of the nodes.
+
+        Returns:
+            The nodes that exist, in no particular order.
+        """
+        pass
+
+    @abstractmethod
+    async def list_all(
+        self, limit: int | None = None, after: Node | None = None
+    ) -> list[Node]:
+        """
+        Fetch the nodes of the system, ordered by name.
+
+        Pages are read by keyset: the next page starts after the last node
+        of the previous one, without counting the nodes before it.
+
+        Args:
+            limit: Maximum number of nodes returned, or None for all.
+            after: The last node of the previous page, if any.
+
+        Returns:
+            The nodes of the system.
+        """
+        pass
+
+    @abstractmethod
+    async def update(self, node: Node) -> None:
+        """
+        Persist changes to an existing node.
+
+        Args:
+            node: The node to update.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, node_id: NodeId) -> None:
+        """
+        Delete a node.
+
+        Args:
+            node_id: The identifier of the node to delete.
+        """
+        pass
@@ -2,15 +2,86 @@
 This module defines the repository interface for the User entity.
 
 This interface provides a contract for persistence operations related to users,
-abstracting the underlying data storage mechanism.
-
-Implementation details:
-- The interface should be an abstract base class (ABC).
-- It should define asynchronous methods for CRUD operations, such as:
-  - `add(user: User) -> None`
-  - `get_by_id(user_id: UserId) -> User | None`
-  - `get_by_email(email: str) -> User | None`
-  - `update(user: User) -> None`
-  - `delete(user_id: UserId) -> None`
-- Implementations of this interface will reside in the infrastructure layer.
+abstracting the underlying data storage mechanism. Implementations of this
+interface reside in the infrastructure layer.
 """
+
+from abc import ABC, abstractmethod
+
+from myjarvis.domain.entities.user import User
+from myjarvis.domain.value_objects.user_id import UserId
+
+
+class UserRepository(ABC):
+    """
+    Abstract persistence contract for User entities.
+    """
+
+    @abstractmethod
+    async def add(self, user: User) -> None:
+        """
+        Persist a new user.
+
+        Args:
+            user: The user to persist.
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_id(self, user_id: UserId) -> User | None:
+        """
+        Fetch a user by its identifier.
+
+        Args:
+            user_id: The identifier of the user.
+
+        Returns:
+            The user, or None if it does not exist.
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_email(self, email: str) -> User | None:
+        """
+        Fetch a user by email address.
+
+        Args:
+            email: The email address of the user.
+
+        Returns:
+            The user, or None if it does not exist.
+        """
+        pass
+
+    @abstractmethod
+    async def get_by_telegram_id(self, telegram_id: int) -> User | None:
+        """
+        Fetch the user who linked a Telegram account.
+
+        Args:
+            telegram_id: The identifier of the Telegram user.
+
+        Returns:
+            The user, or None if no user linked the account.
+        """
+        pass
+
+    @abstractmethod
+    async def update(self, user: User) -> None:
+        """
+        Persist changes to an existing user.
+
+        Args:
+            user: The user to update.
+        """
+        pass
+
+    @abstractmethod
+    async def delete(self, user_id: UserId) -> None:
+        """
+        Delete a user.
+
+        Args:
+            user_id: The identifier of the user to delete.
+        """
+        pass
@@ -12,9 +12,371 @@ LLM's response (e.g., a tool-use request), and execute commands on the
 appropriate nodes.
 
 Implementation details:
-- The service should be stateless.
-- It will depend on repository interfaces to fetch domain entities and on
-  abstract interfaces for external systems like LLMs.
-- It might have a method like `process_message(agent: AIAgent,
-  user_message: Message) -> Message`.
+- The service is stateless.
+- It depends on abstract interfaces for external systems like LLMs; the
+  concrete provider is resolved from the agent's `llm_model` through an
+  injected factory.
+- The history sent to the LLM is chosen by the `ContextWindowService`, when
+  one is given; the rolling summary of older messages is appended to the
+  agent's base prompt.
+- When the agent has nodes, its `Toolset` is offered to the LLM. The tool
+  calls of each LLM response are run concurrently by the `ToolExecutor` and
+  their results sent back, until the LLM answers with text or
+  `max_tool_rounds` is reached. Tool calls are only available from complete
+  responses, so a streamed reply of such an agent is delivered in one
+  fragment.
+- Replies generated without tools are looked up in the `ReplyCache`, when
+  one is given and the agent opted in (`cache_replies`), before the LLM is
+  called.
+- A tool call run as a background job suspends the turn: `process_message`
+  returns a `SuspendedTurn` instead of the reply, and the context is left
+  untouched. Once the jobs have completed (`await_jobs`), `resume_turn`
+  sends their results to the LLM and finishes the turn. A streamed reply
+  waits for the jobs instead, its connection being held anyway.
 """
+
+from typing import Any, AsyncIterator, Callable, Mapping
+
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.interfaces.cache import ReplyCache
+from myjarvis.domain.interfaces.llm import Llm, ToolRound
+from myjarvis.domain.interfaces.node import Node, current_agent_id
+from myjarvis.domain.services.context_window_service import (
+    ContextWindowService,
+)
+from myjarvis.domain.services.node_service import Toolset
+from myjarvis.domain.services.tool_executor import ToolExecutor
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.domain.value_objects.suspended_turn import SuspendedTurn
+from myjarvis.domain.value_objects.tool_call import ToolCall, ToolResult
+
+
+class AgentService:
+    """
+    Runs a conversation turn between a user and an AI agent.
+
+    Args:
+        llm_factory: Callable returning the LLM provider for an agent's
+            `llm_model` identifier.
+        context_window: Service fitting the history into the model's token
+            budget. Without it, the whole loaded history is sent.
+        tool_executor: Executor running the tool calls requested by the LLM.
+            A default ToolExecutor is used if omitted.
+        max_tool_rounds: Maximum number of LLM responses with tool calls
+            in one turn.
+        response_cache: Cache of the replies generated without tools, used
+            for the agents opting in. Every reply is generated by the LLM if
+            omitted.
+    """
+
+    def __init__(
+        self,
+        llm_factory: Callable[[str], Llm],
+        context_window: ContextWindowService | None = None,
+        tool_executor: ToolExecutor | None = None,
+        max_tool_rounds: int = 5,
+        response_cache: ReplyCache[Any] | None = None,
+    ):
+        self._llm_factory = llm_factory
+        self._context_window = context_window
+        self._tool_executor = tool_executor or ToolExecutor()
+        self._max_tool_rounds = max_tool_rounds
+        self._response_cache = response_cache
+
+    async def process_message(
+        self,
+        agent: AIAgent,
+        context: ChatContext,
+        user_message: Message,
+        toolset: Toolset | None = None,
+    ) -> Message | SuspendedTurn:
+        """
+        Generate the agent's reply to a user message.
+
+        Both the user message and the reply are appended to the context.
+
+        Args:
+            agent: The agent answering the message.
+            context: The conversation the message belongs to.
+            user_message: The message sent by the user.
+            toolset: The nodes the agent can use, if any.
+
+        Returns:
+            The agent's reply, or the suspended turn if a tool call runs
+            as a background job.
+        """
+        llm = self._llm_factory(agent.llm_model)
+        history = await self._history(agent, context, user_message)
+        system_prompt = self._system_prompt(agent, context)
+        if toolset is None:
+
+            async def generate() -> str:
+                return await llm.generate_response(
+                    user_message.content,
+                    history=history,
+                    system_prompt=system_prompt,
+                )
+
+            if self._response_cache is None or not agent.cache_replies:
+                reply = await generate()
+            else:
+                reply = await self._response_cache.get_or_generate(
+                    self._response_key(
+                        agent, history, system_prompt, user_message
+                    ),
+                    generate,
+                )
+        else:
+            reply = await self._run_tools(
+                llm, agent, toolset, user_message, history, system_prompt
+            )
+            if isinstance(reply, SuspendedTurn):
+                return reply
+        return self._finish(context, user_message, reply)
+
+    async def await_jobs(
+        self, turn: SuspendedTurn, wait_seconds: float | None = 0.0
+    ) -> SuspendedTurn:
+        """
+        Collect the results of the jobs a suspended turn is waiting for.
+
+        Args:
+            turn: The suspended turn.
+            wait_seconds: How long to wait for the jobs, or None to wait
+                until all of them have finished.
+
+        Returns:
+            The turn with the results of the finished jobs.
+        """
+        results = await self._tool_executor.collect(turn.results, wait_seconds)
+        return turn.model_copy(update={"results": results})
+
+    async def resume_turn(
+        self,
+        agent: AIAgent,
+        context: ChatContext,
+        turn: SuspendedTurn,
+        toolset: Toolset,
+    ) -> Message | SuspendedTurn:
+        """
+        Resume a suspended turn whose jobs have completed.
+
+        Args:
+            agent: The agent answering the message.
+            context: The conversation the message belongs to.
+            turn: The suspended turn, with the results of its jobs.
+            toolset: The nodes the agent can use.
+
+        Returns:
+            The agent's reply, or the turn suspended again if the LLM
+            requested another background command. A turn still waiting for
+            jobs is returned as is.
+        """
+        if turn.job_ids:
+            return turn
+        llm = self._llm_factory(agent.llm_model)
+        history = await self._history(agent, context, turn.user_message)
+        reply = await self._run_tools(
+            llm,
+            agent,
+            toolset,
+            turn.user_message,
+            history,
+            self._system_prompt(agent, context),
+            tool_rounds=[
+                *turn.tool_rounds,
+                list(zip(turn.tool_calls, turn.results)),
+            ],
+        )
+        if isinstance(reply, SuspendedTurn):
+            # The turn keeps its id, so its reply is polled at the same place.
+            return reply.model_copy(update={"turn_id": turn.turn_id})
+        return self._finish(context, turn.user_message, reply)
+
+    async def stream_message(
+        self,
+        agent: AIAgent,
+        context: ChatContext,
+        user_message: Message,
+        toolset: Toolset | None = None,
+    ) -> AsyncIterator[str]:
+        """
+        Stream the agent's reply to a user message.
+
+        The user message and the complete reply are appended to the context
+        only once the LLM has finished; an interrupted stream leaves the
+        context untouched.
+
+        Args:
+            agent: The agent answering the message.
+            context: The conversation the message belongs to.
+            user_message: The message sent by the user.
+            toolset: The nodes the agent can use, if any.
+
+        Yields:
+            Consecutive text fragments of the agent's reply.
+        """
+        llm = self._llm_factory(agent.llm_model)
+        history = await self._history(agent, context, user_message)
+        system_prompt = self._system_prompt(agent, context)
+        chunks = []
+        cached = key = None
+        if (
+            toolset is None
+            and self._response_cache is not None
+            and agent.cache_replies
+        ):
+            key = self._response_key(
+                agent, history, system_prompt, user_message
+            )
+            cached = await self._response_cache.get(key)
+        if cached is not None:
+            chunks.append(cached)
+            yield cached
+        elif toolset is None:
+            async for chunk in llm.stream_response(
+                user_message.content,
+                history=history,
+                system_prompt=system_prompt,
+            ):
+                chunks.append(chunk)
+                yield chunk
+            if key is not None:
+                await self._response_cache.set(key, "".join(chunks))
+        else:
+            reply = await self._run_tools(
+                llm,
+                agent,
+                toolset,
+                user_message,
+                history,
+                system_prompt,
+                wait=True,
+            )
+            chunks.append(reply)
+            yield reply
+        context.add_message(user_message)
+        context.add_message(
+            Message(content="".join(chunks), sender=Sender.AGENT)
+        )
+
+    async def execute_tool_calls(
+        self,
+        agent: AIAgent,
+        tool_calls: list[ToolCall],
+        nodes: Mapping[str, Node],
+    ) -> list[ToolResult]:
+        """
+        Execute the tool calls of one LLM response on the agent's nodes.
+
+        The calls are independent of each other and run concurrently. A
+        failing or timed-out call yields an error result for the LLM to see
+        instead of aborting the turn.
+
+        Args:
+            agent: The agent whose LLM requested the calls.
+            tool_calls: The calls requested by the LLM.
+            nodes: The agent's nodes, by the key the LLM addresses them with.
+
+        Returns:
+            One result per call, in the order of `tool_calls`.
+        """
+        token = current_agent_id.set(str(agent.agent_id))
+        try:
+            return await self._tool_executor.execute(
+                tool_calls, nodes, user_id=agent.user_id.value
+            )
+        finally:
+            current_agent_id.reset(token)
+
+    async def _run_tools(
+        self,
+        llm: Llm,
+        agent: AIAgent,
+        toolset: Toolset,
+        user_message: Message,
+        history: list[Message],
+        system_prompt: str | None,
+        tool_rounds: list[ToolRound] | None = None,
+        wait: bool = False,
+    ) -> str | SuspendedTurn:
+        """
+        Let the LLM call tools until it answers with text.
+
+        Returns:
+            The reply, or the suspended turn if a call runs as a background
+            job and `wait` is false.
+        """
+        tools = toolset.tools_for(llm)
+        tool_rounds = list(tool_rounds or [])
+        while True:
+            reply = await llm.generate_with_tools(
+                user_message.content,
+                history=history,
+                tools=tools,
+                tool_rounds=tool_rounds,
+                system_prompt=system_prompt,
+            )
+            if (
+                not reply.tool_calls
+                or len(tool_rounds) >= self._max_tool_rounds
+            ):
+                return reply.content
+            results = await self.execute_tool_calls(
+                agent, reply.tool_calls, toolset.nodes
+            )
+            if any(result.is_pending for result in results):
+                if not wait:
+                    return SuspendedTurn(
+                        agent_id=str(agent.agent_id),
+                        user_id=agent.user_id.value,
+                        user_message=user_message,
+                        tool_rounds=tool_rounds,
+                        tool_calls=reply.tool_calls,
+                        results=results,
+                    )
+                results = await self._tool_executor.collect(results, None)
+            tool_rounds.append(list(zip(reply.tool_calls, results)))
+
+    @staticmethod
+    def _finish(
+        context: ChatContext, user_message: Message, reply: str
+    ) -> Message:
+        agent_message = Message(content=reply, sender=Sender.AGENT)
+        context.add_message(user_message)
+        context.add_message(agent_message)
+        return agent_message
+
+    def _response_key(
+        self,
+        agent: AIAgent,
+        history: list[Message],
+        system_prompt: str | None,
+        user_message: Message,
+    ) -> Any:
+        return self._response_cache.key(
+            str(agent.agent_id),
+            agent.llm_model,
+            system_prompt,
+            history,
+            user_message.content,
+        )
+
+    async def _history(
+        self, agent: AIAgent, context: ChatContext, user_message: Message
+    ) -> list[Message]:
+        if self._context_window is None:
+            return list(context.messages)
+        return await self._context_window.select_history(
+            agent, context, user_message
+        )
+
+    @staticmethod
+    def _system_prompt(agent: AIAgent, context: ChatContext) -> str | None:
+        if not context.summary:
+            return agent.base_prompt or None
+        return (
+            f"{agent.base_prompt}\n\n"
+            f"Summary of the earlier conversation:\n{context.summary}"
+        ).lstrip()
@@ -0,0 +1,109 @@
+"""
+This module defines the ContextWindowService.
+
+Sending the whole conversation to the LLM on every turn costs latency and
+tokens, and long conversations eventually exceed the model's context window.
+The ContextWindowService chooses which part of the history is sent: the
+newest messages that fit into the model's token budget. Older messages are
+folded into a rolling summary stored on the ChatContext, so the agent keeps
+the gist of the conversation without resending it.
+
+Implementation details:
+- The service is stateless; the summary lives on the ChatContext.
+- Token counting and budgets are pluggable per `llm_model` through an
+  injected policy factory. The policy and the summarizer are domain
+  interfaces (`domain.interfaces.context_window`), implemented in the
+  infrastructure layer.
+- Summarization is optional. Without a summarizer, messages that do not fit
+  are left out of the request.
+- Only messages loaded into the context can be summarized. The history window
+  loaded per turn should therefore be larger than what fits into the token
+  budget, so messages are summarized before they fall out of it.
+"""
+
+from typing import Callable
+
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.interfaces.context_window import (
+    ContextWindowPolicy,
+    Summarizer,
+)
+from myjarvis.domain.value_objects.message import Message, Sender
+
+
+class ContextWindowService:
+    """
+    Fits chat history into a model's token budget.
+
+    Args:
+        policy_factory: Callable returning the context window policy for an
+            agent's `llm_model` identifier.
+        summarizer: Summarizer for evicted messages, if any.
+    """
+
+    def __init__(
+        self,
+        policy_factory: Callable[[str], ContextWindowPolicy],
+        summarizer: Summarizer | None = None,
+    ):
+        self._policy_factory = policy_factory
+        self._summarizer = summarizer
+
+    async def select_history(
+        self, agent: AIAgent, context: ChatContext, user_message: Message
+    ) -> list[Message]:
+        """
+        Select the history to send along with a user message.
+
+        Messages that do not fit are folded into the context's summary, if a
+        summarizer is configured. The selected history never starts with an
+        agent message, so it is valid for providers requiring the user to
+        speak first.
+
+        Args:
+            agent: The agent answering the message.
+            context: The conversation the message belongs to.
+            user_message: The message about to be sent.
+
+        Returns:
+            The newest messages of the context that fit into the budget,
+            oldest first.
+        """
+        policy = self._policy_factory(agent.llm_model)
+        counter = policy.token_counter
+        budget = (
+            policy.max_tokens
+            - counter.count(agent.base_prompt)
+            - counter.count_message(user_message)
+        )
+        if self._summarizer is not None:
+            budget -= policy.summary_max_tokens
+
+        start = max(context.summarized_through - context.first_sequence, 0)
+        candidates = context.messages[start:]
+        kept = 0
+        used = 0
+        for message in reversed(candidates):
+            used += counter.count_message(message)
+            if used > budget:
+                break
+            kept += 1
+        split = len(candidates) - kept
+        while split < len(candidates) and (
+            candidates[split].sender is not Sender.USER
+        ):
+            split += 1
+
+        evicted = candidates[:split]
+        if evicted and self._summarizer is not None:
+            summary = await self._summarizer.summarize(
+                agent.llm_model,
+                context.summary,
+                evicted,
+                policy.summary_max_tokens,
+            )
+            context.update_summary(
+                summary, context.first_sequence + start + split
+            )
+        return candidates[split:]
@@ -2,16 +2,200 @@
 This module defines the NodeService.
 
 The NodeService is responsible for domain logic related to nodes that does not
-fit within the Node entity itself. This might include operations for managing
-the lifecycle of nodes or for discovering available node types from a central
-registry.
+fit within the Node entity itself. It looks the `node_type` of a Node up in
+the injected `NodeRegistry`, which maps it to the implementation executing
+its commands.
 
 While most of the node interaction logic will be handled by the `AgentService`
-(interpreting LLM requests to use a tool), this service can handle broader,
-node-specific administrative tasks.
+(interpreting LLM requests to use a tool), this service supplies it with the
+agent's `Toolset`: the node implementations and the tool definitions
+presenting them to the LLM.
 
 Implementation details:
-- The service will be stateless.
-- It could have methods like `get_available_node_types()` or
-  `validate_node_configuration(node: Node)`.
+- The tool definitions of a node type are formatted once per LLM provider
+  and reused for every agent.
+- The toolset of an agent, including the tool block combining its nodes'
+  definitions for each provider, is cached per agent in the injected
+  `LocalCache`, so a chat turn neither
+  queries the nodes nor rebuilds the tool schemas. The cache entry records the
+  agent's node ids: a turn that sees a different set of nodes (e.g. changed by
+  another worker) rebuilds the toolset. `AttachNodeHandler` drops the entry
+  of the agent it changes, in every worker if the injected cache shares its
+  deletions with them, as the composition root's does.
 """
+
+import logging
+from dataclasses import dataclass, field
+from typing import Any
+
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.interfaces.cache import LocalCache
+from myjarvis.domain.interfaces.llm import Llm
+from myjarvis.domain.interfaces.node import CommandSpec, Node, NodeRegistry
+from myjarvis.domain.repositories.node_repository import NodeRepository
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.node_id import NodeId
+from myjarvis.domain.value_objects.tool_call import tool_name
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Toolset:
+    """
+    The nodes an agent can use and their tool definitions.
+
+    Attributes:
+        nodes: Node implementations, by node type. The LLM addresses a node
+            by its type.
+    """
+
+    nodes: dict[str, Node]
+    _service: "NodeService" = field(repr=False)
+    _blocks: dict[str, Any] = field(default_factory=dict, repr=False)
+
+    def tools_for(self, llm: Llm) -> Any:
+        """
+        Return the tool block of the agent's nodes for an LLM provider.
+
+        The block is built on first use and reused afterwards.
+        """
+        block = self._blocks.get(llm.provider)
+        if block is None:
+            block = llm.build_tool_block(
+                [
+                    tool
+                    for node_type in self.nodes
+                    for tool in self._service.tool_definitions(node_type, llm)
+                ]
+            )
+            self._blocks[llm.provider] = block
+        return block
+
+
+@dataclass(slots=True)
+class _CachedToolset:
+    node_ids: frozenset[NodeId]
+    toolset: Toolset | None
+
+
+class NodeService:
+    """
+    Access to the node types and cache of the agents' toolsets.
+
+    Args:
+        node_registry: The implementations of the node types.
+        toolset_cache: Cache of the agents' toolsets, by agent id. Entries
+            are counted, not measured: every entry has size 1.
+    """
+
+    def __init__(
+        self,
+        node_registry: NodeRegistry,
+        toolset_cache: LocalCache[str, Any],
+    ):
+        self._registry = node_registry
+        self._definitions: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self._toolsets = toolset_cache
+
+    def get_available_node_types(self) -> list[str]:
+        """
+        Return the node types that can be attached to agents.
+        """
+        return self._registry.get_node_types()
+
+    def get_commands(self, node_type: str) -> tuple[CommandSpec, ...]:
+        """
+        Return the commands supported by a node type.
+
+        Raises:
+            KeyError: If the node type is not registered.
+        """
+        return self._registry.get_commands(node_type)
+
+    def get_command_names(self, node_type: str) -> list[str]:
+        """
+        Return the command names of a node type, or an empty list if the
+        node type is not registered.
+        """
+        try:
+            commands = self._registry.get_commands(node_type)
+        except KeyError:
+            return []
+        return [command.name for command in commands]
+
+    def get_node(self, node_type: str) -> Node:
+        """
+        Return the implementation of a node type.
+
+        Nodes hold no per-agent state, so one instance per type is shared.
+
+        Raises:
+            KeyError: If the node type is not registered.
+        """
+        return self._registry.get_node(node_type)
+
+    def tool_definitions(
+        self, node_type: str, llm: Llm
+    ) -> list[dict[str, Any]]:
+        """
+        Return the tool definitions of a node type for an LLM provider.
+
+        The definitions are formatted on first use and reused afterwards.
+        """
+        key = (node_type, llm.provider)
+        definitions = self._definitions.get(key)
+        if definitions is None:
+            definitions = [
+                llm.format_tool(
+                    tool_name(node_type, command.name),
+                    command.description,
+                    command.parameters,
+                )
+                for command in self.get_commands(node_type)
+            ]
+            self._definitions[key] = definitions
+        return definitions
+
+    async def get_toolset(
+        self, agent: AIAgent, node_repository: NodeRepository
+    ) -> Toolset | None:
+        """
+        Return the toolset of an agent.
+
+        The agent's nodes are loaded from the repository only if the toolset
+        is not cached yet.
+
+        Args:
+            agent: The agent whose toolset is requested.
+            node_repository: Repository used to load the agent's nodes.
+
+        Returns:
+            The agent's toolset, or None if the agent has no usable nodes.
+        """
+        if not agent.node_ids:
+            return None
+        key = str(agent.agent_id)
+        node_ids = frozenset(agent.node_ids)
+        cached = self._toolsets.get(key)
+        if cached is not None and cached.node_ids == node_ids:
+            return cached.toolset
+        nodes = await node_repository.get_by_ids(list(agent.node_ids))
+        toolset = self._build_toolset(sorted(node.node_type for node in nodes))
+        self._toolsets.set(key, _CachedToolset(node_ids, toolset), size=1)
+        return toolset
+
+    def invalidate_agent(self, agent_id: AgentId) -> None:
+        """
+        Drop the cached toolset of an agent whose nodes have changed.
+        """
+        self._toolsets.delete(str(agent_id))
+
+    def _build_toolset(self, node_types: list[str]) -> Toolset | None:
+        nodes = {}
+        for node_type in node_types:
+            try:
+                nodes[node_type] = self.get_node(node_type)
+            except KeyError:
+                logger.warning("Unknown node type %r ignored", node_type)
+        return Toolset(nodes=nodes, _service=self) if nodes else None
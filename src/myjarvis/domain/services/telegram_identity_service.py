@@ -0,0 +1,107 @@
+"""
+This module defines the TelegramIdentityService.
+
+Every Telegram message must be attributed to an internal user and answered by
+that user's active agent. The service resolves a Telegram account to both and
+memoizes the result, so that in the steady state a message is attributed
+without querying the database.
+
+Implementation details:
+- Resolved identities are cached per Telegram account in the injected
+  `LocalCache`, for its time to live. An account linked to no user is cached
+  too, for a shorter time, so messages from strangers do not query the
+  database either.
+- `SelectAgentHandler` drops the entry of the user whose active agent it
+  changes. The entries of the other workers are dropped too if the injected
+  cache shares its deletions with them, as the API's does; otherwise the
+  time to live bounds how long they may still answer with the previous
+  agent.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from myjarvis.domain.interfaces.cache import LocalCache
+from myjarvis.domain.repositories.user_repository import UserRepository
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.user_id import UserId
+
+
+@dataclass(frozen=True, slots=True)
+class TelegramIdentity:
+    """
+    The internal identity behind a Telegram account.
+
+    Attributes:
+        user_id: The user who linked the account.
+        agent_id: The user's active agent, or None if none was selected.
+    """
+
+    user_id: UserId
+    agent_id: AgentId | None
+
+
+@dataclass(slots=True)
+class _CachedIdentity:
+    identity: TelegramIdentity | None
+
+
+class TelegramIdentityService:
+    """
+    Memoized mapping from Telegram accounts to users and active agents.
+
+    Args:
+        identity_cache: Cache of the identities, by Telegram account. Its
+            time to live is how long the identity of a linked account is
+            cached. Entries are counted, not measured: every entry has
+            size 1.
+        unknown_ttl_seconds: How long an account linked to no user is
+            remembered as such.
+    """
+
+    def __init__(
+        self,
+        identity_cache: LocalCache[int, Any],
+        unknown_ttl_seconds: float = 60.0,
+    ):
+        self._unknown_ttl_seconds = unknown_ttl_seconds
+        self._identities = identity_cache
+
+    async def resolve(
+        self, telegram_id: int, user_repository: UserRepository
+    ) -> TelegramIdentity | None:
+        """
+        Return the identity behind a Telegram account.
+
+        The user is loaded from the repository only if the account is not
+        cached.
+
+        Args:
+            telegram_id: The identifier of the Telegram user.
+            user_repository: Repository used to load the user.
+
+        Returns:
+            The identity, or None if no user linked the account.
+        """
+        cached = self._identities.get(telegram_id)
+        if cached is not None:
+            return cached.identity
+        user = await user_repository.get_by_telegram_id(telegram_id)
+        if user is None:
+            self._identities.set(
+                telegram_id,
+                _CachedIdentity(None),
+                size=1,
+                ttl_seconds=self._unknown_ttl_seconds,
+            )
+            return None
+        identity = TelegramIdentity(user.user_id, user.active_agent_id)
+        self._identities.set(telegram_id, _CachedIdentity(identity), size=1)
+        return identity
+
+    def invalidate(self, telegram_id: int) -> None:
+        """
+        Drop the cached identity of a Telegram account whose user or active
+        agent has changed.
+        """
+        self._identities.delete(telegram_id)
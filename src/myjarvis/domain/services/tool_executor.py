@@ -0,0 +1,303 @@
+"""
+This module defines the ToolExecutor.
+
+An LLM response may ask for several tool calls at once. Those calls are
+independent of each other, so the ToolExecutor runs them concurrently instead
+of one after another, and one slow node no longer holds up the others.
+
+Implementation details:
+- At most `max_concurrency` calls of one batch run at the same time.
+- Every call has a timeout: the node's `timeout_seconds` if it declares one,
+  the executor's default otherwise. A call that fails or times out produces
+  an error result; it never fails the whole batch.
+- Results are returned in the order of the calls, whatever order they
+  complete in.
+- Nodes are awaited: nodes built on blocking libraries reach the executor
+  already moved onto a thread pool by the node registry, so they never
+  block the event loop.
+- Results of cacheable commands are served by the `CommandResultCache`,
+  when one is given. Results are cached by the node type the call
+  addresses.
+- If the batch itself is cancelled (e.g. the client went away), all running
+  calls are cancelled as well.
+- When a `JobQueue` is given, the nodes' `background_commands` are not
+  run but enqueued as `node_command` jobs, and yield pending results. A
+  worker runs the job with `run_job`, under `job_timeout`; `collect`
+  replaces the pending results with the jobs' results once available.
+  Identical commands of an agent enqueued within `job_idempotency_seconds`
+  share one job, so a retried turn does not run them again. If the queue
+  is unavailable, the command runs in process.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+from typing import Any, Mapping
+
+from myjarvis.domain.interfaces.cache import CommandResultCache
+from myjarvis.domain.interfaces.jobs import Job, JobQueue, JobStatus
+from myjarvis.domain.interfaces.node import Node, current_agent_id
+from myjarvis.domain.value_objects.tool_call import ToolCall, ToolResult
+
+logger = logging.getLogger(__name__)
+
+# Name of the jobs executing a node command in the background.
+NODE_COMMAND_JOB = "node_command"
+
+
+class ToolExecutor:
+    """
+    Executes the tool calls of one LLM response concurrently.
+
+    Args:
+        max_concurrency: Maximum number of calls of a batch running at once.
+        default_timeout: Timeout in seconds for nodes that do not declare
+            their own.
+        result_cache: Cache of the results of idempotent commands.
+        job_queue: Queue of the background commands. Every command runs in
+            process if omitted.
+        job_timeout: Timeout in seconds of the commands run as jobs.
+        job_idempotency_seconds: How long an enqueued command is reused for
+            an identical command of the same agent.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int = 8,
+        default_timeout: float = 30.0,
+        result_cache: CommandResultCache | None = None,
+        job_queue: JobQueue | None = None,
+        job_timeout: float = 600.0,
+        job_idempotency_seconds: float = 60.0,
+    ):
+        self._max_concurrency = max_concurrency
+        self._job_queue = job_queue
+        self._job_timeout = job_timeout
+        self._job_idempotency_seconds = job_idempotency_seconds
+        self._result_cache = result_cache
+        self._default_timeout = default_timeout
+
+    async def execute(
+        self,
+        tool_calls: list[ToolCall],
+        nodes: Mapping[str, Node],
+        user_id: str | None = None,
+    ) -> list[ToolResult]:
+        """
+        Execute tool calls concurrently.
+
+        Args:
+            tool_calls: The calls requested by the LLM.
+            nodes: The agent's nodes, by the key the LLM addresses them with.
+            user_id: The user the calls run for; scopes cached results of
+                private commands.
+
+        Returns:
+            One result per call, in the order of `tool_calls`.
+        """
+        semaphore = asyncio.Semaphore(self._max_concurrency)
+        return list(
+            await asyncio.gather(
+                *(
+                    self._run(call, nodes, user_id, semaphore)
+                    for call in tool_calls
+                )
+            )
+        )
+
+    async def collect(
+        self, results: list[ToolResult], wait_seconds: float | None = 0.0
+    ) -> list[ToolResult]:
+        """
+        Replace pending results with the results of their jobs.
+
+        Args:
+            results: Results of a batch, some of them pending.
+            wait_seconds: How long to wait for the jobs, or None to wait
+                until all of them have finished, up to the queue's
+                deadline.
+
+        Returns:
+            The results, in the same order; results of unfinished jobs
+            are still pending, or errors when waiting until they finish.
+        """
+        job_ids = [result.job_id for result in results if result.is_pending]
+        if not job_ids:
+            return results
+        jobs = await self._job_queue.wait(job_ids, wait_seconds)
+        results = [
+            (
+                self._job_result(result, jobs[result.job_id])
+                if result.is_pending
+                else result
+            )
+            for result in results
+        ]
+        if wait_seconds is not None:
+            return results
+        # The queue gave up waiting, e.g. as no worker is running.
+        return [
+            (
+                result.model_copy(
+                    update={"error": "The background job did not finish."}
+                )
+                if result.is_pending
+                else result
+            )
+            for result in results
+        ]
+
+    async def run_job(
+        self, payload: dict[str, Any], node: Node
+    ) -> dict[str, Any]:
+        """
+        Run the command of a `node_command` job.
+
+        Args:
+            payload: The payload of the job.
+            node: The node addressed by the job's call.
+
+        Returns:
+            The result of the call, as a `ToolResult` dictionary. A failing
+            command yields an error result, not a failed job.
+        """
+        call = ToolCall.model_validate(payload["call"])
+        token = current_agent_id.set(payload.get("agent_id"))
+        try:
+            result = await self._call(
+                node, call, payload.get("user_id"), self._job_timeout
+            )
+        finally:
+            current_agent_id.reset(token)
+        return result.model_dump(mode="json")
+
+    async def _run(
+        self,
+        call: ToolCall,
+        nodes: Mapping[str, Node],
+        user_id: str | None,
+        semaphore: asyncio.Semaphore,
+    ) -> ToolResult:
+        node = nodes.get(call.node)
+        if node is None:
+            return self._error(call, f"Unknown node {call.node!r}.")
+        if (
+            self._job_queue is not None
+            and call.command in node.background_commands
+        ):
+            try:
+                return await self._enqueue(call, user_id)
+            except Exception:
+                # The queue is unavailable: the command runs in process.
+                logger.warning(
+                    "Failed to enqueue command %s on node %s",
+                    call.command,
+                    call.node,
+                    exc_info=True,
+                )
+        timeout = node.timeout_seconds or self._default_timeout
+        async with semaphore:
+            return await self._call(node, call, user_id, timeout)
+
+    async def _call(
+        self,
+        node: Node,
+        call: ToolCall,
+        user_id: str | None,
+        timeout: float,
+    ) -> ToolResult:
+        try:
+            async with asyncio.timeout(timeout):
+                output = await self._execute(node, call, user_id)
+        except TimeoutError:
+            return self._error(
+                call, f"Command timed out after {timeout:g} seconds."
+            )
+        except Exception as exc:
+            logger.warning(
+                "Command %s on node %s failed",
+                call.command,
+                call.node,
+                exc_info=True,
+            )
+            return self._error(call, str(exc) or type(exc).__name__)
+        return ToolResult(
+            call_id=call.call_id,
+            node=call.node,
+            command=call.command,
+            output=output,
+        )
+
+    async def _enqueue(
+        self, call: ToolCall, user_id: str | None
+    ) -> ToolResult:
+        agent_id = current_agent_id.get()
+        digest = hashlib.sha256(
+            json.dumps(
+                [agent_id, user_id, call.node, call.command, call.params],
+                sort_keys=True,
+                default=str,
+            ).encode()
+        ).hexdigest()
+        job = await self._job_queue.enqueue(
+            NODE_COMMAND_JOB,
+            {
+                "call": call.model_dump(mode="json"),
+                "agent_id": agent_id,
+                "user_id": user_id,
+            },
+            idempotency_key=f"{NODE_COMMAND_JOB}:{digest}",
+            idempotency_ttl_seconds=self._job_idempotency_seconds,
+        )
+        return ToolResult(
+            call_id=call.call_id,
+            node=call.node,
+            command=call.command,
+            job_id=job.job_id,
+        )
+
+    @staticmethod
+    def _job_result(result: ToolResult, job: Job | None) -> ToolResult:
+        if job is None:
+            return result.model_copy(
+                update={"error": "The background job expired."}
+            )
+        if job.status is JobStatus.SUCCEEDED:
+            # The job ran the same call, possibly for an earlier turn.
+            return result.model_copy(
+                update={
+                    "output": job.result.get("output"),
+                    "error": job.result.get("error"),
+                }
+            )
+        if job.status is JobStatus.FAILED:
+            return result.model_copy(update={"error": job.error})
+        return result
+
+    async def _execute(
+        self,
+        node: Node,
+        call: ToolCall,
+        user_id: str | None,
+    ) -> dict[str, Any]:
+        policy = node.cacheable_commands.get(call.command)
+        if self._result_cache is None or policy is None:
+            return await node.execute_command(call.command, call.params)
+        return await self._result_cache.get_or_execute(
+            call.node,
+            call.command,
+            call.params,
+            policy,
+            user_id,
+            lambda: node.execute_command(call.command, call.params),
+        )
+
+    @staticmethod
+    def _error(call: ToolCall, message: str) -> ToolResult:
+        return ToolResult(
+            call_id=call.call_id,
+            node=call.node,
+            command=call.command,
+            error=message,
+        )
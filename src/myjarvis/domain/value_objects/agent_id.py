@@ -3,10 +3,34 @@ This module defines the AgentId value object.
 
 AgentId is a unique identifier for an AIAgent entity. Using a dedicated type
 for the ID improves type safety and makes the domain model more explicit.
-
-Implementation details:
-- The class should be a Pydantic BaseModel or a simple wrapper around a
-  standard type like UUID or int.
-- It should be immutable (e.g., using `frozen=True` in Pydantic).
-- It can include factory methods for creating new IDs, e.g., `generate()`.
 """
+
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class AgentId(BaseModel):
+    """
+    Immutable identifier of an AIAgent.
+
+    Wraps a UUID so that agent identifiers cannot be mixed up with other
+    identifiers (users, nodes) at type-checking time.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    value: UUID = Field(default_factory=uuid4)
+
+    @classmethod
+    def generate(cls) -> "AgentId":
+        """
+        Create a new, random AgentId.
+
+        Returns:
+            A freshly generated AgentId.
+        """
+        return cls(value=uuid4())
+
+    def __str__(self) -> str:
+        return str(self.value)
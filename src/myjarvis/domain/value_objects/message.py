@@ -4,9 +4,38 @@ This module defines the Message value object.
 A Message represents a single entry in a chat context, containing the content
 of the message, who sent it (user or agent), and when it was sent.
 
-Implementation details:
-- The class should be a Pydantic BaseModel and immutable (`frozen=True`).
-- It should contain fields like `content` (str), `sender` (e.g., an Enum
-  'USER' | 'AGENT'), and `timestamp` (datetime).
-- This object is part of the ChatContext entity.
+This object is part of the ChatContext entity.
 """
+
+from datetime import datetime, timezone
+from enum import Enum
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class Sender(str, Enum):
+    """
+    The author of a message in a conversation.
+    """
+
+    USER = "user"
+    AGENT = "agent"
+
+
+class Message(BaseModel):
+    """
+    An immutable chat message.
+
+    Attributes:
+        content: The text of the message.
+        sender: Who wrote the message.
+        timestamp: When the message was created (UTC).
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    content: str
+    sender: Sender
+    timestamp: datetime = Field(
+        default_factory=lambda: datetime.now(timezone.utc)
+    )
@@ -3,10 +3,31 @@ This module defines the NodeId value object.
 
 NodeId is a unique identifier for a Node entity. Using a dedicated type for the
 ID improves type safety and makes the domain model more explicit.
-
-Implementation details:
-- The class should be a Pydantic BaseModel or a simple wrapper around a
-  standard type like UUID or int.
-- It should be immutable (e.g., using `frozen=True` in Pydantic).
-- It can include factory methods for creating new IDs.
 """
+
+from uuid import UUID, uuid4
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class NodeId(BaseModel):
+    """
+    Immutable identifier of a Node.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    value: UUID = Field(default_factory=uuid4)
+
+    @classmethod
+    def generate(cls) -> "NodeId":
+        """
+        Create a new, random NodeId.
+
+        Returns:
+            A freshly generated NodeId.
+        """
+        return cls(value=uuid4())
+
+    def __str__(self) -> str:
+        return str(self.value)
@@ -0,0 +1,52 @@
+"""
+This module defines the SuspendedTurn value object.
+
+A chat turn is suspended when a tool call of the LLM runs as a background
+job: instead of holding the request until the job completes, the turn is
+saved and the user is told its reply is pending. A SuspendedTurn holds what
+is needed to resume the turn later, possibly in another process: the user
+message, the tool rounds completed so far, and the calls of the last LLM
+response with their results, some of them pending.
+"""
+
+from uuid import uuid4
+
+from pydantic import BaseModel, ConfigDict, Field
+
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.domain.value_objects.tool_call import ToolCall, ToolResult
+
+
+class SuspendedTurn(BaseModel):
+    """
+    An immutable chat turn waiting for background jobs.
+
+    Attributes:
+        turn_id: Identifier of the turn, used to poll for its reply.
+        agent_id: The agent answering the message.
+        user_id: The user who sent the message.
+        user_message: The message being answered.
+        tool_rounds: The tool calls and results of the LLM responses
+            before the last one.
+        tool_calls: The tool calls of the last LLM response.
+        results: The results of `tool_calls`, in the same order.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    turn_id: str = Field(default_factory=lambda: uuid4().hex)
+    agent_id: str
+    user_id: str
+    user_message: Message
+    tool_rounds: list[list[tuple[ToolCall, ToolResult]]] = Field(
+        default_factory=list
+    )
+    tool_calls: list[ToolCall]
+    results: list[ToolResult]
+
+    @property
+    def job_ids(self) -> list[str]:
+        """
+        The jobs the turn is waiting for.
+        """
+        return [result.job_id for result in self.results if result.is_pending]
@@ -0,0 +1,116 @@
+"""
+This module defines the ToolCall and ToolResult value objects.
+
+A ToolCall is a request from the LLM to run one command on one of the nodes
+attached to an agent. A ToolResult carries the outcome of a ToolCall back to
+the LLM. Results reference their call through `call_id`, which is assigned by
+the LLM provider.
+
+A command run as a background job first yields a pending result, carrying
+the id of the job; the turn resumes once the job has produced the actual
+result.
+
+A tool is named after the node type and the command, joined by a double
+underscore (e.g. 'search__search_web'); `tool_name` and `parse_tool_call`
+convert between the two forms.
+"""
+
+from typing import Any, Mapping
+
+from pydantic import BaseModel, ConfigDict, Field
+
+_TOOL_NAME_SEPARATOR = "__"
+
+
+class ToolCall(BaseModel):
+    """
+    An immutable request to execute a node command.
+
+    Attributes:
+        call_id: Identifier of the call, as assigned by the LLM provider.
+        node: Key of the node the command is addressed to.
+        command: The name of the command to execute.
+        params: Parameters of the command.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    call_id: str
+    node: str
+    command: str
+    params: dict[str, Any] = Field(default_factory=dict)
+
+
+class ToolResult(BaseModel):
+    """
+    The immutable outcome of a ToolCall.
+
+    Exactly one of `output` and `error` is set, unless the result is pending:
+    then only `job_id` is.
+
+    Attributes:
+        call_id: Identifier of the call this result answers.
+        node: Key of the node the command was addressed to.
+        command: The name of the executed command.
+        output: The command's result, if it succeeded.
+        error: A description of the failure, if it failed.
+        job_id: The background job executing the command, if any.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    call_id: str
+    node: str
+    command: str
+    output: dict[str, Any] | None = None
+    error: str | None = None
+    job_id: str | None = None
+
+    @property
+    def is_error(self) -> bool:
+        return self.error is not None
+
+    @property
+    def is_pending(self) -> bool:
+        """
+        Whether the command is still running as a background job.
+        """
+        return self.output is None and self.error is None and bool(self.job_id)
+
+    def payload(self) -> dict[str, Any]:
+        """
+        Return the result as it is reported back to the LLM.
+        """
+        if self.error is not None:
+            return {"error": self.error}
+        return self.output or {}
+
+
+def tool_name(node: str, command: str) -> str:
+    """
+    Return the name of the tool running a command on a node.
+    """
+    return f"{node}{_TOOL_NAME_SEPARATOR}{command}"
+
+
+def parse_tool_call(
+    call_id: str, name: str, arguments: Mapping[str, Any] | None
+) -> ToolCall:
+    """
+    Convert a tool call returned by a provider to a ToolCall.
+
+    Args:
+        call_id: Identifier of the call, as assigned by the provider.
+        name: The name of the called tool.
+        arguments: The arguments of the call.
+
+    Returns:
+        The call of the command on the node the tool name refers to.
+    """
+    node, _, command = name.partition(_TOOL_NAME_SEPARATOR)
+    return ToolCall(
+        call_id=call_id,
+        node=node,
+        command=command,
+        params=dict(arguments or {}),
+    )
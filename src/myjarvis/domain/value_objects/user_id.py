@@ -4,9 +4,21 @@ This module defines the UserId value object.
 UserId is a unique identifier for a User entity. Using a dedicated type for the
 ID improves type safety and makes the domain model more explicit.
 
-Implementation details:
-- The class should be a Pydantic BaseModel or a simple wrapper around a
-  standard type like UUID, int, or string, depending on the identity provider
-  (e.g., Firebase Auth).
-- It should be immutable (e.g., using `frozen=True` in Pydantic).
+The identifier is a plain string because users are identified by the UID
+issued by the identity provider (Firebase Auth).
 """
+
+from pydantic import BaseModel, ConfigDict, Field
+
+
+class UserId(BaseModel):
+    """
+    Immutable identifier of a User, as issued by Firebase Auth.
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    value: str = Field(..., min_length=1)
+
+    def __str__(self) -> str:
+        return self.value
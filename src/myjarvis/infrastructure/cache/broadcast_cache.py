@@ -0,0 +1,178 @@
+"""
+This module provides a bounded in-process cache shared by all workers for
+its invalidations.
+
+The domain services memoize derived data (the Telegram identities, the
+agents' toolsets) in a `LocalCache` per process. When a command changes the
+underlying data, it drops the entry of the worker that handled it; the other
+workers would keep serving theirs until it expires. `BroadcastLocalCache`
+announces every deletion on a Redis pub/sub channel instead, and each worker
+drops its own entry, the way `TieredRedisCache` keeps the chat contexts
+consistent.
+
+Implementation details:
+- The values are kept in an `LruTtlCache`; only the deletions are shared.
+- `delete` is synchronous, like the interface it implements: the entry is
+  dropped at once and the announcement is published in the background.
+  `stop` waits for the announcements still being published.
+- If the subscription is lost, the cache is cleared, since invalidations may
+  have been missed in the meantime. The time to live bounds the staleness
+  window of a lost or delayed message.
+"""
+
+import asyncio
+import logging
+import uuid
+from typing import Callable, Generic, Hashable, TypeVar
+
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError
+
+from .local_cache import CacheStats, LruTtlCache
+
+logger = logging.getLogger(__name__)
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+_RESUBSCRIBE_DELAY_SECONDS = 1.0
+# How long the listener waits for a message before checking for `stop`.
+_LISTEN_TIMEOUT_SECONDS = 1.0
+
+
+class BroadcastLocalCache(Generic[K, V]):
+    """
+    LruTtlCache whose deletions are announced to the other workers,
+    implementing the domain's `LocalCache` interface.
+
+    `start` must be called once the event loop is running to listen for
+    invalidations, and `stop` on shutdown.
+
+    Args:
+        redis_client: The asynchronous Redis client to use.
+        channel: The pub/sub channel of the cache's invalidations. Every
+            cache holding the same data must use the same channel.
+        max_entries: Maximum number of entries kept.
+        max_bytes: Maximum total size of the entries kept.
+        ttl_seconds: How long an entry stays valid after it was set.
+        parse_key: Converts a key announced on the channel, as a string,
+            back to a key of the cache.
+    """
+
+    def __init__(
+        self,
+        redis_client: AsyncRedis,
+        channel: str,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float,
+        parse_key: Callable[[str], K] = str,
+    ):
+        self._client = redis_client
+        self._channel = channel
+        self._parse_key = parse_key
+        self._local: LruTtlCache[K, V] = LruTtlCache(
+            max_entries=max_entries,
+            max_bytes=max_bytes,
+            ttl_seconds=ttl_seconds,
+        )
+        self._origin = uuid.uuid4().hex
+        self._listener: asyncio.Task | None = None
+        self._stopping = False
+        self._publishing: set[asyncio.Task] = set()
+        self.invalidations = 0
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Hit and miss counters of the cache.
+        """
+        return self._local.stats
+
+    async def start(self) -> None:
+        """
+        Start listening for invalidations from other workers.
+        """
+        if self._listener is None:
+            self._stopping = False
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """
+        Publish the pending announcements and stop listening for
+        invalidations.
+        """
+        if self._publishing:
+            await asyncio.gather(*self._publishing)
+        if self._listener is not None:
+            # A Redis client may swallow the cancellation of a pending
+            # command (fakeredis does), so the listener also checks the flag.
+            self._stopping = True
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    def get(self, key: K) -> V | None:
+        return self._local.get(key)
+
+    def set(
+        self, key: K, value: V, size: int, ttl_seconds: float | None = None
+    ) -> None:
+        self._local.set(key, value, size, ttl_seconds)
+
+    def delete(self, key: K) -> None:
+        """
+        Drop the entry of a key in this worker and in the others.
+        """
+        self._local.delete(key)
+        task = asyncio.create_task(self._publish_invalidation(key))
+        self._publishing.add(task)
+        task.add_done_callback(self._publishing.discard)
+
+    async def _publish_invalidation(self, key: K) -> None:
+        try:
+            await self._client.publish(self._channel, f"{self._origin}:{key}")
+        except RedisError:
+            logger.warning(
+                "Failed to announce the invalidation of %s on %s",
+                key,
+                self._channel,
+                exc_info=True,
+            )
+
+    async def _listen(self) -> None:
+        while not self._stopping:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.subscribe(self._channel)
+                # Anything cached before the subscription was active may have
+                # been changed without us hearing about it.
+                self._local.clear()
+                while not self._stopping:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=_LISTEN_TIMEOUT_SECONDS,
+                    )
+                    if message is not None and message["type"] == "message":
+                        self._handle_invalidation(message["data"])
+            except RedisError:
+                logger.warning(
+                    "Invalidation channel %s lost, resubscribing",
+                    self._channel,
+                    exc_info=True,
+                )
+                self._local.clear()
+                await asyncio.sleep(_RESUBSCRIBE_DELAY_SECONDS)
+            finally:
+                await pubsub.aclose()
+
+    def _handle_invalidation(self, data: bytes | str) -> None:
+        if isinstance(data, bytes):
+            data = data.decode()
+        origin, _, key = data.partition(":")
+        if origin != self._origin:
+            self._local.delete(self._parse_key(key))
+            self.invalidations += 1
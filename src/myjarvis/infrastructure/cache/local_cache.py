@@ -0,0 +1,137 @@
+"""
+This module provides a bounded in-process cache.
+
+`LruTtlCache` keeps the most recently used entries in memory. An entry expires
+after a fixed time to live, and the cache evicts the least recently used
+entries once either the entry count or the total size in bytes exceeds its
+limits. The size of an entry is supplied by the caller, typically the length
+of the entry's serialized form.
+
+The cache is not thread-safe; it is meant to be used from a single event
+loop.
+"""
+
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Generic, Hashable, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+@dataclass(slots=True)
+class _Entry(Generic[V]):
+    value: V
+    size: int
+    expires_at: float
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """
+    Counters describing the effectiveness of a cache.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class LruTtlCache(Generic[K, V]):
+    """
+    Least-recently-used cache bounded by entry count and total size.
+
+    Args:
+        max_entries: Maximum number of entries kept.
+        max_bytes: Maximum total size of the entries kept.
+        ttl_seconds: How long an entry stays valid after it was set.
+    """
+
+    def __init__(self, max_entries: int, max_bytes: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.stats = CacheStats()
+        self._entries: OrderedDict[K, _Entry[V]] = OrderedDict()
+        self._total_bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def get(self, key: K) -> V | None:
+        """
+        Return the value of a key and mark it as recently used.
+
+        Returns:
+            The cached value, or None if the key is missing or expired.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            self._remove(key)
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return entry.value
+
+    def set(
+        self, key: K, value: V, size: int, ttl_seconds: float | None = None
+    ) -> None:
+        """
+        Store a value, evicting the least recently used entries if needed.
+
+        Values larger than `max_bytes` are not cached at all.
+
+        Args:
+            key: The key to store the value under.
+            value: The value to store.
+            size: The size of the value in bytes.
+            ttl_seconds: Time to live of this entry. Defaults to the cache's
+                `ttl_seconds`.
+        """
+        self.delete(key)
+        if size > self.max_bytes:
+            return
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._entries[key] = _Entry(value, size, time.monotonic() + ttl)
+        self._total_bytes += size
+        while (
+            len(self._entries) > self.max_entries
+            or self._total_bytes > self.max_bytes
+        ):
+            oldest = next(iter(self._entries))
+            self._remove(oldest)
+            self.stats.evictions += 1
+
+    def delete(self, key: K) -> None:
+        """
+        Remove a key if it is present.
+        """
+        if key in self._entries:
+            self._remove(key)
+
+    def clear(self) -> None:
+        """
+        Remove all entries.
+        """
+        self._entries.clear()
+        self._total_bytes = 0
+
+    def _remove(self, key: K) -> None:
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry.size
@@ -0,0 +1,192 @@
+"""
+This module provides a cache for the results of idempotent node commands.
+
+Agents often repeat the same lookup across turns and users: the same web
+search, the same document read, the same day of the calendar. Nodes declare
+such commands in their `cacheable_commands`, and `NodeResultCache` reuses
+their results for the time to live of the command's `CommandCachePolicy`.
+
+Implementation details:
+- Results are kept in a bounded in-process LRU in front of Redis. The Redis
+  tier is optional and shared by all workers; if it is unavailable, the cache
+  degrades to the local tier.
+- Both tiers hold the result serialized as JSON, and every caller receives
+  its own decoded copy: a caller modifying its result does not change the
+  result served to the others.
+- The cache key is derived from the node type, the command and its
+  normalized parameters: dictionary keys are sorted, strings are stripped and
+  have their whitespace collapsed, and the parameters listed by the policy are
+  compared ignoring case.
+- Results of commands reading private data are cached per user; results of
+  shared commands (e.g. web search) are cached once for everybody.
+- Identical calls in flight at the same time in one process are executed
+  once: later callers wait for the first call's result (single flight). The
+  shared call is not cancelled when one of its callers gives up.
+- Only successful results are cached.
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict
+
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError
+
+from myjarvis.domain.interfaces.node import CommandCachePolicy
+
+from .local_cache import CacheStats, LruTtlCache
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "node_result"
+_WHITESPACE = re.compile(r"\s+")
+
+
+class NodeResultCache:
+    """
+    Two-tier cache of node command results with single-flight execution.
+
+    Args:
+        redis_client: The asynchronous Redis client of the shared tier, or
+            None to cache in process only.
+        local_max_entries: Maximum number of results kept in process.
+        local_max_bytes: Maximum total serialized size kept in process.
+    """
+
+    def __init__(
+        self,
+        redis_client: AsyncRedis | None = None,
+        local_max_entries: int = 4096,
+        local_max_bytes: int = 32 * 1024 * 1024,
+    ):
+        self._client = redis_client
+        # Entries always carry the TTL of their command's policy.
+        self._local: LruTtlCache[str, str] = LruTtlCache(
+            max_entries=local_max_entries,
+            max_bytes=local_max_bytes,
+            ttl_seconds=0.0,
+        )
+        self._in_flight: dict[str, asyncio.Task[str]] = {}
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Hit and miss counters of the in-process tier.
+        """
+        return self._local.stats
+
+    async def get_or_execute(
+        self,
+        node_type: str,
+        command: str,
+        params: Dict[str, Any],
+        policy: CommandCachePolicy,
+        user_id: str | None,
+        execute: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        """
+        Return the cached result of a command, executing it on a miss.
+
+        Args:
+            node_type: The type of the node executing the command.
+            command: The name of the command.
+            params: The parameters of the command.
+            policy: The cache policy of the command.
+            user_id: The user the command runs for. Results of private
+                commands are not cached without one.
+            execute: Coroutine function executing the command.
+
+        Returns:
+            The result of the command.
+        """
+        if not policy.shared and user_id is None:
+            return await execute()
+        key = self._key(node_type, command, params, policy, user_id)
+        raw = self._local.get(key)
+        if raw is not None:
+            return json.loads(raw)
+        task = self._in_flight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._load(key, policy, execute))
+            self._in_flight[key] = task
+            task.add_done_callback(lambda _: self._in_flight.pop(key, None))
+        return json.loads(await asyncio.shield(task))
+
+    async def _load(
+        self,
+        key: str,
+        policy: CommandCachePolicy,
+        execute: Callable[[], Awaitable[Dict[str, Any]]],
+    ) -> str:
+        cached = await self._redis_get(key)
+        if cached is not None:
+            raw = cached.decode() if isinstance(cached, bytes) else cached
+        else:
+            raw = json.dumps(
+                await execute(), separators=(",", ":"), default=str
+            )
+            await self._redis_set(key, raw, policy.ttl_seconds)
+        self._local.set(key, raw, len(raw), policy.ttl_seconds)
+        return raw
+
+    async def _redis_get(self, key: str) -> bytes | None:
+        if self._client is None:
+            return None
+        try:
+            return await self._client.get(key)
+        except RedisError:
+            logger.warning("Failed to read node result %s", key, exc_info=True)
+            return None
+
+    async def _redis_set(self, key: str, raw: str, ttl_seconds: float) -> None:
+        if self._client is None:
+            return
+        try:
+            await self._client.set(key, raw, px=int(ttl_seconds * 1000))
+        except RedisError:
+            logger.warning(
+                "Failed to store node result %s", key, exc_info=True
+            )
+
+    @classmethod
+    def _key(
+        cls,
+        node_type: str,
+        command: str,
+        params: Dict[str, Any],
+        policy: CommandCachePolicy,
+        user_id: str | None,
+    ) -> str:
+        normalized = {
+            name: cls._normalize(
+                value, casefold=name in policy.case_insensitive_params
+            )
+            for name, value in params.items()
+        }
+        digest = hashlib.sha256(
+            json.dumps(
+                normalized,
+                sort_keys=True,
+                separators=(",", ":"),
+                default=str,
+            ).encode()
+        ).hexdigest()
+        scope = "shared" if policy.shared else f"user:{user_id}"
+        return f"{_KEY_PREFIX}:{node_type}:{command}:{scope}:{digest}"
+
+    @classmethod
+    def _normalize(cls, value: Any, casefold: bool = False) -> Any:
+        if isinstance(value, str):
+            value = _WHITESPACE.sub(" ", value).strip()
+            return value.casefold() if casefold else value
+        if isinstance(value, dict):
+            return {
+                str(name): cls._normalize(item, casefold)
+                for name, item in value.items()
+            }
+        if isinstance(value, (list, tuple)):
+            return [cls._normalize(item, casefold) for item in value]
+        return value
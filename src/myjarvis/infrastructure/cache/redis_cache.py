@@ -5,50 +5,202 @@ It is primarily used for caching chat contexts to maintain conversation history
 without repeatedly querying the main database. This improves performance and
 reduces latency in chat interactions.
 
-The implementation should provide a simple key-value store interface with methods
-for setting, getting, and deleting cache entries. It will use the `redis-py`
-library for asynchronous communication with a Redis server.
+A chat context is stored as an append-only log rather than as one serialized
+blob, so the cost of a chat turn does not grow with the length of the
+conversation:
+- `chat_context:{agent_id}` is a hash with the context's metadata, its
+  rolling summary and the sequence number following the last message held in
+  Redis (`end`).
+- `chat_context:{agent_id}:messages` is a list with one JSON-encoded message
+  per item, in sequence order. With `max_messages`, the list is trimmed to
+  the newest messages on every write, so it stays as long as the window of
+  history a chat turn loads. The sequence numbers are counted from `end`,
+  so trimming needs no metadata update.
 
-Example Implementation:
+Saving a context pushes only its pending messages, and loading can fetch just
+the newest messages with `LRANGE`. If the stored log no longer lines up with
+the context being saved (it expired, or another conversation replaced it),
+the log is rewritten from the messages the context holds. The check and the
+append are one transaction (`WATCH`/`MULTI`): nothing is pushed onto a log
+that does not line up, and a log changed meanwhile is rewritten instead.
+"""
+
+from datetime import datetime
+from uuid import UUID
 
-import json
-from typing import Any
 from redis.asyncio import Redis as AsyncRedis
+from redis.asyncio.client import Pipeline
+from redis.exceptions import WatchError
+
 from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.message import Message
+
+_DEFAULT_TTL_SECONDS = 3600
+
 
 class RedisCache:
-    def __init__(self, redis_client: AsyncRedis):
+    """
+    Redis-backed storage for chat contexts, keyed by agent, implementing the
+    domain's `ChatContextCache` interface.
+
+    Args:
+        redis_client: The asynchronous Redis client to use.
+        ttl_seconds: How long a context is kept after its last update.
+        max_messages: Number of newest messages kept per context, or None to
+            keep them all.
+    """
+
+    def __init__(
+        self,
+        redis_client: AsyncRedis,
+        ttl_seconds: int = _DEFAULT_TTL_SECONDS,
+        max_messages: int | None = None,
+    ):
         self._client = redis_client
+        self._ttl_seconds = ttl_seconds
+        self._max_messages = max_messages
 
-    async def get_chat_context(self, agent_id: str) -> ChatContext | None:
+    async def get_chat_context(
+        self, agent_id: str, tail: int | None = None
+    ) -> ChatContext | None:
+        """
         Retrieves a chat context from the cache.
 
         Args:
             agent_id (str): The unique identifier for the AI agent.
+            tail (int | None): Maximum number of newest messages to load, or
+                               None for all cached messages.
 
         Returns:
-            ChatContext | None: The deserialized ChatContext object if found,
-                                otherwise None.
-        cached_context = await self._client.get(f"chat_context:{agent_id}")
-        if cached_context:
-            return ChatContext(**json.loads(cached_context))
-        return None
+            ChatContext | None: The ChatContext object if found, otherwise
+                                None. Its messages are marked as persisted.
+        """
+        context, _ = await self._load(agent_id, tail)
+        return context
 
     async def set_chat_context(self, context: ChatContext) -> None:
-        Saves a chat context to the cache.
+        """
+        Appends the pending messages of a chat context to the cache.
 
         Args:
             context (ChatContext): The ChatContext object to cache.
-        key = f"chat_context:{context.agent_id}"
-        # The ChatContext object would need a serializable representation.
-        # Pydantic's model_dump_json is a good candidate.
-        await self._client.set(key, context.model_dump_json(), ex=3600) # 1 hour TTL
+        """
+        meta_key, messages_key = self._keys(str(context.agent_id))
+        pending = context.pending_messages()
+        async with self._client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(meta_key, messages_key)
+                stored_context_id, end = await pipe.hmget(
+                    meta_key, "context_id", "end"
+                )
+                # The pending messages must continue the stored log exactly.
+                if (
+                    stored_context_id is not None
+                    and stored_context_id.decode() == str(context.context_id)
+                    and end is not None
+                    and int(end) == context.next_sequence - len(pending)
+                ):
+                    pipe.multi()
+                    if pending:
+                        pipe.rpush(
+                            messages_key,
+                            *(
+                                message.model_dump_json()
+                                for message in pending
+                            ),
+                        )
+                        pipe.hset(meta_key, "end", context.next_sequence)
+                        self._trim(pipe, messages_key)
+                    if context.summary_changed:
+                        pipe.hset(
+                            meta_key, mapping=self._summary_fields(context)
+                        )
+                    pipe.expire(meta_key, self._ttl_seconds)
+                    pipe.expire(messages_key, self._ttl_seconds)
+                    await pipe.execute()
+                    return
+            except WatchError:
+                # The log was written meanwhile.
+                pass
+        await self._rewrite(context)
 
     async def delete_chat_context(self, agent_id: str) -> None:
+        """
         Deletes a chat context from the cache.
 
         Args:
             agent_id (str): The ID of the agent whose context should be deleted.
-        await self._client.delete(f"chat_context:{agent_id}")
+        """
+        await self._client.delete(*self._keys(agent_id))
 
-"""
+    async def _load(
+        self, agent_id: str, tail: int | None
+    ) -> tuple[ChatContext | None, int]:
+        """
+        Load a context and report the size of the data read, in bytes.
+        """
+        meta_key, messages_key = self._keys(agent_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hgetall(meta_key)
+            pipe.lrange(messages_key, -tail if tail else 0, -1)
+            meta, raw_messages = await pipe.execute()
+        if b"end" not in meta or b"context_id" not in meta:
+            return None, 0
+        context = ChatContext(
+            context_id=UUID(meta[b"context_id"].decode()),
+            agent_id=AgentId(value=agent_id),
+            messages=[
+                Message.model_validate_json(raw) for raw in raw_messages
+            ],
+            first_sequence=int(meta[b"end"]) - len(raw_messages),
+            summary=meta.get(b"summary", b"").decode(),
+            summarized_through=int(meta.get(b"summarized_through", 0)),
+            created_at=datetime.fromisoformat(meta[b"created_at"].decode()),
+        )
+        context.mark_persisted()
+        return context, sum(len(raw) for raw in raw_messages)
+
+    async def _rewrite(self, context: ChatContext) -> None:
+        """
+        Replace the stored log with the messages held by the context.
+        """
+        meta_key, messages_key = self._keys(str(context.agent_id))
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.delete(meta_key, messages_key)
+            pipe.hset(
+                meta_key,
+                mapping={
+                    "context_id": str(context.context_id),
+                    "created_at": context.created_at.isoformat(),
+                    "end": context.next_sequence,
+                    **self._summary_fields(context),
+                },
+            )
+            if context.messages:
+                pipe.rpush(
+                    messages_key,
+                    *(
+                        message.model_dump_json()
+                        for message in context.messages
+                    ),
+                )
+                self._trim(pipe, messages_key)
+            pipe.expire(meta_key, self._ttl_seconds)
+            pipe.expire(messages_key, self._ttl_seconds)
+            await pipe.execute()
+
+    def _trim(self, pipe: Pipeline, messages_key: str) -> None:
+        if self._max_messages:
+            pipe.ltrim(messages_key, -self._max_messages, -1)
+
+    @staticmethod
+    def _summary_fields(context: ChatContext) -> dict[str, str | int]:
+        return {
+            "summary": context.summary,
+            "summarized_through": context.summarized_through,
+        }
+
+    @staticmethod
+    def _keys(agent_id: str) -> tuple[str, str]:
+        return f"chat_context:{agent_id}", f"chat_context:{agent_id}:messages"
@@ -0,0 +1,323 @@
+"""
+This module provides a cache of LLM replies to repeated questions.
+
+Agents answering FAQ-style questions receive the same question again and
+again, from one user or many. `ResponseCache` reuses the reply to a question
+the agent already answered in the same situation instead of calling the LLM
+again. It is only used for replies generated without tools, since those
+depend on the state of the agent's nodes.
+
+Implementation details:
+- A reply is looked up by a `ResponseKey` derived from the agent, its model,
+  the system prompt (the base prompt and the conversation summary), the last
+  `history_messages` messages of the history and the user message. Messages
+  are compared with their whitespace collapsed and ignoring case. The system
+  prompt is part of the key as is, so changing an agent's prompt invalidates
+  its replies.
+- Exact matches are kept in a bounded in-process LRU in front of Redis, like
+  the node results. The Redis tier is optional and shared by all workers; if
+  it is unavailable, the cache degrades to the local tier.
+- With an embedder, a reply to a different wording of the same question is
+  reused too: when the cosine similarity of the user messages' embeddings
+  reaches `similarity_threshold`, among the replies cached in the same
+  situation (agent, model, prompts and history). This tier is in-process
+  only and keeps at most `max_similar_replies` replies per situation. If the
+  embedder fails, the lookup proceeds without it.
+- Identical questions in flight at the same time in one process are sent to
+  the LLM once (single flight).
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Awaitable, Callable
+
+import numpy as np
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError
+
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.infrastructure.llm.embedder import BaseEmbedder
+
+from .local_cache import LruTtlCache
+
+logger = logging.getLogger(__name__)
+
+_KEY_PREFIX = "llm_response"
+_WHITESPACE = re.compile(r"\s+")
+
+
+@dataclass(slots=True)
+class ResponseKey:
+    """
+    Identifies a question asked to an agent in a given situation.
+
+    Attributes:
+        exact: Key of the reply to this exact question.
+        scope: Key of the situation, shared by all questions asked in it.
+        message: The normalized user message.
+        vector: The embedding of the message, once computed.
+    """
+
+    exact: str
+    scope: str
+    message: str
+    vector: np.ndarray | None = None
+
+
+@dataclass(slots=True)
+class ResponseCacheStats:
+    """
+    Counters of the reply lookups.
+    """
+
+    hits: int = 0
+    similar_hits: int = 0
+    misses: int = 0
+
+
+@dataclass(slots=True)
+class _SimilarReplies:
+    """The replies cached in one situation, with their messages' vectors."""
+
+    vectors: np.ndarray
+    replies: list[str] = field(default_factory=list)
+    expires_at: list[float] = field(default_factory=list)
+
+    def best(self, vector: np.ndarray, threshold: float) -> str | None:
+        now = time.monotonic()
+        live = [index for index, at in enumerate(self.expires_at) if at > now]
+        if len(live) < len(self.replies):
+            self.vectors = self.vectors[live]
+            self.replies = [self.replies[index] for index in live]
+            self.expires_at = [self.expires_at[index] for index in live]
+        if not self.replies:
+            return None
+        similarities = self.vectors @ vector
+        best = int(np.argmax(similarities))
+        if similarities[best] < threshold:
+            return None
+        return self.replies[best]
+
+    def add(
+        self,
+        vector: np.ndarray,
+        reply: str,
+        expires_at: float,
+        max_replies: int,
+    ) -> None:
+        self.vectors = np.vstack([self.vectors, vector])[-max_replies:]
+        self.replies = [*self.replies, reply][-max_replies:]
+        self.expires_at = [*self.expires_at, expires_at][-max_replies:]
+
+
+class ResponseCache:
+    """
+    Two-tier cache of LLM replies with an optional similarity tier.
+
+    Args:
+        redis_client: The asynchronous Redis client of the shared tier, or
+            None to cache in process only.
+        ttl_seconds: How long a reply is reused.
+        history_messages: Number of the last history messages the reply
+            depends on.
+        local_max_entries: Maximum number of replies kept in process.
+        local_max_bytes: Maximum total size of the replies kept in process.
+        embedder: Embedder of the user messages, enabling the similarity
+            tier.
+        similarity_threshold: Minimum cosine similarity of two messages for
+            the reply to one to be reused for the other.
+        max_similar_replies: Maximum number of replies compared by
+            similarity per situation.
+    """
+
+    def __init__(
+        self,
+        redis_client: AsyncRedis | None = None,
+        ttl_seconds: float = 3600.0,
+        history_messages: int = 2,
+        local_max_entries: int = 4096,
+        local_max_bytes: int = 16 * 1024 * 1024,
+        embedder: BaseEmbedder | None = None,
+        similarity_threshold: float = 0.95,
+        max_similar_replies: int = 256,
+    ):
+        self._client = redis_client
+        self._ttl_seconds = ttl_seconds
+        self._history_messages = history_messages
+        self._embedder = embedder
+        self._similarity_threshold = similarity_threshold
+        self._max_similar_replies = max_similar_replies
+        self._local: LruTtlCache[str, str] = LruTtlCache(
+            max_entries=local_max_entries,
+            max_bytes=local_max_bytes,
+            ttl_seconds=ttl_seconds,
+        )
+        # Entries are counted, not measured: every entry has size 1.
+        self._similar: LruTtlCache[str, _SimilarReplies] = LruTtlCache(
+            max_entries=local_max_entries,
+            max_bytes=local_max_entries,
+            ttl_seconds=ttl_seconds,
+        )
+        self._in_flight: dict[str, asyncio.Task[str]] = {}
+        self.stats = ResponseCacheStats()
+
+    def key(
+        self,
+        agent_id: str,
+        llm_model: str,
+        system_prompt: str | None,
+        history: list[Message],
+        message: str,
+    ) -> ResponseKey:
+        """
+        Return the key of a question asked to an agent.
+
+        Args:
+            agent_id: The agent answering the question.
+            llm_model: The agent's model identifier.
+            system_prompt: The system prompt sent with the question.
+            history: The history sent with the question.
+            message: The user message.
+        """
+        tail = (
+            history[-self._history_messages :]
+            if self._history_messages
+            else []
+        )
+        scope = self._digest(
+            [
+                agent_id,
+                llm_model,
+                system_prompt or "",
+                [
+                    [item.sender.value, self._normalize(item.content)]
+                    for item in tail
+                ],
+            ]
+        )
+        normalized = self._normalize(message)
+        return ResponseKey(
+            exact=f"{_KEY_PREFIX}:{agent_id}:"
+            f"{self._digest([scope, normalized])}",
+            scope=scope,
+            message=normalized,
+        )
+
+    async def get(self, key: ResponseKey) -> str | None:
+        """
+        Return the cached reply to a question, if any.
+        """
+        reply = self._local.get(key.exact)
+        if reply is None:
+            reply = await self._redis_get(key.exact)
+            if reply is not None:
+                self._local.set(key.exact, reply, len(reply))
+        if reply is not None:
+            self.stats.hits += 1
+            return reply
+        reply = await self._get_similar(key)
+        if reply is not None:
+            self.stats.similar_hits += 1
+            return reply
+        self.stats.misses += 1
+        return None
+
+    async def set(self, key: ResponseKey, reply: str) -> None:
+        """
+        Cache the reply to a question.
+        """
+        self._local.set(key.exact, reply, len(reply))
+        await self._redis_set(key.exact, reply)
+        if key.vector is None:
+            return
+        similar = self._similar.get(key.scope)
+        if similar is None:
+            similar = _SimilarReplies(
+                np.empty((0, key.vector.shape[0]), dtype=np.float32)
+            )
+        similar.add(
+            key.vector,
+            reply,
+            time.monotonic() + self._ttl_seconds,
+            self._max_similar_replies,
+        )
+        self._similar.set(key.scope, similar, 1)
+
+    async def get_or_generate(
+        self, key: ResponseKey, generate: Callable[[], Awaitable[str]]
+    ) -> str:
+        """
+        Return the cached reply to a question, generating it on a miss.
+
+        Args:
+            key: The key of the question.
+            generate: Coroutine function asking the LLM for the reply.
+        """
+        task = self._in_flight.get(key.exact)
+        if task is None:
+            task = asyncio.create_task(self._load(key, generate))
+            self._in_flight[key.exact] = task
+            task.add_done_callback(
+                lambda _: self._in_flight.pop(key.exact, None)
+            )
+        return await asyncio.shield(task)
+
+    async def _load(
+        self, key: ResponseKey, generate: Callable[[], Awaitable[str]]
+    ) -> str:
+        reply = await self.get(key)
+        if reply is None:
+            reply = await generate()
+            await self.set(key, reply)
+        return reply
+
+    async def _get_similar(self, key: ResponseKey) -> str | None:
+        if self._embedder is None:
+            return None
+        try:
+            (vector,) = await self._embedder.embed([key.message])
+        except Exception:
+            logger.warning("Failed to embed a user message", exc_info=True)
+            return None
+        vector = np.asarray(vector, dtype=np.float32)
+        norm = float(np.linalg.norm(vector))
+        key.vector = vector / norm if norm else vector
+        similar = self._similar.get(key.scope)
+        if similar is None:
+            return None
+        return similar.best(key.vector, self._similarity_threshold)
+
+    async def _redis_get(self, key: str) -> str | None:
+        if self._client is None:
+            return None
+        try:
+            raw = await self._client.get(key)
+        except RedisError:
+            logger.warning("Failed to read reply %s", key, exc_info=True)
+            return None
+        return raw.decode() if isinstance(raw, bytes) else raw
+
+    async def _redis_set(self, key: str, reply: str) -> None:
+        if self._client is None:
+            return
+        try:
+            await self._client.set(
+                key, reply, px=int(self._ttl_seconds * 1000)
+            )
+        except RedisError:
+            logger.warning("Failed to store reply %s", key, exc_info=True)
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return _WHITESPACE.sub(" ", text).strip().casefold()
+
+    @staticmethod
+    def _digest(value: object) -> str:
+        return hashlib.sha256(
+            json.dumps(value, separators=(",", ":")).encode()
+        ).hexdigest()
@@ -0,0 +1,208 @@
+"""
+This module provides a two-tier chat context cache.
+
+`TieredRedisCache` keeps recently used chat contexts in a bounded in-process
+LRU in front of Redis, so a worker that served the previous turn of a
+conversation can skip both the network round trip and the JSON parsing.
+
+Several API workers can hold a copy of the same context. Every write or
+delete is therefore announced on a Redis pub/sub channel, and each worker
+drops its local copy when another worker changes the context. If the
+subscription is lost, the local tier is cleared, since invalidations may have
+been missed in the meantime. A short local TTL bounds the staleness window of
+a lost or delayed message.
+"""
+
+import asyncio
+import logging
+import uuid
+from dataclasses import dataclass
+
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import RedisError
+
+from myjarvis.domain.entities.chat_context import ChatContext
+
+from .local_cache import LruTtlCache
+from .redis_cache import RedisCache
+
+logger = logging.getLogger(__name__)
+
+INVALIDATION_CHANNEL = "chat_context:invalidate"
+_RESUBSCRIBE_DELAY_SECONDS = 1.0
+# How long the listener waits for a message before checking for `stop`.
+_LISTEN_TIMEOUT_SECONDS = 1.0
+# Approximate size of a serialized message without its content.
+_MESSAGE_OVERHEAD_BYTES = 80
+
+
+@dataclass(slots=True)
+class TieredCacheStats:
+    """
+    Hit and miss counters of both cache tiers.
+    """
+
+    local_hits: int
+    local_misses: int
+    redis_hits: int
+    redis_misses: int
+    local_evictions: int
+    invalidations: int
+    local_entries: int
+    local_bytes: int
+
+
+class TieredRedisCache(RedisCache):
+    """
+    RedisCache with an in-process LRU tier and pub/sub invalidation.
+
+    `start` must be called once the event loop is running to listen for
+    invalidations, and `stop` on shutdown.
+
+    Args:
+        redis_client: The asynchronous Redis client to use.
+        ttl_seconds: How long a context is kept in Redis.
+        max_messages: Number of newest messages kept per context in Redis,
+            or None to keep them all.
+        local_max_entries: Maximum number of contexts kept in process.
+        local_max_bytes: Maximum total serialized size kept in process.
+        local_ttl_seconds: How long a context is kept in process.
+    """
+
+    def __init__(
+        self,
+        redis_client: AsyncRedis,
+        ttl_seconds: int = 3600,
+        max_messages: int | None = None,
+        local_max_entries: int = 1024,
+        local_max_bytes: int = 64 * 1024 * 1024,
+        local_ttl_seconds: float = 30.0,
+    ):
+        super().__init__(redis_client, ttl_seconds, max_messages)
+        self._local: LruTtlCache[str, ChatContext] = LruTtlCache(
+            max_entries=local_max_entries,
+            max_bytes=local_max_bytes,
+            ttl_seconds=local_ttl_seconds,
+        )
+        self._origin = uuid.uuid4().hex
+        self._listener: asyncio.Task | None = None
+        self._stopping = False
+        self._redis_hits = 0
+        self._redis_misses = 0
+        self._invalidations = 0
+
+    @property
+    def stats(self) -> TieredCacheStats:
+        """
+        Current counters of both tiers.
+        """
+        return TieredCacheStats(
+            local_hits=self._local.stats.hits,
+            local_misses=self._local.stats.misses,
+            redis_hits=self._redis_hits,
+            redis_misses=self._redis_misses,
+            local_evictions=self._local.stats.evictions,
+            invalidations=self._invalidations,
+            local_entries=len(self._local),
+            local_bytes=self._local.total_bytes,
+        )
+
+    async def start(self) -> None:
+        """
+        Start listening for invalidations from other workers.
+        """
+        if self._listener is None:
+            self._stopping = False
+            self._listener = asyncio.create_task(self._listen())
+
+    async def stop(self) -> None:
+        """
+        Stop listening for invalidations.
+        """
+        if self._listener is not None:
+            # A Redis client may swallow the cancellation of a pending
+            # command (fakeredis does), so the listener also checks the flag.
+            self._stopping = True
+            self._listener.cancel()
+            try:
+                await self._listener
+            except asyncio.CancelledError:
+                pass
+            self._listener = None
+
+    async def get_chat_context(
+        self, agent_id: str, tail: int | None = None
+    ) -> ChatContext | None:
+        context = self._local.get(agent_id)
+        # A context cached without its oldest messages cannot answer a
+        # request for the whole conversation.
+        if context is not None and (tail or context.first_sequence == 0):
+            return context.tail(tail)
+        context, size = await self._load(agent_id, tail)
+        if context is None:
+            self._redis_misses += 1
+            return None
+        self._redis_hits += 1
+        self._local.set(agent_id, context.tail(None), size)
+        return context
+
+    async def set_chat_context(self, context: ChatContext) -> None:
+        await super().set_chat_context(context)
+        agent_id = str(context.agent_id)
+        cached = context.tail(None)
+        cached.mark_persisted()
+        self._local.set(agent_id, cached, _estimate_size(cached))
+        await self._publish_invalidation(agent_id)
+
+    async def delete_chat_context(self, agent_id: str) -> None:
+        self._local.delete(agent_id)
+        await super().delete_chat_context(agent_id)
+        await self._publish_invalidation(agent_id)
+
+    async def _publish_invalidation(self, agent_id: str) -> None:
+        await self._client.publish(
+            INVALIDATION_CHANNEL, f"{self._origin}:{agent_id}"
+        )
+
+    async def _listen(self) -> None:
+        while not self._stopping:
+            pubsub = self._client.pubsub()
+            try:
+                await pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Anything cached before the subscription was active may have
+                # been changed without us hearing about it.
+                self._local.clear()
+                while not self._stopping:
+                    message = await pubsub.get_message(
+                        ignore_subscribe_messages=True,
+                        timeout=_LISTEN_TIMEOUT_SECONDS,
+                    )
+                    if message is not None and message["type"] == "message":
+                        self._handle_invalidation(message["data"])
+            except RedisError:
+                logger.warning(
+                    "Chat context invalidation channel lost, resubscribing",
+                    exc_info=True,
+                )
+                self._local.clear()
+                await asyncio.sleep(_RESUBSCRIBE_DELAY_SECONDS)
+            finally:
+                await pubsub.aclose()
+
+    def _handle_invalidation(self, data: bytes | str) -> None:
+        if isinstance(data, bytes):
+            data = data.decode()
+        origin, _, agent_id = data.partition(":")
+        if origin != self._origin:
+            self._local.delete(agent_id)
+            self._invalidations += 1
+
+
+def _estimate_size(context: ChatContext) -> int:
+    """
+    Approximate the serialized size of a context without serializing it.
+    """
+    return sum(
+        len(message.content) + _MESSAGE_OVERHEAD_BYTES
+        for message in context.messages
+    )
@@ -1,21 +1,73 @@
 """SQLAlchemy AI Agent model.
 
-This module defines the `AgentModel` class, the SQLAlchemy ORM model for the `agents` table.
-It represents the persistent state of an `AIAgent` domain entity.
-
-Implementation Details:
-- The class should inherit from a declarative base.
-- It must define columns for the `AIAgent` attributes:
-  - `id`: Primary key.
-  - `agent_id`: A unique identifier for the agent (Value Object).
-  - `user_id`: A foreign key to the `users` table, linking the agent to its owner.
-  - `name`: The name of the agent.
-  - `base_prompt`: The initial prompt or instruction for the agent.
-  - `llm_model`: A string indicating the LLM model used (e.g., 'openai', 'anthropic').
-  - `created_at`: Timestamp of agent creation.
-- It should define the many-to-one relationship back to the `UserModel`:
-  - `user = relationship("UserModel", back_populates="agents")`
-- It should also define a many-to-many relationship with `NodeModel` to represent
-  the nodes attached to this agent. This will require an association table.
-  - `nodes = relationship("NodeModel", secondary="agent_nodes_association")`
+This module defines the `AgentModel` class, the SQLAlchemy ORM model for the
+`agents` table. It represents the persistent state of an `AIAgent` domain
+entity, together with the `agent_nodes_association` table that links agents
+to the nodes attached to them.
 """
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import (
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    String,
+    Table,
+    Text,
+    false,
+)
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+from .node_model import NodeModel
+from .user_model import UserModel
+
+agent_nodes_association = Table(
+    "agent_nodes_association",
+    Base.metadata,
+    Column(
+        "agent_id",
+        ForeignKey("agents.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+    Column(
+        "node_id",
+        ForeignKey("nodes.id", ondelete="CASCADE"),
+        primary_key=True,
+    ),
+)
+
+
+class AgentModel(Base):
+    """ORM model of the `agents` table."""
+
+    __tablename__ = "agents"
+    # Serves the listing of a user's agents, in keyset order.
+    __table_args__ = (
+        Index(
+            "ix_agents_user_id_created_at", "user_id", "created_at", "agent_id"
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    agent_id: Mapped[UUID] = mapped_column(unique=True)
+    user_id: Mapped[str] = mapped_column(
+        ForeignKey("users.user_id", ondelete="CASCADE")
+    )
+    name: Mapped[str] = mapped_column(String(100))
+    base_prompt: Mapped[str] = mapped_column(Text, default="")
+    llm_model: Mapped[str] = mapped_column(String(100))
+    cache_replies: Mapped[bool] = mapped_column(
+        default=False, server_default=false()
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+
+    user: Mapped[UserModel] = relationship(back_populates="agents")
+    nodes: Mapped[list[NodeModel]] = relationship(
+        secondary=agent_nodes_association
+    )
@@ -0,0 +1,11 @@
+"""Declarative base for the SQLAlchemy ORM models.
+
+Every model in this package inherits from `Base`, which lets Alembic discover
+the tables through `Base.metadata`.
+"""
+
+from sqlalchemy.orm import DeclarativeBase
+
+
+class Base(DeclarativeBase):
+    """Base class of all ORM models."""
@@ -0,0 +1,50 @@
+"""SQLAlchemy chat context models.
+
+This module defines the ORM models that persist `ChatContext` entities as an
+append-only log:
+- `ChatContextModel` (`chat_contexts` table) holds one row per conversation,
+  including its rolling summary.
+- `ChatMessageModel` (`chat_messages` table) holds one row per message, keyed
+  by the conversation and the message's sequence number, so a turn inserts
+  only its new messages and the newest messages can be read with an index
+  range scan.
+"""
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import DateTime, ForeignKey, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class ChatContextModel(Base):
+    """ORM model of the `chat_contexts` table."""
+
+    __tablename__ = "chat_contexts"
+
+    context_id: Mapped[UUID] = mapped_column(primary_key=True)
+    agent_id: Mapped[UUID] = mapped_column(
+        ForeignKey("agents.agent_id", ondelete="CASCADE"), index=True
+    )
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    summary: Mapped[str] = mapped_column(Text, default="")
+    summarized_through: Mapped[int] = mapped_column(default=0)
+
+
+class ChatMessageModel(Base):
+    """ORM model of the `chat_messages` table."""
+
+    __tablename__ = "chat_messages"
+
+    context_id: Mapped[UUID] = mapped_column(
+        ForeignKey("chat_contexts.context_id", ondelete="CASCADE"),
+        primary_key=True,
+    )
+    sequence: Mapped[int] = mapped_column(primary_key=True)
+    sender: Mapped[str] = mapped_column(String(16))
+    content: Mapped[str] = mapped_column(Text)
+    timestamp: Mapped[datetime] = mapped_column(DateTime(timezone=True))
@@ -3,15 +3,27 @@
 This module defines the `NodeModel`, the SQLAlchemy ORM model for the `nodes` table.
 It represents a "Node", which is an external service or tool that an AI Agent can use.
 
-Implementation Details:
-- The class should inherit from a declarative base.
-- It should define columns for the `Node` entity attributes:
-  - `id`: Primary key.
-  - `node_id`: A unique identifier for the node (Value Object).
-  - `name`: The name of the node (e.g., "Google Docs", "Email Sender").
-  - `description`: A text description of what the node does, for the LLM to understand.
-  - `node_type`: A string identifying the type of node (e.g., 'google_docs', 'search').
-- It should define the many-to-many relationship with `AgentModel` if not already defined
-  on the agent side, but typically this is managed via the `agent_model`'s relationship
-  and a separate association table.
+The many-to-many relationship with `AgentModel` is managed from the agent side
+through the `agent_nodes_association` table.
 """
+
+from uuid import UUID
+
+from sqlalchemy import Index, String, Text
+from sqlalchemy.orm import Mapped, mapped_column
+
+from .base import Base
+
+
+class NodeModel(Base):
+    """ORM model of the `nodes` table."""
+
+    __tablename__ = "nodes"
+    # Serves the listing of the node catalog, in keyset order.
+    __table_args__ = (Index("ix_nodes_name", "name", "node_id"),)
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    node_id: Mapped[UUID] = mapped_column(unique=True)
+    name: Mapped[str] = mapped_column(String(100))
+    description: Mapped[str] = mapped_column(Text, default="")
+    node_type: Mapped[str] = mapped_column(String(50))
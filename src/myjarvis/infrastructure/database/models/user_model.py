@@ -4,15 +4,37 @@ This module defines the `UserModel` class, which is the SQLAlchemy ORM model
 representing the `users` table in the database. It maps the `User` domain entity
 to the database schema.
 
-Implementation Details:
-- The class should inherit from a declarative base.
-- It should define columns corresponding to the `User` entity's attributes:
-  - `id`: The primary key, likely a UUID or an integer.
-  - `user_id`: A unique identifier for the user (Value Object from domain).
-  - `email`: The user's email address, should be unique.
-  - `created_at`: Timestamp of when the user was created.
-  - `telegram_id`: Optional field for the user's Telegram ID.
-- It should define the relationship to the `AgentModel`, indicating that a user
-  can have multiple agents (a one-to-many relationship).
-  - `agents = relationship("AgentModel", back_populates="user")`
+`telegram_id` is indexed: the Telegram bot looks users up by their Telegram
+account. `active_agent_id` carries no foreign key, because `agents` already
+references `users`; a user whose active agent was deleted is asked to select
+another one.
 """
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+from sqlalchemy import BigInteger, DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+
+from .base import Base
+
+
+class UserModel(Base):
+    """ORM model of the `users` table."""
+
+    __tablename__ = "users"
+
+    id: Mapped[int] = mapped_column(primary_key=True)
+    user_id: Mapped[str] = mapped_column(String(128), unique=True)
+    email: Mapped[str] = mapped_column(String(320), unique=True)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), default=lambda: datetime.now(timezone.utc)
+    )
+    telegram_id: Mapped[int | None] = mapped_column(
+        BigInteger, unique=True, index=True, default=None
+    )
+    active_agent_id: Mapped[UUID | None] = mapped_column(default=None)
+
+    agents: Mapped[list["AgentModel"]] = relationship(  # noqa: F821
+        back_populates="user"
+    )
@@ -0,0 +1,43 @@
+"""Keyset pagination conditions.
+
+Lists are paginated by keyset rather than by offset: a page is selected with a
+condition on the sort key of the last row of the previous page, which an index
+on that key answers directly, however deep the page. The sort keys end with a
+unique column, so rows sharing the leading value are neither skipped nor
+repeated.
+
+- Agents are listed by `(created_at, agent_id)`, within one user; the
+  `ix_agents_user_id_created_at` index covers that order.
+- Nodes are listed by `(name, node_id)`.
+"""
+
+from datetime import datetime
+from uuid import UUID
+
+from sqlalchemy import ColumnElement, and_, or_
+
+from .models.agent_model import AgentModel
+from .models.node_model import NodeModel
+
+
+def agent_keyset_after(created_at: datetime, agent_id: UUID) -> ColumnElement:
+    """
+    Return the condition selecting the agents listed after a given one.
+    """
+    return or_(
+        AgentModel.created_at > created_at,
+        and_(
+            AgentModel.created_at == created_at,
+            AgentModel.agent_id > agent_id,
+        ),
+    )
+
+
+def node_keyset_after(name: str, node_id: UUID) -> ColumnElement:
+    """
+    Return the condition selecting the nodes listed after a given one.
+    """
+    return or_(
+        NodeModel.name > name,
+        and_(NodeModel.name == name, NodeModel.node_id > node_id),
+    )
@@ -0,0 +1,105 @@
+"""Connection pool metrics.
+
+This module provides `InstrumentedQueuePool`, the connection pool used by the
+application's database engines. It behaves like SQLAlchemy's
+`AsyncAdaptedQueuePool` and additionally records how long callers wait to
+check a connection out, which is the first symptom of an undersized pool:
+queries stay fast while requests queue up in front of the pool.
+
+`pool_stats` returns a `PoolStats` snapshot combining these counters with the
+pool's own view of the connections in use.
+"""
+
+import time
+from dataclasses import dataclass
+
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, ConnectionPoolEntry, Pool
+
+
+@dataclass(slots=True)
+class PoolStats:
+    """
+    Snapshot of a connection pool.
+
+    Attributes:
+        size: Number of persistent connections the pool keeps.
+        checked_out: Connections currently in use.
+        overflow: Connections open beyond `size`.
+        checkouts: Connections handed out since startup.
+        timeouts: Checkouts that gave up waiting for a connection.
+        wait_seconds_total: Total time spent waiting for a connection.
+        wait_seconds_max: Longest single wait for a connection.
+    """
+
+    size: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_seconds_total: float
+    wait_seconds_max: float
+
+    @property
+    def wait_seconds_mean(self) -> float:
+        return (
+            self.wait_seconds_total / self.checkouts if self.checkouts else 0.0
+        )
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """
+    `AsyncAdaptedQueuePool` recording the checkout wait time.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_seconds_total = 0.0
+        self.wait_seconds_max = 0.0
+
+    def recreate(self) -> "InstrumentedQueuePool":
+        pool = super().recreate()
+        # Keep counting across pool recreation (e.g. after a disconnect).
+        pool.checkouts = self.checkouts
+        pool.timeouts = self.timeouts
+        pool.wait_seconds_total = self.wait_seconds_total
+        pool.wait_seconds_max = self.wait_seconds_max
+        return pool
+
+    def _do_get(self) -> ConnectionPoolEntry:
+        started = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts += 1
+            raise
+        waited = time.perf_counter() - started
+        self.checkouts += 1
+        self.wait_seconds_total += waited
+        self.wait_seconds_max = max(self.wait_seconds_max, waited)
+        return record
+
+
+def pool_stats(engine: AsyncEngine) -> PoolStats | None:
+    """
+    Return a snapshot of an engine's connection pool.
+
+    Returns:
+        The pool's statistics, or None if the engine does not use an
+        `InstrumentedQueuePool` (e.g. an in-memory SQLite database).
+    """
+    pool: Pool = engine.sync_engine.pool
+    if not isinstance(pool, InstrumentedQueuePool):
+        return None
+    return PoolStats(
+        size=pool.size(),
+        checked_out=pool.checkedout(),
+        overflow=max(pool.overflow(), 0),
+        checkouts=pool.checkouts,
+        timeouts=pool.timeouts,
+        wait_seconds_total=pool.wait_seconds_total,
+        wait_seconds_max=pool.wait_seconds_max,
+    )
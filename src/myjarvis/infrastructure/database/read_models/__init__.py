@@ -0,0 +1,7 @@
+"""SQLAlchemy Read Model Implementations.
+
+This package provides the concrete implementations of the read model
+interfaces defined in the `application.read_models` package. They select the
+columns a query needs and map the rows straight to DTOs, without loading ORM
+entities.
+"""
@@ -0,0 +1,155 @@
+"""SQLAlchemy implementation of the AgentReadModel.
+
+Implementation details:
+- The agents are selected in one query and the nodes of all of them in a
+  second one, joined through `agent_nodes_association`: reading any number of
+  agents takes two round trips.
+- Only the columns of the requested DTO fields are selected, and the rows are
+  mapped to DTOs directly; neither ORM models nor domain entities are built.
+  The nodes are not queried at all unless `attached_nodes` is requested.
+- Pages are selected by keyset on `(created_at, agent_id)`, see
+  `infrastructure.database.pagination`.
+- The commands of a node are not stored in the database; they are supplied
+  by the `command_names` callable, e.g. `NodeService.get_command_names`.
+"""
+
+from collections import defaultdict
+from datetime import datetime
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myjarvis.application.dto.agent_dto import AgentDTO
+from myjarvis.application.dto.node_dto import NodeDTO
+from myjarvis.application.read_models.agent_read_model import AgentReadModel
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.user_id import UserId
+from myjarvis.infrastructure.database.models.agent_model import (
+    AgentModel,
+    agent_nodes_association,
+)
+from myjarvis.infrastructure.database.models.node_model import NodeModel
+from myjarvis.infrastructure.database.pagination import agent_keyset_after
+
+# AgentDTO fields that can be left out, by their column.
+_COLUMNS = {
+    "name": AgentModel.name,
+    "base_prompt": AgentModel.base_prompt,
+    "llm_model": AgentModel.llm_model,
+}
+
+
+class SQLAlchemyAgentReadModel(AgentReadModel):
+    """
+    AgentReadModel backed by a SQLAlchemy `AsyncSession`.
+
+    Args:
+        session: The session used for all queries.
+        command_names: Callable returning the command names of a node type.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        command_names: Callable[[str], list[str]],
+    ):
+        self._session = session
+        self._command_names = command_names
+
+    async def get_agent(
+        self, agent_id: AgentId, user_id: UserId
+    ) -> AgentDTO | None:
+        agents = await self._fetch(
+            self._agents_query(None).where(
+                AgentModel.agent_id == agent_id.value,
+                AgentModel.user_id == user_id.value,
+            ),
+            None,
+        )
+        return agents[0] if agents else None
+
+    async def get_agents_of_user(
+        self,
+        user_id: UserId,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> list[AgentDTO]:
+        query = (
+            self._agents_query(fields)
+            .where(AgentModel.user_id == user_id.value)
+            .order_by(AgentModel.created_at, AgentModel.agent_id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(agent_keyset_after(*after))
+        return await self._fetch(query, fields)
+
+    @staticmethod
+    def _agents_query(fields: frozenset[str] | None) -> Select:
+        return select(
+            AgentModel.id,
+            AgentModel.agent_id,
+            AgentModel.created_at,
+            *(
+                column
+                for name, column in _COLUMNS.items()
+                if fields is None or name in fields
+            ),
+        )
+
+    async def _fetch(
+        self, query: Select, fields: frozenset[str] | None
+    ) -> list[AgentDTO]:
+        agents = (await self._session.execute(query)).all()
+        with_nodes = fields is None or "attached_nodes" in fields
+        nodes = (
+            await self._nodes_of([agent.id for agent in agents])
+            if agents and with_nodes
+            else {}
+        )
+        return [
+            AgentDTO(
+                id=agent.agent_id,
+                created_at=agent.created_at,
+                name=agent._mapping.get("name"),
+                base_prompt=agent._mapping.get("base_prompt"),
+                llm_model=agent._mapping.get("llm_model"),
+                attached_nodes=nodes.get(agent.id, []) if with_nodes else None,
+            )
+            for agent in agents
+        ]
+
+    async def _nodes_of(
+        self, agent_pks: list[int]
+    ) -> dict[int, list[NodeDTO]]:
+        rows = await self._session.execute(
+            select(
+                agent_nodes_association.c.agent_id,
+                NodeModel.node_id,
+                NodeModel.name,
+                NodeModel.description,
+                NodeModel.node_type,
+            )
+            .join(NodeModel, NodeModel.id == agent_nodes_association.c.node_id)
+            .where(agent_nodes_association.c.agent_id.in_(agent_pks))
+            .order_by(NodeModel.id)
+        )
+        # Agents sharing a node share its DTO.
+        dtos: dict[UUID, NodeDTO] = {}
+        nodes: dict[int, list[NodeDTO]] = defaultdict(list)
+        for row in rows:
+            dto = dtos.get(row.node_id)
+            if dto is None:
+                dto = NodeDTO(
+                    id=row.node_id,
+                    name=row.name,
+                    description=row.description,
+                    node_type=row.node_type,
+                    available_commands=self._command_names(row.node_type),
+                )
+                dtos[row.node_id] = dto
+            nodes[row.agent_id].append(dto)
+        return nodes
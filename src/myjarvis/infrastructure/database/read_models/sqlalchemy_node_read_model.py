@@ -0,0 +1,75 @@
+"""SQLAlchemy implementation of the NodeReadModel.
+
+Implementation details:
+- Only the columns of the requested DTO fields are selected, and the rows are
+  mapped to DTOs directly.
+- Pages are selected by keyset on `(name, node_id)`, see
+  `infrastructure.database.pagination`.
+- The commands of a node are not stored in the database; they are supplied
+  by the `command_names` callable, e.g. `NodeService.get_command_names`.
+"""
+
+from typing import Callable
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myjarvis.application.dto.node_dto import NodeDTO
+from myjarvis.application.read_models.node_read_model import NodeReadModel
+from myjarvis.infrastructure.database.models.node_model import NodeModel
+from myjarvis.infrastructure.database.pagination import node_keyset_after
+
+
+class SQLAlchemyNodeReadModel(NodeReadModel):
+    """
+    NodeReadModel backed by a SQLAlchemy `AsyncSession`.
+
+    Args:
+        session: The session used for all queries.
+        command_names: Callable returning the command names of a node type.
+    """
+
+    def __init__(
+        self,
+        session: AsyncSession,
+        command_names: Callable[[str], list[str]],
+    ):
+        self._session = session
+        self._command_names = command_names
+
+    async def list_nodes(
+        self,
+        limit: int | None = None,
+        after: tuple[str, UUID] | None = None,
+        fields: frozenset[str] | None = None,
+    ) -> list[NodeDTO]:
+        wanted = NodeDTO.model_fields.keys() if fields is None else fields
+        with_commands = "available_commands" in wanted
+        columns = [NodeModel.node_id, NodeModel.name]
+        if "description" in wanted:
+            columns.append(NodeModel.description)
+        if "node_type" in wanted or with_commands:
+            columns.append(NodeModel.node_type)
+        query = (
+            select(*columns)
+            .order_by(NodeModel.name, NodeModel.node_id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(node_keyset_after(*after))
+        rows = await self._session.execute(query)
+        return [
+            NodeDTO(
+                id=row.node_id,
+                name=row.name,
+                description=row._mapping.get("description"),
+                node_type=(row.node_type if "node_type" in wanted else None),
+                available_commands=(
+                    self._command_names(row.node_type)
+                    if with_commands
+                    else None
+                ),
+            )
+            for row in rows
+        ]
@@ -4,16 +4,107 @@ This module contains the `SQLAlchemyAgentRepository`, which is the concrete
 implementation of the `AgentRepository` interface from the domain layer.
 It handles the persistence of `AIAgent` entities using SQLAlchemy.
 
-Implementation Details:
-- The class `SQLAlchemyAgentRepository` should inherit from `AgentRepository`.
-- It depends on an `AsyncSession` for all database operations.
-- It must implement methods like:
-  - `add(agent: AIAgent)`: Persists a new `AIAgent` entity.
-  - `get_by_id(agent_id: AgentID)`: Fetches an agent by its ID. It should eagerly
-    load related nodes to avoid lazy loading issues.
-  - `list_by_user_id(user_id: UserID)`: Retrieves all agents for a given user.
-  - `update(agent: AIAgent)`: Updates an existing agent, including its attached nodes.
-- Mapping between the `AIAgent` domain entity and the `AgentModel` ORM model
-  is a key responsibility. This includes handling the many-to-many relationship
-  with nodes. Helper methods for mapping are recommended.
+Mapping between the `AIAgent` domain entity and the `AgentModel` ORM model,
+including the many-to-many relationship with nodes, is done by the private
+`_to_entity` and `_apply_entity` helpers.
 """
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import selectinload
+
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.repositories.agent_repository import AgentRepository
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.node_id import NodeId
+from myjarvis.domain.value_objects.user_id import UserId
+from myjarvis.infrastructure.database.models.agent_model import AgentModel
+from myjarvis.infrastructure.database.models.node_model import NodeModel
+from myjarvis.infrastructure.database.pagination import agent_keyset_after
+
+
+class SQLAlchemyAgentRepository(AgentRepository):
+    """
+    AgentRepository backed by a SQLAlchemy `AsyncSession`.
+
+    Args:
+        session: The session used for all database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def add(self, agent: AIAgent) -> None:
+        model = AgentModel(agent_id=agent.agent_id.value)
+        await self._apply_entity(model, agent)
+        self._session.add(model)
+        await self._session.flush()
+
+    async def get_by_id(self, agent_id: AgentId) -> AIAgent | None:
+        model = await self._get_model(agent_id)
+        return self._to_entity(model) if model else None
+
+    async def get_all_by_user_id(
+        self,
+        user_id: UserId,
+        limit: int | None = None,
+        after: AIAgent | None = None,
+    ) -> list[AIAgent]:
+        query = (
+            select(AgentModel)
+            .where(AgentModel.user_id == user_id.value)
+            .options(selectinload(AgentModel.nodes))
+            .order_by(AgentModel.created_at, AgentModel.agent_id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(
+                agent_keyset_after(after.created_at, after.agent_id.value)
+            )
+        result = await self._session.scalars(query)
+        return [self._to_entity(model) for model in result]
+
+    async def update(self, agent: AIAgent) -> None:
+        model = await self._get_model(agent.agent_id)
+        if model is None:
+            return
+        await self._apply_entity(model, agent)
+        await self._session.flush()
+
+    async def delete(self, agent_id: AgentId) -> None:
+        await self._session.execute(
+            delete(AgentModel).where(AgentModel.agent_id == agent_id.value)
+        )
+
+    async def _get_model(self, agent_id: AgentId) -> AgentModel | None:
+        return await self._session.scalar(
+            select(AgentModel)
+            .where(AgentModel.agent_id == agent_id.value)
+            .options(selectinload(AgentModel.nodes))
+        )
+
+    async def _apply_entity(self, model: AgentModel, agent: AIAgent) -> None:
+        model.user_id = agent.user_id.value
+        model.name = agent.name
+        model.base_prompt = agent.base_prompt
+        model.llm_model = agent.llm_model
+        model.cache_replies = agent.cache_replies
+        model.created_at = agent.created_at
+        node_ids = [node_id.value for node_id in agent.node_ids]
+        nodes = await self._session.scalars(
+            select(NodeModel).where(NodeModel.node_id.in_(node_ids))
+        )
+        model.nodes = list(nodes)
+
+    @staticmethod
+    def _to_entity(model: AgentModel) -> AIAgent:
+        return AIAgent(
+            agent_id=AgentId(value=model.agent_id),
+            user_id=UserId(value=model.user_id),
+            name=model.name,
+            base_prompt=model.base_prompt,
+            llm_model=model.llm_model,
+            created_at=model.created_at,
+            cache_replies=model.cache_replies,
+            node_ids=[NodeId(value=node.node_id) for node in model.nodes],
+        )
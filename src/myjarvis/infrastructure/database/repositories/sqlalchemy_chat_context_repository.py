@@ -0,0 +1,150 @@
+"""SQLAlchemy implementation of the ChatContextRepository.
+
+This module contains the `SQLAlchemyChatContextRepository`, the durable store
+of conversations. Messages are inserted one row per message with their
+sequence number, so appending a turn never rewrites earlier messages, and the
+newest messages of a conversation are read in a single ordered, limited query.
+
+Two turns of the same conversation may append at once, both numbering their
+messages from the sequence they loaded. The messages are inserted in a
+savepoint; if their sequence numbers are taken, the savepoint is rolled back,
+the messages stored in the meantime are read into the context, and the
+pending messages are inserted again after them.
+"""
+
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.repositories.chat_context_repository import (
+    ChatContextRepository,
+)
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.infrastructure.database.models.chat_context_model import (
+    ChatContextModel,
+    ChatMessageModel,
+)
+
+_MAX_APPEND_ATTEMPTS = 5
+
+
+class SQLAlchemyChatContextRepository(ChatContextRepository):
+    """
+    ChatContextRepository backed by a SQLAlchemy `AsyncSession`.
+
+    Args:
+        session: The session used for all database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def get_by_agent_id(
+        self, agent_id: AgentId, tail: int | None = None
+    ) -> ChatContext | None:
+        context_model = await self._session.scalar(
+            select(ChatContextModel)
+            .where(ChatContextModel.agent_id == agent_id.value)
+            .order_by(ChatContextModel.created_at.desc())
+            .limit(1)
+        )
+        if context_model is None:
+            return None
+        query = (
+            select(ChatMessageModel)
+            .where(ChatMessageModel.context_id == context_model.context_id)
+            .order_by(ChatMessageModel.sequence.desc())
+        )
+        if tail is not None:
+            query = query.limit(tail)
+        rows = list(await self._session.scalars(query))
+        rows.reverse()
+        context = ChatContext(
+            context_id=context_model.context_id,
+            agent_id=agent_id,
+            messages=[self._to_message(row) for row in rows],
+            first_sequence=rows[0].sequence if rows else 0,
+            summary=context_model.summary,
+            summarized_through=context_model.summarized_through,
+            created_at=context_model.created_at,
+        )
+        context.mark_persisted()
+        return context
+
+    async def append(self, context: ChatContext) -> None:
+        if context.is_new and not await self._session.get(
+            ChatContextModel, context.context_id
+        ):
+            self._session.add(
+                ChatContextModel(
+                    context_id=context.context_id,
+                    agent_id=context.agent_id.value,
+                    created_at=context.created_at,
+                    summary=context.summary,
+                    summarized_through=context.summarized_through,
+                )
+            )
+        elif context.summary_changed:
+            await self._session.execute(
+                update(ChatContextModel)
+                .where(ChatContextModel.context_id == context.context_id)
+                .values(
+                    summary=context.summary,
+                    summarized_through=context.summarized_through,
+                )
+            )
+        await self._session.flush()
+        for attempt in range(_MAX_APPEND_ATTEMPTS):
+            pending = context.pending_messages()
+            first_sequence = context.next_sequence - len(pending)
+            try:
+                async with self._session.begin_nested():
+                    self._session.add_all(
+                        ChatMessageModel(
+                            context_id=context.context_id,
+                            sequence=first_sequence + index,
+                            sender=message.sender.value,
+                            content=message.content,
+                            timestamp=message.timestamp,
+                        )
+                        for index, message in enumerate(pending)
+                    )
+                return
+            except IntegrityError:
+                if attempt == _MAX_APPEND_ATTEMPTS - 1:
+                    raise
+            # Another turn took these sequence numbers; catch up with it.
+            rows = await self._session.scalars(
+                select(ChatMessageModel)
+                .where(
+                    ChatMessageModel.context_id == context.context_id,
+                    ChatMessageModel.sequence >= first_sequence,
+                )
+                .order_by(ChatMessageModel.sequence)
+            )
+            context.insert_persisted([self._to_message(row) for row in rows])
+
+    async def delete(self, agent_id: AgentId) -> None:
+        context_ids = select(ChatContextModel.context_id).where(
+            ChatContextModel.agent_id == agent_id.value
+        )
+        await self._session.execute(
+            delete(ChatMessageModel).where(
+                ChatMessageModel.context_id.in_(context_ids)
+            )
+        )
+        await self._session.execute(
+            delete(ChatContextModel).where(
+                ChatContextModel.agent_id == agent_id.value
+            )
+        )
+
+    @staticmethod
+    def _to_message(row: ChatMessageModel) -> Message:
+        return Message(
+            content=row.content,
+            sender=Sender(row.sender),
+            timestamp=row.timestamp,
+        )
@@ -0,0 +1,94 @@
+"""SQLAlchemy implementation of the NodeRepository.
+
+This module contains the `SQLAlchemyNodeRepository`, which is the concrete
+implementation of the `NodeRepository` interface from the domain layer.
+It handles the persistence of `Node` entities using SQLAlchemy.
+"""
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myjarvis.domain.entities.node import Node
+from myjarvis.domain.repositories.node_repository import NodeRepository
+from myjarvis.domain.value_objects.node_id import NodeId
+from myjarvis.infrastructure.database.models.node_model import NodeModel
+from myjarvis.infrastructure.database.pagination import node_keyset_after
+
+
+class SQLAlchemyNodeRepository(NodeRepository):
+    """
+    NodeRepository backed by a SQLAlchemy `AsyncSession`.
+
+    Args:
+        session: The session used for all database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def add(self, node: Node) -> None:
+        model = NodeModel(node_id=node.node_id.value)
+        self._apply_entity(model, node)
+        self._session.add(model)
+        await self._session.flush()
+
+    async def get_by_id(self, node_id: NodeId) -> Node | None:
+        model = await self._get_model(node_id)
+        return self._to_entity(model) if model else None
+
+    async def get_by_ids(self, node_ids: list[NodeId]) -> list[Node]:
+        if not node_ids:
+            return []
+        result = await self._session.scalars(
+            select(NodeModel).where(
+                NodeModel.node_id.in_([node_id.value for node_id in node_ids])
+            )
+        )
+        return [self._to_entity(model) for model in result]
+
+    async def list_all(
+        self, limit: int | None = None, after: Node | None = None
+    ) -> list[Node]:
+        query = (
+            select(NodeModel)
+            .order_by(NodeModel.name, NodeModel.node_id)
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.where(
+                node_keyset_after(after.name, after.node_id.value)
+            )
+        result = await self._session.scalars(query)
+        return [self._to_entity(model) for model in result]
+
+    async def update(self, node: Node) -> None:
+        model = await self._get_model(node.node_id)
+        if model is None:
+            return
+        self._apply_entity(model, node)
+        await self._session.flush()
+
+    async def delete(self, node_id: NodeId) -> None:
+        await self._session.execute(
+            delete(NodeModel).where(NodeModel.node_id == node_id.value)
+        )
+
+    async def _get_model(self, node_id: NodeId) -> NodeModel | None:
+        return await self._session.scalar(
+            select(NodeModel).where(NodeModel.node_id == node_id.value)
+        )
+
+    @staticmethod
+    def _apply_entity(model: NodeModel, node: Node) -> None:
+        model.name = node.name
+        model.description = node.description
+        model.node_type = node.node_type
+
+    @staticmethod
+    def _to_entity(model: NodeModel) -> Node:
+        return Node(
+            node_id=NodeId(value=model.node_id),
+            name=model.name,
+            description=model.description,
+            node_type=model.node_type,
+        )
@@ -1,19 +1,92 @@
 """SQLAlchemy implementation of the UserRepository.
 
-This module provides a concrete implementation of the `UserRepository` interface
-defined in the domain layer. It uses SQLAlchemy for data persistence.
-
-Implementation Details:
-- The class `SQLAlchemyUserRepository` should inherit from `UserRepository`.
-- It will require an `AsyncSession` to be injected for database communication.
-- It must implement all the methods from the interface, such as:
-  - `add(user: User)`: Adds a new user to the database. This involves creating a
-    `UserModel` instance from the `User` entity and adding it to the session.
-  - `get_by_id(user_id: UserID)`: Retrieves a user by their unique ID. This involves
-    querying the `UserModel` table and converting the result back to a `User` entity.
-  - `get_by_email(email: str)`: Retrieves a user by their email address.
-  - `list()`: Retrieves all users.
-- A private method `_to_entity` could be used to map from `UserModel` to `User` entity,
-  and `_from_entity` to map from the entity to the model. This separates the mapping
-  logic from the data access logic.
+This module contains the `SQLAlchemyUserRepository`, which is the concrete
+implementation of the `UserRepository` interface from the domain layer.
+It handles the persistence of `User` entities using SQLAlchemy.
+
+Mapping between the `User` domain entity and the `UserModel` ORM model is done
+by the private `_to_entity` and `_apply_entity` helpers.
 """
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from myjarvis.domain.entities.user import User
+from myjarvis.domain.repositories.user_repository import UserRepository
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.user_id import UserId
+from myjarvis.infrastructure.database.models.user_model import UserModel
+
+
+class SQLAlchemyUserRepository(UserRepository):
+    """
+    UserRepository backed by a SQLAlchemy `AsyncSession`.
+
+    Args:
+        session: The session used for all database operations.
+    """
+
+    def __init__(self, session: AsyncSession):
+        self._session = session
+
+    async def add(self, user: User) -> None:
+        model = UserModel(user_id=user.user_id.value)
+        self._apply_entity(model, user)
+        self._session.add(model)
+        await self._session.flush()
+
+    async def get_by_id(self, user_id: UserId) -> User | None:
+        model = await self._get_model(user_id)
+        return self._to_entity(model) if model else None
+
+    async def get_by_email(self, email: str) -> User | None:
+        model = await self._session.scalar(
+            select(UserModel).where(UserModel.email == email)
+        )
+        return self._to_entity(model) if model else None
+
+    async def get_by_telegram_id(self, telegram_id: int) -> User | None:
+        model = await self._session.scalar(
+            select(UserModel).where(UserModel.telegram_id == telegram_id)
+        )
+        return self._to_entity(model) if model else None
+
+    async def update(self, user: User) -> None:
+        model = await self._get_model(user.user_id)
+        if model is None:
+            return
+        self._apply_entity(model, user)
+        await self._session.flush()
+
+    async def delete(self, user_id: UserId) -> None:
+        await self._session.execute(
+            delete(UserModel).where(UserModel.user_id == user_id.value)
+        )
+
+    async def _get_model(self, user_id: UserId) -> UserModel | None:
+        return await self._session.scalar(
+            select(UserModel).where(UserModel.user_id == user_id.value)
+        )
+
+    @staticmethod
+    def _apply_entity(model: UserModel, user: User) -> None:
+        model.email = user.email
+        model.created_at = user.created_at
+        model.telegram_id = user.telegram_id
+        model.active_agent_id = (
+            user.active_agent_id.value if user.active_agent_id else None
+        )
+
+    @staticmethod
+    def _to_entity(model: UserModel) -> User:
+        return User(
+            user_id=UserId(value=model.user_id),
+            email=model.email,
+            created_at=model.created_at,
+            telegram_id=model.telegram_id,
+            active_agent_id=(
+                AgentId(value=model.active_agent_id)
+                if model.active_agent_id
+                else None
+            ),
+        )
@@ -4,13 +4,179 @@ This module is responsible for setting up and managing the database connection a
 It provides a centralized way to get a database session for use in other parts of the application,
 particularly within repository implementations.
 
-Implementation Details:
-- It should use SQLAlchemy's `create_async_engine` for creating an asynchronous engine.
-- An `async_sessionmaker` should be configured to create new `AsyncSession` objects.
-- A dependency injectable function (e.g., `get_db_session`) should be created to provide
-  a session to the application's request handlers or command handlers. This function will
-  yield a session and ensure it is closed properly after the request is handled,
-  managing the transaction scope (commit on success, rollback on failure).
-- Database connection settings should be loaded from a configuration object (e.g., Pydantic's BaseSettings)
-  to avoid hardcoding credentials.
+Connection settings are loaded from `config.settings` to avoid hardcoding
+credentials.
+
+Implementation details:
+- The engines are created on first use, from the settings of that time,
+  and disposed by `dispose_engines` on shutdown.
+- The engines use an `InstrumentedQueuePool` sized by the `db_pool_*`
+  settings. Connections are pinged before use and recycled periodically, so
+  connections dropped by the server or a proxy are replaced transparently.
+- With asyncpg, prepared statements are cached per connection, so repeated
+  queries skip parsing and planning on the server.
+- Query handlers read through `get_read_db_session`. If a read replica is
+  configured (`database_read_url`), those sessions go to the replica;
+  otherwise they share the primary engine.
+- `get_pool_stats` exposes the checkout wait time and the connections in use
+  of both engines.
 """
+
+from dataclasses import dataclass
+from typing import Any, AsyncIterator
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
+    AsyncSession,
+    async_sessionmaker,
+    create_async_engine,
+)
+
+from config.settings import Settings, get_settings
+
+from .pool_metrics import InstrumentedQueuePool, PoolStats, pool_stats
+
+
+def create_engine(url: str, settings: Settings) -> AsyncEngine:
+    """
+    Create an engine with the application's pooling configuration.
+
+    In-memory SQLite databases keep SQLAlchemy's default pool, since every
+    connection to them would open a separate database.
+
+    Args:
+        url: The database URL.
+        settings: The settings supplying the pool configuration.
+
+    Returns:
+        The configured engine.
+    """
+    parsed = make_url(url)
+    options: dict[str, Any] = {}
+    if not (
+        parsed.get_backend_name() == "sqlite"
+        and parsed.database in (None, "", ":memory:")
+    ):
+        options.update(
+            poolclass=InstrumentedQueuePool,
+            pool_size=settings.db_pool_size,
+            max_overflow=settings.db_max_overflow,
+            pool_timeout=settings.db_pool_timeout_seconds,
+            pool_recycle=settings.db_pool_recycle_seconds,
+            pool_pre_ping=settings.db_pool_pre_ping,
+        )
+    if parsed.get_driver_name() == "asyncpg":
+        # SQLAlchemy's cache of prepared statements, and asyncpg's own.
+        parsed = parsed.update_query_dict(
+            {
+                "prepared_statement_cache_size": str(
+                    settings.db_statement_cache_size
+                )
+            }
+        )
+        options["connect_args"] = {
+            "statement_cache_size": settings.db_statement_cache_size
+        }
+    return create_async_engine(parsed, **options)
+
+
+@dataclass(frozen=True, slots=True)
+class _Engines:
+    engine: AsyncEngine
+    read_engine: AsyncEngine
+    session_factory: async_sessionmaker[AsyncSession]
+    read_session_factory: async_sessionmaker[AsyncSession]
+
+
+_engines: _Engines | None = None
+
+
+def _get_engines() -> _Engines:
+    """
+    Return the engines of the process, creating them on first use.
+
+    They are created lazily rather than on import, so importing the module
+    neither reads the settings nor needs the database driver.
+    """
+    global _engines
+    if _engines is None:
+        settings = get_settings()
+        engine = create_engine(settings.database_url, settings)
+        read_engine = (
+            create_engine(settings.database_read_url, settings)
+            if settings.database_read_url
+            else engine
+        )
+        _engines = _Engines(
+            engine=engine,
+            read_engine=read_engine,
+            session_factory=async_sessionmaker(engine, expire_on_commit=False),
+            read_session_factory=async_sessionmaker(
+                read_engine, expire_on_commit=False
+            ),
+        )
+    return _engines
+
+
+async def get_db_session() -> AsyncIterator[AsyncSession]:
+    """
+    Provide a session scoped to a single unit of work.
+
+    The transaction is committed when the caller finishes without an error
+    and rolled back otherwise.
+
+    Yields:
+        AsyncSession: An open database session.
+    """
+    async with _get_engines().session_factory() as session:
+        try:
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+
+
+async def get_read_db_session() -> AsyncIterator[AsyncSession]:
+    """
+    Provide a session for read-only queries.
+
+    The session uses the read replica if one is configured. Nothing is
+    committed; the transaction is rolled back when the session closes.
+
+    Yields:
+        AsyncSession: An open database session.
+    """
+    async with _get_engines().read_session_factory() as session:
+        yield session
+
+
+def get_pool_stats() -> dict[str, PoolStats | None]:
+    """
+    Return the statistics of the connection pools.
+
+    Returns:
+        The statistics of the primary pool under 'primary' and, if a read
+        replica is configured, of the replica pool under 'replica'.
+    """
+    engines = _get_engines()
+    stats = {"primary": pool_stats(engines.engine)}
+    if engines.read_engine is not engines.engine:
+        stats["replica"] = pool_stats(engines.read_engine)
+    return stats
+
+
+async def dispose_engines() -> None:
+    """
+    Close all pooled connections.
+
+    The engines are created again if a session is requested afterwards.
+    """
+    global _engines
+    engines, _engines = _engines, None
+    if engines is None:
+        return
+    await engines.engine.dispose()
+    if engines.read_engine is not engines.engine:
+        await engines.read_engine.dispose()
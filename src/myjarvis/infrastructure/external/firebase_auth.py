@@ -3,56 +3,240 @@ This module handles user authentication using Firebase Authentication.
 
 It provides functionalities to verify Firebase ID tokens passed from client
 applications. This allows the backend to securely identify users and protect
-endpoints. The implementation will use the `firebase-admin` SDK.
+endpoints. `FirebaseAuthService.verify_token` takes an ID token as input and
+returns the decoded user claims, including the user's unique Firebase UID.
 
-The main function will take an ID token as input and return the decoded user
-claims, including the user's unique Firebase UID.
+Firebase ID tokens are JWTs signed with RS256 by keys whose X.509 certificates
+Google publishes at a well-known URL. Rather than calling the blocking
+`firebase_admin.auth.verify_id_token`, which may fetch the certificates on the
+request path, the service verifies tokens locally:
 
-Example Implementation:
+Implementation details:
+- The certificates are fetched once at startup and then refreshed by a
+  background task before the `max-age` of their `Cache-Control` header runs
+  out. Verification itself never waits on the network, except before the
+  first fetch has succeeded, or once for a token signed by a key id that is
+  not known yet (Google rotates keys).
+- If a refresh fails, the previous certificates are kept and the refresh is
+  retried; Google publishes new keys well before it signs with them.
+- The signature, audience (project id), issuer and times of a token are
+  checked as the Admin SDK does. Revocation is not checked.
+- Decoded claims are kept in a bounded cache keyed by the SHA-256 hash of the
+  token, until the token's `exp`. A client sending the same token with every
+  request is verified once.
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import time
+from typing import Any
+
+import httpx
+from google.auth import jwt
+from google.auth.exceptions import GoogleAuthError
+
+from myjarvis.infrastructure.cache.local_cache import CacheStats, LruTtlCache
+
+logger = logging.getLogger(__name__)
+
+GOOGLE_CERTS_URL = (
+    "https://www.googleapis.com/robot/v1/metadata/x509/"
+    "securetoken@system.gserviceaccount.com"
+)
+_ISSUER_PREFIX = "https://securetoken.google.com/"
+_MAX_AGE = re.compile(r"max-age=(\d+)")
+# Used when the certificate response carries no max-age.
+_DEFAULT_CERTS_TTL_SECONDS = 3600.0
+
+
+class InvalidTokenError(ValueError):
+    """
+    Raised when an ID token is malformed, expired or not signed by Firebase.
+    """
 
-import firebase_admin
-from firebase_admin import auth, credentials
-from myjarvis.domain.entities.user import User
-from myjarvis.domain.value_objects.user_id import UserID
 
 class FirebaseAuthService:
-    def __init__(self, credentials_path: str):
-        if not firebase_admin._apps:
-            cred = credentials.Certificate(credentials_path)
-            firebase_admin.initialize_app(cred)
+    """
+    Verifies Firebase ID tokens offline against Google's cached certificates.
+
+    Call `start` before verifying tokens and `stop` on shutdown.
+
+    Args:
+        project_id: The Firebase project the tokens must be issued for.
+        http_client: Client used to fetch the certificates. A client owned by
+            the service is created if omitted.
+        certs_url: URL of the signing certificates.
+        max_cached_tokens: Maximum number of decoded tokens kept.
+        clock_skew_seconds: Tolerance applied to the token's `iat` and `exp`.
+        refresh_margin_seconds: How long before their expiry the
+            certificates are refreshed.
+        retry_seconds: Delay before retrying a failed refresh, and minimum
+            interval between refreshes triggered by unknown key ids.
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        http_client: httpx.AsyncClient | None = None,
+        certs_url: str = GOOGLE_CERTS_URL,
+        max_cached_tokens: int = 10000,
+        clock_skew_seconds: int = 5,
+        refresh_margin_seconds: float = 300.0,
+        retry_seconds: float = 30.0,
+    ):
+        self._project_id = project_id
+        self._issuer = _ISSUER_PREFIX + project_id
+        self._owns_client = http_client is None
+        self._client = http_client or httpx.AsyncClient(timeout=10.0)
+        self._certs_url = certs_url
+        self._clock_skew = clock_skew_seconds
+        self._refresh_margin = refresh_margin_seconds
+        self._retry_seconds = retry_seconds
+        self._certs: dict[str, str] = {}
+        self._certs_expire_at = 0.0
+        self._fetched_at = float("-inf")
+        self._fetch_lock = asyncio.Lock()
+        self._refresher: asyncio.Task[None] | None = None
+        # Entries are counted, not measured: every entry has size 1.
+        self._claims: LruTtlCache[bytes, dict[str, Any]] = LruTtlCache(
+            max_entries=max_cached_tokens,
+            max_bytes=max_cached_tokens,
+            ttl_seconds=0.0,
+        )
+
+    @property
+    def stats(self) -> CacheStats:
+        """
+        Hit and miss counters of the decoded-token cache.
+        """
+        return self._claims.stats
+
+    async def start(self) -> None:
+        """
+        Fetch the certificates and start refreshing them in the background.
+
+        A failed first fetch is logged; it is retried in the background and
+        on the next verification.
+        """
+        if self._refresher is not None:
+            return
+        try:
+            await self._refresh_certs()
+        except (httpx.HTTPError, ValueError):
+            logger.warning("Failed to fetch Firebase certs", exc_info=True)
+        self._refresher = asyncio.create_task(self._refresh_periodically())
+
+    async def stop(self) -> None:
+        """
+        Stop the background refresh and close the owned HTTP client.
+        """
+        if self._refresher is not None:
+            self._refresher.cancel()
+            try:
+                await self._refresher
+            except asyncio.CancelledError:
+                pass
+            self._refresher = None
+        if self._owns_client:
+            await self._client.aclose()
 
-    def verify_token(self, token: str) -> dict:
-        Verifies a Firebase ID token and returns the decoded claims.
+    async def verify_token(self, token: str) -> dict[str, Any]:
+        """
+        Verify a Firebase ID token and return its decoded claims.
 
         Args:
-            token (str): The Firebase ID token to verify.
+            token: The Firebase ID token to verify.
 
         Returns:
-            dict: A dictionary containing the user's claims.
+            The claims of the token. The user's Firebase UID is under 'uid'.
 
         Raises:
-            ValueError: If the token is invalid.
+            InvalidTokenError: If the token is invalid or expired.
+        """
+        key = hashlib.sha256(token.encode()).digest()
+        claims = self._claims.get(key)
+        if claims is not None:
+            return dict(claims)
+        certs = await self._certs_for(token)
         try:
-            decoded_token = auth.verify_id_token(token)
-            return decoded_token
-        except Exception as e:
-            raise ValueError(f"Invalid or expired token: {e}")
+            claims = jwt.decode(
+                token,
+                certs=certs,
+                audience=self._project_id,
+                clock_skew_in_seconds=self._clock_skew,
+            )
+        except (GoogleAuthError, ValueError) as exc:
+            raise InvalidTokenError(
+                f"Invalid or expired token: {exc}"
+            ) from None
+        if claims.get("iss") != self._issuer:
+            raise InvalidTokenError("Invalid token issuer.")
+        subject = claims.get("sub")
+        if not isinstance(subject, str) or not 0 < len(subject) <= 128:
+            raise InvalidTokenError("Invalid token subject.")
+        claims["uid"] = subject
+        ttl = claims["exp"] - time.time()
+        if ttl > 0:
+            self._claims.set(key, claims, size=1, ttl_seconds=ttl)
+        return dict(claims)
 
-    def get_user_from_token(self, token: str) -> User:
-        Verifies a token and constructs a User domain entity.
+    async def _certs_for(self, token: str) -> dict[str, str]:
+        try:
+            header = jwt.decode_header(token)
+        except (GoogleAuthError, ValueError) as exc:
+            raise InvalidTokenError(f"Malformed token: {exc}") from None
+        if header.get("alg") != "RS256":
+            raise InvalidTokenError("Token is not signed with RS256.")
+        key_id = header.get("kid")
+        if key_id not in self._certs and (
+            time.monotonic() - self._fetched_at >= self._retry_seconds
+        ):
+            # Cold start, or a key that was published after the last fetch.
+            try:
+                await self._refresh_certs()
+            except (httpx.HTTPError, ValueError) as exc:
+                if not self._certs:
+                    raise InvalidTokenError(
+                        f"Signing certs unavailable: {exc}"
+                    ) from None
+        if key_id not in self._certs:
+            raise InvalidTokenError(f"Unknown signing key {key_id!r}.")
+        return self._certs
 
-        This is a higher-level method that combines token verification
-        with domain object creation.
+    async def _refresh_certs(self) -> None:
+        fetched_at = self._fetched_at
+        async with self._fetch_lock:
+            if self._fetched_at != fetched_at:
+                # Refreshed by a concurrent caller meanwhile.
+                return
+            self._fetched_at = time.monotonic()
+            response = await self._client.get(self._certs_url)
+            response.raise_for_status()
+            self._certs = response.json()
+            self._certs_expire_at = self._fetched_at + self._max_age(response)
 
-        Args:
-            token (str): The Firebase ID token.
+    async def _refresh_periodically(self) -> None:
+        while True:
+            if self._certs:
+                delay = self._certs_expire_at - self._refresh_margin
+                delay = max(delay - time.monotonic(), self._retry_seconds)
+            else:
+                delay = self._retry_seconds
+            await asyncio.sleep(delay)
+            try:
+                await self._refresh_certs()
+            except (httpx.HTTPError, ValueError):
+                logger.warning(
+                    "Failed to refresh Firebase certs", exc_info=True
+                )
 
-        Returns:
-            User: A User entity populated with data from the token.
-        claims = self.verify_token(token)
-        return User(
-            user_id=UserID(claims["uid"]),
-            email=claims.get("email"),
-            telegram_id=claims.get("telegram_id") # Assuming custom claim
-        )
-"""
+    @staticmethod
+    def _max_age(response: httpx.Response) -> float:
+        match = _MAX_AGE.search(response.headers.get("cache-control", ""))
+        if match is None:
+            return _DEFAULT_CERTS_TTL_SECONDS
+        age = response.headers.get("age", "")
+        elapsed = float(age) if age.isdigit() else 0.0
+        return max(float(match.group(1)) - elapsed, 0.0)
@@ -0,0 +1,320 @@
+"""
+This module provides the incremental extraction of the text of HTML pages.
+
+`HtmlTextExtractor` is fed the decoded HTML piece by piece, as it is
+downloaded, and keeps only the readable text of the page, never the
+document tree: its memory is bounded by the token budget of the text, not
+by the size of the page. Once the budget is reached it reports `done`, so
+the caller can stop downloading.
+
+Implementation details:
+- The parser is the standard library's `HTMLParser`, which tolerates
+  malformed markup and calls back for every start tag, end tag and piece of
+  text (SAX-style).
+- Main content: the text of `<main>` and `<article>` elements, or of
+  elements with `role="main"`, is collected apart from the rest of the
+  body. If the page has such an element, only its text is returned.
+  Otherwise the whole body is, without the boilerplate elements skipped
+  below. As the text of the body is collected until the budget is reached,
+  a main element starting after a budget's worth of other text is missed.
+- Skipped: scripts, styles and other non-text elements, navigation,
+  headers, footers, asides and forms, elements with a navigation-like
+  `role`, and elements hidden with `hidden` or `aria-hidden`.
+- Whitespace is collapsed, except in `<pre>`; block elements start a new
+  line.
+- `sniff_charset` picks the encoding of a page the way browsers do: byte
+  order mark, then the `Content-Type` charset, then a `<meta>` declaration
+  in the first kilobyte, then UTF-8 if the first bytes are valid UTF-8,
+  else windows-1252.
+"""
+
+import codecs
+import re
+from html.parser import HTMLParser
+
+from myjarvis.infrastructure.llm.token_counter import ApproximateTokenCounter
+
+# Elements whose content is never text to read.
+_IGNORED = frozenset(
+    {
+        "script",
+        "style",
+        "noscript",
+        "template",
+        "svg",
+        "math",
+        "canvas",
+        "iframe",
+        "object",
+        "select",
+        "textarea",
+        "button",
+    }
+)
+# Page furniture around the main content.
+_BOILERPLATE = frozenset(
+    {"nav", "header", "footer", "aside", "form", "dialog"}
+)
+_BOILERPLATE_ROLES = frozenset(
+    {"navigation", "banner", "contentinfo", "complementary", "search"}
+)
+_MAIN = frozenset({"main", "article"})
+_BLOCKS = frozenset(
+    {
+        "address",
+        "article",
+        "blockquote",
+        "br",
+        "dd",
+        "details",
+        "div",
+        "dl",
+        "dt",
+        "figcaption",
+        "figure",
+        "h1",
+        "h2",
+        "h3",
+        "h4",
+        "h5",
+        "h6",
+        "hr",
+        "li",
+        "main",
+        "ol",
+        "p",
+        "pre",
+        "section",
+        "summary",
+        "table",
+        "td",
+        "th",
+        "tr",
+        "ul",
+    }
+)
+# Elements without an end tag, which must not be counted as open.
+_VOID = frozenset(
+    {
+        "area",
+        "base",
+        "br",
+        "col",
+        "embed",
+        "hr",
+        "img",
+        "input",
+        "link",
+        "meta",
+        "param",
+        "source",
+        "track",
+        "wbr",
+    }
+)
+
+_WHITESPACE = re.compile(r"\s+")
+_META_CHARSET = re.compile(
+    rb"""<meta[^>]+charset\s*=\s*["']?\s*([a-zA-Z0-9_.:-]+)""", re.IGNORECASE
+)
+_HEADER_CHARSET = re.compile(r"""charset\s*=\s*["']?([^\s;"']+)""", re.I)
+_BOMS = (
+    (codecs.BOM_UTF8, "utf-8"),
+    (codecs.BOM_UTF16_LE, "utf-16"),
+    (codecs.BOM_UTF16_BE, "utf-16"),
+)
+# Labels browsers decode as windows-1252, a superset.
+_WINDOWS_1252_LABELS = frozenset(
+    {"ascii", "us-ascii", "iso-8859-1", "latin-1", "latin1", "l1"}
+)
+# Bytes of a page searched for a `<meta>` charset declaration.
+PRESCAN_BYTES = 1024
+
+
+def sniff_charset(head: bytes, content_type: str | None = None) -> str:
+    """
+    Return the encoding of a page.
+
+    Args:
+        head: The first bytes of the page, at least `PRESCAN_BYTES` of them
+            unless the page is shorter.
+        content_type: The `Content-Type` header of the response, if any.
+
+    Returns:
+        The name of a Python codec.
+    """
+    for bom, encoding in _BOMS:
+        if head.startswith(bom):
+            return encoding
+    declared = None
+    if content_type:
+        match = _HEADER_CHARSET.search(content_type)
+        declared = match and match.group(1)
+    if not declared:
+        match = _META_CHARSET.search(head[:PRESCAN_BYTES])
+        declared = match and match.group(1).decode("ascii")
+    if declared:
+        label = declared.strip().lower()
+        if label in _WINDOWS_1252_LABELS:
+            return "cp1252"
+        try:
+            return codecs.lookup(label).name
+        except LookupError:
+            pass
+    try:
+        codecs.getincrementaldecoder("utf-8")().decode(head)
+    except UnicodeDecodeError:
+        return "cp1252"
+    return "utf-8"
+
+
+class HtmlTextExtractor(HTMLParser):
+    """
+    Incremental extractor of the readable text of an HTML page.
+
+    Args:
+        max_tokens: Budget of the extracted text, in approximate tokens.
+    """
+
+    def __init__(self, max_tokens: int):
+        super().__init__(convert_charrefs=True)
+        self.max_tokens = max_tokens
+        self.title = ""
+        self.truncated = False
+        self._counter = ApproximateTokenCounter()
+        # Lines of the body and of the main elements, with their tokens.
+        self._body: list[str] = []
+        self._main: list[str] = []
+        self._body_tokens = 0
+        self._main_tokens = 0
+        self._line: list[str] = []
+        self._seen_main = False
+        # Depths of the open elements of each kind; 0 when outside.
+        self._ignored = 0
+        self._boilerplate = 0
+        self._main_depth = 0
+        self._pre = 0
+        self._in_title = False
+        # Tags opened by a skipped or main element, closed by their end tag.
+        self._closers: list[tuple[str, str]] = []
+
+    @property
+    def done(self) -> bool:
+        """
+        Whether the text to return has reached the budget.
+        """
+        if self._main_tokens >= self.max_tokens:
+            return True
+        return not self._seen_main and self._body_tokens >= self.max_tokens
+
+    @property
+    def text(self) -> str:
+        """
+        The text extracted so far.
+        """
+        self._end_line()
+        lines = self._main if self._seen_main else self._body
+        return "\n".join(lines)
+
+    def feed(self, data: str) -> None:
+        if not self.done:
+            super().feed(data)
+
+    def handle_starttag(
+        self, tag: str, attrs: list[tuple[str, str | None]]
+    ) -> None:
+        if tag == "title" and not self.title:
+            self._in_title = True
+            return
+        if tag in _VOID:
+            if tag in _BLOCKS:
+                self._end_line()
+            return
+        attributes = dict(attrs)
+        role = (attributes.get("role") or "").lower()
+        kind = None
+        if (
+            tag in _IGNORED
+            or "hidden" in attributes
+            or attributes.get("aria-hidden") == "true"
+        ):
+            kind = "ignored"
+            self._ignored += 1
+        elif tag in _BOILERPLATE or role in _BOILERPLATE_ROLES:
+            kind = "boilerplate"
+            self._boilerplate += 1
+        elif tag in _MAIN or role == "main":
+            kind = "main"
+            self._end_line()
+            self._main_depth += 1
+            self._seen_main = True
+        elif tag == "pre":
+            kind = "pre"
+            self._pre += 1
+        if kind is not None:
+            self._closers.append((tag, kind))
+        if tag in _BLOCKS:
+            self._end_line()
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+            return
+        if tag in _BLOCKS:
+            self._end_line()
+        # Close the innermost element of this tag opened with a kind,
+        # along with those left unclosed inside it.
+        for index in range(len(self._closers) - 1, -1, -1):
+            if self._closers[index][0] == tag:
+                for _, kind in self._closers[index:]:
+                    self._leave(kind)
+                del self._closers[index:]
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += _WHITESPACE.sub(" ", data)
+            return
+        if self._ignored or self._boilerplate:
+            return
+        if not self._pre:
+            data = _WHITESPACE.sub(" ", data)
+        self._line.append(data)
+
+    def close(self) -> None:
+        super().close()
+        self._end_line()
+        self.title = self.title.strip()
+
+    def _leave(self, kind: str) -> None:
+        if kind == "ignored":
+            self._ignored -= 1
+        elif kind == "boilerplate":
+            self._boilerplate -= 1
+        elif kind == "main":
+            self._end_line()
+            self._main_depth -= 1
+        elif kind == "pre":
+            self._pre -= 1
+
+    def _end_line(self) -> None:
+        line = "".join(self._line).strip()
+        self._line = []
+        if not line:
+            return
+        if self._main_depth:
+            self._main_tokens = self._add(self._main, self._main_tokens, line)
+        elif not self._seen_main:
+            self._body_tokens = self._add(self._body, self._body_tokens, line)
+
+    def _add(self, lines: list[str], tokens: int, line: str) -> int:
+        if tokens >= self.max_tokens:
+            self.truncated = True
+            return tokens
+        count = self._counter.count(line)
+        if tokens + count > self.max_tokens:
+            # Keep the beginning of the line that fits in the budget.
+            line = line[: int((self.max_tokens - tokens) * 4)]
+            self.truncated = True
+        lines.append(line)
+        return tokens + count
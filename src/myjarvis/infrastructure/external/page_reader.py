@@ -0,0 +1,322 @@
+"""
+This module provides the reading of the text of web pages.
+
+`PageReader` downloads a page and returns its readable text, within a token
+budget, for the `get_page_content` command of the search node. The page is
+streamed and its text extracted as it arrives (see `HtmlTextExtractor`), so
+a multi-megabyte page costs no more memory than the text kept from it, and
+the download stops as soon as the budget is reached.
+
+Implementation details:
+- At most `max_bytes` bytes of the (decompressed) body are read; httpx
+  decodes gzip and deflate bodies as they are streamed. The text of a page
+  cut short by the budget or by `max_bytes` is marked truncated.
+- The encoding is sniffed from the first kilobyte of the body and the
+  `Content-Type` header (see `sniff_charset`), then the body is decoded
+  incrementally, replacing invalid bytes.
+- HTML and plain-text pages are read; other content types are rejected
+  before their body is downloaded.
+- The texts of pages served with an `ETag` or `Last-Modified` header are
+  kept in an in-process LRU cache, by URL and budget. Until the entry
+  expires, a page is revalidated with a conditional request, and a
+  `304 Not Modified` answer reuses the cached text without a body.
+- The URLs come from the LLM and the search results, so the reader must
+  not be turned against the internal network (SSRF): the host of the URL,
+  and of every redirect, which are followed one by one, must resolve to
+  global addresses only. Loopback, private, link-local, reserved and other
+  non-global addresses are rejected with `UnsafeUrlError`.
+"""
+
+import asyncio
+import codecs
+import ipaddress
+import socket
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+import httpx
+
+from myjarvis.infrastructure.cache.local_cache import LruTtlCache
+
+from .html_text import PRESCAN_BYTES, HtmlTextExtractor, sniff_charset
+
+_USER_AGENT = "MyJarvis/1.0 (+page reader)"
+_HTML_TYPES = frozenset({"text/html", "application/xhtml+xml"})
+_TEXT_TYPES = frozenset({"text/plain"})
+_MAX_REDIRECTS = 10
+
+# Resolves a host name and port to the IP addresses it would connect to.
+Resolver = Callable[[str, int], Awaitable[list[str]]]
+
+
+class UnsafeUrlError(ValueError):
+    """
+    Raised when a URL, or a redirect, leads to a host the reader must not
+    reach, e.g. on the internal network.
+    """
+
+
+async def resolve_host(host: str, port: int) -> list[str]:
+    """
+    Return the IP addresses of a host, as resolved by the system.
+    """
+    infos = await asyncio.get_running_loop().getaddrinfo(
+        host, port, type=socket.SOCK_STREAM
+    )
+    return [info[4][0] for info in infos]
+
+
+@dataclass(frozen=True, slots=True)
+class PageContent:
+    """
+    The text of a web page.
+
+    Attributes:
+        url: The URL of the page, after redirects.
+        title: The title of the page; empty if it has none.
+        text: The readable text of the page.
+        truncated: Whether the text was cut to the token budget or the page
+            to the byte limit.
+        charset: The encoding the page was decoded with.
+        bytes_read: Bytes of the body read to extract the text.
+    """
+
+    url: str
+    title: str
+    text: str
+    truncated: bool
+    charset: str
+    bytes_read: int
+
+
+@dataclass(frozen=True, slots=True)
+class _CachedPage:
+    page: PageContent
+    etag: str | None
+    last_modified: str | None
+
+
+class _PlainText:
+    """
+    Collects the text of a plain-text page within a token budget, with the
+    interface of `HtmlTextExtractor`.
+    """
+
+    def __init__(self, max_tokens: int):
+        self._max_chars = max_tokens * 4
+        self._parts: list[str] = []
+        self._chars = 0
+        self.title = ""
+        self.truncated = False
+
+    @property
+    def done(self) -> bool:
+        return self._chars >= self._max_chars
+
+    @property
+    def text(self) -> str:
+        return "".join(self._parts).strip()
+
+    def feed(self, data: str) -> None:
+        kept = data[: self._max_chars - self._chars]
+        if len(kept) < len(data):
+            self.truncated = True
+        self._parts.append(kept)
+        self._chars += len(kept)
+
+    def close(self) -> None:
+        pass
+
+
+class PageReader:
+    """
+    Reads the text of web pages, streamed and bounded in size.
+
+    Args:
+        client: The HTTP client; by default one of the reader's own, closed
+            by `close`.
+        max_bytes: Maximum number of bytes of a body read.
+        timeout_seconds: Timeout of the connection and of every read.
+        cache_max_entries: Maximum number of pages kept in the cache.
+        cache_max_bytes: Maximum total size of the texts kept in the cache.
+        cache_ttl_seconds: How long a cached page is revalidated rather than
+            downloaded again.
+        resolver: Resolver of the host names, checked before every request;
+            defaults to the system's.
+    """
+
+    def __init__(
+        self,
+        client: httpx.AsyncClient | None = None,
+        max_bytes: int = 2 * 1024 * 1024,
+        timeout_seconds: float = 15.0,
+        cache_max_entries: int = 1024,
+        cache_max_bytes: int = 32 * 1024 * 1024,
+        cache_ttl_seconds: float = 86400.0,
+        resolver: Resolver = resolve_host,
+    ):
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(
+            timeout=timeout_seconds,
+            headers={"User-Agent": _USER_AGENT},
+        )
+        self._max_bytes = max_bytes
+        self._resolver = resolver
+        self._cache: LruTtlCache[tuple[str, int], _CachedPage] = LruTtlCache(
+            max_entries=cache_max_entries,
+            max_bytes=cache_max_bytes,
+            ttl_seconds=cache_ttl_seconds,
+        )
+
+    async def read(self, url: str, max_tokens: int) -> PageContent:
+        """
+        Return the text of a page.
+
+        Args:
+            url: The URL of the page.
+            max_tokens: Budget of the text, in approximate tokens.
+
+        Raises:
+            UnsafeUrlError: If the URL or a redirect leads to a host on a
+                non-global network.
+            ValueError: If the page is neither HTML nor plain text.
+            httpx.HTTPError: If the page could not be downloaded.
+        """
+        key = (url, max_tokens)
+        cached = self._cache.get(key)
+        headers = {"Accept": "text/html,application/xhtml+xml,text/plain"}
+        if cached is not None:
+            if cached.etag:
+                headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                headers["If-Modified-Since"] = cached.last_modified
+        response = await self._send(
+            self._client.build_request("GET", url, headers=headers)
+        )
+        try:
+            if cached is not None and response.status_code == 304:
+                return cached.page
+            response.raise_for_status()
+            page = await self._extract(response, max_tokens)
+        finally:
+            await response.aclose()
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if etag or last_modified:
+            self._cache.set(
+                key,
+                _CachedPage(page, etag, last_modified),
+                size=len(page.text) + len(page.title) + len(url),
+            )
+        else:
+            self._cache.delete(key)
+        return page
+
+    async def close(self) -> None:
+        """
+        Close the HTTP client, if the reader created it.
+        """
+        if self._owns_client:
+            await self._client.aclose()
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        # Redirects are followed here rather than by httpx, so that the
+        # host of every hop is checked before it is connected to.
+        for _ in range(_MAX_REDIRECTS + 1):
+            await self._check_host(request)
+            response = await self._client.send(
+                request, stream=True, follow_redirects=False
+            )
+            if response.next_request is None:
+                return response
+            await response.aclose()
+            request = response.next_request
+        raise httpx.TooManyRedirects(
+            f"Exceeded {_MAX_REDIRECTS} redirects.", request=request
+        )
+
+    async def _check_host(self, request: httpx.Request) -> None:
+        url = request.url
+        if url.scheme not in ("http", "https"):
+            raise UnsafeUrlError(f"Unsupported URL scheme {url.scheme!r}.")
+        port = url.port or (443 if url.scheme == "https" else 80)
+        if _is_ip(url.host):
+            addresses = [url.host]
+        else:
+            try:
+                addresses = await self._resolver(url.host, port)
+            except OSError as exc:
+                raise httpx.ConnectError(
+                    f"Failed to resolve {url.host!r}: {exc}", request=request
+                ) from exc
+        if not addresses or not all(map(_is_global, addresses)):
+            raise UnsafeUrlError(
+                f"The host {url.host!r} is not on a public network."
+            )
+
+    async def _extract(
+        self, response: httpx.Response, max_tokens: int
+    ) -> PageContent:
+        content_type = response.headers.get("Content-Type", "text/html")
+        media_type = content_type.split(";")[0].strip().lower()
+        if media_type in _HTML_TYPES:
+            extractor = HtmlTextExtractor(max_tokens)
+        elif media_type in _TEXT_TYPES:
+            extractor = _PlainText(max_tokens)
+        else:
+            raise ValueError(f"Unsupported content type {media_type!r}.")
+        head = b""
+        decoder = None
+        charset = ""
+        bytes_read = 0
+        cut = stopped = False
+        async for data in response.aiter_bytes():
+            if bytes_read + len(data) > self._max_bytes:
+                data = data[: self._max_bytes - bytes_read]
+                cut = True
+            bytes_read += len(data)
+            if decoder is None:
+                # The encoding is sniffed once the first kilobyte arrived.
+                head += data
+                if len(head) < PRESCAN_BYTES and not cut:
+                    continue
+                data, head = head, b""
+                charset = sniff_charset(data, content_type)
+                decoder = codecs.getincrementaldecoder(charset)("replace")
+            extractor.feed(decoder.decode(data))
+            if extractor.done:
+                # The rest of the page is not downloaded.
+                stopped = True
+                break
+            if cut:
+                break
+        if decoder is None:
+            charset = sniff_charset(head, content_type)
+            decoder = codecs.getincrementaldecoder(charset)("replace")
+            extractor.feed(decoder.decode(head))
+        extractor.feed(decoder.decode(b"", final=True))
+        extractor.close()
+        return PageContent(
+            url=str(response.url),
+            title=extractor.title,
+            text=extractor.text,
+            truncated=extractor.truncated or cut or stopped,
+            charset=charset,
+            bytes_read=bytes_read,
+        )
+
+
+def _is_ip(host: str) -> bool:
+    try:
+        ipaddress.ip_address(host)
+    except ValueError:
+        return False
+    return True
+
+
+def _is_global(address: str) -> bool:
+    # IPv6 addresses may carry a zone (`fe80::1%eth0`).
+    ip = ipaddress.ip_address(address.split("%")[0])
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return ip.is_global and not ip.is_multicast
@@ -1,67 +1,250 @@
 """
 This module contains the logic for the Telegram bot interface.
 
-It connects to the Telegram Bot API to handle user interactions. The bot will
-be responsible for receiving messages from users, forwarding them to the
-appropriate AI agent through the application layer, and sending the agent's
-responses back to the user.
+It connects to the Telegram Bot API to handle user interactions. The bot
+receives messages from users, hands them to a message handler supplied by the
+caller (which forwards them to the appropriate AI agent through the
+application layer), and sends the agent's responses back to the user.
 
-This implementation will use the `python-telegram-bot` library and will be
-structured to run asynchronously.
+The bot runs in webhook mode: Telegram POSTs every update to an endpoint of the
+FastAPI app, which passes it to `TelegramBot.submit`. The Bot API is called
+directly over HTTPS with `httpx`.
 
-Example Implementation:
+Implementation details:
+- Updates are not processed on the webhook request. They are queued and
+  processed by a fixed number of worker tasks, so one slow agent turn does
+  not hold up the other chats, and the webhook answers Telegram at once.
+- Messages of one chat are processed one at a time, in the order received;
+  different chats are processed in parallel. A chat with queued messages
+  waits in a ready queue; a worker takes it, processes its oldest message and
+  puts it back at the end of the ready queue if more are waiting, so busy
+  chats take turns with the others.
+- At most `max_pending` messages are queued or in progress. Beyond that,
+  `submit` rejects the update and the webhook answers with an error, so that
+  Telegram retries it later (backpressure).
+- Replies longer than Telegram's message limit are sent in several messages.
+"""
 
-from telegram import Update
-from telegram.ext import (
-    Application,
-    CommandHandler,
-    MessageHandler,
-    ContextTypes,
-    filters,
-)
+import asyncio
+import logging
+from collections import deque
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
 
-# Assume Command and Query handlers from the application layer are available
-# for dependency injection.
-from myjarvis.application.handlers.command_handlers import SendMessageHandler
-from myjarvis.application.commands.send_message import SendMessageCommand
+import httpx
 
+logger = logging.getLogger(__name__)
 
-class TelegramBot:
-    def __init__(self, token: str, send_message_handler: SendMessageHandler):
-        self.application = Application.builder().token(token).build()
-        self.send_message_handler = send_message_handler
-        # Register handlers
-        self.application.add_handler(CommandHandler("start", self._start))
-        self.application.add_handler(
-            MessageHandler(filters.TEXT & ~filters.COMMAND, self._handle_message)
+TELEGRAM_API_URL = "https://api.telegram.org"
+# Maximum length of the text of one Telegram message.
+MAX_MESSAGE_LENGTH = 4096
+
+
+@dataclass(frozen=True, slots=True)
+class TelegramMessage:
+    """
+    A text message received from a Telegram user.
+
+    Attributes:
+        update_id: The identifier of the update carrying the message.
+        chat_id: The chat the message was sent in; replies go there.
+        telegram_user_id: The Telegram user who sent the message.
+        text: The text of the message.
+    """
+
+    update_id: int
+    chat_id: int
+    telegram_user_id: int
+    text: str
+
+    @classmethod
+    def from_update(cls, update: dict[str, Any]) -> "TelegramMessage | None":
+        """
+        Extract the text message of an update.
+
+        Returns:
+            The message, or None if the update carries no text message from
+            a user (e.g. an edited message, a photo or a service message).
+        """
+        message = update.get("message")
+        if not isinstance(message, dict):
+            return None
+        text = message.get("text")
+        sender = message.get("from")
+        if not text or not isinstance(sender, dict):
+            return None
+        return cls(
+            update_id=update["update_id"],
+            chat_id=message["chat"]["id"],
+            telegram_user_id=sender["id"],
+            text=text,
         )
 
-    async def _start(self, update: Update, context: ContextTypes.DEFAULT_TYPE) -> None:
-        await update.message.reply_text("Hello! I am your Jarvis agent.")
 
-    async def _handle_message(
-        self, update: Update, context: ContextTypes.DEFAULT_TYPE
+MessageHandler = Callable[[TelegramMessage], Awaitable[str | None]]
+
+
+class TelegramBot:
+    """
+    Telegram bot processing webhook updates on a bounded worker pool.
+
+    Call `start` before submitting updates and `stop` on shutdown.
+
+    Args:
+        token: The bot token issued by BotFather.
+        on_message: Coroutine function producing the reply to a message, or
+            None to send no reply.
+        api_url: Base URL of the Bot API.
+        http_client: Client used to call the Bot API. A client owned by the
+            bot is created if omitted.
+        workers: Number of messages processed concurrently.
+        max_pending: Maximum number of messages queued or in progress.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        on_message: MessageHandler,
+        api_url: str = TELEGRAM_API_URL,
+        http_client: httpx.AsyncClient | None = None,
+        workers: int = 16,
+        max_pending: int = 1000,
+    ):
+        self._on_message = on_message
+        self._base_url = f"{api_url.rstrip('/')}/bot{token}"
+        self._owns_client = http_client is None
+        self._client = http_client or httpx.AsyncClient(timeout=30.0)
+        self._worker_count = workers
+        self._max_pending = max_pending
+        self._pending = 0
+        # Queued messages of every chat with messages queued or in progress.
+        self._chats: dict[int, deque[TelegramMessage]] = {}
+        self._ready: asyncio.Queue[int] = asyncio.Queue()
+        self._workers: list[asyncio.Task[None]] = []
+
+    @property
+    def pending(self) -> int:
+        """
+        Number of messages queued or in progress.
+        """
+        return self._pending
+
+    async def start(self) -> None:
+        """
+        Start the worker tasks.
+        """
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._work())
+                for _ in range(self._worker_count)
+            ]
+
+    async def stop(self) -> None:
+        """
+        Stop the worker tasks and close the owned HTTP client.
+
+        Messages still queued are dropped; Telegram does not resend them.
+        """
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        if self._owns_client:
+            await self._client.aclose()
+
+    def submit(self, update: dict[str, Any]) -> bool:
+        """
+        Queue an update received by the webhook.
+
+        Updates without a text message are accepted and ignored.
+
+        Args:
+            update: The update, as decoded from the webhook request body.
+
+        Returns:
+            False if the update was rejected because too many messages are
+            pending, True otherwise.
+        """
+        message = TelegramMessage.from_update(update)
+        if message is None:
+            return True
+        if self._pending >= self._max_pending:
+            return False
+        self._pending += 1
+        queue = self._chats.get(message.chat_id)
+        if queue is None:
+            self._chats[message.chat_id] = deque([message])
+            self._ready.put_nowait(message.chat_id)
+        else:
+            # The chat is already waiting in the ready queue or in progress.
+            queue.append(message)
+        return True
+
+    async def set_webhook(
+        self,
+        url: str,
+        secret_token: str | None = None,
+        max_connections: int = 40,
     ) -> None:
-        user_id = update.message.from_user.id
-        text = update.message.text
-
-        This is a simplified example. In a real scenario, you would need
-        to map the telegram user_id to your internal user_id and select
-        the correct agent_id to use. This might involve a database lookup
-        or storing state in context.user_data.
-        For now, we assume a default agent or one specified in the command.
-
-        command = SendMessageCommand(
-            agent_id="some_default_agent_id",
-            user_id=str(user_id),
-            message_text=text,
-        )
-        result = await self.send_message_handler.handle(command)
+        """
+        Register the webhook URL with Telegram.
 
-        # For demonstration:
-        response_text = f"Received: {text}"
-        await update.message.reply_text(response_text)
+        Args:
+            url: The public HTTPS URL of the webhook endpoint.
+            secret_token: Secret Telegram sends back in the
+                `X-Telegram-Bot-Api-Secret-Token` header of every update.
+            max_connections: Maximum number of concurrent webhook requests.
+        """
+        payload: dict[str, Any] = {
+            "url": url,
+            "max_connections": max_connections,
+            "allowed_updates": ["message"],
+        }
+        if secret_token:
+            payload["secret_token"] = secret_token
+        await self._call("setWebhook", payload)
 
-    def run(self) -> None:
-        self.application.run_polling()
-"""
+    async def send_message(self, chat_id: int, text: str) -> None:
+        """
+        Send a text message, split into several if it is too long.
+        """
+        for start in range(0, len(text), MAX_MESSAGE_LENGTH):
+            await self._call(
+                "sendMessage",
+                {
+                    "chat_id": chat_id,
+                    "text": text[start : start + MAX_MESSAGE_LENGTH],
+                },
+            )
+
+    async def _work(self) -> None:
+        while True:
+            chat_id = await self._ready.get()
+            queue = self._chats[chat_id]
+            message = queue[0]
+            try:
+                await self._process(message)
+            finally:
+                queue.popleft()
+                self._pending -= 1
+                if queue:
+                    self._ready.put_nowait(chat_id)
+                else:
+                    del self._chats[chat_id]
+
+    async def _process(self, message: TelegramMessage) -> None:
+        try:
+            reply = await self._on_message(message)
+            if reply:
+                await self.send_message(message.chat_id, reply)
+        except Exception:
+            logger.exception(
+                "Failed to process Telegram update %s", message.update_id
+            )
+
+    async def _call(self, method: str, payload: dict[str, Any]) -> Any:
+        response = await self._client.post(
+            f"{self._base_url}/{method}", json=payload
+        )
+        response.raise_for_status()
+        return response.json().get("result")
@@ -0,0 +1,271 @@
+"""
+This module defines the interface of web search providers and the merging of
+their results.
+
+Two providers are implemented:
+- `TavilySearchProvider` calls the Tavily search API over HTTPS with `httpx`.
+- `FakeSearchProvider` searches an in-memory list of pages by the words they
+  share with the query, after a simulated latency. It needs no external
+  service, which makes it suitable for local development, tests and
+  benchmarks.
+
+Results of several queries are merged with `reciprocal_rank_fusion`: a page
+scores `1 / (k + rank)` in every ranking it appears in, and the pages are
+ordered by their total score. Pages ranked well by several queries come
+first, and the scores of different queries need not be comparable, only
+their ranks. Results are matched by `canonical_url`, so the same page
+reached through a tracking link or with another letter case of the host is
+counted once.
+"""
+
+import asyncio
+import os
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Iterable, Sequence
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import httpx
+
+TAVILY_API_URL = "https://api.tavily.com/search"
+# Constant of reciprocal rank fusion, as in the original paper (Cormack et
+# al., 2009): it dampens the weight of the very first ranks.
+RRF_K = 60
+
+_TRACKING_PARAMS = frozenset(
+    {"fbclid", "gclid", "dclid", "msclkid", "mc_cid", "mc_eid", "ref_src"}
+)
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_WORD_PATTERN = re.compile(r"\w+")
+
+
+@dataclass(frozen=True, slots=True)
+class SearchResult:
+    """
+    A page found by a web search.
+
+    Attributes:
+        title: The title of the page.
+        url: The URL of the page.
+        snippet: An excerpt of the page relevant to the query.
+    """
+
+    title: str
+    url: str
+    snippet: str
+
+
+@dataclass(frozen=True, slots=True)
+class RankedResult:
+    """
+    A result of several merged searches.
+
+    Attributes:
+        result: The result, as returned by its best ranking.
+        score: The reciprocal rank fusion score of the result.
+        queries: Indexes of the queries that found the result.
+    """
+
+    result: SearchResult
+    score: float
+    queries: tuple[int, ...]
+
+
+class BaseSearchProvider(ABC):
+    """
+    Abstract base class of the web search providers.
+    """
+
+    @abstractmethod
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        """
+        Search the web.
+
+        Args:
+            query: The search query.
+            max_results: Maximum number of results returned.
+
+        Returns:
+            The results, most relevant first.
+        """
+
+    async def close(self) -> None:
+        """
+        Release the resources of the provider.
+        """
+
+
+class TavilySearchProvider(BaseSearchProvider):
+    """
+    Search provider backed by the Tavily search API.
+
+    Args:
+        api_key: The Tavily API key. Read from `TAVILY_API_KEY` if omitted.
+        client: The HTTP client; by default one of the provider's own,
+            closed by `close`.
+        timeout_seconds: Timeout of a search request.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        client: httpx.AsyncClient | None = None,
+        timeout_seconds: float = 15.0,
+    ):
+        self.api_key = api_key or os.getenv("TAVILY_API_KEY")
+        if not self.api_key:
+            raise ValueError("Tavily API key is not provided.")
+        self._owns_client = client is None
+        self._client = client or httpx.AsyncClient(timeout=timeout_seconds)
+
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        response = await self._client.post(
+            TAVILY_API_URL,
+            headers={"Authorization": f"Bearer {self.api_key}"},
+            json={"query": query, "max_results": max_results},
+        )
+        response.raise_for_status()
+        return [
+            SearchResult(
+                title=item.get("title") or "",
+                url=item["url"],
+                snippet=item.get("content") or "",
+            )
+            for item in response.json().get("results", [])[:max_results]
+        ]
+
+    async def close(self) -> None:
+        if self._owns_client:
+            await self._client.aclose()
+
+
+class FakeSearchProvider(BaseSearchProvider):
+    """
+    Deterministic, in-process stand-in for a web search provider.
+
+    A page matches a query if it shares a word with it; pages sharing more
+    words rank first, ties in the order of `pages`.
+
+    Args:
+        pages: The pages searched. By default a few placeholder pages.
+        latency: Seconds to wait before returning the results of a search.
+    """
+
+    def __init__(
+        self,
+        pages: Sequence[SearchResult] | None = None,
+        latency: float = 0.0,
+    ):
+        if pages is None:
+            pages = [
+                SearchResult(
+                    title=f"Example page {index}",
+                    url=f"https://example.com/page/{index}",
+                    snippet=f"Placeholder result {index} of the fake search.",
+                )
+                for index in range(10)
+            ]
+        self.pages = list(pages)
+        self.latency = latency
+        self._words = [
+            set(_WORD_PATTERN.findall(f"{page.title} {page.snippet}".lower()))
+            for page in self.pages
+        ]
+        self.searches = 0
+
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        self.searches += 1
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        terms = set(_WORD_PATTERN.findall(query.lower()))
+        matches = [
+            (len(terms & words), index)
+            for index, words in enumerate(self._words)
+            if terms & words
+        ]
+        matches.sort(key=lambda match: (-match[0], match[1]))
+        return [self.pages[index] for _, index in matches[:max_results]]
+
+
+def canonical_url(url: str) -> str:
+    """
+    Return the form of a URL used to recognize results of the same page.
+
+    The scheme and host are lowercased, a leading `www.`, the default port,
+    the fragment, a trailing slash and tracking parameters (`utm_*`,
+    `gclid`...) are dropped, and the remaining query parameters are sorted.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").removeprefix("www.")
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = urlencode(
+        sorted(
+            (name, value)
+            for name, value in parse_qsl(parts.query, keep_blank_values=True)
+            if not name.lower().startswith("utm_")
+            and name.lower() not in _TRACKING_PARAMS
+        )
+    )
+    path = parts.path.rstrip("/") or "/"
+    return urlunsplit((scheme, host, path, query, ""))
+
+
+def reciprocal_rank_fusion(
+    rankings: Iterable[Sequence[SearchResult]], k: int = RRF_K
+) -> list[RankedResult]:
+    """
+    Merge several rankings of search results into one.
+
+    A result appearing several times in a ranking counts at its best rank.
+
+    Args:
+        rankings: The results of every query, most relevant first.
+        k: Constant added to the ranks, damping the weight of the first
+            ones.
+
+    Returns:
+        The distinct results, highest score first; ties in the order they
+        were first found.
+    """
+    scores: dict[str, float] = {}
+    results: dict[str, tuple[int, SearchResult]] = {}
+    queries: dict[str, list[int]] = {}
+    for query, ranking in enumerate(rankings):
+        for rank, result in enumerate(ranking, start=1):
+            key = canonical_url(result.url)
+            found = queries.setdefault(key, [])
+            if query in found:
+                continue
+            found.append(query)
+            scores[key] = scores.get(key, 0.0) + 1.0 / (k + rank)
+            # Keep the title and snippet of the best ranking of the page.
+            if key not in results or rank < results[key][0]:
+                results[key] = (rank, result)
+    return [
+        RankedResult(
+            result=results[key][1],
+            score=scores[key],
+            queries=tuple(queries[key]),
+        )
+        for key in sorted(scores, key=lambda key: -scores[key])
+    ]
+
+
+def create_search_provider(name: str) -> BaseSearchProvider:
+    """
+    Create a web search provider.
+
+    Args:
+        name: "tavily", or "fake" for the in-process provider.
+
+    Raises:
+        ValueError: If the provider is unknown.
+    """
+    if name == "tavily":
+        return TavilySearchProvider()
+    if name == "fake":
+        return FakeSearchProvider()
+    raise ValueError(f"Unknown search provider {name!r}.")
@@ -0,0 +1,347 @@
+"""
+This module provides the worker tier of the chat turns.
+
+Besides waiting for the LLM, a chat turn takes CPU time: decoding and
+encoding large chat contexts, counting their tokens, processing tool
+results. Within the API process, that work competes with request handling
+on a single event loop. With the worker tier, the API enqueues every turn
+(`AgentTurnClient`) and worker processes run it (`AgentTurnRunner`), so the
+turns are spread over as many processes as the machine has cores while the
+API only relays their replies.
+
+Implementation details:
+- Turns are `agent_turn` jobs of a `RedisJobQueue` of their own
+  (`agent_turns` prefix), whose payload is the `SendMessageCommand`, whether
+  the reply is streamed and the key of the turn's events.
+- The worker publishes the progress of a turn to a Redis stream
+  (`agent_turns:events:<id>`): `started` once the agent and its context are
+  loaded, `chunk` with the fragments of a streamed reply (those generated
+  while the previous event was being published are sent as one), then
+  `done`; or `reply` with the complete reply (or the suspended turn). A
+  failing turn publishes `error` with the kind of failure, so the client
+  raises the same exceptions as `SendMessageHandler` does in process.
+- The client reads the events with a blocking `XREAD`, so fragments are
+  relayed as soon as they are published. Whenever no event arrived for a
+  while, it checks that the job has not failed (e.g. its worker died), and
+  it gives up after the turn timeout. The stream expires after the timeout
+  even if nobody reads it.
+- A turn is claimed once: a turn interrupted halfway may already have
+  replied, and running it again could answer the message twice. The
+  worker cancels a turn running longer than the timeout, since its client
+  stopped waiting.
+"""
+
+import asyncio
+import logging
+import time
+import uuid
+from contextlib import AbstractAsyncContextManager
+from typing import Any, AsyncIterator, Callable
+
+from redis.asyncio import Redis as AsyncRedis
+
+from myjarvis.application.commands.send_message import SendMessageCommand
+from myjarvis.application.handlers.command_handlers import SendMessageHandler
+from myjarvis.domain.exceptions.domain_exceptions import (
+    AgentNotFoundException,
+)
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.domain.value_objects.suspended_turn import SuspendedTurn
+from myjarvis.infrastructure.llm.scheduler import LlmOverloadedError
+
+from .job_queue import JobStatus, RedisJobQueue
+
+logger = logging.getLogger(__name__)
+
+AGENT_TURN_JOB = "agent_turn"
+
+_PREFIX = "agent_turns"
+# Longest blocking read of the events, between two checks of the job.
+_READ_BLOCK_SECONDS = 1.0
+_READ_COUNT = 256
+# Pause after an empty read, so a client whose reads do not block does not
+# spin.
+_IDLE_SECONDS = 0.02
+
+
+class AgentTurnError(Exception):
+    """
+    Raised when the worker tier fails to run a turn.
+    """
+
+
+def create_agent_turn_queue(
+    redis_client: AsyncRedis, timeout_seconds: float
+) -> RedisJobQueue:
+    """
+    Return the queue of the turns run by the worker tier.
+
+    Args:
+        redis_client: The asynchronous Redis client.
+        timeout_seconds: Maximum time of a turn, from when it is enqueued.
+    """
+    return RedisJobQueue(
+        redis_client,
+        result_ttl_seconds=timeout_seconds,
+        lease_seconds=timeout_seconds * 2,
+        max_attempts=1,
+        prefix=_PREFIX,
+    )
+
+
+class AgentTurnClient:
+    """
+    Runs chat turns on the worker tier, with the interface of
+    `SendMessageHandler`.
+
+    Args:
+        queue: The queue of the turns.
+        redis_client: The client reading the events of the turns.
+        timeout_seconds: Maximum time of a turn, from when it is enqueued.
+    """
+
+    def __init__(
+        self,
+        queue: RedisJobQueue,
+        redis_client: AsyncRedis,
+        timeout_seconds: float = 300.0,
+    ):
+        self._queue = queue
+        self._client = redis_client
+        self._timeout_seconds = timeout_seconds
+
+    async def handle(
+        self, command: SendMessageCommand
+    ) -> Message | SuspendedTurn:
+        """
+        Send a message to an agent and wait for the complete reply.
+
+        Raises:
+            AgentNotFoundException: If the agent does not exist or is not
+                owned by the user.
+            LlmOverloadedError: If the LLM provider's rate limit did not let
+                a request of the turn through in time.
+            AgentTurnError: If the turn failed or timed out.
+        """
+        events = self._events(command, stream=False)
+        try:
+            event = await anext(events)
+        finally:
+            await events.aclose()
+        self._check(event)
+        if event["kind"] == "turn":
+            return SuspendedTurn.model_validate_json(event["data"])
+        return Message.model_validate_json(event["data"])
+
+    async def stream(self, command: SendMessageCommand) -> AsyncIterator[str]:
+        """
+        Send a message to an agent and stream the reply.
+
+        As with `SendMessageHandler.stream`, lookup errors are raised here
+        rather than in the middle of the stream.
+
+        Raises:
+            AgentNotFoundException: If the agent does not exist or is not
+                owned by the user.
+            AgentTurnError: If the turn failed or timed out before the
+                reply started.
+        """
+        events = self._events(command, stream=True)
+        try:
+            self._check(await anext(events))
+        except BaseException:
+            await events.aclose()
+            raise
+        return self._chunks(events)
+
+    async def _chunks(
+        self, events: AsyncIterator[dict[str, str]]
+    ) -> AsyncIterator[str]:
+        try:
+            async for event in events:
+                self._check(event)
+                if event["event"] == "done":
+                    return
+                yield event["data"]
+        finally:
+            await events.aclose()
+
+    async def _events(
+        self, command: SendMessageCommand, stream: bool
+    ) -> AsyncIterator[dict[str, str]]:
+        key = f"{_PREFIX}:events:{uuid.uuid4().hex}"
+        job = await self._queue.enqueue(
+            AGENT_TURN_JOB,
+            {
+                "command": command.model_dump(mode="json"),
+                "stream": stream,
+                "events": key,
+            },
+        )
+        deadline = time.monotonic() + self._timeout_seconds
+        last_id = "0-0"
+        try:
+            while True:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise AgentTurnError("The agent turn timed out.")
+                response = await self._client.xread(
+                    {key: last_id},
+                    count=_READ_COUNT,
+                    block=max(
+                        1, int(min(remaining, _READ_BLOCK_SECONDS) * 1000)
+                    ),
+                )
+                if not response:
+                    await self._check_job(job.job_id)
+                    await asyncio.sleep(_IDLE_SECONDS)
+                    continue
+                for last_id, fields in response[0][1]:
+                    yield {
+                        name.decode(): value.decode()
+                        for name, value in fields.items()
+                    }
+        finally:
+            await self._client.delete(key)
+
+    async def _check_job(self, job_id: str) -> None:
+        job = await self._queue.get(job_id)
+        if job is None:
+            raise AgentTurnError("The agent turn expired.")
+        if job.status is JobStatus.FAILED:
+            raise AgentTurnError(job.error or "The agent turn failed.")
+
+    @staticmethod
+    def _check(event: dict[str, str]) -> None:
+        if event["event"] != "error":
+            return
+        if event["kind"] == "agent_not_found":
+            raise AgentNotFoundException(event["message"])
+        if event["kind"] == "overloaded":
+            raise LlmOverloadedError(
+                event["message"], float(event["retry_after"])
+            )
+        raise AgentTurnError(event["message"])
+
+
+class AgentTurnRunner:
+    """
+    Runs the turns of the worker tier: the handler of `agent_turn` jobs.
+
+    Args:
+        redis_client: The client publishing the events of the turns.
+        handler_scope: Returns a context manager providing the
+            `SendMessageHandler` of one turn, e.g. bound to a database
+            session of its own.
+        timeout_seconds: Maximum time of a turn; also how long its events
+            are kept.
+    """
+
+    def __init__(
+        self,
+        redis_client: AsyncRedis,
+        handler_scope: Callable[
+            [], AbstractAsyncContextManager[SendMessageHandler]
+        ],
+        timeout_seconds: float = 300.0,
+    ):
+        self._client = redis_client
+        self._handler_scope = handler_scope
+        self._timeout_seconds = timeout_seconds
+
+    async def __call__(self, payload: dict[str, Any]) -> dict[str, Any]:
+        command = SendMessageCommand.model_validate(payload["command"])
+        key = payload["events"]
+        try:
+            async with asyncio.timeout(self._timeout_seconds):
+                async with self._handler_scope() as handler:
+                    if payload["stream"]:
+                        await self._stream(key, handler, command)
+                    else:
+                        await self._handle(key, handler, command)
+        except AgentNotFoundException as exc:
+            await self._publish(
+                key, event="error", kind="agent_not_found", message=str(exc)
+            )
+        except LlmOverloadedError as exc:
+            await self._publish(
+                key,
+                event="error",
+                kind="overloaded",
+                message=str(exc),
+                retry_after=str(exc.retry_after),
+            )
+        except TimeoutError:
+            await self._publish(
+                key,
+                event="error",
+                kind="failed",
+                message="The agent turn timed out.",
+            )
+        except Exception:
+            logger.exception("Agent turn failed")
+            await self._publish(
+                key,
+                event="error",
+                kind="failed",
+                message="The agent turn failed.",
+            )
+        return {}
+
+    async def _handle(
+        self,
+        key: str,
+        handler: SendMessageHandler,
+        command: SendMessageCommand,
+    ) -> None:
+        reply = await handler.handle(command)
+        await self._publish(
+            key,
+            event="reply",
+            kind="turn" if isinstance(reply, SuspendedTurn) else "message",
+            data=reply.model_dump_json(),
+        )
+
+    async def _stream(
+        self,
+        key: str,
+        handler: SendMessageHandler,
+        command: SendMessageCommand,
+    ) -> None:
+        chunks = await handler.stream(command)
+        await self._publish(key, event="started")
+        # Fragments generated while the previous ones are being published
+        # are sent together, so a slow Redis does not slow the turn down.
+        buffered: list[str] = []
+        publishing: asyncio.Task | None = None
+        try:
+            async for chunk in chunks:
+                buffered.append(chunk)
+                if publishing is not None:
+                    if not publishing.done():
+                        continue
+                    publishing.result()
+                publishing = asyncio.create_task(
+                    self._client.xadd(
+                        key, {"event": "chunk", "data": "".join(buffered)}
+                    )
+                )
+                buffered = []
+            if publishing is not None:
+                await publishing
+        finally:
+            if publishing is not None and not publishing.done():
+                publishing.cancel()
+        if buffered:
+            await self._client.xadd(
+                key, {"event": "chunk", "data": "".join(buffered)}
+            )
+        await self._publish(key, event="done")
+
+    async def _publish(self, key: str, **fields: str) -> None:
+        # The fragments of a streamed reply are added between `started`
+        # and `done`, without renewing the expiry.
+        async with self._client.pipeline(transaction=False) as pipe:
+            pipe.xadd(key, fields)
+            pipe.pexpire(key, int(self._timeout_seconds * 1000))
+            await pipe.execute()
@@ -0,0 +1,305 @@
+"""
+This module provides the queue of background jobs.
+
+Some node commands (e.g. searching a large mailbox) take tens of seconds.
+Rather than holding an HTTP request and a database session open meanwhile,
+the `ToolExecutor` enqueues them as jobs, which worker processes execute
+(`JobWorker`); the caller polls the job until its result is available.
+
+Implementation details:
+- Jobs are Redis hashes (`jobs:job:<id>`, with the default `prefix`)
+  holding their name, JSON payload, status, attempts and, once finished,
+  their JSON result or error.
+- Pending job ids wait in the `jobs:queue` list. A worker claims a job by
+  moving its id to the `jobs:processing` list (`BLMOVE`), atomically, so a
+  job is claimed by exactly one worker.
+- A claimed job has a lease. If its worker dies, the lease expires and
+  `requeue_expired`, run periodically by every worker, puts the job back in
+  the queue, up to `max_attempts` claims; the job fails after that. The lease
+  must therefore outlast the longest job.
+- Finished jobs are kept for `result_ttl_seconds`, then expire.
+- A job enqueued with an idempotency key is created once: enqueueing the
+  same key again, while the key and the job are kept, returns the existing
+  job. The key is reserved with `SET NX` once the job is written, so
+  concurrent callers agree on one job.
+- `wait` polls the job hashes, backing off up to `_MAX_POLL_SECONDS`.
+  Waiting for the jobs to finish stops after `max_wait_seconds` anyway, so
+  a caller does not wait forever when no worker runs.
+"""
+
+import asyncio
+import json
+import time
+import uuid
+from typing import Any
+
+from redis.asyncio import Redis as AsyncRedis
+
+from myjarvis.domain.interfaces.jobs import Job, JobStatus
+
+_MIN_POLL_SECONDS = 0.05
+_MAX_POLL_SECONDS = 1.0
+
+
+class RedisJobQueue:
+    """
+    Queue of background jobs stored in Redis, implementing the domain's
+    `JobQueue` interface.
+
+    Args:
+        redis_client: The asynchronous Redis client.
+        result_ttl_seconds: How long finished jobs are kept, and by default
+            the idempotency keys of the jobs.
+        lease_seconds: How long a worker may run a job before it is
+            considered dead and the job is claimed again.
+        max_attempts: Maximum number of claims of a job.
+        prefix: Prefix of the queue's Redis keys. Queues with different
+            prefixes are independent, e.g. to scale their workers
+            separately.
+        max_wait_seconds: How long `wait` waits for jobs to finish when
+            given no timeout; defaults to the longest a claimed job may
+            run, `lease_seconds` per attempt.
+    """
+
+    def __init__(
+        self,
+        redis_client: AsyncRedis,
+        result_ttl_seconds: float = 3600.0,
+        lease_seconds: float = 900.0,
+        max_attempts: int = 3,
+        prefix: str = "jobs",
+        max_wait_seconds: float | None = None,
+    ):
+        self._client = redis_client
+        self._prefix = prefix
+        self.result_ttl_seconds = result_ttl_seconds
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.max_wait_seconds = (
+            max_wait_seconds
+            if max_wait_seconds is not None
+            else lease_seconds * max_attempts
+        )
+
+    async def enqueue(
+        self,
+        name: str,
+        payload: dict[str, Any],
+        idempotency_key: str | None = None,
+        idempotency_ttl_seconds: float | None = None,
+    ) -> Job:
+        """
+        Create a job, or return the job created with the same key.
+
+        Args:
+            name: The kind of job.
+            payload: The input of the job's handler; must be JSON
+                serializable.
+            idempotency_key: Key identifying the work, if retries or
+                duplicate requests must not create another job.
+            idempotency_ttl_seconds: How long the key is kept; defaults to
+                `result_ttl_seconds`.
+
+        Returns:
+            The new or existing job.
+        """
+        job = Job(uuid.uuid4().hex, name, payload, JobStatus.PENDING)
+        key = self._job_key(job.job_id)
+        ttl = int(self.result_ttl_seconds * 1000)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                key,
+                mapping={
+                    "name": name,
+                    "payload": json.dumps(payload, default=str),
+                    "status": job.status.value,
+                    "attempts": 0,
+                },
+            )
+            # Unclaimed jobs expire too, should no worker ever run.
+            pipe.pexpire(key, ttl)
+            await pipe.execute()
+        if idempotency_key is not None:
+            # Jobs are written before their key, so a key whose job is
+            # missing belongs to an expired job and is taken over.
+            reserved = f"{self._prefix}:key:{idempotency_key}"
+            if idempotency_ttl_seconds is not None:
+                key_ttl = int(idempotency_ttl_seconds * 1000)
+            else:
+                key_ttl = ttl
+            if not await self._client.set(
+                reserved, job.job_id, nx=True, px=key_ttl
+            ):
+                existing = await self._client.get(reserved)
+                current = existing and await self.get(existing.decode())
+                if current is not None:
+                    await self._client.delete(key)
+                    return current
+                await self._client.set(reserved, job.job_id, px=key_ttl)
+        await self._client.lpush(f"{self._prefix}:queue", job.job_id)
+        return job
+
+    async def get(self, job_id: str) -> Job | None:
+        """
+        Return a job, or None if it does not exist or has expired.
+        """
+        fields = {
+            key.decode(): value.decode()
+            for key, value in (
+                await self._client.hgetall(self._job_key(job_id))
+            ).items()
+        }
+        if "name" not in fields:
+            return None
+        return Job(
+            job_id=job_id,
+            name=fields["name"],
+            payload=json.loads(fields["payload"]),
+            status=JobStatus(fields["status"]),
+            attempts=int(fields["attempts"]),
+            result=(
+                json.loads(fields["result"]) if "result" in fields else None
+            ),
+            error=fields.get("error"),
+        )
+
+    async def wait(
+        self, job_ids: list[str], timeout: float | None = None
+    ) -> dict[str, Job | None]:
+        """
+        Wait until jobs have finished or `timeout` seconds have passed.
+
+        Args:
+            job_ids: The jobs to wait for.
+            timeout: Maximum time to wait, or None to wait until all jobs
+                have finished, up to `max_wait_seconds`. Zero returns the
+                current state at once.
+
+        Returns:
+            The jobs by id, finished or not; None for expired jobs.
+        """
+        if timeout is None:
+            timeout = self.max_wait_seconds
+        deadline = time.monotonic() + timeout
+        delay = _MIN_POLL_SECONDS
+        while True:
+            jobs = {job_id: await self.get(job_id) for job_id in job_ids}
+            if all(
+                job is None or job.status.finished for job in jobs.values()
+            ):
+                return jobs
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return jobs
+            await asyncio.sleep(min(delay, remaining))
+            delay = min(delay * 2, _MAX_POLL_SECONDS)
+
+    async def claim(self, timeout: float = 1.0) -> Job | None:
+        """
+        Take the oldest pending job, waiting up to `timeout` seconds for one.
+
+        Returns:
+            The job, now running, or None if none was pending.
+        """
+        job_id = await self._client.blmove(
+            f"{self._prefix}:queue",
+            f"{self._prefix}:processing",
+            timeout,
+            "RIGHT",
+            "LEFT",
+        )
+        if job_id is None:
+            return None
+        job_id = job_id.decode()
+        key = self._job_key(job_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(
+                key,
+                mapping={
+                    "status": JobStatus.RUNNING.value,
+                    "lease_until": time.time() + self.lease_seconds,
+                },
+            )
+            pipe.hincrby(key, "attempts", 1)
+            # A running job is kept until it finishes.
+            pipe.persist(key)
+            await pipe.execute()
+        job = await self.get(job_id)
+        if job is None:
+            # The job expired while pending.
+            await self._client.delete(key)
+            await self._client.lrem(f"{self._prefix}:processing", 1, job_id)
+            return None
+        if job.attempts > self.max_attempts:
+            await self.fail(job_id, "The job was abandoned by its workers.")
+            return None
+        return job
+
+    async def complete(self, job_id: str, result: dict[str, Any]) -> None:
+        """
+        Record the result of a job claimed by the caller.
+        """
+        await self._finish(
+            job_id,
+            {
+                "status": JobStatus.SUCCEEDED.value,
+                "result": json.dumps(result, default=str),
+            },
+        )
+
+    async def fail(self, job_id: str, error: str) -> None:
+        """
+        Record the failure of a job claimed by the caller.
+        """
+        await self._finish(
+            job_id, {"status": JobStatus.FAILED.value, "error": error}
+        )
+
+    async def requeue_expired(self) -> int:
+        """
+        Put the jobs whose lease has expired back in the queue.
+
+        Returns:
+            The number of jobs requeued.
+        """
+        requeued = 0
+        now = time.time()
+        for raw in await self._client.lrange(
+            f"{self._prefix}:processing", 0, -1
+        ):
+            job_id = raw.decode()
+            lease_until = await self._client.hget(
+                self._job_key(job_id), "lease_until"
+            )
+            if lease_until is None:
+                # Claimed a moment ago, or expired before it was claimed.
+                if await self._client.exists(self._job_key(job_id)):
+                    continue
+                await self._client.lrem(
+                    f"{self._prefix}:processing", 1, job_id
+                )
+                continue
+            if float(lease_until) > now:
+                continue
+            # Only the caller removing the id requeues it.
+            if await self._client.lrem(
+                f"{self._prefix}:processing", 1, job_id
+            ):
+                await self._client.hset(
+                    self._job_key(job_id), "status", JobStatus.PENDING.value
+                )
+                await self._client.lpush(f"{self._prefix}:queue", job_id)
+                requeued += 1
+        return requeued
+
+    async def _finish(self, job_id: str, fields: dict[str, str]) -> None:
+        key = self._job_key(job_id)
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.hset(key, mapping=fields)
+            pipe.hdel(key, "lease_until")
+            pipe.pexpire(key, int(self.result_ttl_seconds * 1000))
+            pipe.lrem(f"{self._prefix}:processing", 1, job_id)
+            await pipe.execute()
+
+    def _job_key(self, job_id: str) -> str:
+        return f"{self._prefix}:job:{job_id}"
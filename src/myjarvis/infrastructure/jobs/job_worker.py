@@ -0,0 +1,129 @@
+"""
+This module provides the worker executing background jobs.
+
+A `JobWorker` runs `concurrency` tasks, each claiming a job from the
+`RedisJobQueue`, running the handler registered for the job's name and
+recording its result. Worker processes are started with the `worker.py`
+entry point; the API process may also run workers of its own
+(`jobs_in_process_workers`), e.g. in development.
+
+Implementation details:
+- A handler is a coroutine function taking the job's payload and returning
+  its JSON-serializable result. A handler raising an exception fails the
+  job; errors the caller should see as results (e.g. a node command
+  failing) are returned by the handler instead.
+- Jobs without a registered handler fail at once.
+- Every `requeue_interval` seconds, one task of the worker puts the jobs
+  abandoned by dead workers back in the queue.
+- `stop` cancels the running jobs. Their lease expires and they are claimed
+  again by another worker.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Mapping
+
+from redis.exceptions import RedisError
+
+from .job_queue import Job, RedisJobQueue
+
+logger = logging.getLogger(__name__)
+
+JobHandler = Callable[[dict[str, Any]], Awaitable[dict[str, Any]]]
+
+# Pause after an empty or failed claim, so a queue whose client does not
+# block (or a Redis outage) does not make the worker spin.
+_IDLE_SECONDS = 0.1
+
+
+class JobWorker:
+    """
+    Executes the jobs of a queue with registered handlers.
+
+    Args:
+        queue: The queue the jobs are claimed from.
+        handlers: Handlers of the jobs, by job name.
+        concurrency: Number of jobs run at once.
+        claim_timeout: How long a claim waits for a job, in seconds.
+        requeue_interval: Interval between two checks for abandoned jobs.
+    """
+
+    def __init__(
+        self,
+        queue: RedisJobQueue,
+        handlers: Mapping[str, JobHandler],
+        concurrency: int = 4,
+        claim_timeout: float = 1.0,
+        requeue_interval: float = 30.0,
+    ):
+        self._queue = queue
+        self._handlers = dict(handlers)
+        self._concurrency = concurrency
+        self._claim_timeout = claim_timeout
+        self._requeue_interval = requeue_interval
+        self._next_requeue = 0.0
+        self._stopping = False
+        self._tasks: list[asyncio.Task] = []
+
+    async def start(self) -> None:
+        """
+        Start claiming and running jobs.
+        """
+        self._stopping = False
+        self._tasks = [
+            asyncio.create_task(self._run()) for _ in range(self._concurrency)
+        ]
+
+    async def stop(self) -> None:
+        """
+        Stop the worker, cancelling the jobs it is running.
+        """
+        # A Redis client may swallow the cancellation of a pending command
+        # (fakeredis does), so the tasks also check the flag.
+        self._stopping = True
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await self._requeue_expired()
+                job = await self._queue.claim(self._claim_timeout)
+            except RedisError:
+                logger.warning("Failed to claim a job", exc_info=True)
+                job = None
+            if job is None:
+                await asyncio.sleep(_IDLE_SECONDS)
+                continue
+            try:
+                await self._execute(job)
+            except RedisError:
+                # The job's lease expires and it is run again.
+                logger.warning(
+                    "Failed to record job %s", job.job_id, exc_info=True
+                )
+
+    async def _execute(self, job: Job) -> None:
+        handler = self._handlers.get(job.name)
+        if handler is None:
+            await self._queue.fail(job.job_id, f"Unknown job {job.name!r}.")
+            return
+        try:
+            result = await handler(job.payload)
+        except Exception as exc:
+            logger.warning("Job %s (%s) failed", job.job_id, job.name)
+            await self._queue.fail(job.job_id, str(exc) or type(exc).__name__)
+            return
+        await self._queue.complete(job.job_id, result)
+
+    async def _requeue_expired(self) -> None:
+        now = time.monotonic()
+        if now < self._next_requeue:
+            return
+        self._next_requeue = now + self._requeue_interval
+        requeued = await self._queue.requeue_expired()
+        if requeued:
+            logger.warning("Requeued %d abandoned jobs", requeued)
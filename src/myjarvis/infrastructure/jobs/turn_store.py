@@ -0,0 +1,127 @@
+"""
+This module provides the storage of suspended chat turns.
+
+A `SuspendedTurn` is stored in Redis, as JSON under `suspended_turn:<id>`,
+until it is resumed or its time to live runs out. The time to live should
+match the result TTL of the job queue: a turn outliving its jobs could not
+be resumed anyway.
+
+Resuming a turn calls the LLM and appends the reply to the conversation, so
+two polls of the same turn must not resume it both: a poll first takes the
+turn's lock (`SET NX` with an expiry, in case its process dies) and the
+others report the turn as still pending meanwhile. Once the turn is
+finished, its reply is kept under `suspended_turn:<id>:reply` for the same
+time to live, so a poll arriving afterwards still gets it.
+"""
+
+import json
+import uuid
+
+from redis.asyncio import Redis as AsyncRedis
+from redis.exceptions import WatchError
+
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.domain.value_objects.suspended_turn import SuspendedTurn
+
+_KEY_PREFIX = "suspended_turn"
+
+
+class SuspendedTurnStore:
+    """
+    Redis-backed storage of suspended turns, keyed by turn id, implementing
+    the domain's `TurnStore` interface.
+
+    Args:
+        redis_client: The asynchronous Redis client to use.
+        ttl_seconds: How long a suspended turn is kept.
+        lock_seconds: How long a turn stays locked if its holder never
+            releases it.
+    """
+
+    def __init__(
+        self,
+        redis_client: AsyncRedis,
+        ttl_seconds: float = 3600.0,
+        lock_seconds: float = 300.0,
+    ):
+        self._client = redis_client
+        self._ttl_ms = int(ttl_seconds * 1000)
+        self._lock_ms = int(lock_seconds * 1000)
+
+    async def save(self, turn: SuspendedTurn) -> None:
+        await self._client.set(
+            f"{_KEY_PREFIX}:{turn.turn_id}",
+            turn.model_dump_json(),
+            px=self._ttl_ms,
+        )
+
+    async def get(self, turn_id: str) -> SuspendedTurn | None:
+        raw = await self._client.get(f"{_KEY_PREFIX}:{turn_id}")
+        if raw is None:
+            return None
+        return SuspendedTurn.model_validate_json(raw)
+
+    async def delete(self, turn_id: str) -> None:
+        await self._client.delete(f"{_KEY_PREFIX}:{turn_id}")
+
+    async def finish(self, turn: SuspendedTurn, reply: Message) -> None:
+        """
+        Replace a suspended turn with its reply.
+        """
+        async with self._client.pipeline(transaction=True) as pipe:
+            pipe.set(
+                f"{_KEY_PREFIX}:{turn.turn_id}:reply",
+                json.dumps(
+                    {
+                        "turn": turn.model_dump(mode="json"),
+                        "reply": reply.model_dump(mode="json"),
+                    }
+                ),
+                px=self._ttl_ms,
+            )
+            pipe.delete(f"{_KEY_PREFIX}:{turn.turn_id}")
+            await pipe.execute()
+
+    async def get_reply(
+        self, turn_id: str
+    ) -> tuple[SuspendedTurn, Message] | None:
+        """
+        Return a finished turn and its reply, or None if the turn is not
+        finished or has expired.
+        """
+        raw = await self._client.get(f"{_KEY_PREFIX}:{turn_id}:reply")
+        if raw is None:
+            return None
+        data = json.loads(raw)
+        return (
+            SuspendedTurn.model_validate(data["turn"]),
+            Message.model_validate(data["reply"]),
+        )
+
+    async def lock(self, turn_id: str) -> str | None:
+        """
+        Take the lock of a turn.
+
+        Returns:
+            The token releasing the lock, or None if the turn is locked.
+        """
+        token = uuid.uuid4().hex
+        locked = await self._client.set(
+            f"{_KEY_PREFIX}:{turn_id}:lock", token, nx=True, px=self._lock_ms
+        )
+        return token if locked else None
+
+    async def unlock(self, turn_id: str, token: str) -> None:
+        """
+        Release the lock of a turn, unless it expired and was taken since.
+        """
+        key = f"{_KEY_PREFIX}:{turn_id}:lock"
+        async with self._client.pipeline(transaction=True) as pipe:
+            try:
+                await pipe.watch(key)
+                if await pipe.get(key) == token.encode():
+                    pipe.multi()
+                    pipe.delete(key)
+                    await pipe.execute()
+            except WatchError:
+                pass
@@ -3,32 +3,191 @@ This module provides the implementation for interacting with Anthropic's LLMs.
 
 It contains the `AnthropicLlm` class that inherits from `BaseLlm` and implements
 the methods for generating responses using the Anthropic API (e.g., Claude models).
-This class will manage the API key, model selection, and the specifics of
+This class manages the API key, model selection, and the specifics of
 communicating with the Anthropic API.
+"""
 
-Example Implementation:
-
+import json
 import os
+from typing import Any, AsyncIterator, Mapping
+
 from anthropic import AsyncAnthropic
-from myjarvis.domain.value_objects.message import Message
-from myjarvis.infrastructure.llm.base_llm import BaseLlm
+
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.infrastructure.llm.base_llm import (
+    BaseLlm,
+    LlmReply,
+    ToolRound,
+    parse_tool_call,
+    tool_name,
+)
+from myjarvis.infrastructure.llm.scheduler import LlmScheduler, estimate_tokens
+
+_ROLES = {Sender.USER: "user", Sender.AGENT: "assistant"}
+_DEFAULT_MAX_TOKENS = 1024
+
 
 class AnthropicLlm(BaseLlm):
-    def __init__(self, api_key: str | None = None, model: str = "claude-3-opus-20240229"):
+    """
+    LLM provider backed by the Anthropic Messages API.
+
+    Args:
+        api_key: The Anthropic API key. Read from `ANTHROPIC_API_KEY` if
+            omitted.
+        model: The model to use.
+        client: A shared SDK client. A dedicated client is created if
+            omitted.
+        scheduler: Scheduler of the requests to the provider. A scheduler
+            of this instance's own is created if omitted.
+    """
+
+    provider = "anthropic"
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str = "claude-3-opus-20240229",
+        client: AsyncAnthropic | None = None,
+        scheduler: LlmScheduler | None = None,
+    ):
         self.api_key = api_key or os.getenv("ANTHROPIC_API_KEY")
         if not self.api_key:
             raise ValueError("Anthropic API key is not provided.")
-        self.client = AsyncAnthropic(api_key=self.api_key)
+        self.client = client or AsyncAnthropic(api_key=self.api_key)
         self.model = model
+        self._scheduler = scheduler or LlmScheduler(self.provider)
 
     async def generate_response(
         self,
         prompt: str,
         history: list[Message] | None = None,
-        **kwargs
+        **kwargs: Any,
     ) -> str:
-        # Implementation to call the Anthropic API.
-        # It should handle the conversion of the chat history and prompt
-        # to the format expected by the Anthropic client.
-        pass
-"""
+        request = self._build_request(prompt, history, kwargs)
+        response = await self._scheduler.run(
+            lambda: self.client.messages.create(**request),
+            self._estimate_tokens(request, prompt, history),
+        )
+        return "".join(
+            block.text for block in response.content if block.type == "text"
+        )
+
+    async def stream_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        request = self._build_request(prompt, history, kwargs)
+        tokens = self._estimate_tokens(request, prompt, history)
+        for attempt in self._scheduler.attempts(tokens):
+            async with attempt, self.client.messages.stream(
+                **request
+            ) as stream:
+                async for text in stream.text_stream:
+                    yield text
+
+    async def generate_with_tools(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        tools: Any = None,
+        tool_rounds: list[ToolRound] | None = None,
+        **kwargs: Any,
+    ) -> LlmReply:
+        request = self._build_request(prompt, history, kwargs)
+        tokens = self._estimate_tokens(request, prompt, history)
+        for tool_round in tool_rounds or []:
+            request["messages"].append(
+                {
+                    "role": "assistant",
+                    "content": [
+                        {
+                            "type": "tool_use",
+                            "id": call.call_id,
+                            "name": tool_name(call.node, call.command),
+                            "input": call.params,
+                        }
+                        for call, _ in tool_round
+                    ],
+                }
+            )
+            request["messages"].append(
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "tool_result",
+                            "tool_use_id": result.call_id,
+                            "content": json.dumps(
+                                result.payload(), default=str
+                            ),
+                            "is_error": result.is_error,
+                        }
+                        for _, result in tool_round
+                    ],
+                }
+            )
+        if tools:
+            request["tools"] = tools
+        response = await self._scheduler.run(
+            lambda: self.client.messages.create(**request), tokens
+        )
+        return LlmReply(
+            content="".join(
+                block.text
+                for block in response.content
+                if block.type == "text"
+            ),
+            tool_calls=[
+                parse_tool_call(block.id, block.name, block.input)
+                for block in response.content
+                if block.type == "tool_use"
+            ],
+        )
+
+    @classmethod
+    def format_tool(
+        cls, name: str, description: str, parameters: Mapping[str, Any]
+    ) -> dict[str, Any]:
+        return {
+            "name": name,
+            "description": description,
+            "input_schema": dict(parameters),
+        }
+
+    def _build_request(
+        self,
+        prompt: str,
+        history: list[Message] | None,
+        kwargs: dict[str, Any],
+    ) -> dict[str, Any]:
+        """
+        Build the keyword arguments of a Messages API call.
+
+        The system prompt is a top-level parameter in the Anthropic API
+        rather than a message, and `max_tokens` is mandatory.
+        """
+        system_prompt = kwargs.pop("system_prompt", None)
+        messages = [
+            {"role": _ROLES[message.sender], "content": message.content}
+            for message in history or []
+        ]
+        messages.append({"role": "user", "content": prompt})
+        request = {
+            "model": self.model,
+            "max_tokens": kwargs.pop("max_tokens", _DEFAULT_MAX_TOKENS),
+            "messages": messages,
+            **kwargs,
+        }
+        if system_prompt:
+            request["system"] = system_prompt
+        return request
+
+    @staticmethod
+    def _estimate_tokens(
+        request: dict[str, Any], prompt: str, history: list[Message] | None
+    ) -> int:
+        return estimate_tokens(
+            prompt, history, request.get("system"), request["max_tokens"]
+        )
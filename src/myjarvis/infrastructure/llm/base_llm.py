@@ -5,31 +5,153 @@ It contains an abstract base class `BaseLlm` that all specific LLM implementatio
 (e.g., OpenAI, Anthropic, Gemini) must inherit from. This ensures that the application
 can interact with different LLM providers through a consistent interface.
 
-The `BaseLlm` class should define a standard method for generating responses,
-handling chat history, and managing model-specific configurations.
+Two ways of generating a reply are supported:
+- `generate_response`: returns the whole reply once the provider has finished.
+- `stream_response`: yields the reply incrementally as the provider produces
+  it, so callers can forward the first tokens to the user immediately.
 
-Example Implementation:
+Agents with nodes call `generate_with_tools` instead, which offers the nodes'
+commands to the LLM as tools and returns the tool calls it requests. The tool
+definitions are formatted once per provider with `format_tool` and
+`build_tool_block`, and the resulting block is reused across turns.
+
+Tools are named with `tool_name`, and the calls a provider returns are
+converted with `parse_tool_call`.
+"""
 
 from abc import ABC, abstractmethod
+from typing import Any, AsyncIterator, ClassVar, Mapping
+
+from myjarvis.domain.interfaces.llm import LlmReply, ToolRound
 from myjarvis.domain.value_objects.message import Message
+from myjarvis.domain.value_objects.tool_call import parse_tool_call, tool_name
+
 
 class BaseLlm(ABC):
+    """
+    Abstract base class for all LLM provider implementations, implementing
+    the domain's `Llm` interface.
+
+    Both methods accept the same arguments. The agent's base prompt is passed
+    as the `system_prompt` keyword argument and the reply length limit as
+    `max_tokens`; every other keyword argument is forwarded to the provider
+    as-is.
+
+    Attributes:
+        provider: Name of the provider's API dialect; tool blocks built for
+            one provider can be reused by every instance of the same
+            provider.
+    """
+
+    provider: ClassVar[str] = "generic"
+
     @abstractmethod
     async def generate_response(
         self,
         prompt: str,
         history: list[Message] | None = None,
-        **kwargs
+        **kwargs: Any,
     ) -> str:
-        Generates a response from the LLM based on a given prompt and chat history.
+        """
+        Generates a response from the LLM based on a given prompt and chat
+        history.
 
         Args:
             prompt (str): The user's input prompt.
-            history (list[Message] | None): A list of previous messages in the chat
-                                            to provide context. Defaults to None.
+            history (list[Message] | None): A list of previous messages in
+                the chat to provide context. Defaults to None.
             **kwargs: Additional model-specific parameters.
 
         Returns:
             str: The generated text response from the LLM.
+        """
         pass
-"""
+
+    @abstractmethod
+    def stream_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        """
+        Streams a response from the LLM as it is being generated.
+
+        Implementations are async generators, so the returned iterator must be
+        fully consumed (or closed) to release the underlying connection.
+
+        Args:
+            prompt (str): The user's input prompt.
+            history (list[Message] | None): A list of previous messages in
+                the chat to provide context. Defaults to None.
+            **kwargs: Additional model-specific parameters.
+
+        Yields:
+            str: Consecutive text fragments of the response. Joining them gives
+                 the same text `generate_response` would have returned.
+        """
+        pass
+
+    async def generate_with_tools(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        tools: Any = None,
+        tool_rounds: list[ToolRound] | None = None,
+        **kwargs: Any,
+    ) -> LlmReply:
+        """
+        Generates a response that may request tool calls.
+
+        Providers without tool support ignore the tools and reply with text
+        only, which is what this default implementation does.
+
+        Args:
+            prompt (str): The user's input prompt.
+            history (list[Message] | None): A list of previous messages in
+                the chat to provide context. Defaults to None.
+            tools: The tool block built by `build_tool_block`.
+            tool_rounds: The tool calls of the previous responses to this
+                prompt, with their results, oldest first.
+            **kwargs: Additional model-specific parameters.
+
+        Returns:
+            LlmReply: The text of the response and the requested tool calls.
+        """
+        return LlmReply(
+            content=await self.generate_response(prompt, history, **kwargs)
+        )
+
+    @classmethod
+    def format_tool(
+        cls, name: str, description: str, parameters: Mapping[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Format the definition of one tool for the provider's API.
+
+        Args:
+            name: The name of the tool.
+            description: What the tool does.
+            parameters: JSON schema of the tool's parameters.
+
+        Returns:
+            The tool definition.
+        """
+        return {
+            "name": name,
+            "description": description,
+            "parameters": dict(parameters),
+        }
+
+    @classmethod
+    def build_tool_block(cls, tools: list[dict[str, Any]]) -> Any:
+        """
+        Combine formatted tool definitions into the `tools` request argument.
+
+        Args:
+            tools: Tool definitions returned by `format_tool`.
+
+        Returns:
+            The value passed as `tools` to `generate_with_tools`.
+        """
+        return tools
@@ -0,0 +1,183 @@
+"""
+This module provides the process-wide registry of LLM provider clients.
+
+Creating an SDK client per agent or per request means a new TCP connection and
+TLS handshake on every chat turn. The `LlmClientRegistry` instead keeps one
+pooled, keep-alive HTTP client per provider and hands out SDK clients built on
+top of it. It also keeps one `LlmScheduler` per provider, which caps the
+number of in-flight requests and paces them by the provider's rate limits, so
+a burst of chat turns queues locally instead of overloading the provider. The
+scheduler reads the rate-limit headers of every response of the pooled HTTP
+client and retries 429 responses itself, so the SDK clients do not retry.
+Finally, it keeps the `LlmRouter` holding the latencies, circuit breakers and
+counters of the `RoutingLlm` instances.
+
+The registry is created lazily on first use with `get_client_registry` and
+must be closed with `close_client_registry` on application shutdown.
+
+HTTP/2 is used if the `llm_http2` setting enables it and the `h2` package is
+installed; otherwise the clients fall back to HTTP/1.1 connections.
+"""
+
+import importlib.util
+import logging
+
+import httpx
+from anthropic import AsyncAnthropic
+from openai import AsyncOpenAI
+
+from config.settings import Settings, get_settings
+from myjarvis.infrastructure.llm.routing_llm import LlmRouter
+from myjarvis.infrastructure.llm.scheduler import LlmScheduler
+
+logger = logging.getLogger(__name__)
+
+
+class LlmClientRegistry:
+    """
+    Shared, pooled clients and request schedulers for the LLM providers.
+
+    Args:
+        settings: Connection pool and scheduling configuration.
+    """
+
+    def __init__(self, settings: Settings):
+        self._settings = settings
+        self._http_clients: dict[str, httpx.AsyncClient] = {}
+        self._openai_clients: dict[str, AsyncOpenAI] = {}
+        self._anthropic_clients: dict[str, AsyncAnthropic] = {}
+        self._schedulers: dict[str, LlmScheduler] = {}
+        self._router: LlmRouter | None = None
+
+    def http_client(self, provider: str) -> httpx.AsyncClient:
+        """
+        Return the pooled HTTP client of a provider, creating it if needed.
+
+        Args:
+            provider: The provider name, e.g. 'openai'.
+
+        Returns:
+            An `httpx.AsyncClient` shared by all requests to the provider.
+        """
+        if provider not in self._http_clients:
+            self._http_clients[provider] = httpx.AsyncClient(
+                http2=self._http2(),
+                limits=httpx.Limits(
+                    max_connections=self._settings.llm_max_connections,
+                    max_keepalive_connections=(
+                        self._settings.llm_max_keepalive_connections
+                    ),
+                    keepalive_expiry=(
+                        self._settings.llm_keepalive_expiry_seconds
+                    ),
+                ),
+                timeout=self._settings.llm_request_timeout_seconds,
+                event_hooks={
+                    "response": [self.scheduler(provider).observe_response]
+                },
+            )
+        return self._http_clients[provider]
+
+    def _http2(self) -> bool:
+        if not self._settings.llm_http2:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            logger.warning(
+                "HTTP/2 is enabled but the h2 package is not installed; "
+                "falling back to HTTP/1.1."
+            )
+            return False
+        return True
+
+    def openai_client(self, api_key: str) -> AsyncOpenAI:
+        """
+        Return the shared OpenAI SDK client for an API key.
+        """
+        if api_key not in self._openai_clients:
+            self._openai_clients[api_key] = AsyncOpenAI(
+                api_key=api_key,
+                http_client=self.http_client("openai"),
+                max_retries=0,
+            )
+        return self._openai_clients[api_key]
+
+    def anthropic_client(self, api_key: str) -> AsyncAnthropic:
+        """
+        Return the shared Anthropic SDK client for an API key.
+        """
+        if api_key not in self._anthropic_clients:
+            self._anthropic_clients[api_key] = AsyncAnthropic(
+                api_key=api_key,
+                http_client=self.http_client("anthropic"),
+                max_retries=0,
+            )
+        return self._anthropic_clients[api_key]
+
+    def scheduler(self, provider: str) -> LlmScheduler:
+        """
+        Return the scheduler of the requests to a provider.
+
+        Providers without an explicit concurrency limit in the settings are
+        capped at the size of the connection pool.
+        """
+        if provider not in self._schedulers:
+            settings = self._settings
+            self._schedulers[provider] = LlmScheduler(
+                provider,
+                max_concurrency=settings.llm_max_concurrency.get(
+                    provider, settings.llm_max_connections
+                ),
+                queue_timeout=settings.llm_queue_timeout_seconds,
+                max_retries=settings.llm_max_retries,
+                backoff_base=settings.llm_backoff_base_seconds,
+                backoff_max=settings.llm_backoff_max_seconds,
+            )
+        return self._schedulers[provider]
+
+    def router(self) -> LlmRouter:
+        """
+        Return the state shared by the requests routed across providers.
+        """
+        if self._router is None:
+            settings = self._settings
+            self._router = LlmRouter(
+                hedge_percentile=settings.llm_hedge_percentile,
+                hedge_delay=settings.llm_hedge_delay_seconds,
+                min_hedge_delay=settings.llm_hedge_min_delay_seconds,
+                failure_threshold=settings.llm_circuit_failure_threshold,
+                reset_timeout=settings.llm_circuit_reset_seconds,
+            )
+        return self._router
+
+    async def aclose(self) -> None:
+        """
+        Close all pooled connections.
+        """
+        for client in self._http_clients.values():
+            await client.aclose()
+        self._http_clients.clear()
+        self._openai_clients.clear()
+        self._anthropic_clients.clear()
+
+
+_registry: LlmClientRegistry | None = None
+
+
+def get_client_registry() -> LlmClientRegistry:
+    """
+    Return the process-wide client registry.
+    """
+    global _registry
+    if _registry is None:
+        _registry = LlmClientRegistry(get_settings())
+    return _registry
+
+
+async def close_client_registry() -> None:
+    """
+    Close the process-wide client registry, if it was created.
+    """
+    global _registry
+    if _registry is not None:
+        await _registry.aclose()
+        _registry = None
@@ -0,0 +1,121 @@
+"""
+This module defines the interface of text embedding providers.
+
+An embedder maps texts to vectors whose cosine similarity reflects how close
+the texts are in meaning. Two implementations are provided:
+- `OpenAiEmbedder` calls the OpenAI Embeddings API, through the pooled client
+  and the request scheduler of the `LlmClientRegistry`.
+- `HashingEmbedder` hashes the words of a text into a fixed number of
+  dimensions. It needs no external service and always returns the same
+  vector for the same text, which makes it suitable for local development,
+  tests and benchmarks; texts sharing many words are similar.
+"""
+
+import hashlib
+import math
+import os
+import re
+from abc import ABC, abstractmethod
+
+from openai import AsyncOpenAI
+
+from myjarvis.infrastructure.llm.scheduler import LlmScheduler
+
+_WORD_PATTERN = re.compile(r"\w+")
+_CHARS_PER_TOKEN = 4
+
+
+class BaseEmbedder(ABC):
+    """
+    Abstract base class of the text embedding providers.
+
+    Attributes:
+        model: Identifier of the embedding model; vectors of different
+            models must not be compared.
+    """
+
+    model: str
+
+    @abstractmethod
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        """
+        Embed texts.
+
+        Args:
+            texts: The texts to embed.
+
+        Returns:
+            One vector per text, in the order of `texts`.
+        """
+
+
+class OpenAiEmbedder(BaseEmbedder):
+    """
+    Embedder backed by the OpenAI Embeddings API.
+
+    Args:
+        api_key: The OpenAI API key. Read from `OPENAI_API_KEY` if omitted.
+        model: The embedding model to use.
+        client: A shared SDK client. A dedicated client is created if
+            omitted.
+        scheduler: Scheduler of the requests to the provider. A scheduler
+            of this instance's own is created if omitted.
+    """
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str = "text-embedding-3-small",
+        client: AsyncOpenAI | None = None,
+        scheduler: LlmScheduler | None = None,
+    ):
+        self.api_key = api_key or os.getenv("OPENAI_API_KEY")
+        if not self.api_key:
+            raise ValueError("OpenAI API key is not provided.")
+        self.client = client or AsyncOpenAI(api_key=self.api_key)
+        self.model = model
+        self._scheduler = scheduler or LlmScheduler("openai")
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        if not texts:
+            return []
+        response = await self._scheduler.run(
+            lambda: self.client.embeddings.create(
+                model=self.model, input=texts
+            ),
+            sum(len(text) for text in texts) // _CHARS_PER_TOKEN + 1,
+        )
+        ordered = sorted(response.data, key=lambda item: item.index)
+        return [item.embedding for item in ordered]
+
+
+class HashingEmbedder(BaseEmbedder):
+    """
+    Deterministic, in-process embedder hashing words into `dimensions`.
+
+    Each word adds +1 or -1, chosen by its hash, to the dimension its hash
+    selects; the vector is then normalized to unit length.
+
+    Args:
+        dimensions: Length of the vectors.
+    """
+
+    def __init__(self, dimensions: int = 512):
+        self.dimensions = dimensions
+        self.model = f"hashing-{dimensions}"
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        return [self._embed(text) for text in texts]
+
+    def _embed(self, text: str) -> list[float]:
+        vector = [0.0] * self.dimensions
+        for word in _WORD_PATTERN.findall(text.casefold()):
+            digest = int.from_bytes(
+                hashlib.blake2b(word.encode(), digest_size=8).digest(), "big"
+            )
+            sign = 1.0 if digest & 1 else -1.0
+            vector[(digest >> 1) % self.dimensions] += sign
+        norm = math.sqrt(sum(value * value for value in vector))
+        if norm:
+            vector = [value / norm for value in vector]
+        return vector
@@ -0,0 +1,62 @@
+"""
+This module provides a fake LLM provider.
+
+The `FakeLlm` class implements `BaseLlm` without calling any external service.
+It replies with a fixed text and simulates the latency profile of a real
+provider: a delay before the first token and a delay between the following
+tokens. It is meant for local development, tests and benchmarks.
+"""
+
+import asyncio
+import re
+from typing import Any, AsyncIterator
+
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.infrastructure.llm.base_llm import BaseLlm
+
+_TOKEN_PATTERN = re.compile(r"\S+\s*|\s+")
+
+
+class FakeLlm(BaseLlm):
+    """
+    Deterministic, in-process stand-in for a streaming LLM provider.
+
+    Args:
+        reply: The text returned for every prompt.
+        first_token_delay: Seconds to wait before the first token.
+        token_delay: Seconds to wait between consecutive tokens.
+    """
+
+    provider = "fake"
+
+    def __init__(
+        self,
+        reply: str = "This is a reply from the fake LLM.",
+        first_token_delay: float = 0.0,
+        token_delay: float = 0.0,
+    ):
+        self.reply = reply
+        self.first_token_delay = first_token_delay
+        self.token_delay = token_delay
+
+    async def generate_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> str:
+        return "".join(
+            [chunk async for chunk in self.stream_response(prompt, history)]
+        )
+
+    async def stream_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        await asyncio.sleep(self.first_token_delay)
+        for index, token in enumerate(_TOKEN_PATTERN.findall(self.reply)):
+            if index:
+                await asyncio.sleep(self.token_delay)
+            yield token
@@ -3,33 +3,223 @@ This module provides the implementation for interacting with Google's Gemini LLM
 
 It contains the `GeminiLlm` class that inherits from `BaseLlm`. This class is
 responsible for connecting to the Google AI Platform and using the Gemini models
-to generate text responses. It will handle authentication (e.g., API key),
+to generate text responses. It handles authentication (e.g., API key),
 model selection (e.g., "gemini-pro"), and the request/response lifecycle for the
 Google Generative AI API.
-
-Example Implementation:
+"""
 
 import os
+from typing import Any, AsyncIterator
+
 import google.generativeai as genai
-from myjarvis.domain.value_objects.message import Message
-from myjarvis.infrastructure.llm.base_llm import BaseLlm
+
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.infrastructure.llm.base_llm import (
+    BaseLlm,
+    LlmReply,
+    ToolRound,
+    parse_tool_call,
+    tool_name,
+)
+from myjarvis.infrastructure.llm.scheduler import LlmScheduler, estimate_tokens
+
+_ROLES = {Sender.USER: "user", Sender.AGENT: "model"}
+_configured_api_key: str | None = None
+
 
 class GeminiLlm(BaseLlm):
-    def __init__(self, api_key: str | None = None, model: str = "gemini-pro"):
+    """
+    LLM provider backed by the Google Generative AI API.
+
+    The SDK keeps a single transport per process once `genai.configure` has
+    been called, so connections are already shared between instances.
+
+    Args:
+        api_key: The Google API key. Read from `GOOGLE_API_KEY` if omitted.
+        model: The model to use.
+        scheduler: Scheduler of the requests to the provider. A scheduler
+            of this instance's own is created if omitted.
+    """
+
+    provider = "gemini"
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str = "gemini-pro",
+        scheduler: LlmScheduler | None = None,
+    ):
         self.api_key = api_key or os.getenv("GOOGLE_API_KEY")
         if not self.api_key:
             raise ValueError("Google API key is not provided.")
-        genai.configure(api_key=self.api_key)
+        _configure(self.api_key)
+        self.model_name = model
         self.model = genai.GenerativeModel(model)
+        self._scheduler = scheduler or LlmScheduler(self.provider)
 
     async def generate_response(
         self,
         prompt: str,
         history: list[Message] | None = None,
-        **kwargs
+        **kwargs: Any,
     ) -> str:
-        # Implementation to call the Google Gemini API.
-        # It might need to start a chat session from the history
-        # and then send the new prompt.
-        pass
-"""
+        system_prompt = kwargs.pop("system_prompt", None)
+        tokens = estimate_tokens(
+            prompt, history, system_prompt, kwargs.get("max_tokens")
+        )
+        chat = self._start_chat(history, system_prompt)
+        options = _generation_options(kwargs)
+        response = await self._scheduler.run(
+            lambda: chat.send_message_async(prompt, **options), tokens
+        )
+        return response.text
+
+    async def stream_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        system_prompt = kwargs.pop("system_prompt", None)
+        tokens = estimate_tokens(
+            prompt, history, system_prompt, kwargs.get("max_tokens")
+        )
+        chat = self._start_chat(history, system_prompt)
+        options = _generation_options(kwargs)
+        for attempt in self._scheduler.attempts(tokens):
+            async with attempt:
+                response = await chat.send_message_async(
+                    prompt, stream=True, **options
+                )
+                async for chunk in response:
+                    if chunk.text:
+                        yield chunk.text
+
+    async def generate_with_tools(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        tools: Any = None,
+        tool_rounds: list[ToolRound] | None = None,
+        **kwargs: Any,
+    ) -> LlmReply:
+        system_prompt = kwargs.pop("system_prompt", None)
+        tokens = estimate_tokens(
+            prompt, history, system_prompt, kwargs.get("max_tokens")
+        )
+        model = self._model(system_prompt)
+        contents = _contents(history)
+        contents.append({"role": "user", "parts": [prompt]})
+        for tool_round in tool_rounds or []:
+            contents.append(
+                {
+                    "role": "model",
+                    "parts": [
+                        {
+                            "function_call": {
+                                "name": tool_name(call.node, call.command),
+                                "args": call.params,
+                            }
+                        }
+                        for call, _ in tool_round
+                    ],
+                }
+            )
+            contents.append(
+                {
+                    "role": "user",
+                    "parts": [
+                        {
+                            "function_response": {
+                                "name": tool_name(result.node, result.command),
+                                "response": result.payload(),
+                            }
+                        }
+                        for _, result in tool_round
+                    ],
+                }
+            )
+        if tools:
+            kwargs["tools"] = tools
+        options = _generation_options(kwargs)
+        response = await self._scheduler.run(
+            lambda: model.generate_content_async(contents, **options), tokens
+        )
+        text = []
+        tool_calls = []
+        for part in response.candidates[0].content.parts:
+            if part.function_call:
+                call = type(part.function_call).to_dict(part.function_call)
+                # Gemini does not assign ids to function calls.
+                tool_calls.append(
+                    parse_tool_call(
+                        f"call-{len(tool_calls)}",
+                        call["name"],
+                        call.get("args"),
+                    )
+                )
+            elif part.text:
+                text.append(part.text)
+        return LlmReply(content="".join(text), tool_calls=tool_calls)
+
+    @classmethod
+    def build_tool_block(cls, tools: list[dict[str, Any]]) -> Any:
+        return [{"function_declarations": tools}]
+
+    def _start_chat(
+        self, history: list[Message] | None, system_prompt: str | None
+    ) -> genai.ChatSession:
+        """
+        Start a chat session seeded with the previous messages.
+        """
+        return self._model(system_prompt).start_chat(
+            history=_contents(history)
+        )
+
+    def _model(self, system_prompt: str | None) -> genai.GenerativeModel:
+        """
+        Return the model to send a request to.
+
+        The system instruction is part of the model configuration in the
+        Gemini API, so a dedicated model instance is used when one is given.
+        """
+        if not system_prompt:
+            return self.model
+        return genai.GenerativeModel(
+            self.model_name, system_instruction=system_prompt
+        )
+
+
+def _contents(history: list[Message] | None) -> list[dict[str, Any]]:
+    """
+    Convert the chat history to Gemini contents.
+    """
+    return [
+        {"role": _ROLES[message.sender], "parts": [message.content]}
+        for message in history or []
+    ]
+
+
+def _generation_options(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """
+    Translate the common `max_tokens` option to the Gemini equivalent.
+    """
+    if "max_tokens" in kwargs:
+        kwargs["generation_config"] = {
+            **kwargs.get("generation_config", {}),
+            "max_output_tokens": kwargs.pop("max_tokens"),
+        }
+    return kwargs
+
+
+def _configure(api_key: str) -> None:
+    """
+    Configure the SDK, keeping its transport if the key has not changed.
+
+    `genai.configure` replaces the process-wide client, so calling it for
+    every provider instance would drop the pooled connection.
+    """
+    global _configured_api_key
+    if api_key != _configured_api_key:
+        genai.configure(api_key=api_key)
+        _configured_api_key = api_key
@@ -0,0 +1,141 @@
+"""
+This module maps an agent's `llm_model` identifier to an LLM provider.
+
+Agents store the model they use as a single string, either a bare model name
+(e.g. "gpt-4", "claude-3-opus-20240229", "gemini-pro") or a model name
+prefixed with its provider (e.g. "openai-gpt-4"). `create_llm` resolves that
+string to the matching `BaseLlm` implementation.
+
+Providers are cheap to create: they share the pooled SDK clients and the
+request schedulers of the process-wide `LlmClientRegistry`.
+
+`create_embedder` does the same for the embedding models: "hashing" selects
+the in-process `HashingEmbedder`, any other name an OpenAI model.
+
+A model with a secondary model in the `llm_fallback_models` setting is wrapped
+in a `RoutingLlm`, which hedges slow requests to the secondary and falls back
+to it when the primary fails.
+"""
+
+import os
+
+from config.settings import get_settings
+from myjarvis.infrastructure.llm.anthropic_llm import AnthropicLlm
+from myjarvis.infrastructure.llm.base_llm import BaseLlm
+from myjarvis.infrastructure.llm.client_registry import get_client_registry
+from myjarvis.infrastructure.llm.embedder import (
+    BaseEmbedder,
+    HashingEmbedder,
+    OpenAiEmbedder,
+)
+from myjarvis.infrastructure.llm.fake_llm import FakeLlm
+from myjarvis.infrastructure.llm.gemini_llm import GeminiLlm
+from myjarvis.infrastructure.llm.openai_llm import OpenAiLlm
+from myjarvis.infrastructure.llm.routing_llm import RoutingLlm
+
+_PROVIDER_PREFIXES = {
+    "openai-": "openai",
+    "anthropic-": "anthropic",
+    "google-": "gemini",
+}
+_MODEL_FAMILIES = {
+    "gpt-": "openai",
+    "o1": "openai",
+    "claude-": "anthropic",
+    "gemini-": "gemini",
+}
+
+
+def create_llm(llm_model: str) -> BaseLlm:
+    """
+    Create the LLM provider for a model identifier.
+
+    The identifier "fake" returns a `FakeLlm`, which is useful for local
+    development without API keys.
+
+    Args:
+        llm_model: The model identifier stored on the agent.
+
+    Returns:
+        A provider instance configured for the requested model.
+
+    Raises:
+        ValueError: If the identifier does not match any known provider.
+    """
+    secondary = get_settings().llm_fallback_models.get(llm_model)
+    if secondary is None:
+        return _create_provider(llm_model)
+    return RoutingLlm(
+        _create_provider(llm_model),
+        _create_provider(secondary),
+        get_client_registry().router(),
+        llm_model,
+    )
+
+
+def _create_provider(llm_model: str) -> BaseLlm:
+    if llm_model == "fake":
+        return FakeLlm()
+    provider, model = resolve_provider(llm_model)
+    registry = get_client_registry()
+    if provider == "openai":
+        api_key = os.getenv("OPENAI_API_KEY", "")
+        return OpenAiLlm(
+            api_key=api_key,
+            model=model,
+            client=registry.openai_client(api_key) if api_key else None,
+            scheduler=registry.scheduler(provider),
+        )
+    if provider == "anthropic":
+        api_key = os.getenv("ANTHROPIC_API_KEY", "")
+        return AnthropicLlm(
+            api_key=api_key,
+            model=model,
+            client=registry.anthropic_client(api_key) if api_key else None,
+            scheduler=registry.scheduler(provider),
+        )
+    return GeminiLlm(model=model, scheduler=registry.scheduler(provider))
+
+
+def create_embedder(model: str) -> BaseEmbedder:
+    """
+    Create the embedder of an embedding model.
+
+    Args:
+        model: "hashing", or the name of an OpenAI embedding model.
+
+    Returns:
+        An embedder of the requested model.
+    """
+    if model == "hashing":
+        return HashingEmbedder()
+    registry = get_client_registry()
+    api_key = os.getenv("OPENAI_API_KEY", "")
+    return OpenAiEmbedder(
+        api_key=api_key,
+        model=model,
+        client=registry.openai_client(api_key) if api_key else None,
+        scheduler=registry.scheduler("openai"),
+    )
+
+
+def resolve_provider(llm_model: str) -> tuple[str, str]:
+    """
+    Split a model identifier into the provider name and the model name.
+
+    Args:
+        llm_model: The model identifier stored on the agent.
+
+    Returns:
+        A `(provider, model)` tuple, e.g. `("openai", "gpt-4")`.
+
+    Raises:
+        ValueError: If the identifier does not match any known provider.
+    """
+    for prefix, provider in _PROVIDER_PREFIXES.items():
+        if llm_model.startswith(prefix):
+            return provider, llm_model.removeprefix(prefix)
+    for family, provider in _MODEL_FAMILIES.items():
+        if llm_model.startswith(family):
+            return provider, llm_model
+    raise ValueError(f"Unsupported LLM model: {llm_model!r}")
@@ -3,32 +3,184 @@ This module provides the implementation for interacting with OpenAI's LLMs.
 
 It contains the `OpenAiLlm` class that inherits from `BaseLlm` and implements
 the necessary methods to generate responses using the OpenAI API. This class
-will handle API key management, model selection (e.g., "gpt-4", "gpt-3.5-turbo"),
+handles API key management, model selection (e.g., "gpt-4", "gpt-3.5-turbo"),
 and formatting requests and responses according to the OpenAI API specifications.
+"""
 
-Example Implementation:
-
+import json
 import os
+from typing import Any, AsyncIterator, Mapping
+
 from openai import AsyncOpenAI
-from myjarvis.domain.value_objects.message import Message
-from myjarvis.infrastructure.llm.base_llm import BaseLlm
+
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.infrastructure.llm.base_llm import (
+    BaseLlm,
+    LlmReply,
+    ToolRound,
+    parse_tool_call,
+    tool_name,
+)
+from myjarvis.infrastructure.llm.scheduler import LlmScheduler, estimate_tokens
+
+_ROLES = {Sender.USER: "user", Sender.AGENT: "assistant"}
+
 
 class OpenAiLlm(BaseLlm):
-    def __init__(self, api_key: str | None = None, model: str = "gpt-4"):
+    """
+    LLM provider backed by the OpenAI Chat Completions API.
+
+    Args:
+        api_key: The OpenAI API key. Read from `OPENAI_API_KEY` if omitted.
+        model: The model to use.
+        client: A shared SDK client. A dedicated client is created if
+            omitted.
+        scheduler: Scheduler of the requests to the provider. A scheduler
+            of this instance's own is created if omitted.
+    """
+
+    provider = "openai"
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str = "gpt-4",
+        client: AsyncOpenAI | None = None,
+        scheduler: LlmScheduler | None = None,
+    ):
         self.api_key = api_key or os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             raise ValueError("OpenAI API key is not provided.")
-        self.client = AsyncOpenAI(api_key=self.api_key)
+        self.client = client or AsyncOpenAI(api_key=self.api_key)
         self.model = model
+        self._scheduler = scheduler or LlmScheduler(self.provider)
 
     async def generate_response(
         self,
         prompt: str,
         history: list[Message] | None = None,
-        **kwargs
+        **kwargs: Any,
     ) -> str:
-        # Implementation to call the OpenAI API
-        # It should format the history and prompt into the required
-        # message format for the OpenAI client.
-        pass
-"""
+        system_prompt = kwargs.pop("system_prompt", None)
+        messages = self._build_messages(prompt, history, system_prompt)
+        response = await self._scheduler.run(
+            lambda: self.client.chat.completions.create(
+                model=self.model, messages=messages, **kwargs
+            ),
+            estimate_tokens(
+                prompt, history, system_prompt, kwargs.get("max_tokens")
+            ),
+        )
+        return response.choices[0].message.content or ""
+
+    async def stream_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        system_prompt = kwargs.pop("system_prompt", None)
+        messages = self._build_messages(prompt, history, system_prompt)
+        tokens = estimate_tokens(
+            prompt, history, system_prompt, kwargs.get("max_tokens")
+        )
+        for attempt in self._scheduler.attempts(tokens):
+            async with attempt:
+                stream = await self.client.chat.completions.create(
+                    model=self.model, messages=messages, stream=True, **kwargs
+                )
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        yield chunk.choices[0].delta.content
+
+    async def generate_with_tools(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        tools: Any = None,
+        tool_rounds: list[ToolRound] | None = None,
+        **kwargs: Any,
+    ) -> LlmReply:
+        system_prompt = kwargs.pop("system_prompt", None)
+        messages = self._build_messages(prompt, history, system_prompt)
+        tokens = estimate_tokens(
+            prompt, history, system_prompt, kwargs.get("max_tokens")
+        )
+        for tool_round in tool_rounds or []:
+            messages.append(
+                {
+                    "role": "assistant",
+                    "content": None,
+                    "tool_calls": [
+                        {
+                            "id": call.call_id,
+                            "type": "function",
+                            "function": {
+                                "name": tool_name(call.node, call.command),
+                                "arguments": json.dumps(call.params),
+                            },
+                        }
+                        for call, _ in tool_round
+                    ],
+                }
+            )
+            messages.extend(
+                {
+                    "role": "tool",
+                    "tool_call_id": result.call_id,
+                    "content": json.dumps(result.payload(), default=str),
+                }
+                for _, result in tool_round
+            )
+        if tools:
+            kwargs["tools"] = tools
+        response = await self._scheduler.run(
+            lambda: self.client.chat.completions.create(
+                model=self.model, messages=messages, **kwargs
+            ),
+            tokens,
+        )
+        message = response.choices[0].message
+        return LlmReply(
+            content=message.content or "",
+            tool_calls=[
+                parse_tool_call(
+                    call.id,
+                    call.function.name,
+                    json.loads(call.function.arguments or "{}"),
+                )
+                for call in message.tool_calls or []
+            ],
+        )
+
+    @classmethod
+    def format_tool(
+        cls, name: str, description: str, parameters: Mapping[str, Any]
+    ) -> dict[str, Any]:
+        return {
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": description,
+                "parameters": dict(parameters),
+            },
+        }
+
+    @staticmethod
+    def _build_messages(
+        prompt: str,
+        history: list[Message] | None,
+        system_prompt: str | None,
+    ) -> list[dict[str, Any]]:
+        """
+        Convert the prompt and chat history to OpenAI chat messages.
+        """
+        messages = []
+        if system_prompt:
+            messages.append({"role": "system", "content": system_prompt})
+        for message in history or []:
+            messages.append(
+                {"role": _ROLES[message.sender], "content": message.content}
+            )
+        messages.append({"role": "user", "content": prompt})
+        return messages
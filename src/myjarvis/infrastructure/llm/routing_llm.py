@@ -0,0 +1,477 @@
+"""
+This module provides an LLM that routes requests across two providers.
+
+An agent's `llm_model` pins a single provider, so a slow or failing provider
+shows up directly in the agent's tail latency. A `RoutingLlm` wraps the
+agent's provider (the primary) and a secondary model, usually of another
+provider, configured in `llm_fallback_models`:
+
+- Hedging: a request is sent to the primary first. If it has not answered
+  after the primary's recent p95 latency, the same request is also sent to
+  the secondary. The first answer is kept and the other request is
+  cancelled. Streams are hedged on the time to their first chunk; once a
+  chunk has been yielded, the stream stays with its provider.
+- Fallback: when the primary fails, or its circuit is open, the request is
+  sent to the secondary.
+- Circuit breakers: every provider has a `CircuitBreaker`. After
+  `failure_threshold` consecutive failures it opens and the provider is
+  skipped for `reset_timeout` seconds; then a single probe request is let
+  through, which closes the circuit again if it succeeds. If both circuits
+  are open, `LlmOverloadedError` is raised at once.
+
+The latency samples, the circuit breakers and the counters are kept by the
+process-wide `LlmRouter` of the `LlmClientRegistry`, so they are shared by
+all chat turns; `LlmRouter.stats` returns a snapshot of the counters.
+"""
+
+import asyncio
+import math
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.infrastructure.llm.base_llm import BaseLlm, LlmReply, ToolRound
+from myjarvis.infrastructure.llm.scheduler import LlmOverloadedError
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True, slots=True)
+class RoutingStats:
+    """
+    Counters of the requests routed by an `LlmRouter`.
+
+    Attributes:
+        requests: Requests routed.
+        hedges: Requests also sent to the secondary because the primary was
+            slow.
+        hedge_wins: Hedged requests answered first by the secondary.
+        fallbacks: Requests sent to the secondary because the primary failed
+            or its circuit was open.
+        circuit_opens: Times a provider's circuit opened.
+    """
+
+    requests: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+    fallbacks: int = 0
+    circuit_opens: int = 0
+
+
+class CircuitBreaker:
+    """
+    Stops sending requests to a provider after consecutive failures.
+
+    Args:
+        failure_threshold: Consecutive failures opening the circuit.
+        reset_timeout: Seconds the circuit stays open before a probe request
+            is let through.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._probing = False
+
+    @property
+    def state(self) -> str:
+        """
+        'closed', 'open' or 'half-open' (open, but due for a probe).
+        """
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_timeout:
+            return "open"
+        return "half-open"
+
+    def retry_after(self) -> float:
+        """
+        Seconds until the circuit lets a probe request through.
+        """
+        if self._opened_at is None:
+            return 0.0
+        elapsed = time.monotonic() - self._opened_at
+        return max(0.0, self.reset_timeout - elapsed)
+
+    def allow(self) -> bool:
+        """
+        Return whether a request may be sent, counting it as the probe when
+        the circuit is half-open.
+        """
+        state = self.state
+        if state == "closed":
+            return True
+        if state == "open" or self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._probing = False
+
+    def failure(self) -> bool:
+        """
+        Record a failed request.
+
+        Returns:
+            True if the failure opened the circuit.
+        """
+        self._failures += 1
+        if self._probing or (
+            self._opened_at is None
+            and self._failures >= self.failure_threshold
+        ):
+            self._probing = False
+            self._opened_at = time.monotonic()
+            return True
+        return False
+
+    def abandon(self) -> None:
+        """
+        Record a request cancelled before it completed.
+        """
+        self._probing = False
+
+
+class LatencyTracker:
+    """
+    Percentile of the latency of the last `window` requests.
+
+    Args:
+        window: Number of latency samples kept.
+        min_samples: Samples needed before `percentile` returns a value.
+    """
+
+    def __init__(self, window: int = 200, min_samples: int = 20):
+        self.min_samples = min_samples
+        self._samples: deque[float] = deque(maxlen=window)
+
+    def record(self, seconds: float) -> None:
+        self._samples.append(seconds)
+
+    def percentile(self, fraction: float) -> float | None:
+        """
+        Return the latency below which `fraction` of the samples fall, or
+        None if there are not enough samples yet.
+        """
+        if len(self._samples) < self.min_samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, math.ceil(fraction * len(ordered)) - 1)
+        return ordered[max(0, index)]
+
+
+class LlmRouter:
+    """
+    Process-wide state of the `RoutingLlm` instances.
+
+    Args:
+        hedge_percentile: Latency percentile of the primary after which a
+            request is hedged.
+        hedge_delay: Hedge delay used until enough latencies of the primary
+            were observed.
+        min_hedge_delay: Lower bound of the hedge delay.
+        failure_threshold: Consecutive failures opening a circuit.
+        reset_timeout: Seconds a circuit stays open.
+        latency_window: Latency samples kept per model and method.
+    """
+
+    def __init__(
+        self,
+        hedge_percentile: float = 0.95,
+        hedge_delay: float = 2.0,
+        min_hedge_delay: float = 0.05,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        latency_window: int = 200,
+    ):
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay = hedge_delay
+        self.min_hedge_delay = min_hedge_delay
+        self._failure_threshold = failure_threshold
+        self._reset_timeout = reset_timeout
+        self._latency_window = latency_window
+        self._breakers: dict[str, CircuitBreaker] = {}
+        self._latencies: dict[tuple[str, str], LatencyTracker] = {}
+        self._stats = RoutingStats()
+
+    @property
+    def stats(self) -> RoutingStats:
+        return self._stats
+
+    def count(self, **increments: int) -> None:
+        self._stats = replace(
+            self._stats,
+            **{
+                name: getattr(self._stats, name) + value
+                for name, value in increments.items()
+            },
+        )
+
+    def breaker(self, provider: str) -> CircuitBreaker:
+        """
+        Return the circuit breaker of a provider, creating it if needed.
+        """
+        if provider not in self._breakers:
+            self._breakers[provider] = CircuitBreaker(
+                self._failure_threshold, self._reset_timeout
+            )
+        return self._breakers[provider]
+
+    def latency(self, model: str, method: str) -> LatencyTracker:
+        """
+        Return the latency samples of a method of a model.
+        """
+        key = (model, method)
+        if key not in self._latencies:
+            self._latencies[key] = LatencyTracker(self._latency_window)
+        return self._latencies[key]
+
+    def hedge_after(self, model: str, method: str) -> float:
+        """
+        Return the seconds after which a request to a model is hedged.
+        """
+        latency = self.latency(model, method).percentile(self.hedge_percentile)
+        if latency is None:
+            return self.hedge_delay
+        return max(self.min_hedge_delay, latency)
+
+
+class RoutingLlm(BaseLlm):
+    """
+    Sends requests to a primary LLM, hedged and backed by a secondary one.
+
+    The tool block offered to a `RoutingLlm` uses the generic tool format of
+    `BaseLlm`; it is converted to the format of each provider on use.
+
+    Args:
+        primary: The agent's own provider.
+        secondary: The provider hedging and replacing the primary.
+        router: The process-wide latencies, circuit breakers and counters.
+        model: The primary's model identifier, which its latency samples are
+            kept under.
+    """
+
+    provider = "routing"
+
+    def __init__(
+        self,
+        primary: BaseLlm,
+        secondary: BaseLlm,
+        router: LlmRouter,
+        model: str,
+    ):
+        self.primary = primary
+        self.secondary = secondary
+        self._router = router
+        self._model = model
+        self._tool_blocks: dict[str, tuple[Any, Any]] = {}
+
+    async def generate_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> str:
+        return await self._route(
+            "generate_response",
+            lambda llm: llm.generate_response(prompt, history, **kwargs),
+        )
+
+    async def generate_with_tools(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        tools: Any = None,
+        tool_rounds: list[ToolRound] | None = None,
+        **kwargs: Any,
+    ) -> LlmReply:
+        return await self._route(
+            "generate_with_tools",
+            lambda llm: llm.generate_with_tools(
+                prompt,
+                history,
+                tools=self._tools_for(llm, tools),
+                tool_rounds=tool_rounds,
+                **kwargs,
+            ),
+        )
+
+    async def stream_response(
+        self,
+        prompt: str,
+        history: list[Message] | None = None,
+        **kwargs: Any,
+    ) -> AsyncIterator[str]:
+        async def first_chunk(
+            llm: BaseLlm,
+        ) -> tuple[AsyncIterator[str], str | None]:
+            stream = llm.stream_response(prompt, history, **kwargs)
+            try:
+                return stream, await anext(stream)
+            except StopAsyncIteration:
+                return stream, None
+            except BaseException:
+                await stream.aclose()
+                raise
+
+        async def discard(opened: tuple[AsyncIterator[str], Any]) -> None:
+            await opened[0].aclose()
+
+        stream, first = await self._route(
+            "stream_response", first_chunk, discard
+        )
+        try:
+            if first is None:
+                return
+            yield first
+            async for chunk in stream:
+                yield chunk
+        finally:
+            await stream.aclose()
+
+    def _tools_for(self, llm: BaseLlm, tools: Any) -> Any:
+        """
+        Convert a generic tool block to the format of a provider.
+        """
+        if tools is None:
+            return None
+        cached = self._tool_blocks.get(llm.provider)
+        if cached is None or cached[0] is not tools:
+            llm_class = type(llm)
+            block = llm_class.build_tool_block(
+                [
+                    llm_class.format_tool(
+                        tool["name"], tool["description"], tool["parameters"]
+                    )
+                    for tool in tools
+                ]
+            )
+            cached = self._tool_blocks[llm.provider] = (tools, block)
+        return cached[1]
+
+    async def _route(
+        self,
+        method: str,
+        call: Callable[[BaseLlm], Awaitable[T]],
+        discard: Callable[[T], Awaitable[None]] | None = None,
+    ) -> T:
+        """
+        Run `call` on the primary, hedged or replaced by the secondary.
+
+        Args:
+            method: The name of the routed method; latencies are kept per
+                method.
+            call: Sends the request to a provider.
+            discard: Releases the result of a request that completed but
+                lost the race.
+        """
+        router = self._router
+        router.count(requests=1)
+        primary_breaker = router.breaker(self.primary.provider)
+        secondary_breaker = router.breaker(self.secondary.provider)
+        if not primary_breaker.allow():
+            if not secondary_breaker.allow():
+                raise LlmOverloadedError(
+                    f"The circuits of {self.primary.provider} and "
+                    f"{self.secondary.provider} are open",
+                    min(
+                        primary_breaker.retry_after(),
+                        secondary_breaker.retry_after(),
+                    ),
+                )
+            router.count(fallbacks=1)
+            return await self._attempt(self.secondary, call)
+
+        primary = asyncio.create_task(
+            self._attempt(
+                self.primary, call, router.latency(self._model, method)
+            )
+        )
+        try:
+            done, _ = await asyncio.wait(
+                {primary}, timeout=router.hedge_after(self._model, method)
+            )
+        except BaseException:
+            await self._cancel({primary}, discard)
+            raise
+        if done:
+            error = primary.exception()
+            if error is None:
+                return primary.result()
+            if not secondary_breaker.allow():
+                raise error
+            router.count(fallbacks=1)
+            return await self._attempt(self.secondary, call)
+        if not secondary_breaker.allow():
+            return await primary
+
+        router.count(hedges=1)
+        secondary = asyncio.create_task(self._attempt(self.secondary, call))
+        pending = {primary, secondary}
+        try:
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                winner = next(
+                    (task for task in done if task.exception() is None), None
+                )
+                if winner is None:
+                    continue
+                for task in done - {winner}:
+                    if discard is not None and task.exception() is None:
+                        await discard(task.result())
+                if winner is secondary:
+                    router.count(hedge_wins=1)
+                return winner.result()
+        finally:
+            await self._cancel(pending, discard)
+        raise primary.exception()
+
+    async def _attempt(
+        self,
+        llm: BaseLlm,
+        call: Callable[[BaseLlm], Awaitable[T]],
+        latency: LatencyTracker | None = None,
+    ) -> T:
+        breaker = self._router.breaker(llm.provider)
+        started = time.monotonic()
+        try:
+            result = await call(llm)
+        except asyncio.CancelledError:
+            breaker.abandon()
+            raise
+        except Exception:
+            if breaker.failure():
+                self._router.count(circuit_opens=1)
+            raise
+        breaker.success()
+        if latency is not None:
+            latency.record(time.monotonic() - started)
+        return result
+
+    @staticmethod
+    async def _cancel(
+        tasks: set[asyncio.Task],
+        discard: Callable[[Any], Awaitable[None]] | None,
+    ) -> None:
+        """
+        Cancel the losing requests and release those that completed anyway.
+        """
+        if not tasks:
+            return
+        for task in tasks:
+            task.cancel()
+        await asyncio.wait(tasks)
+        for task in tasks:
+            if task.cancelled() or task.exception() is not None:
+                continue
+            if discard is not None:
+                await discard(task.result())
@@ -0,0 +1,573 @@
+"""
+This module provides the rate-aware scheduler of outbound LLM requests.
+
+Providers enforce request and token budgets per time window and answer
+429 Too Many Requests once a budget is spent. Sending every chat turn straight
+to the provider, with every SDK client retrying on its own, turns a short
+overload into a retry storm. An `LlmScheduler` per provider sits in front of
+the provider's API instead:
+
+- It tracks the request and token budgets from the rate-limit headers of the
+  provider's responses (`x-ratelimit-*` for OpenAI, `anthropic-ratelimit-*`
+  for Anthropic). Both providers refill a budget continuously, so the
+  scheduler assumes it refills at the rate the last response implies, and
+  holds a request back until the budget has room for it.
+- Waiting requests are queued per caller (`llm_caller`, the user on whose
+  behalf the request is sent) and the callers take turns, so a user sending
+  many requests does not hold up the others.
+- At most `max_concurrency` requests are in flight.
+- A 429 response pauses the provider for its `Retry-After` delay, or for an
+  exponential backoff when it gives none. The rejected request is retried
+  after that delay plus a random jitter, so the rejected requests do not all
+  come back at the same moment. The SDK clients' own retries are disabled.
+- A request must be sent within `queue_timeout` seconds of its first attempt.
+  If the wait predicted from the budgets, or the backoff after a 429, would
+  miss that deadline, `LlmOverloadedError` is raised at once. A request
+  that times out or is cancelled while waiting leaves the queue at once, so
+  it no longer counts against the budget of the requests behind it.
+
+Budgets are learned from responses, so requests are not held back before
+the first response of the provider; providers that send no rate-limit
+headers (Gemini) are only paced by their 429 responses.
+"""
+
+import asyncio
+import itertools
+import math
+import random
+import re
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Awaitable, Callable, Iterator, Mapping, TypeVar
+
+import httpx
+
+from myjarvis.domain.interfaces.llm import llm_caller
+from myjarvis.domain.value_objects.message import Message
+
+T = TypeVar("T")
+
+# Tokens counted for a reply whose length is not limited by the request.
+DEFAULT_REPLY_TOKENS = 1024
+_CHARS_PER_TOKEN = 4
+# Fraction of the backoff added at random to the delay of a retry.
+_JITTER = 0.5
+
+# Rate-limit headers, by provider: a common prefix, and the names of the
+# limit, the remaining budget and the time to reset of the request and of the
+# token budget.
+_BUDGET_HEADERS = (
+    (
+        "x-ratelimit-",
+        (
+            ("limit-requests", "remaining-requests", "reset-requests"),
+            ("limit-tokens", "remaining-tokens", "reset-tokens"),
+        ),
+    ),
+    (
+        "anthropic-ratelimit-",
+        (
+            ("requests-limit", "requests-remaining", "requests-reset"),
+            ("tokens-limit", "tokens-remaining", "tokens-reset"),
+        ),
+    ),
+)
+_DURATION = re.compile(r"(?:\d+(?:\.\d+)?(?:ms|s|m|h))+")
+_DURATION_PART = re.compile(r"(\d+(?:\.\d+)?)(ms|s|m|h)")
+_DURATION_UNITS = {"ms": 0.001, "s": 1.0, "m": 60.0, "h": 3600.0}
+
+
+class LlmOverloadedError(Exception):
+    """
+    Raised when a request cannot be sent to the provider before its deadline.
+
+    Attributes:
+        retry_after: Seconds after which the provider is expected to accept
+            requests again.
+    """
+
+    def __init__(self, message: str, retry_after: float):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+def estimate_tokens(
+    prompt: str,
+    history: list[Message] | None,
+    system_prompt: str | None,
+    max_tokens: int | None,
+) -> int:
+    """
+    Estimate the tokens a request counts against the provider's budget.
+
+    Providers count the prompt and the longest possible reply. The prompt
+    is approximated from its length, which is close enough for pacing.
+    """
+    chars = len(prompt) + len(system_prompt or "")
+    chars += sum(len(message.content) for message in history or [])
+    reply = DEFAULT_REPLY_TOKENS if max_tokens is None else max_tokens
+    return math.ceil(chars / _CHARS_PER_TOKEN) + reply
+
+
+def _parse_delay(value: str | None) -> float | None:
+    """
+    Parse a delay: seconds ('1.5'), a duration ('6m0s', '20ms') or a time
+    (ISO 8601 or HTTP date).
+
+    Returns:
+        The delay in seconds from now, or None if it cannot be parsed.
+    """
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    if _DURATION.fullmatch(value):
+        return sum(
+            float(amount) * _DURATION_UNITS[unit]
+            for amount, unit in _DURATION_PART.findall(value)
+        )
+    try:
+        moment = datetime.fromisoformat(value)
+    except ValueError:
+        try:
+            moment = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    # APIStatusError of the OpenAI and Anthropic SDKs, and the
+    # ResourceExhausted error of Google's.
+    return (
+        getattr(exc, "status_code", None) == 429
+        or getattr(exc, "code", None) == 429
+    )
+
+
+def _retry_after(exc: BaseException) -> float | None:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    if not isinstance(headers, Mapping):
+        return None
+    milliseconds = _parse_delay(headers.get("retry-after-ms"))
+    if milliseconds is not None:
+        return milliseconds / 1000
+    return _parse_delay(headers.get("retry-after"))
+
+
+@dataclass(slots=True)
+class RateLimit:
+    """
+    One rate limit of a provider (requests or tokens), as last reported.
+
+    Providers replenish their budgets continuously, reaching the full limit
+    at the reported reset time; the budget is assumed to refill at the rate
+    implied by the last report. Without a reported limit, nothing is known
+    about the refill, and the remaining budget is taken to be available until
+    the reset time and unlimited afterwards.
+
+    Times are on the event loop clock.
+    """
+
+    limit: int | None = None
+    remaining: float | None = None
+    refill_rate: float = 0.0
+    observed_at: float = 0.0
+    reset_at: float = 0.0
+
+    def available(self, now: float) -> float:
+        """
+        Return the budget available at `now`.
+        """
+        if self.remaining is None:
+            return math.inf
+        if self.limit is None:
+            return self.remaining if now < self.reset_at else math.inf
+        refilled = self.refill_rate * (now - self.observed_at)
+        return min(self.limit, self.remaining + refilled)
+
+    def delay(self, amount: int, now: float) -> float:
+        """
+        Return how long until `amount` fits in the budget.
+        """
+        missing = amount - self.available(now)
+        if missing <= 0:
+            return 0.0
+        if self.limit is None or self.refill_rate <= 0:
+            return max(self.reset_at - now, 0.0)
+        # More than the full limit never fits: wait until the budget is full.
+        missing = min(amount, self.limit) - self.available(now)
+        return max(missing, 0.0) / self.refill_rate
+
+    def take(self, amount: int, now: float) -> None:
+        """
+        Count `amount` as spent until the provider reports the budget again.
+        """
+        if self.remaining is not None:
+            self.remaining = self.available(now) - amount
+            self.observed_at = now
+
+    def observe(
+        self, limit: int | None, remaining: float, reset: float, now: float
+    ) -> None:
+        """
+        Record the budget reported by the provider.
+
+        Args:
+            limit: The full budget, if reported.
+            remaining: The budget left.
+            reset: Seconds until the budget is full again.
+            now: The time of the report.
+        """
+        # A response reports the budget as it was when its request arrived,
+        # before the requests sent since then: the report may lower the
+        # estimate, only the refill raises it.
+        estimate = min(remaining, self.available(now))
+        self.refill_rate = 0.0
+        if limit is not None and reset > 0:
+            self.refill_rate = max(limit - remaining, 0) / reset
+        self.limit = limit
+        self.remaining = estimate
+        self.observed_at = now
+        self.reset_at = now + reset
+
+
+@dataclass(slots=True)
+class RateLimitBudget:
+    """
+    The request and token budgets of a provider.
+
+    Attributes:
+        requests: The limit on the number of requests.
+        tokens: The limit on the tokens of the requests.
+        paused_until: Time before which no request may be sent, after a 429
+            response.
+    """
+
+    requests: RateLimit = field(default_factory=RateLimit)
+    tokens: RateLimit = field(default_factory=RateLimit)
+    paused_until: float = 0.0
+
+    def delay(self, requests: int, tokens: int, now: float) -> float:
+        """
+        Return how long until `requests` requests using `tokens` tokens in
+        total fit in the budget.
+        """
+        return max(
+            self.paused_until - now,
+            self.requests.delay(requests, now),
+            self.tokens.delay(tokens, now),
+            0.0,
+        )
+
+    def reserve(self, tokens: int, now: float) -> None:
+        """
+        Count a request being sent.
+        """
+        self.requests.take(1, now)
+        self.tokens.take(tokens, now)
+
+    def pause(self, delay: float, now: float) -> None:
+        """
+        Hold back all requests for `delay` seconds.
+        """
+        self.paused_until = max(self.paused_until, now + delay)
+
+    def observe(self, headers: Mapping[str, str], now: float) -> None:
+        """
+        Update the budgets from the rate-limit headers of a response.
+        """
+        for prefix, names in _BUDGET_HEADERS:
+            for budget, (limit, remaining, reset) in zip(
+                (self.requests, self.tokens), names
+            ):
+                left = headers.get(prefix + remaining, "")
+                if not left.isdigit():
+                    continue
+                full = headers.get(prefix + limit, "")
+                budget.observe(
+                    int(full) if full.isdigit() else None,
+                    int(left),
+                    _parse_delay(headers.get(prefix + reset)) or 0.0,
+                    now,
+                )
+
+
+@dataclass(eq=False, slots=True)
+class _Waiter:
+    tokens: int
+    admitted: asyncio.Future[None]
+
+
+class Attempt:
+    """
+    One attempt at sending a request, used as an async context manager.
+
+    Entering waits until the request may be sent and takes an in-flight
+    slot; exiting releases it. A 429 raised inside the block is suppressed
+    once the backoff has passed, and the next attempt is made, unless the
+    retries are exhausted or the deadline would be missed, in which case
+    `LlmOverloadedError` is raised.
+    """
+
+    def __init__(
+        self,
+        scheduler: "LlmScheduler",
+        tokens: int,
+        deadline: float,
+        retry: int,
+    ):
+        self._scheduler = scheduler
+        self._tokens = tokens
+        self._deadline = deadline
+        self._retry = retry
+        self.rate_limited = False
+
+    async def __aenter__(self) -> "Attempt":
+        await self._scheduler._admit(
+            self._tokens, self._deadline, retry=self._retry > 0
+        )
+        return self
+
+    async def __aexit__(self, exc_type: Any, exc: Any, traceback: Any) -> bool:
+        self._scheduler._release()
+        if exc is None or not _is_rate_limited(exc):
+            return False
+        delay = self._scheduler._back_off(exc, self._retry)
+        now = asyncio.get_running_loop().time()
+        if self._retry >= self._scheduler.max_retries:
+            raise LlmOverloadedError(
+                f"{self._scheduler.provider} kept rejecting the request "
+                f"with 429 after {self._retry} retries",
+                retry_after=delay,
+            ) from exc
+        if now + delay > self._deadline:
+            raise LlmOverloadedError(
+                f"{self._scheduler.provider} asked to retry in {delay:.1f}s, "
+                "after the request's deadline",
+                retry_after=delay,
+            ) from exc
+        await asyncio.sleep(delay)
+        self.rate_limited = True
+        return True
+
+
+class LlmScheduler:
+    """
+    Sends the requests to one LLM provider within its rate limits.
+
+    Args:
+        provider: The provider name, used in error messages.
+        max_concurrency: Maximum number of requests in flight.
+        queue_timeout: Seconds within which a request must be sent,
+            including the backoff after 429 responses.
+        max_retries: Maximum number of retries of a request after a 429.
+        backoff_base: Backoff after a first 429 without `Retry-After`; it
+            doubles with every retry of the request.
+        backoff_max: Upper bound of the backoff.
+    """
+
+    def __init__(
+        self,
+        provider: str,
+        max_concurrency: int = 64,
+        queue_timeout: float = 30.0,
+        max_retries: int = 3,
+        backoff_base: float = 0.5,
+        backoff_max: float = 30.0,
+    ):
+        self.provider = provider
+        self.max_concurrency = max_concurrency
+        self.queue_timeout = queue_timeout
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.budget = RateLimitBudget()
+        self._in_flight = 0
+        # Waiting requests by caller, and the callers in the order they
+        # take turns.
+        self._queues: dict[str, deque[_Waiter]] = {}
+        self._callers: deque[str] = deque()
+        self._queued_requests = 0
+        self._queued_tokens = 0
+        self._wakeup: asyncio.TimerHandle | None = None
+
+    @property
+    def in_flight(self) -> int:
+        """
+        Number of requests being sent.
+        """
+        return self._in_flight
+
+    @property
+    def queued(self) -> int:
+        """
+        Number of requests waiting to be sent.
+        """
+        return self._queued_requests
+
+    async def observe_response(self, response: httpx.Response) -> None:
+        """
+        Record the rate-limit headers of a response.
+
+        Installed as a response event hook of the provider's HTTP client.
+        """
+        self.budget.observe(
+            response.headers, asyncio.get_running_loop().time()
+        )
+        self._dispatch()
+
+    def attempts(self, tokens: int) -> Iterator[Attempt]:
+        """
+        Yield the attempts at sending a request, until one is not rejected
+        with a 429.
+
+        Used to send a request whose response is consumed inside the
+        attempt, e.g. a stream::
+
+            for attempt in scheduler.attempts(tokens):
+                async with attempt:
+                    ...
+
+        Args:
+            tokens: Estimated tokens of the request (`estimate_tokens`).
+        """
+        deadline = asyncio.get_running_loop().time() + self.queue_timeout
+        for retry in itertools.count():
+            attempt = Attempt(self, tokens, deadline, retry)
+            yield attempt
+            if not attempt.rate_limited:
+                return
+
+    async def run(self, send: Callable[[], Awaitable[T]], tokens: int) -> T:
+        """
+        Send a request, retrying it after 429 responses.
+
+        Args:
+            send: Coroutine function sending the request.
+            tokens: Estimated tokens of the request (`estimate_tokens`).
+
+        Returns:
+            The result of `send`.
+
+        Raises:
+            LlmOverloadedError: If the request could not be sent before its
+                deadline.
+        """
+        for attempt in self.attempts(tokens):
+            async with attempt:
+                return await send()
+        raise AssertionError("unreachable")
+
+    async def _admit(self, tokens: int, deadline: float, retry: bool) -> None:
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        wait = self.budget.delay(
+            self._queued_requests + 1, self._queued_tokens + tokens, now
+        )
+        if now + wait > deadline:
+            raise LlmOverloadedError(
+                f"{self.provider} rate limit reached: the request would wait "
+                f"{wait:.1f}s, after its deadline",
+                retry_after=wait,
+            )
+        waiter = _Waiter(tokens, loop.create_future())
+        caller = llm_caller.get()
+        queue = self._queues.get(caller)
+        if queue is None:
+            queue = self._queues[caller] = deque()
+            self._callers.append(caller)
+        if retry:
+            queue.appendleft(waiter)
+        else:
+            queue.append(waiter)
+        self._queued_requests += 1
+        self._queued_tokens += tokens
+        self._dispatch()
+        if waiter.admitted.done():
+            return
+        try:
+            await asyncio.wait_for(waiter.admitted, deadline - now)
+        except asyncio.TimeoutError:
+            self._abandon(caller, waiter)
+            raise LlmOverloadedError(
+                f"{self.provider} is busy: the request was not sent before "
+                "its deadline",
+                retry_after=self.budget.delay(1, tokens, loop.time()),
+            ) from None
+        except asyncio.CancelledError:
+            if waiter.admitted.done() and not waiter.admitted.cancelled():
+                self._release()
+            else:
+                self._abandon(caller, waiter)
+            raise
+
+    def _abandon(self, caller: str, waiter: _Waiter) -> None:
+        """
+        Drop a waiter that timed out or was cancelled before its admission.
+        """
+        queue = self._queues[caller]
+        queue.remove(waiter)
+        self._queued_requests -= 1
+        self._queued_tokens -= waiter.tokens
+        if not queue:
+            del self._queues[caller]
+            self._callers.remove(caller)
+        self._dispatch()
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._dispatch()
+
+    def _back_off(self, exc: BaseException, retry: int) -> float:
+        """
+        Pause the provider after a 429 and return the delay of the retry.
+        """
+        backoff = _retry_after(exc)
+        if backoff is None:
+            backoff = min(self.backoff_max, self.backoff_base * 2**retry)
+        self.budget.pause(backoff, asyncio.get_running_loop().time())
+        return backoff + random.uniform(0, backoff * _JITTER)
+
+    def _dispatch(self) -> None:
+        """
+        Admit waiting requests, the callers taking turns, as long as the
+        budget and the in-flight limit allow.
+        """
+        now = asyncio.get_running_loop().time()
+        while self._callers and self._in_flight < self.max_concurrency:
+            caller = self._callers[0]
+            queue = self._queues[caller]
+            waiter = queue[0]
+            delay = self.budget.delay(1, waiter.tokens, now)
+            if delay > 0:
+                self._wake_up_at(now + delay)
+                return
+            self._in_flight += 1
+            self.budget.reserve(waiter.tokens, now)
+            waiter.admitted.set_result(None)
+            queue.popleft()
+            self._queued_requests -= 1
+            self._queued_tokens -= waiter.tokens
+            self._callers.popleft()
+            if queue:
+                self._callers.append(caller)
+            else:
+                del self._queues[caller]
+
+    def _wake_up_at(self, when: float) -> None:
+        if self._wakeup is not None:
+            if self._wakeup.when() <= when:
+                return
+            self._wakeup.cancel()
+        self._wakeup = asyncio.get_running_loop().call_at(when, self._wake_up)
+
+    def _wake_up(self) -> None:
+        self._wakeup = None
+        self._dispatch()
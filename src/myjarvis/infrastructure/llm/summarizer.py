@@ -0,0 +1,75 @@
+"""
+This module provides the rolling summarizer of chat history.
+
+When older messages no longer fit into a model's context window they are not
+simply dropped: `LlmSummarizer` folds them into a running summary of the
+conversation, which is sent to the model instead of the messages themselves.
+"""
+
+from typing import Callable
+
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.infrastructure.llm.base_llm import BaseLlm
+
+_INSTRUCTIONS = (
+    "You maintain a running summary of a conversation between a user and an "
+    "AI assistant. Update the summary so that it also covers the new "
+    "messages. Keep facts, decisions, names and open questions; drop "
+    "pleasantries. Answer with the updated summary only, in at most "
+    "{max_words} words."
+)
+
+
+class LlmSummarizer:
+    """
+    Summarizes chat history with an LLM; the domain's `Summarizer`.
+
+    Args:
+        llm_factory: Callable returning the LLM provider for a model
+            identifier.
+        llm_model: Model used for summaries. Defaults to the agent's model.
+    """
+
+    def __init__(
+        self,
+        llm_factory: Callable[[str], BaseLlm],
+        llm_model: str | None = None,
+    ):
+        self._llm_factory = llm_factory
+        self._llm_model = llm_model
+
+    async def summarize(
+        self,
+        agent_llm_model: str,
+        previous_summary: str,
+        messages: list[Message],
+        max_tokens: int,
+    ) -> str:
+        """
+        Fold messages into the previous summary.
+
+        Args:
+            agent_llm_model: The model of the agent owning the conversation.
+            previous_summary: The summary so far; empty for the first one.
+            messages: Messages to add to the summary, oldest first.
+            max_tokens: Upper bound on the length of the new summary.
+
+        Returns:
+            The updated summary.
+        """
+        llm = self._llm_factory(self._llm_model or agent_llm_model)
+        transcript = "\n".join(
+            f"{'User' if message.sender is Sender.USER else 'Assistant'}: "
+            f"{message.content}"
+            for message in messages
+        )
+        prompt = (
+            f"Current summary:\n{previous_summary or '(none)'}\n\n"
+            f"New messages:\n{transcript}"
+        )
+        summary = await llm.generate_response(
+            prompt,
+            system_prompt=_INSTRUCTIONS.format(max_words=max_tokens * 3 // 4),
+            max_tokens=max_tokens,
+        )
+        return summary.strip()
@@ -0,0 +1,170 @@
+"""
+This module provides token counting and context window limits per LLM model.
+
+A `TokenCounter` estimates how many tokens a text uses with a given model's
+tokenizer. Counts of chat messages are cached, so each message of a
+conversation is tokenized once rather than on every turn. A
+`ContextWindowPolicy` pairs a model's counter with the number of tokens of
+chat history that may be sent to it.
+
+`get_context_window_policy` resolves the policy for an agent's `llm_model`.
+OpenAI models are counted exactly with `tiktoken` when it is installed; other
+providers only offer token counting as a remote API call, so their counts are
+approximated locally from the text length.
+"""
+
+import math
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from functools import lru_cache
+
+from config.settings import get_settings
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.infrastructure.llm.llm_factory import resolve_provider
+
+# Tokens used by the chat formatting around every message (role, separators).
+MESSAGE_OVERHEAD_TOKENS = 4
+
+_DEFAULT_CONTEXT_WINDOW = 8192
+# Context window sizes by model name prefix; the longest match wins.
+_CONTEXT_WINDOWS = {
+    "gpt-3.5-turbo": 16385,
+    "gpt-4": 8192,
+    "gpt-4-turbo": 128000,
+    "gpt-4o": 128000,
+    "o1": 128000,
+    "claude-": 200000,
+    "gemini-pro": 32760,
+    "gemini-1.5": 1048576,
+}
+
+
+class TokenCounter(ABC):
+    """
+    Counts tokens the way a particular model's tokenizer does.
+
+    Args:
+        cache_size: Number of message counts to keep cached.
+    """
+
+    def __init__(self, cache_size: int = 100_000):
+        self.count_message = lru_cache(maxsize=cache_size)(self._count_message)
+
+    @abstractmethod
+    def count(self, text: str) -> int:
+        """
+        Count the tokens of a text.
+
+        Args:
+            text: The text to count.
+
+        Returns:
+            The number of tokens.
+        """
+        pass
+
+    def _count_message(self, message: Message) -> int:
+        return self.count(message.content) + MESSAGE_OVERHEAD_TOKENS
+
+
+class ApproximateTokenCounter(TokenCounter):
+    """
+    Estimates tokens from the text length.
+
+    Args:
+        chars_per_token: Average number of characters per token.
+    """
+
+    def __init__(
+        self, chars_per_token: float = 4.0, cache_size: int = 100_000
+    ):
+        super().__init__(cache_size)
+        self.chars_per_token = chars_per_token
+
+    def count(self, text: str) -> int:
+        return math.ceil(len(text) / self.chars_per_token)
+
+
+class TiktokenCounter(TokenCounter):
+    """
+    Counts tokens exactly with an OpenAI `tiktoken` encoding.
+
+    Args:
+        model: The OpenAI model whose encoding to use.
+    """
+
+    def __init__(self, model: str, cache_size: int = 100_000):
+        import tiktoken
+
+        super().__init__(cache_size)
+        try:
+            self._encoding = tiktoken.encoding_for_model(model)
+        except KeyError:
+            self._encoding = tiktoken.get_encoding("cl100k_base")
+
+    def count(self, text: str) -> int:
+        return len(self._encoding.encode(text, disallowed_special=()))
+
+
+@dataclass(frozen=True, slots=True)
+class ContextWindowPolicy:
+    """
+    How much chat history may be sent to a model; implements the domain's
+    `ContextWindowPolicy` interface.
+
+    Attributes:
+        token_counter: Counter matching the model's tokenizer.
+        max_tokens: Tokens available for the system prompt, the summary, the
+            history and the new message together.
+        summary_max_tokens: Tokens reserved for the rolling summary.
+    """
+
+    token_counter: TokenCounter
+    max_tokens: int
+    summary_max_tokens: int
+
+
+@lru_cache
+def get_context_window_policy(llm_model: str) -> ContextWindowPolicy:
+    """
+    Return the context window policy of a model.
+
+    The history budget is the model's context window minus the tokens
+    reserved for the reply, capped by the `chat_context_max_tokens` setting.
+    Policies are cached, so every model shares one token counter and its
+    message count cache.
+
+    Args:
+        llm_model: The model identifier stored on the agent.
+
+    Returns:
+        The model's policy.
+    """
+    settings = get_settings()
+    if llm_model == "fake":
+        provider, model = "fake", llm_model
+    else:
+        provider, model = resolve_provider(llm_model)
+    window = _DEFAULT_CONTEXT_WINDOW
+    matches = [
+        prefix for prefix in _CONTEXT_WINDOWS if model.startswith(prefix)
+    ]
+    if matches:
+        window = _CONTEXT_WINDOWS[max(matches, key=len)]
+    return ContextWindowPolicy(
+        token_counter=_token_counter(provider, model),
+        max_tokens=min(
+            window - settings.chat_reply_reserved_tokens,
+            settings.chat_context_max_tokens,
+        ),
+        summary_max_tokens=settings.chat_summary_max_tokens,
+    )
+
+
+def _token_counter(provider: str, model: str) -> TokenCounter:
+    if provider == "openai":
+        try:
+            return TiktokenCounter(model)
+        except ImportError:
+            pass
+    return ApproximateTokenCounter()
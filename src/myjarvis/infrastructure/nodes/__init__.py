@@ -6,6 +6,7 @@ Google Docs, Email, Calendar, Search services, etc. Each node implementation
 encapsulates the logic for connecting to and interacting with its respective
 service, providing a standardized interface for the Application layer.
 
-Each node must inherit from the `BaseNode` abstract class and implement its
-methods to ensure consistent behavior across all nodes.
+Each node must inherit from the `AsyncBaseNode` abstract class and implement
+its methods to ensure consistent behavior across all nodes. Only the nodes
+registered in `node_registry.NODE_TYPES` can be attached to agents.
 """
@@ -1,28 +1,146 @@
 """
-This module defines the base interface for all Nodes.
+This module defines the base classes of all Nodes.
 
 A Node is an external service that an AI Agent can interact with. To ensure
 consistency and interchangeability, all specific node implementations must
-inherit from the `BaseNode` abstract class defined in this module.
+inherit from the `AsyncBaseNode` abstract class defined in this module, which
+implements the domain's `Node` interface.
 
-The `BaseNode` class enforces the implementation of two key methods:
-- `execute_command`: To run a specific command on the node.
-- `get_available_commands`: To list all commands supported by the node.
+The `AsyncBaseNode` class enforces the implementation of `execute_command`,
+which runs a specific command on the node. It is a coroutine, so that calls to
+external services never block the event loop.
+
+The commands a node supports are declared as `CommandSpec`s in its `commands`
+class attribute. The specs carry the description and the JSON schema of the
+parameters the LLM needs to call a command; `get_available_commands` lists
+their names.
+
+Read-only commands whose result can be reused for a while declare a
+`CommandCachePolicy` in the node's `cacheable_commands`; their results are
+then served by the `NodeResultCache`.
+
+Commands that can take tens of seconds (e.g. searching a large mailbox) are
+listed in the node's `background_commands`. When a job queue is configured,
+the `ToolExecutor` runs them as background jobs and the chat turn is resumed
+once they complete, instead of holding the request meanwhile.
+
+Nodes keeping data per agent (e.g. the vector store) read the agent a
+command runs for from `current_agent_id`, which the `AgentService` sets while
+it executes the agent's tool calls; the LLM cannot address another agent's
+data through the command parameters.
+
+The synchronous `BaseNode` class is kept for nodes built on blocking client
+libraries. Such nodes are run through the `SyncNodeAdapter`, which moves
+their commands onto a bounded thread pool.
 """
 
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List
+from typing import Any, ClassVar, Dict, FrozenSet, List, Mapping, Tuple
 
+from myjarvis.domain.interfaces.node import (
+    CommandCachePolicy,
+    CommandSpec,
+    current_agent_id,
+)
 
-class BaseNode(ABC):
+
+def object_schema(
+    required: Mapping[str, Mapping[str, Any]],
+    optional: Mapping[str, Mapping[str, Any]] | None = None,
+) -> Dict[str, Any]:
+    """
+    Build the JSON schema of a parameters object.
+
+    Args:
+        required: Schemas of the required parameters, by name.
+        optional: Schemas of the optional parameters, by name.
+
+    Returns:
+        A JSON schema of type 'object'.
+    """
+    return {
+        "type": "object",
+        "properties": {**required, **(optional or {})},
+        "required": list(required),
+    }
+
+
+class AsyncBaseNode(ABC):
     """
     Abstract base class for all Node implementations.
 
     This class defines the common interface that all nodes must adhere to,
     allowing the system to interact with different services (like Google Docs,
     email, etc.) in a uniform way.
+
+    Attributes:
+        timeout_seconds: Maximum duration of a command, or None to use the
+            executor's default.
+        commands: The commands supported by the node.
+        cacheable_commands: Cache policies of the node's idempotent commands,
+            by command name.
+        background_commands: Names of the long-running commands, run as
+            background jobs when a job queue is configured.
+    """
+
+    timeout_seconds: float | None = None
+    commands: ClassVar[Tuple[CommandSpec, ...]] = ()
+    cacheable_commands: ClassVar[Dict[str, CommandCachePolicy]] = {}
+    background_commands: ClassVar[FrozenSet[str]] = frozenset()
+
+    @abstractmethod
+    async def execute_command(
+        self, command: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """
+        Execute a specific command on the node.
+
+        Args:
+            command: The name of the command to execute.
+            params: A dictionary of parameters required for the command.
+
+        Returns:
+            A dictionary containing the result of the command execution.
+            The structure of the result will depend on the command.
+        """
+        pass
+
+    def get_available_commands(self) -> List[str]:
+        """
+        Get a list of available commands for this node.
+
+        This method helps the LLM understand what actions it can perform
+        with this node.
+
+        Returns:
+            A list of strings, where each string is a command name.
+        """
+        return [command.name for command in self.commands]
+
+
+class BaseNode(ABC):
+    """
+    Abstract base class for synchronous Node implementations.
+
+    Same interface as `AsyncBaseNode`, but `execute_command` is a blocking
+    method. Wrap such nodes in a `SyncNodeAdapter` before executing them.
+
+    Attributes:
+        timeout_seconds: Maximum duration of a command, or None to use the
+            executor's default.
+        commands: The commands supported by the node, as presented to
+            the LLM.
+        cacheable_commands: Cache policies of the node's idempotent commands,
+            by command name.
+        background_commands: Names of the long-running commands, run as
+            background jobs when a job queue is configured.
     """
 
+    timeout_seconds: float | None = None
+    commands: ClassVar[Tuple[CommandSpec, ...]] = ()
+    cacheable_commands: ClassVar[Dict[str, CommandCachePolicy]] = {}
+    background_commands: ClassVar[FrozenSet[str]] = frozenset()
+
     @abstractmethod
     def execute_command(
         self, command: str, params: Dict[str, Any]
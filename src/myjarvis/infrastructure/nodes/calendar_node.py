@@ -6,12 +6,17 @@ Google Calendar. It enables the AI agent to manage events, check schedules,
 and answer questions related to dates and appointments.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict
 
-from .base_node import BaseNode
+from .base_node import (
+    AsyncBaseNode,
+    CommandCachePolicy,
+    CommandSpec,
+    object_schema,
+)
 
 
-class CalendarNode(BaseNode):
+class CalendarNode(AsyncBaseNode):
     """
     A node for interacting with a calendar service.
 
@@ -21,7 +26,8 @@ class CalendarNode(BaseNode):
     calendar events.
 
     Implementation Details:
-    - Use the Google Calendar API client library.
+    - Use the Google Calendar API client library. Its calls are blocking, so
+      run them with `asyncio.to_thread` from the `execute_command` coroutine.
     - Implement an OAuth 2.0 flow to get user consent and store credentials
       securely for each user.
     - The `execute_command` method will need to map commands to specific API calls.
@@ -34,7 +40,69 @@ class CalendarNode(BaseNode):
       find available slots.
     """
 
-    def execute_command(
+    commands = (
+        CommandSpec(
+            name="create_event",
+            description="Create an event in the user's calendar.",
+            parameters=object_schema(
+                required={
+                    "summary": {"type": "string"},
+                    "start_time": {
+                        "type": "string",
+                        "description": "ISO 8601 date and time.",
+                    },
+                    "end_time": {
+                        "type": "string",
+                        "description": "ISO 8601 date and time.",
+                    },
+                },
+                optional={
+                    "attendees": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "description": "Email addresses of the attendees.",
+                    },
+                },
+            ),
+        ),
+        CommandSpec(
+            name="get_events_for_date",
+            description="List the events of the user's calendar on a date.",
+            parameters=object_schema(
+                required={
+                    "date": {
+                        "type": "string",
+                        "description": "ISO 8601 date, e.g. 2024-05-01.",
+                    },
+                },
+            ),
+        ),
+        CommandSpec(
+            name="find_free_time",
+            description=(
+                "Find free slots of a given duration in the user's calendar."
+            ),
+            parameters=object_schema(
+                required={
+                    "start_date": {"type": "string"},
+                    "end_date": {"type": "string"},
+                    "duration": {
+                        "type": "integer",
+                        "description": "Length of the slot in minutes.",
+                    },
+                },
+            ),
+        ),
+    )
+
+    cacheable_commands = {
+        "get_events_for_date": CommandCachePolicy(ttl_seconds=60),
+    }
+
+    # Intersecting the calendars of many attendees can take tens of seconds.
+    background_commands = frozenset({"find_free_time"})
+
+    async def execute_command(
         self, command: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
@@ -47,16 +115,3 @@ class CalendarNode(BaseNode):
             "The `execute_command` method for CalendarNode is not "
             "implemented yet."
         )
-
-    def get_available_commands(self) -> List[str]:
-        """
-        Returns the list of commands available for the calendar node.
-
-        This method is a placeholder and should be implemented to return
-        the actual commands supported, e.g., ['create_event',
-        'get_events_for_date'].
-        """
-        raise NotImplementedError(
-            "The `get_available_commands` method for CalendarNode is not "
-            "implemented yet."
-        )
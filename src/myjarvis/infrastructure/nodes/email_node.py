@@ -6,12 +6,12 @@ email service (e.g., Gmail, Outlook). It can be used to send emails, check for
 new messages, read email content, and summarize threads.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict
 
-from .base_node import BaseNode
+from .base_node import AsyncBaseNode, CommandSpec, object_schema
 
 
-class EmailNode(BaseNode):
+class EmailNode(AsyncBaseNode):
     """
     A node for interacting with an email service.
 
@@ -20,7 +20,8 @@ class EmailNode(BaseNode):
     to get user permission to access their mailbox.
 
     Implementation Details:
-    - Use the Gmail API or a generic IMAP/SMTP library.
+    - Use the Gmail API or a generic IMAP/SMTP library; prefer an asyncio
+      one (e.g. aiosmtplib) so that mailbox access does not block.
     - Implement OAuth 2.0 for secure user authorization.
     - Handle different email formats (plain text, HTML) and attachments.
 
@@ -34,7 +35,48 @@ class EmailNode(BaseNode):
       returns matching emails.
     """
 
-    def execute_command(
+    commands = (
+        CommandSpec(
+            name="send_email",
+            description="Send an email from the user's mailbox.",
+            parameters=object_schema(
+                required={
+                    "to": {"type": "string"},
+                    "subject": {"type": "string"},
+                    "body": {"type": "string"},
+                },
+            ),
+        ),
+        CommandSpec(
+            name="check_new_emails",
+            description="List unread emails with their sender and subject.",
+            parameters=object_schema(required={}),
+        ),
+        CommandSpec(
+            name="read_email",
+            description="Return the full content of an email.",
+            parameters=object_schema(
+                required={"email_id": {"type": "string"}},
+            ),
+        ),
+        CommandSpec(
+            name="search_emails",
+            description="Search the user's mailbox.",
+            parameters=object_schema(
+                required={
+                    "query": {
+                        "type": "string",
+                        "description": "e.g. from:person@example.com",
+                    },
+                },
+            ),
+        ),
+    )
+
+    # Searching a large mailbox can take tens of seconds.
+    background_commands = frozenset({"search_emails"})
+
+    async def execute_command(
         self, command: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
@@ -47,15 +89,3 @@ class EmailNode(BaseNode):
             "The `execute_command` method for EmailNode is not implemented "
             "yet."
         )
-
-    def get_available_commands(self) -> List[str]:
-        """
-        Returns the list of commands available for the email node.
-
-        This method is a placeholder and should be implemented to return
-        the actual commands supported, e.g., ['send_email', 'read_email'].
-        """
-        raise NotImplementedError(
-            "The `get_available_commands` method for EmailNode is not "
-            "implemented yet."
-        )
@@ -7,12 +7,17 @@ This is useful for tasks like report generation, note-taking, and content
 creation.
 """
 
-from typing import Any, Dict, List
+from typing import Any, Dict
 
-from .base_node import BaseNode
+from .base_node import (
+    AsyncBaseNode,
+    CommandCachePolicy,
+    CommandSpec,
+    object_schema,
+)
 
 
-class GoogleDocsNode(BaseNode):
+class GoogleDocsNode(AsyncBaseNode):
     """
     A node for interacting with the Google Docs API.
 
@@ -21,7 +26,8 @@ class GoogleDocsNode(BaseNode):
     authentication and authorization, likely through OAuth 2.0.
 
     Implementation Details:
-    - Use the Google Docs API client library for Python.
+    - Use the Google Docs API client library for Python, off the event loop
+      (`asyncio.to_thread`), since it performs blocking HTTP calls.
     - Implement an OAuth 2.0 flow to obtain the necessary permissions from the
       user to access their documents.
     - Store user credentials securely.
@@ -38,7 +44,41 @@ class GoogleDocsNode(BaseNode):
       documents from the user's Google Drive.
     """
 
-    def execute_command(
+    commands = (
+        CommandSpec(
+            name="create_document",
+            description="Create a new blank Google Docs document.",
+            parameters=object_schema(required={"title": {"type": "string"}}),
+        ),
+        CommandSpec(
+            name="read_document",
+            description="Return the content of a document as plain text.",
+            parameters=object_schema(
+                required={"document_id": {"type": "string"}},
+            ),
+        ),
+        CommandSpec(
+            name="append_text",
+            description="Append text to the end of a document.",
+            parameters=object_schema(
+                required={
+                    "document_id": {"type": "string"},
+                    "text": {"type": "string"},
+                },
+            ),
+        ),
+        CommandSpec(
+            name="search_documents",
+            description="Search the documents in the user's Google Drive.",
+            parameters=object_schema(required={"query": {"type": "string"}}),
+        ),
+    )
+
+    cacheable_commands = {
+        "read_document": CommandCachePolicy(ttl_seconds=60),
+    }
+
+    async def execute_command(
         self, command: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
@@ -51,15 +91,3 @@ class GoogleDocsNode(BaseNode):
             "The `execute_command` method for GoogleDocsNode is not "
             "implemented yet."
         )
-
-    def get_available_commands(self) -> List[str]:
-        """
-        Returns the list of commands available for the Google Docs node.
-
-        This method is a placeholder and should be implemented to return
-        the actual commands, e.g., ['create_document', 'read_document'].
-        """
-        raise NotImplementedError(
-            "The `get_available_commands` method for GoogleDocsNode is not "
-            "implemented yet."
-        )
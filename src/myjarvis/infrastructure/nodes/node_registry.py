@@ -0,0 +1,98 @@
+"""
+This module provides the registry of the node types, which maps the
+`node_type` of a Node to the implementation executing its commands.
+
+Implementation details:
+- Nodes hold no per-agent state, so one instance per node type is created on
+  first use and shared by all agents.
+- Synchronous nodes (`BaseNode`) are wrapped in a `SyncNodeAdapter` running
+  their commands on the registry's bounded thread pool, shared by all of
+  them, so they never block the event loop.
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import Mapping, Tuple
+
+from myjarvis.domain.interfaces.node import CommandSpec
+
+from .base_node import AsyncBaseNode, BaseNode
+from .search_node import SearchNode
+from .sync_adapter import SyncNodeAdapter
+from .vector_store_node import VectorStoreNode
+
+# Only the implemented nodes are registered; the calendar, email and Google
+# Docs nodes are still stubs.
+NODE_TYPES: dict[str, type[AsyncBaseNode]] = {
+    "search": SearchNode,
+    "vector_store": VectorStoreNode,
+}
+
+
+class NodeTypeRegistry:
+    """
+    Registry of the node implementations, by node type.
+
+    Args:
+        node_types: Node implementations, by node type. Defaults to
+            `NODE_TYPES`.
+        sync_workers: Size of the thread pool running synchronous nodes,
+            when no `thread_pool` is given.
+        thread_pool: Pool running synchronous nodes. A dedicated pool is
+            created if omitted, and shut down by `close`.
+    """
+
+    def __init__(
+        self,
+        node_types: (
+            Mapping[str, type[AsyncBaseNode] | type[BaseNode]] | None
+        ) = None,
+        sync_workers: int = 16,
+        thread_pool: ThreadPoolExecutor | None = None,
+    ):
+        self._node_types = dict(
+            NODE_TYPES if node_types is None else node_types
+        )
+        self._instances: dict[str, AsyncBaseNode] = {}
+        self._owns_thread_pool = thread_pool is None
+        self._thread_pool = thread_pool or ThreadPoolExecutor(
+            max_workers=sync_workers, thread_name_prefix="node"
+        )
+
+    def close(self) -> None:
+        """
+        Shut down the thread pool, if it was created by the registry.
+
+        Commands still running on it are not waited for.
+        """
+        if self._owns_thread_pool:
+            self._thread_pool.shutdown(wait=False, cancel_futures=True)
+
+    def get_node_types(self) -> list[str]:
+        """
+        Return the registered node types, sorted.
+        """
+        return sorted(self._node_types)
+
+    def get_commands(self, node_type: str) -> Tuple[CommandSpec, ...]:
+        """
+        Return the commands supported by a node type.
+
+        Raises:
+            KeyError: If the node type is not registered.
+        """
+        return self._node_types[node_type].commands
+
+    def get_node(self, node_type: str) -> AsyncBaseNode:
+        """
+        Return the implementation of a node type.
+
+        Raises:
+            KeyError: If the node type is not registered.
+        """
+        node = self._instances.get(node_type)
+        if node is None:
+            node = self._node_types[node_type]()
+            if isinstance(node, BaseNode):
+                node = SyncNodeAdapter(node, self._thread_pool)
+            self._instances[node_type] = node
+        return node
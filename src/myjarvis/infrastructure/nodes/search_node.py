@@ -5,56 +5,263 @@ The SearchNode is responsible for interacting with a search engine or service
 (e.g., Google Search, DuckDuckGo, Tavily API) to perform web searches and
 retrieve information. It allows the AI agent to find real-time information
 from the internet.
+
+'get_page_content' reads a page with a `PageReader`: the page is streamed,
+at most `page_max_bytes` of it, and its main text is extracted as it
+arrives, up to a token budget, so a long page fills neither the agent's
+context nor the process's memory. Pages are cached by URL and revalidated
+with their `ETag` or `Last-Modified` header.
+
+'search_many' runs several related queries of one turn at once, at most
+`search_max_concurrency` searches in flight per process, and merges their
+results into one ranking (see `reciprocal_rank_fusion`), so the agent reads
+every page once, in the order of its relevance to all the queries. It can
+also read the top pages ahead, concurrently.
 """
 
-from typing import Any, Dict, List
+import asyncio
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+from config.settings import get_settings
+from myjarvis.infrastructure.external.page_reader import PageReader
+from myjarvis.infrastructure.external.web_search import (
+    BaseSearchProvider,
+    RankedResult,
+    SearchResult,
+    create_search_provider,
+    reciprocal_rank_fusion,
+)
 
-from .base_node import BaseNode
+from .base_node import (
+    AsyncBaseNode,
+    CommandCachePolicy,
+    CommandSpec,
+    object_schema,
+)
 
+_MAX_QUERIES = 8
+_MAX_RESULTS = 20
+_MAX_PREFETCH = 5
+_CACHE_POLICY = CommandCachePolicy(
+    ttl_seconds=600,
+    shared=True,
+    case_insensitive_params=frozenset({"query", "queries"}),
+)
+_MAX_RESULTS_SCHEMA = {
+    "type": "integer",
+    "minimum": 1,
+    "maximum": _MAX_RESULTS,
+}
 
-class SearchNode(BaseNode):
+
+class SearchNode(AsyncBaseNode):
     """
     A node for performing web searches.
 
-    This node should be implemented to connect to a search service provider.
-    The LLM will use this node to answer questions about recent events or to
+    The LLM uses this node to answer questions about recent events or to
     find information not present in its training data.
 
-    Implementation Details:
-    - Choose a search provider (e.g., Tavily, SerpAPI, Google Custom Search).
-    - Use an API client or library to interact with the chosen service.
-    - Securely manage API keys using environment variables or a configuration
-      service.
-
-    Example commands to implement:
-    - 'search_web': Takes a 'query' parameter and returns a list of search
-      results, including snippets and URLs.
-    - 'get_page_content': Takes a 'url' parameter and returns the text content
-      of the web page.
+    Args:
+        provider: The search provider. Defaults to the configured
+            `search_provider`, created on first use.
+        page_reader: The reader of 'get_page_content'. Defaults to one
+            configured by the `page_*` settings, created on first use.
     """
 
-    def execute_command(
+    commands = (
+        CommandSpec(
+            name="search_web",
+            description=(
+                "Search the web. Returns result titles, snippets and URLs."
+            ),
+            parameters=object_schema(
+                required={"query": {"type": "string"}},
+                optional={"max_results": _MAX_RESULTS_SCHEMA},
+            ),
+        ),
+        CommandSpec(
+            name="search_many",
+            description=(
+                "Run several related web searches at once. Returns the "
+                "distinct results of all queries, the most relevant to all "
+                "of them first, with the queries that found each. With "
+                "prefetch_top_k, also returns the text of the top pages."
+            ),
+            parameters=object_schema(
+                required={
+                    "queries": {
+                        "type": "array",
+                        "items": {"type": "string"},
+                        "minItems": 1,
+                        "maxItems": _MAX_QUERIES,
+                    }
+                },
+                optional={
+                    "max_results": _MAX_RESULTS_SCHEMA,
+                    "prefetch_top_k": {
+                        "type": "integer",
+                        "minimum": 0,
+                        "maximum": _MAX_PREFETCH,
+                    },
+                },
+            ),
+        ),
+        CommandSpec(
+            name="get_page_content",
+            description=(
+                "Return the title and main text of a web page, cut to "
+                "max_tokens tokens."
+            ),
+            parameters=object_schema(
+                required={"url": {"type": "string"}},
+                optional={"max_tokens": {"type": "integer", "minimum": 1}},
+            ),
+        ),
+    )
+
+    cacheable_commands = {
+        "search_web": _CACHE_POLICY,
+        "search_many": _CACHE_POLICY,
+    }
+
+    def __init__(
+        self,
+        provider: BaseSearchProvider | None = None,
+        page_reader: PageReader | None = None,
+    ):
+        self._provider = provider
+        self._page_reader = page_reader
+        # Shared by the commands of all agents, as the node is.
+        concurrency = get_settings().search_max_concurrency
+        self._search_slots = asyncio.Semaphore(concurrency)
+        self._page_slots = asyncio.Semaphore(concurrency)
+
+    @property
+    def provider(self) -> BaseSearchProvider:
+        if self._provider is None:
+            name = get_settings().search_provider
+            if name is None:
+                raise ValueError("No web search provider is configured.")
+            self._provider = create_search_provider(name)
+        return self._provider
+
+    @property
+    def page_reader(self) -> PageReader:
+        if self._page_reader is None:
+            settings = get_settings()
+            self._page_reader = PageReader(
+                max_bytes=settings.page_max_bytes,
+                timeout_seconds=settings.page_timeout_seconds,
+                cache_max_entries=settings.page_cache_max_entries,
+                cache_max_bytes=settings.page_cache_max_bytes,
+                cache_ttl_seconds=settings.page_cache_ttl_seconds,
+            )
+        return self._page_reader
+
+    async def execute_command(
         self, command: str, params: Dict[str, Any]
     ) -> Dict[str, Any]:
         """
         Executes a search-related command.
-
-        This method is a placeholder and should be implemented to handle
-        commands like 'search_web'.
         """
-        raise NotImplementedError(
-            "The `execute_command` method for SearchNode is not "
-            "implemented yet."
-        )
+        if command == "search_web":
+            results = await self._search(
+                params["query"], self._max_results(params)
+            )
+            return {"results": [self._result(result) for result in results]}
+        if command == "search_many":
+            return await self._search_many(params)
+        if command == "get_page_content":
+            return await self._get_page_content(params)
+        raise ValueError(f"Unknown command {command!r}.")
 
-    def get_available_commands(self) -> List[str]:
-        """
-        Returns the list of commands available for the search node.
+    async def _search(
+        self, query: str, max_results: int
+    ) -> list[SearchResult]:
+        async with self._search_slots:
+            return await self.provider.search(query, max_results)
 
-        This method is a placeholder and should be implemented to return
-        the actual commands supported by the node, e.g., ['search_web'].
-        """
-        raise NotImplementedError(
-            "The `get_available_commands` method for SearchNode is not "
-            "implemented yet."
+    async def _search_many(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        # Queries differing only in case or spacing are searched once.
+        distinct: dict[str, str] = {}
+        for query in params["queries"]:
+            distinct.setdefault(" ".join(query.split()).casefold(), query)
+        queries = list(distinct.values())
+        max_results = self._max_results(params)
+        outcomes = await asyncio.gather(
+            *(self._search(query, max_results) for query in queries),
+            return_exceptions=True,
         )
+        # The results of the queries that succeeded are returned, with the
+        # errors of the others; the command fails if all of them did.
+        rankings: list[list[SearchResult]] = []
+        errors: dict[str, str] = {}
+        for query, outcome in zip(queries, outcomes):
+            if isinstance(outcome, Exception):
+                errors[query] = str(outcome) or type(outcome).__name__
+                rankings.append([])
+            elif isinstance(outcome, BaseException):
+                raise outcome
+            else:
+                rankings.append(outcome)
+        if len(errors) == len(queries):
+            raise outcomes[0]
+        ranked = reciprocal_rank_fusion(rankings)[:max_results]
+        results = [
+            {
+                **self._result(item.result),
+                "score": round(item.score, 6),
+                "queries": [queries[index] for index in item.queries],
+            }
+            for item in ranked
+        ]
+        prefetch = min(params.get("prefetch_top_k") or 0, len(ranked))
+        if prefetch:
+            pages = await asyncio.gather(
+                *(self._prefetch(item) for item in ranked[:prefetch])
+            )
+            for result, page in zip(results, pages):
+                result.update(page)
+        response: Dict[str, Any] = {"results": results}
+        if errors:
+            response["errors"] = errors
+        return response
+
+    async def _prefetch(self, item: RankedResult) -> Dict[str, Any]:
+        max_tokens = get_settings().search_prefetch_max_tokens
+        try:
+            async with self._page_slots:
+                page = await self.page_reader.read(item.result.url, max_tokens)
+        except Exception as exc:
+            return {"content_error": str(exc) or type(exc).__name__}
+        return {"content": page.text, "truncated": page.truncated}
+
+    async def _get_page_content(
+        self, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        url = params["url"]
+        if urlsplit(url).scheme not in ("http", "https"):
+            raise ValueError("Only http and https pages can be read.")
+        max_tokens = get_settings().page_max_tokens
+        if params.get("max_tokens"):
+            max_tokens = min(max_tokens, params["max_tokens"])
+        page = await self.page_reader.read(url, max_tokens)
+        return {
+            "url": page.url,
+            "title": page.title,
+            "content": page.text,
+            "truncated": page.truncated,
+        }
+
+    @staticmethod
+    def _max_results(params: Dict[str, Any]) -> int:
+        return params.get("max_results") or get_settings().search_max_results
+
+    @staticmethod
+    def _result(result: SearchResult) -> Dict[str, Any]:
+        return {
+            "title": result.title,
+            "url": result.url,
+            "snippet": result.snippet,
+        }
@@ -0,0 +1,62 @@
+"""
+This module defines the SyncNodeAdapter.
+
+Nodes built on blocking client libraries implement the synchronous `BaseNode`
+interface. Calling them directly from a request handler would block the event
+loop and stall every other request served by the process. The adapter exposes
+such a node through the `AsyncBaseNode` interface and runs its commands on a
+bounded thread pool instead.
+
+Implementation details:
+- The pool is shared by all adapted nodes of the process; its size bounds the
+  number of blocking commands running at once. Further commands wait for a
+  free thread without holding up the event loop.
+- Commands run in a copy of the caller's context, so context variables such
+  as `current_agent_id` are visible to them.
+- A command that is cancelled or times out while running cannot be
+  interrupted; its thread finishes in the background and the result is
+  discarded.
+"""
+
+import asyncio
+import contextvars
+import functools
+from concurrent.futures import Executor
+from typing import Any, Dict, List
+
+from .base_node import AsyncBaseNode, BaseNode
+
+
+class SyncNodeAdapter(AsyncBaseNode):
+    """
+    Exposes a synchronous node through the asynchronous node interface.
+
+    Args:
+        node: The synchronous node to wrap.
+        executor: The bounded pool running the node's commands.
+    """
+
+    def __init__(self, node: BaseNode, executor: Executor):
+        self.node = node
+        self.timeout_seconds = node.timeout_seconds
+        self.commands = node.commands
+        self.cacheable_commands = node.cacheable_commands
+        self.background_commands = node.background_commands
+        self._executor = executor
+
+    async def execute_command(
+        self, command: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor,
+            functools.partial(
+                contextvars.copy_context().run,
+                self.node.execute_command,
+                command,
+                params,
+            ),
+        )
+
+    def get_available_commands(self) -> List[str]:
+        return self.node.get_available_commands()
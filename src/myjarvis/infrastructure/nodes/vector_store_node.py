@@ -0,0 +1,234 @@
+"""
+This module contains the implementation for the VectorStoreNode.
+
+The VectorStoreNode gives an AI agent a memory it can search by meaning: the
+agent stores texts with 'upsert' and later retrieves the stored texts closest
+to a question with 'query'. Texts are embedded with the configured embedding
+model and kept in the local `VectorStore`, in a collection of the agent's
+own: the namespace is the agent the command runs for (`current_agent_id`),
+never a command parameter.
+
+Long texts, e.g. documents read with the google_docs node or emails found
+with the email node, are stored with 'ingest': they go through an
+`IngestionPipeline`, which splits them into chunks and only embeds the
+chunks missing from the persistent `EmbeddingCache`, in batches.
+
+The embedding is awaited on the event loop; opening a collection and the
+index operations, which are CPU-bound, run on a worker thread
+(`asyncio.to_thread`).
+"""
+
+import asyncio
+from typing import Any, Dict
+
+from config.settings import get_settings
+from myjarvis.infrastructure.llm.embedder import BaseEmbedder
+from myjarvis.infrastructure.llm.llm_factory import create_embedder
+from myjarvis.infrastructure.vector_store.embedding_cache import (
+    EmbeddingCache,
+)
+from myjarvis.infrastructure.vector_store.ingestion import (
+    IngestionPipeline,
+    SourceDocument,
+)
+from myjarvis.infrastructure.vector_store.vector_store import (
+    VectorRecord,
+    VectorStore,
+)
+
+from .base_node import (
+    AsyncBaseNode,
+    CommandSpec,
+    current_agent_id,
+    object_schema,
+)
+
+_MAX_TOP_K = 50
+
+
+class VectorStoreNode(AsyncBaseNode):
+    """
+    A node storing texts and searching them by similarity.
+
+    Args:
+        store: The vector store. Defaults to the store at the configured
+            `vector_store_path`.
+        embedder: The embedder of the texts and queries. Defaults to the
+            configured `vector_store_embedding_model`, created on first use.
+        pipeline: The pipeline of the 'ingest' command. Defaults to one
+            configured by the `ingestion_*` settings, with the embedding
+            cache at `embedding_cache_path`, created on first use.
+    """
+
+    commands = (
+        CommandSpec(
+            name="upsert",
+            description=(
+                "Store texts in the agent's memory, replacing texts stored "
+                "under the same ids."
+            ),
+            parameters=object_schema(
+                required={
+                    "documents": {
+                        "type": "array",
+                        "items": object_schema(
+                            required={
+                                "id": {"type": "string"},
+                                "text": {"type": "string"},
+                            },
+                            optional={"metadata": {"type": "object"}},
+                        ),
+                    }
+                },
+            ),
+        ),
+        CommandSpec(
+            name="ingest",
+            description=(
+                "Store long texts, such as documents or emails, in the "
+                "agent's memory, split into chunks searchable with 'query'. "
+                "Ingesting a text again under the same id replaces it."
+            ),
+            parameters=object_schema(
+                required={
+                    "documents": {
+                        "type": "array",
+                        "items": object_schema(
+                            required={
+                                "id": {"type": "string"},
+                                "text": {"type": "string"},
+                            },
+                            optional={"metadata": {"type": "object"}},
+                        ),
+                    }
+                },
+            ),
+        ),
+        CommandSpec(
+            name="query",
+            description=(
+                "Return the stored texts most similar in meaning to a text, "
+                "most similar first."
+            ),
+            parameters=object_schema(
+                required={"text": {"type": "string"}},
+                optional={
+                    "top_k": {
+                        "type": "integer",
+                        "minimum": 1,
+                        "maximum": _MAX_TOP_K,
+                    }
+                },
+            ),
+        ),
+        CommandSpec(
+            name="delete",
+            description="Delete stored texts by id.",
+            parameters=object_schema(
+                required={
+                    "ids": {"type": "array", "items": {"type": "string"}}
+                },
+            ),
+        ),
+    )
+
+    # Embedding many long texts can take tens of seconds.
+    background_commands = frozenset({"ingest"})
+
+    def __init__(
+        self,
+        store: VectorStore | None = None,
+        embedder: BaseEmbedder | None = None,
+        pipeline: IngestionPipeline | None = None,
+    ):
+        if store is None:
+            settings = get_settings()
+            store = VectorStore(
+                settings.vector_store_path,
+                nprobe=settings.vector_store_nprobe,
+            )
+        self.store = store
+        self._embedder = embedder
+        self._pipeline = pipeline
+
+    @property
+    def embedder(self) -> BaseEmbedder:
+        if self._embedder is None:
+            self._embedder = create_embedder(
+                get_settings().vector_store_embedding_model
+            )
+        return self._embedder
+
+    @property
+    def pipeline(self) -> IngestionPipeline:
+        if self._pipeline is None:
+            settings = get_settings()
+            self._pipeline = IngestionPipeline(
+                self.embedder,
+                self.store,
+                EmbeddingCache(
+                    settings.embedding_cache_path, self.embedder.model
+                ),
+                batch_size=settings.ingestion_batch_size,
+                max_concurrency=settings.ingestion_max_concurrency,
+                chunk_chars=settings.ingestion_chunk_chars,
+                overlap_chars=settings.ingestion_chunk_overlap_chars,
+            )
+        return self._pipeline
+
+    async def execute_command(
+        self, command: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        agent_id = current_agent_id.get()
+        if agent_id is None:
+            raise ValueError("The vector store is only available to agents.")
+        collection = await asyncio.to_thread(self.store.collection, agent_id)
+        if command == "upsert":
+            documents = params["documents"]
+            vectors = await self.embedder.embed(
+                [document["text"] for document in documents]
+            )
+            records = [
+                VectorRecord(
+                    id=str(document["id"]),
+                    vector=vector,
+                    text=document["text"],
+                    metadata=document.get("metadata") or {},
+                )
+                for document, vector in zip(documents, vectors)
+            ]
+            upserted = await asyncio.to_thread(collection.upsert, records)
+            return {"upserted": upserted}
+        if command == "ingest":
+            stats = await self.pipeline.ingest(
+                agent_id,
+                (
+                    SourceDocument(
+                        id=str(document["id"]),
+                        text=document["text"],
+                        metadata=document.get("metadata") or {},
+                    )
+                    for document in params["documents"]
+                ),
+            )
+            return {"chunks": stats.written, "embedded": stats.embedded}
+        if command == "query":
+            top_k = min(int(params.get("top_k", 5)), _MAX_TOP_K)
+            (vector,) = await self.embedder.embed([params["text"]])
+            matches = await asyncio.to_thread(collection.query, vector, top_k)
+            return {
+                "matches": [
+                    {
+                        "id": match.id,
+                        "score": round(match.score, 4),
+                        "text": match.text,
+                        "metadata": match.metadata,
+                    }
+                    for match in matches
+                ]
+            }
+        if command == "delete":
+            ids = [str(record_id) for record_id in params["ids"]]
+            deleted = await asyncio.to_thread(collection.delete, ids)
+            return {"deleted": deleted}
+        raise ValueError(f"Unknown command {command!r}.")
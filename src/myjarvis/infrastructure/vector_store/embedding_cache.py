@@ -0,0 +1,129 @@
+"""
+This module provides the persistent cache of text embeddings.
+
+An `EmbeddingCache` maps the content hash of a text to its embedding by one
+model, so a text already embedded, by any agent and in any earlier run, is
+never sent to the embedding provider again. The cache of a model lives in a
+directory of its own under the cache's root, laid out like a collection of
+the vector store:
+- `vectors.f32`: the embeddings, as a `MappedMatrix`.
+- `keys.log`: the content hash of every row, one per line, appended after
+  the rows are flushed, so rows written but not logged are overwritten.
+- `meta.json`: the dimensions of the embeddings.
+
+Entries never expire: an embedding only depends on the text and the model.
+The cache has a lock, so it can be used from worker threads.
+"""
+
+import hashlib
+import json
+import re
+import threading
+from pathlib import Path
+
+import numpy as np
+
+from .mapped_matrix import MappedMatrix
+
+_UNSAFE_CHARACTERS = re.compile(r"[^A-Za-z0-9_.-]")
+
+
+def content_hash(text: str) -> str:
+    """
+    Return the key of a text in the embedding cache.
+    """
+    return hashlib.blake2b(text.encode(), digest_size=16).hexdigest()
+
+
+class EmbeddingCache:
+    """
+    Embeddings of one model, keyed by `content_hash`.
+
+    Args:
+        root: The directory holding the caches of all models.
+        model: The embedding model; its embeddings are cached in a
+            directory named after it.
+    """
+
+    def __init__(self, root: str | Path, model: str):
+        self.model = model
+        self.path = Path(root) / _UNSAFE_CHARACTERS.sub("_", model)
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._matrix: MappedMatrix | None = None
+        self._rows: dict[str, int] = {}
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def get(self, hashes: list[str]) -> dict[str, np.ndarray]:
+        """
+        Return the cached embeddings of the given hashes; misses are left
+        out.
+        """
+        with self._lock:
+            found = [key for key in hashes if key in self._rows]
+            if not found:
+                return {}
+            rows = self._matrix.array[[self._rows[key] for key in found]]
+            return dict(zip(found, np.array(rows)))
+
+    def put(
+        self, hashes: list[str], vectors: list[list[float]] | np.ndarray
+    ) -> None:
+        """
+        Cache embeddings; hashes already cached are skipped.
+
+        Raises:
+            ValueError: If the vectors do not have the cache's dimensions.
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            new = {
+                key: row
+                for row, key in enumerate(hashes)
+                if key not in self._rows
+            }
+            if not new:
+                return
+            if self._matrix is None:
+                self._open(vectors.shape[1])
+            if vectors.shape[1] != self._matrix.dimensions:
+                raise ValueError(
+                    f"Expected vectors of {self._matrix.dimensions} "
+                    f"dimensions, got {vectors.shape[1]}."
+                )
+            start = len(self._rows)
+            self._matrix.reserve(start + len(new))
+            self._matrix.array[start : start + len(new)] = vectors[
+                list(new.values())
+            ]
+            self._matrix.flush()
+            with open(self.path / "keys.log", "a") as log:
+                log.writelines(f"{key}\n" for key in new)
+            for row, key in enumerate(new, start):
+                self._rows[key] = row
+
+    def close(self) -> None:
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.close()
+
+    def _load(self) -> None:
+        meta = self.path / "meta.json"
+        if not meta.exists():
+            return
+        self._open(json.loads(meta.read_text())["dimensions"])
+        log = self.path / "keys.log"
+        if log.exists():
+            with open(log) as lines:
+                for key in lines:
+                    self._rows[key.strip()] = len(self._rows)
+        self._matrix.reserve(len(self._rows))
+
+    def _open(self, dimensions: int) -> None:
+        meta = self.path / "meta.json"
+        if not meta.exists():
+            meta.write_text(json.dumps({"dimensions": dimensions}))
+        self._matrix = MappedMatrix(self.path / "vectors.f32", dimensions)
@@ -0,0 +1,336 @@
+"""
+This module provides the ingestion of long texts into the vector store.
+
+An `IngestionPipeline` consumes a stream of `SourceDocument`s, e.g. the
+documents read by the google_docs node or the emails found by the email
+node, and makes them searchable in the collection of an agent:
+1. Every document is split into chunks of paragraphs (`chunk_text`).
+   Chunk `i` of document `d` is stored under the id `d#i`, so ingesting a
+   document again replaces its chunks, and the chunks beyond its new length
+   are deleted.
+2. Every chunk is keyed by its content hash. Chunks found in the
+   `EmbeddingCache` are not embedded again, and a text repeated in the
+   stream, e.g. a quoted email or a signature, is embedded once.
+3. The remaining chunks are embedded `batch_size` at a time, with at most
+   `max_concurrency` batches in flight. The stream is only read further
+   while a batch can be sent, so the memory held by the pipeline is bounded
+   whatever the length of the stream.
+4. The vectors are added to the cache, then the chunks are written to the
+   collection.
+
+Implementation details:
+- Chunks waiting for their embedding are indexed by hash until the
+  embedding is cached, so a duplicate arriving meanwhile waits for the same
+  embedding instead of being sent again.
+- Writing to the cache and to the collection runs on a worker thread
+  (`asyncio.to_thread`); reading the cache, an in-memory lookup, does not.
+- The first failed batch fails the ingestion; the batches still in flight
+  are cancelled. Chunks already written stay written.
+"""
+
+import asyncio
+import re
+from collections.abc import AsyncIterable, Iterable
+from dataclasses import dataclass, field
+from typing import Any
+
+import numpy as np
+
+from myjarvis.infrastructure.llm.embedder import BaseEmbedder
+
+from .embedding_cache import EmbeddingCache, content_hash
+from .vector_store import VectorCollection, VectorRecord, VectorStore
+
+_PARAGRAPH_BREAK = re.compile(r"\n\s*\n")
+
+
+@dataclass(frozen=True, slots=True)
+class SourceDocument:
+    """
+    A text to ingest.
+
+    Attributes:
+        id: Identifier of the document, unique in the collection, e.g.
+            "google_docs:<document id>" or "email:<message id>".
+        text: The full text of the document.
+        metadata: Free-form data stored with every chunk of the document.
+    """
+
+    id: str
+    text: str
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class IngestionStats:
+    """
+    Counters of an ingestion.
+
+    Attributes:
+        documents: Documents read from the stream.
+        chunks: Chunks of these documents.
+        cache_hits: Chunks whose embedding was in the cache.
+        duplicates: Chunks whose text was already being embedded.
+        embedded: Chunks sent to the embedder.
+        batches: Requests sent to the embedder.
+        written: Chunks written to the collection.
+        deleted: Chunks deleted because their document got shorter.
+    """
+
+    documents: int = 0
+    chunks: int = 0
+    cache_hits: int = 0
+    duplicates: int = 0
+    embedded: int = 0
+    batches: int = 0
+    written: int = 0
+    deleted: int = 0
+
+
+def chunk_text(text: str, size: int = 1000, overlap: int = 200) -> list[str]:
+    """
+    Split a text into chunks of at most `size` characters.
+
+    Consecutive paragraphs are packed into a chunk as long as they fit, and
+    a paragraph that does not fit starts the next chunk, so the same
+    paragraph, e.g. a quoted email, mostly yields the same chunk in every
+    text it appears in. A paragraph longer than `size` is split at word
+    boundaries, every part but the first repeating the last words of the
+    previous one, up to `overlap` characters, so a sentence cut by a
+    boundary is still found whole in one of them. Runs of whitespace within
+    a paragraph are collapsed.
+    """
+    chunks: list[str] = []
+    current = ""
+    for paragraph in _PARAGRAPH_BREAK.split(text):
+        paragraph = " ".join(paragraph.split())
+        if not paragraph:
+            continue
+        if current and len(current) + 2 + len(paragraph) <= size:
+            current += "\n\n" + paragraph
+            continue
+        if current:
+            chunks.append(current)
+        parts = _split_words(paragraph, size, overlap)
+        chunks.extend(parts[:-1])
+        current = parts[-1]
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def _split_words(text: str, size: int, overlap: int) -> list[str]:
+    """
+    Split a paragraph into overlapping parts of at most `size` characters.
+    """
+    words: list[str] = []
+    for word in text.split(" "):
+        words.extend(word[i : i + size] for i in range(0, len(word), size))
+    parts: list[str] = []
+    start = 0
+    while True:
+        end, length = start + 1, len(words[start])
+        while end < len(words) and length + 1 + len(words[end]) <= size:
+            length += 1 + len(words[end])
+            end += 1
+        parts.append(" ".join(words[start:end]))
+        if end == len(words):
+            return parts
+        back, length = end, -1
+        while (
+            back > start + 1 and length + 1 + len(words[back - 1]) <= overlap
+        ):
+            length += 1 + len(words[back - 1])
+            back -= 1
+        start = back
+
+
+@dataclass(slots=True)
+class _Chunk:
+    id: str
+    text: str
+    metadata: dict[str, Any]
+
+    def record(self, vector: np.ndarray) -> VectorRecord:
+        return VectorRecord(self.id, vector, self.text, self.metadata)
+
+
+@dataclass(slots=True)
+class _Run:
+    """
+    State of one call to `IngestionPipeline.ingest`.
+    """
+
+    collection: VectorCollection
+    semaphore: asyncio.Semaphore
+    stats: IngestionStats = field(default_factory=IngestionStats)
+    # Texts of the next batch, by hash, and the chunks waiting for them.
+    batch: dict[str, str] = field(default_factory=dict)
+    waiting: dict[str, list[_Chunk]] = field(default_factory=dict)
+    # Chunks whose embedding is known, not written yet.
+    ready: list[VectorRecord] = field(default_factory=list)
+    tasks: list[asyncio.Task] = field(default_factory=list)
+
+
+class IngestionPipeline:
+    """
+    Chunks, embeds and stores streams of documents.
+
+    Args:
+        embedder: The embedder of the chunks.
+        store: The vector store the chunks are written to.
+        cache: The cache of the embeddings of `embedder`'s model.
+        batch_size: Chunks embedded per request.
+        max_concurrency: Embedding requests in flight at once.
+        chunk_chars: Maximum length of a chunk, in characters.
+        overlap_chars: Length of the text repeated between two consecutive
+            chunks of a document, at most.
+    """
+
+    def __init__(
+        self,
+        embedder: BaseEmbedder,
+        store: VectorStore,
+        cache: EmbeddingCache,
+        batch_size: int = 64,
+        max_concurrency: int = 4,
+        chunk_chars: int = 1000,
+        overlap_chars: int = 200,
+    ):
+        if cache.model != embedder.model:
+            raise ValueError(
+                f"The cache holds embeddings of {cache.model!r}, not "
+                f"{embedder.model!r}."
+            )
+        if not 0 <= overlap_chars < chunk_chars:
+            raise ValueError("The overlap must be shorter than the chunks.")
+        self.embedder = embedder
+        self.store = store
+        self.cache = cache
+        self.batch_size = batch_size
+        self.max_concurrency = max_concurrency
+        self.chunk_chars = chunk_chars
+        self.overlap_chars = overlap_chars
+
+    async def ingest(
+        self,
+        namespace: str,
+        documents: Iterable[SourceDocument] | AsyncIterable[SourceDocument],
+    ) -> IngestionStats:
+        """
+        Ingest documents into the collection of a namespace.
+
+        Args:
+            namespace: The namespace of the collection, e.g. an agent id.
+            documents: The documents, consumed as they are ingested.
+
+        Returns:
+            The counters of the ingestion.
+        """
+        collection = await asyncio.to_thread(self.store.collection, namespace)
+        run = _Run(collection, asyncio.Semaphore(self.max_concurrency))
+        try:
+            async for document in _iterate(documents):
+                await self._add(run, document)
+            if run.batch:
+                await self._dispatch(run)
+            await asyncio.gather(*run.tasks)
+        except BaseException:
+            for task in run.tasks:
+                task.cancel()
+            await asyncio.gather(*run.tasks, return_exceptions=True)
+            raise
+        await self._write(run, run.ready)
+        return run.stats
+
+    async def _add(self, run: _Run, document: SourceDocument) -> None:
+        chunks = chunk_text(
+            document.text, self.chunk_chars, self.overlap_chars
+        )
+        run.stats.documents += 1
+        run.stats.chunks += len(chunks)
+        stale = await asyncio.to_thread(
+            self._delete_stale, run.collection, document.id, len(chunks)
+        )
+        run.stats.deleted += stale
+        hashes = [content_hash(chunk) for chunk in chunks]
+        cached = self.cache.get(
+            [key for key in hashes if key not in run.waiting]
+        )
+        for index, (text, key) in enumerate(zip(chunks, hashes)):
+            chunk = _Chunk(
+                f"{document.id}#{index}",
+                text,
+                {**document.metadata, "source": document.id, "chunk": index},
+            )
+            if key in cached:
+                run.stats.cache_hits += 1
+                run.ready.append(chunk.record(cached[key]))
+            elif key in run.waiting:
+                run.stats.duplicates += 1
+                run.waiting[key].append(chunk)
+            else:
+                run.waiting[key] = [chunk]
+                run.batch[key] = text
+                if len(run.batch) >= self.batch_size:
+                    await self._dispatch(run)
+        if len(run.ready) >= self.batch_size:
+            ready, run.ready = run.ready, []
+            await self._write(run, ready)
+
+    async def _dispatch(self, run: _Run) -> None:
+        """
+        Send the current batch once fewer than `max_concurrency` batches
+        are in flight.
+        """
+        batch, run.batch = run.batch, {}
+        await run.semaphore.acquire()
+        for task in run.tasks:
+            if task.done() and task.exception() is not None:
+                run.semaphore.release()
+                raise task.exception()
+        run.stats.batches += 1
+        run.stats.embedded += len(batch)
+        run.tasks.append(asyncio.create_task(self._embed(run, batch)))
+
+    async def _embed(self, run: _Run, batch: dict[str, str]) -> None:
+        try:
+            vectors = await self.embedder.embed(list(batch.values()))
+        finally:
+            run.semaphore.release()
+        hashes = list(batch)
+        await asyncio.to_thread(self.cache.put, hashes, vectors)
+        records = [
+            chunk.record(vector)
+            for key, vector in zip(hashes, vectors)
+            for chunk in run.waiting.pop(key)
+        ]
+        await self._write(run, records)
+
+    async def _write(self, run: _Run, records: list[VectorRecord]) -> None:
+        if records:
+            written = await asyncio.to_thread(run.collection.upsert, records)
+            run.stats.written += written
+
+    @staticmethod
+    def _delete_stale(
+        collection: VectorCollection, document_id: str, count: int
+    ) -> int:
+        """
+        Delete the chunks of a document from index `count` on.
+        """
+        stale = []
+        while f"{document_id}#{count + len(stale)}" in collection:
+            stale.append(f"{document_id}#{count + len(stale)}")
+        return collection.delete(stale)
+
+
+async def _iterate(
+    documents: Iterable[SourceDocument] | AsyncIterable[SourceDocument],
+):
+    if isinstance(documents, AsyncIterable):
+        async for document in documents:
+            yield document
+    else:
+        for document in documents:
+            yield document
@@ -0,0 +1,178 @@
+"""
+This module provides an approximate nearest-neighbour index over NumPy.
+
+`IvfIndex` is an inverted file index: the vectors are partitioned into
+`nlist` clusters by k-means, and a query is compared with the vectors of the
+`nprobe` clusters whose centroids are closest to it instead of with every
+vector. Vectors are unit length and compared by their dot product, i.e. by
+cosine similarity.
+
+Implementation details:
+- The index does not own the vectors; it reads them by row from the matrix
+  it is given, typically a memory map of the collection's vector file.
+- Below `train_size` vectors, and for the rows added since the last
+  training, queries fall back to an exact scan.
+- New rows are assigned to their nearest centroid as they are added. Once
+  the collection has grown to `retrain_factor` times the size the centroids
+  were trained on, the index is trained again, so the cost of training is
+  amortized over the inserts.
+- Deleted rows stay in their cluster and are masked out of the results.
+- The index is not thread-safe; callers serialize access to it.
+"""
+
+import math
+
+import numpy as np
+
+_KMEANS_ITERATIONS = 10
+_SAMPLES_PER_CENTROID = 40
+# Rows scored against the centroids at once, bounding the temporary matrix.
+_ASSIGN_CHUNK = 8192
+
+
+class IvfIndex:
+    """
+    Inverted file index of unit vectors.
+
+    Args:
+        nprobe: Number of clusters searched per query.
+        train_size: Number of vectors from which the index is trained;
+            smaller collections are searched exactly.
+        retrain_factor: Growth of the collection, relative to the size the
+            index was trained on, that triggers a new training.
+        seed: Seed of the k-means initialization.
+    """
+
+    def __init__(
+        self,
+        nprobe: int = 16,
+        train_size: int = 10_000,
+        retrain_factor: float = 4.0,
+        seed: int = 0,
+    ):
+        self.nprobe = nprobe
+        self.train_size = train_size
+        self.retrain_factor = retrain_factor
+        self._random = np.random.default_rng(seed)
+        self._centroids: np.ndarray | None = None
+        # Rows of each cluster: an array, and the rows appended since.
+        self._lists: list[np.ndarray] = []
+        self._appended: list[list[int]] = []
+        self._trained_rows = 0
+        self._indexed_rows = 0
+
+    @property
+    def trained(self) -> bool:
+        return self._centroids is not None
+
+    def add(self, vectors: np.ndarray, count: int) -> None:
+        """
+        Index the rows added to the matrix since the last call.
+
+        Args:
+            vectors: The matrix of all vectors, one per row.
+            count: Number of rows in use.
+        """
+        if count >= max(
+            self.train_size, self._trained_rows * self.retrain_factor
+        ):
+            self._train(vectors, count)
+            return
+        if self._centroids is None:
+            return
+        clusters = self._assign(vectors[self._indexed_rows : count])
+        for row, cluster in enumerate(clusters.tolist(), self._indexed_rows):
+            self._appended[cluster].append(row)
+        self._indexed_rows = count
+
+    def search(
+        self,
+        vectors: np.ndarray,
+        count: int,
+        query: np.ndarray,
+        k: int,
+        deleted: np.ndarray,
+    ) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Return the rows most similar to a query.
+
+        Args:
+            vectors: The matrix of all vectors, one per row.
+            count: Number of rows in use.
+            query: The unit query vector.
+            k: Number of rows to return.
+            deleted: Mask of the deleted rows.
+
+        Returns:
+            The rows and their similarities, most similar first.
+        """
+        if self._centroids is None:
+            candidates = np.arange(count)
+        else:
+            probes = np.argsort(self._centroids @ query)[-self.nprobe :]
+            candidates = np.concatenate(
+                [self._array(cluster) for cluster in probes.tolist()]
+                + [np.arange(self._indexed_rows, count)]
+            )
+        candidates = candidates[~deleted[candidates]]
+        if not len(candidates):
+            return candidates, np.empty(0, dtype=np.float32)
+        scores = vectors[candidates] @ query
+        if len(candidates) > k:
+            top = np.argpartition(scores, -k)[-k:]
+            candidates, scores = candidates[top], scores[top]
+        order = np.argsort(scores)[::-1]
+        return candidates[order], scores[order]
+
+    def _train(self, vectors: np.ndarray, count: int) -> None:
+        nlist = max(1, int(2 * math.sqrt(count)))
+        sample_size = min(count, nlist * _SAMPLES_PER_CENTROID)
+        sample = np.sort(
+            self._random.choice(count, sample_size, replace=False)
+        )
+        data = np.asarray(vectors[sample], dtype=np.float32)
+        centroids = data[self._random.choice(sample_size, nlist, False)]
+        for _ in range(_KMEANS_ITERATIONS):
+            self._centroids = centroids
+            assignment = self._assign(data)
+            order = np.argsort(assignment, kind="stable")
+            clusters, starts = np.unique(assignment[order], return_index=True)
+            sums = np.add.reduceat(data[order], starts, axis=0)
+            norms = np.linalg.norm(sums, axis=1, keepdims=True)
+            # Empty clusters keep their previous centroid.
+            centroids = centroids.copy()
+            centroids[clusters] = sums / np.maximum(norms, 1e-12)
+        self._centroids = centroids
+        assignment = self._assign(vectors, count)
+        rows = np.argsort(assignment, kind="stable")
+        bounds = np.cumsum(np.bincount(assignment, minlength=nlist))[:-1]
+        self._lists = np.split(rows, bounds)
+        self._appended = [[] for _ in range(nlist)]
+        self._trained_rows = self._indexed_rows = count
+
+    def _assign(
+        self, vectors: np.ndarray, count: int | None = None
+    ) -> np.ndarray:
+        """
+        Return the nearest centroid of each of the first `count` rows.
+        """
+        count = len(vectors) if count is None else count
+        return np.concatenate(
+            [
+                np.argmax(
+                    vectors[start : min(count, start + _ASSIGN_CHUNK)]
+                    @ self._centroids.T,
+                    axis=1,
+                )
+                for start in range(0, count, _ASSIGN_CHUNK)
+            ]
+            or [np.empty(0, dtype=np.int64)]
+        )
+
+    def _array(self, cluster: int) -> np.ndarray:
+        if self._appended[cluster]:
+            self._lists[cluster] = np.concatenate(
+                [self._lists[cluster], self._appended[cluster]]
+            )
+            self._appended[cluster] = []
+        return self._lists[cluster]
@@ -0,0 +1,65 @@
+"""
+This module provides a growable float32 matrix memory-mapped from a file.
+
+The file grows by doubling its capacity, so appending rows stays
+incremental, and the operating system pages rows in and out as they are
+read instead of the process holding them all in memory. The matrix is not
+thread-safe; callers serialize access to it.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+_INITIAL_CAPACITY = 1024
+
+
+class MappedMatrix:
+    """
+    Float32 matrix of `dimensions` columns, memory-mapped from `path`.
+
+    Args:
+        path: The file of the matrix; created on the first `reserve`.
+        dimensions: Number of columns.
+    """
+
+    def __init__(self, path: Path, dimensions: int):
+        self.path = path
+        self.dimensions = dimensions
+        self.array: np.memmap | None = None
+
+    @property
+    def capacity(self) -> int:
+        return 0 if self.array is None else len(self.array)
+
+    def reserve(self, rows: int) -> None:
+        """
+        Grow the file to hold at least `rows` rows, mapping it if needed.
+        """
+        capacity = self.capacity
+        if self.array is not None and rows <= capacity:
+            return
+        row_bytes = self.dimensions * 4
+        existing = (
+            self.path.stat().st_size // row_bytes if self.path.exists() else 0
+        )
+        capacity = max(_INITIAL_CAPACITY, capacity, existing)
+        while capacity < rows:
+            capacity *= 2
+        self.flush()
+        with open(self.path, "ab") as file:
+            file.truncate(capacity * row_bytes)
+        self.array = np.memmap(
+            self.path,
+            dtype=np.float32,
+            mode="r+",
+            shape=(capacity, self.dimensions),
+        )
+
+    def flush(self) -> None:
+        if self.array is not None:
+            self.array.flush()
+
+    def close(self) -> None:
+        self.flush()
+        self.array = None
@@ -0,0 +1,324 @@
+"""
+This module provides the local store of embedding vectors.
+
+A `VectorStore` holds one `VectorCollection` per namespace, e.g. per agent,
+each in a directory of its own under the store's root:
+- `vectors.f32`: the vectors, as a `MappedMatrix` memory-mapped from the
+  file. Inserts stay incremental, and the operating system pages vectors in
+  and out as the index touches them instead of the process holding them all
+  in memory.
+- `records.jsonl`: an append-only log of the upserted records (their id,
+  row, text and metadata) and of the deletions. It is replayed when the
+  collection is opened. Vectors are flushed before their records are
+  logged, so rows written but not logged are simply overwritten.
+- `meta.json`: the dimensions of the vectors.
+
+Collections are searched through an `IvfIndex`, rebuilt from the vector file
+when a collection is opened. Upserting an existing id adds a new row and
+deletes the old one. Every collection has a lock, so commands running on
+different threads do not interleave.
+"""
+
+import json
+import re
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from .ivf_index import IvfIndex
+from .mapped_matrix import MappedMatrix
+
+_NAMESPACE_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,128}$")
+
+
+@dataclass(frozen=True, slots=True)
+class VectorRecord:
+    """
+    A vector with the text it embeds.
+
+    Attributes:
+        id: Identifier of the record, unique in its collection.
+        vector: The embedding.
+        text: The embedded text.
+        metadata: Free-form data returned with the record.
+    """
+
+    id: str
+    vector: list[float] | np.ndarray
+    text: str = ""
+    metadata: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(frozen=True, slots=True)
+class VectorMatch:
+    """
+    A record found by a query, with its cosine similarity to the query.
+    """
+
+    id: str
+    score: float
+    text: str
+    metadata: dict[str, Any]
+
+
+class VectorCollection:
+    """
+    Vectors of one namespace, memory-mapped from a directory.
+
+    Args:
+        path: The directory of the collection; created if missing.
+        nprobe: Clusters searched per query, see `IvfIndex`.
+        train_size: Size from which queries use the index, see `IvfIndex`.
+    """
+
+    def __init__(self, path: Path, nprobe: int = 16, train_size: int = 10_000):
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._index = IvfIndex(nprobe=nprobe, train_size=train_size)
+        self._dimensions: int | None = None
+        self._matrix: MappedMatrix | None = None
+        self._vectors: np.memmap | None = None
+        self._deleted = np.zeros(0, dtype=bool)
+        self._count = 0
+        self._rows: dict[str, int] = {}
+        self._ids: list[str] = []
+        self._payloads: list[tuple[str, dict[str, Any]]] = []
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, record_id: str) -> bool:
+        return record_id in self._rows
+
+    @property
+    def dimensions(self) -> int | None:
+        return self._dimensions
+
+    @property
+    def nprobe(self) -> int:
+        """
+        Number of index clusters searched per query.
+        """
+        return self._index.nprobe
+
+    @nprobe.setter
+    def nprobe(self, value: int) -> None:
+        self._index.nprobe = value
+
+    def upsert(self, records: list[VectorRecord]) -> int:
+        """
+        Insert records, replacing those with the same id.
+
+        Returns:
+            The number of records written.
+
+        Raises:
+            ValueError: If the vectors do not have the collection's
+                dimensions.
+        """
+        if not records:
+            return 0
+        vectors = np.asarray([record.vector for record in records], np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors /= np.maximum(norms, 1e-12)
+        with self._lock:
+            if self._dimensions is None:
+                self._set_dimensions(vectors.shape[1])
+            if vectors.shape[1] != self._dimensions:
+                raise ValueError(
+                    f"Expected vectors of {self._dimensions} dimensions, "
+                    f"got {vectors.shape[1]}."
+                )
+            start = self._count
+            self._reserve(start + len(records))
+            self._vectors[start : start + len(records)] = vectors
+            self._vectors.flush()
+            with open(self.path / "records.jsonl", "a") as log:
+                for row, record in enumerate(records, start):
+                    entry = {
+                        "id": record.id,
+                        "row": row,
+                        "text": record.text,
+                        "metadata": record.metadata,
+                    }
+                    log.write(json.dumps(entry, default=str) + "\n")
+                    self._apply(entry)
+            self._index.add(self._vectors, self._count)
+        return len(records)
+
+    def delete(self, ids: list[str]) -> int:
+        """
+        Delete records by id.
+
+        Returns:
+            The number of records deleted; unknown ids are ignored.
+        """
+        with self._lock:
+            known = [record_id for record_id in ids if record_id in self._rows]
+            if known:
+                with open(self.path / "records.jsonl", "a") as log:
+                    for record_id in known:
+                        entry = {"delete": record_id}
+                        log.write(json.dumps(entry) + "\n")
+                        self._apply(entry)
+        return len(known)
+
+    def query(
+        self, vector: list[float] | np.ndarray, k: int = 10
+    ) -> list[VectorMatch]:
+        """
+        Return the `k` records most similar to a vector, most similar first.
+        """
+        query = np.array(vector, dtype=np.float32)
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+        with self._lock:
+            if self._vectors is None or not self._rows:
+                return []
+            rows, scores = self._index.search(
+                self._vectors, self._count, query, k, self._deleted
+            )
+            return [
+                VectorMatch(self._ids[row], float(score), *self._payloads[row])
+                for row, score in zip(rows.tolist(), scores.tolist())
+            ]
+
+    def exact_query(
+        self, vector: list[float] | np.ndarray, k: int = 10
+    ) -> list[str]:
+        """
+        Return the ids of the `k` most similar records by an exhaustive
+        scan, e.g. to measure the recall of `query`.
+        """
+        query = np.array(vector, dtype=np.float32)
+        query /= max(float(np.linalg.norm(query)), 1e-12)
+        with self._lock:
+            if self._vectors is None or not self._rows:
+                return []
+            scores = np.asarray(self._vectors[: self._count] @ query)
+            scores[self._deleted[: self._count]] = -np.inf
+            top = np.argsort(scores)[::-1][:k]
+            return [
+                self._ids[row]
+                for row in top.tolist()
+                if not self._deleted[row]
+            ]
+
+    def close(self) -> None:
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.close()
+                self._matrix = self._vectors = None
+
+    def _load(self) -> None:
+        meta = self.path / "meta.json"
+        if not meta.exists():
+            return
+        self._set_dimensions(json.loads(meta.read_text())["dimensions"])
+        log = self.path / "records.jsonl"
+        if log.exists():
+            with open(log) as lines:
+                for line in lines:
+                    if line.strip():
+                        self._apply(json.loads(line))
+        self._reserve(self._count)
+        self._index.add(self._vectors, self._count)
+
+    def _apply(self, entry: dict[str, Any]) -> None:
+        """
+        Apply a record of the log to the in-memory state.
+        """
+        if "delete" in entry:
+            row = self._rows.pop(entry["delete"], None)
+            if row is not None:
+                self._deleted[row] = True
+            return
+        row = entry["row"]
+        previous = self._rows.get(entry["id"])
+        if previous is not None:
+            self._deleted[previous] = True
+        if len(self._deleted) <= row:
+            self._deleted = np.concatenate(
+                [self._deleted, np.zeros(row + 1, dtype=bool)]
+            )
+        self._rows[entry["id"]] = row
+        del self._ids[row:], self._payloads[row:]
+        self._ids.append(entry["id"])
+        self._payloads.append((entry["text"], entry["metadata"]))
+        self._count = row + 1
+
+    def _set_dimensions(self, dimensions: int) -> None:
+        self._dimensions = dimensions
+        meta = self.path / "meta.json"
+        if not meta.exists():
+            meta.write_text(json.dumps({"dimensions": dimensions}))
+
+    def _reserve(self, rows: int) -> None:
+        """
+        Grow the vector file to hold at least `rows` rows.
+        """
+        if self._matrix is None:
+            self._matrix = MappedMatrix(
+                self.path / "vectors.f32", self._dimensions
+            )
+        self._matrix.reserve(rows)
+        self._vectors = self._matrix.array
+        capacity = self._matrix.capacity
+        if len(self._deleted) < capacity:
+            self._deleted = np.concatenate(
+                [
+                    self._deleted,
+                    np.zeros(capacity - len(self._deleted), dtype=bool),
+                ]
+            )
+
+
+class VectorStore:
+    """
+    Collections of vectors by namespace, under a root directory.
+
+    Args:
+        root: The directory holding the collections.
+        nprobe: Clusters searched per query, see `IvfIndex`.
+        train_size: Size from which queries use the index, see `IvfIndex`.
+    """
+
+    def __init__(
+        self, root: str | Path, nprobe: int = 16, train_size: int = 10_000
+    ):
+        self.root = Path(root)
+        self._nprobe = nprobe
+        self._train_size = train_size
+        self._collections: dict[str, VectorCollection] = {}
+        self._lock = threading.Lock()
+
+    def collection(self, namespace: str) -> VectorCollection:
+        """
+        Return the collection of a namespace, opening it if needed.
+
+        Raises:
+            ValueError: If the namespace is not a valid directory name.
+        """
+        if not _NAMESPACE_PATTERN.match(namespace):
+            raise ValueError(f"Invalid namespace: {namespace!r}")
+        with self._lock:
+            collection = self._collections.get(namespace)
+            if collection is None:
+                collection = VectorCollection(
+                    self.root / namespace, self._nprobe, self._train_size
+                )
+                self._collections[namespace] = collection
+            return collection
+
+    def close(self) -> None:
+        """
+        Flush and close all open collections.
+        """
+        with self._lock:
+            for collection in self._collections.values():
+                collection.close()
+            self._collections.clear()
@@ -10,6 +10,10 @@ This layer is composed of three main sub-packages:
 - `middleware`: Contains custom middleware for handling requests.
 - `schemas`: Contains Pydantic schemas for data validation and serialization.
 
+The `composition` module creates the process-wide resources and wires them
+into the application and domain services, for the API and the workers
+alike.
+
 The presentation layer interacts with the application layer to execute business
 logic and retrieve data. It should not contain any business logic itself and
 should be kept as thin as possible.
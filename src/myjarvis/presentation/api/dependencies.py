@@ -1,33 +1,303 @@
 """
-This module will contain dependency injection providers for the API.
+This module contains dependency injection providers for the API.
 
 Dependency injection is a key principle of the Clean Architecture, and it is used
-to decouple the different layers of the application. This module will provide
+to decouple the different layers of the application. This module provides
 the dependencies required by the API endpoints, such as repositories, services,
 and use case handlers.
 
-Implementation Details:
-- Define provider functions for each dependency (e.g., `get_user_repository`).
-- Use FastAPI's `Depends` function to inject the dependencies into the route
-  handlers.
-- Initialize dependencies such as database sessions, repositories, and
-  application service handlers here.
-
-Example:
-    from typing import Annotated
-    from fastapi import Depends
-    from sqlalchemy.orm import Session
-    from myjarvis.application.services import AgentService
-    from myjarvis.infrastructure.database.session import get_db_session
-    from myjarvis.infrastructure.database.repositories import (
-        SQLAlchemyAgentRepository
+Process-wide resources (e.g. the Redis client) are created in the application
+lifespan and stored on `app.state`; per-request resources (e.g. database
+sessions) are created by the providers below.
+"""
+
+from typing import Annotated, Any
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import get_settings
+
+from myjarvis.presentation.composition import create_agent_service
+from myjarvis.application.handlers.command_handlers import (
+    AttachNodeHandler,
+    SelectAgentHandler,
+    SendMessageHandler,
+)
+from myjarvis.application.handlers.query_handlers import (
+    GetAgentHandler,
+    GetNodesHandler,
+    GetUserAgentsHandler,
+)
+from myjarvis.application.read_models.agent_read_model import AgentReadModel
+from myjarvis.application.read_models.node_read_model import NodeReadModel
+from myjarvis.domain.repositories.agent_repository import AgentRepository
+from myjarvis.domain.repositories.chat_context_repository import (
+    ChatContextRepository,
+)
+from myjarvis.domain.repositories.node_repository import NodeRepository
+from myjarvis.domain.repositories.user_repository import UserRepository
+from myjarvis.domain.services.agent_service import AgentService
+from myjarvis.domain.services.node_service import NodeService
+from myjarvis.domain.services.telegram_identity_service import (
+    TelegramIdentityService,
+)
+from myjarvis.domain.services.tool_executor import ToolExecutor
+from myjarvis.infrastructure.cache.redis_cache import RedisCache
+from myjarvis.infrastructure.cache.response_cache import ResponseCache
+from myjarvis.infrastructure.database.read_models.sqlalchemy_agent_read_model import (  # noqa: E501
+    SQLAlchemyAgentReadModel,
+)
+from myjarvis.infrastructure.database.read_models.sqlalchemy_node_read_model import (  # noqa: E501
+    SQLAlchemyNodeReadModel,
+)
+from myjarvis.infrastructure.database.repositories.sqlalchemy_agent_repository import (  # noqa: E501
+    SQLAlchemyAgentRepository,
+)
+from myjarvis.infrastructure.database.repositories.sqlalchemy_chat_context_repository import (  # noqa: E501
+    SQLAlchemyChatContextRepository,
+)
+from myjarvis.infrastructure.database.repositories.sqlalchemy_node_repository import (  # noqa: E501
+    SQLAlchemyNodeRepository,
+)
+from myjarvis.infrastructure.database.repositories.sqlalchemy_user_repository import (  # noqa: E501
+    SQLAlchemyUserRepository,
+)
+from myjarvis.infrastructure.database.session import (
+    get_db_session,
+    get_read_db_session,
+)
+from myjarvis.infrastructure.jobs.agent_turns import AgentTurnClient
+from myjarvis.infrastructure.jobs.turn_store import SuspendedTurnStore
+from myjarvis.infrastructure.llm.client_registry import get_client_registry
+from myjarvis.infrastructure.llm.routing_llm import LlmRouter
+
+DbSessionDep = Annotated[AsyncSession, Depends(get_db_session)]
+ReadDbSessionDep = Annotated[AsyncSession, Depends(get_read_db_session)]
+
+
+def get_current_user(request: Request) -> dict[str, Any]:
+    """
+    Return the claims of the authenticated user.
+
+    The claims are put on the request state by the authentication middleware.
+
+    Raises:
+        HTTPException: 401 if the request is not authenticated.
+    """
+    user = getattr(request.state, "user", None)
+    if user is None:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Not authenticated",
+        )
+    return user
+
+
+CurrentUserDep = Annotated[dict[str, Any], Depends(get_current_user)]
+
+
+def get_fields(fields: str | None = None) -> frozenset[str] | None:
+    """
+    Parse the `fields=` projection of a list endpoint.
+
+    Args:
+        fields: Comma-separated names of the fields to return, or None for
+            all fields.
+    """
+    if fields is None:
+        return None
+    names = (name.strip() for name in fields.split(","))
+    return frozenset(name for name in names if name)
+
+
+FieldsDep = Annotated[frozenset[str] | None, Depends(get_fields)]
+
+
+def get_agent_repository(session: DbSessionDep) -> AgentRepository:
+    return SQLAlchemyAgentRepository(session)
+
+
+def get_chat_context_repository(
+    session: DbSessionDep,
+) -> ChatContextRepository:
+    return SQLAlchemyChatContextRepository(session)
+
+
+def get_node_repository(session: DbSessionDep) -> NodeRepository:
+    return SQLAlchemyNodeRepository(session)
+
+
+def get_user_repository(session: DbSessionDep) -> UserRepository:
+    return SQLAlchemyUserRepository(session)
+
+
+def get_node_service(request: Request) -> NodeService:
+    return request.app.state.node_service
+
+
+def get_telegram_identity_service(request: Request) -> TelegramIdentityService:
+    return request.app.state.telegram_identities
+
+
+def get_chat_cache(request: Request) -> RedisCache:
+    return request.app.state.chat_cache
+
+
+ChatCacheDep = Annotated[RedisCache, Depends(get_chat_cache)]
+
+
+def get_llm_router() -> LlmRouter | None:
+    """
+    Return the LLM router of the process, or None if no model has a
+    fallback configured.
+    """
+    if not get_settings().llm_fallback_models:
+        return None
+    return get_client_registry().router()
+
+
+LlmRouterDep = Annotated[LlmRouter | None, Depends(get_llm_router)]
+
+
+def get_tool_executor(request: Request) -> ToolExecutor:
+    return request.app.state.tool_executor
+
+
+def get_response_cache(request: Request) -> ResponseCache | None:
+    return request.app.state.response_cache
+
+
+def get_turn_store(request: Request) -> SuspendedTurnStore | None:
+    return request.app.state.turn_store
+
+
+def get_agent_turn_client(request: Request) -> AgentTurnClient | None:
+    return request.app.state.agent_turns
+
+
+AgentTurnClientDep = Annotated[
+    AgentTurnClient | None, Depends(get_agent_turn_client)
+]
+
+
+def get_agent_service(
+    tool_executor: Annotated[ToolExecutor, Depends(get_tool_executor)],
+    response_cache: Annotated[
+        ResponseCache | None, Depends(get_response_cache)
+    ],
+) -> AgentService:
+    return create_agent_service(tool_executor, response_cache)
+
+
+def get_send_message_handler(
+    agent_repository: Annotated[
+        AgentRepository, Depends(get_agent_repository)
+    ],
+    chat_repository: Annotated[
+        ChatContextRepository, Depends(get_chat_context_repository)
+    ],
+    chat_cache: Annotated[RedisCache, Depends(get_chat_cache)],
+    agent_service: Annotated[AgentService, Depends(get_agent_service)],
+    node_repository: Annotated[NodeRepository, Depends(get_node_repository)],
+    node_service: Annotated[NodeService, Depends(get_node_service)],
+    turn_store: Annotated[SuspendedTurnStore | None, Depends(get_turn_store)],
+) -> SendMessageHandler:
+    return SendMessageHandler(
+        agent_repository=agent_repository,
+        chat_repository=chat_repository,
+        chat_cache=chat_cache,
+        agent_service=agent_service,
+        history_window=get_settings().chat_history_window,
+        node_repository=node_repository,
+        node_service=node_service,
+        turn_store=turn_store,
     )
 
-    def get_agent_service(
-        session: Session = Depends(get_db_session)
-    ) -> AgentService:
-        repo = SQLAlchemyAgentRepository(session)
-        return AgentService(agent_repository=repo)
 
-    AgentServiceDep = Annotated[AgentService, Depends(get_agent_service)]
-"""
+SendMessageHandlerDep = Annotated[
+    SendMessageHandler, Depends(get_send_message_handler)
+]
+
+
+def get_attach_node_handler(
+    agent_repository: Annotated[
+        AgentRepository, Depends(get_agent_repository)
+    ],
+    node_repository: Annotated[NodeRepository, Depends(get_node_repository)],
+    node_service: Annotated[NodeService, Depends(get_node_service)],
+) -> AttachNodeHandler:
+    return AttachNodeHandler(
+        agent_repository=agent_repository,
+        node_repository=node_repository,
+        node_service=node_service,
+    )
+
+
+AttachNodeHandlerDep = Annotated[
+    AttachNodeHandler, Depends(get_attach_node_handler)
+]
+
+
+def get_select_agent_handler(
+    user_repository: Annotated[UserRepository, Depends(get_user_repository)],
+    agent_repository: Annotated[
+        AgentRepository, Depends(get_agent_repository)
+    ],
+    identity_service: Annotated[
+        TelegramIdentityService, Depends(get_telegram_identity_service)
+    ],
+) -> SelectAgentHandler:
+    return SelectAgentHandler(
+        user_repository=user_repository,
+        agent_repository=agent_repository,
+        identity_service=identity_service,
+    )
+
+
+SelectAgentHandlerDep = Annotated[
+    SelectAgentHandler, Depends(get_select_agent_handler)
+]
+
+
+def get_agent_read_model(
+    session: ReadDbSessionDep,
+    node_service: Annotated[NodeService, Depends(get_node_service)],
+) -> AgentReadModel:
+    return SQLAlchemyAgentReadModel(session, node_service.get_command_names)
+
+
+def get_agent_handler(
+    agent_read_model: Annotated[AgentReadModel, Depends(get_agent_read_model)],
+) -> GetAgentHandler:
+    return GetAgentHandler(agent_read_model=agent_read_model)
+
+
+GetAgentHandlerDep = Annotated[GetAgentHandler, Depends(get_agent_handler)]
+
+
+def get_user_agents_handler(
+    agent_read_model: Annotated[AgentReadModel, Depends(get_agent_read_model)],
+) -> GetUserAgentsHandler:
+    return GetUserAgentsHandler(agent_read_model=agent_read_model)
+
+
+GetUserAgentsHandlerDep = Annotated[
+    GetUserAgentsHandler, Depends(get_user_agents_handler)
+]
+
+
+def get_node_read_model(
+    session: ReadDbSessionDep,
+    node_service: Annotated[NodeService, Depends(get_node_service)],
+) -> NodeReadModel:
+    return SQLAlchemyNodeReadModel(session, node_service.get_command_names)
+
+
+def get_nodes_handler(
+    node_read_model: Annotated[NodeReadModel, Depends(get_node_read_model)],
+) -> GetNodesHandler:
+    return GetNodesHandler(node_read_model=node_read_model)
+
+
+GetNodesHandlerDep = Annotated[GetNodesHandler, Depends(get_nodes_handler)]
@@ -7,4 +7,5 @@ This package includes the following modules:
 - `agents.py`: Endpoints for managing AI agents.
 - `nodes.py`: Endpoints for managing nodes.
 - `chat.py`: Endpoints for interacting with AI agents.
+- `stats.py`: Endpoint exposing the counters of the service.
 """
@@ -1,5 +1,5 @@
 """
-This module will contain the API endpoints for managing AI agents.
+This module contains the API endpoints for managing AI agents.
 
 It will provide CRUD (Create, Read, Update, Delete) functionality for AI agents,
 allowing users to create new agents, retrieve information about existing agents,
@@ -12,13 +12,18 @@ Implementation Details:
     - Input: `AgentCreate` schema.
     - Output: `AgentRead` schema.
     - It will call the `CreateAgentHandler` from the application layer.
-  - `GET /agents/`: Get a list of all AI agents for the authenticated user.
-    - Output: A list of `AgentRead` schemas.
-    - It will call the `GetUserAgentsHandler` from the application layer.
+  - `GET /agents/`: Get the AI agents of the authenticated user, one page
+    at a time.
+    - Input: `limit`, `cursor` (from the previous page) and `fields`
+      (comma-separated projection) query parameters.
+    - Output: `AgentPage` schema.
+    - It calls the `GetUserAgentsHandler` from the application layer.
+    - Implemented.
   - `GET /agents/{agent_id}`: Get a specific AI agent by its ID.
     - Input: `agent_id` path parameter.
     - Output: `AgentRead` schema.
-    - It will call the `GetAgentHandler` from the application layer.
+    - It calls the `GetAgentHandler` from the application layer.
+    - Implemented.
   - `PUT /agents/{agent_id}`: Update an AI agent.
     - Input: `agent_id` path parameter and `AgentUpdate` schema.
     - Output: `AgentRead` schema.
@@ -30,8 +35,117 @@ Implementation Details:
   - `POST /agents/{agent_id}/nodes/{node_id}`: Attach a node to an agent.
     - Input: `agent_id` and `node_id` path parameters.
     - Output: A success message.
-    - It will call the `AttachNodeHandler` from the application layer.
+    - It calls the `AttachNodeHandler` from the application layer.
+    - Implemented.
+  - `POST /agents/{agent_id}/select`: Make an agent the one answering the
+    user's Telegram messages.
+    - Input: `agent_id` path parameter.
+    - Output: A success message.
+    - It calls the `SelectAgentHandler` from the application layer.
+    - Implemented.
 - Use the dependency injection system to get the required handlers.
 - Use the schemas from `src/myjarvis/presentation/schemas/agent_schemas.py`
   for request and response validation.
 """
+
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import ValidationError
+
+from myjarvis.application.commands.attach_node import AttachNodeCommand
+from myjarvis.application.commands.select_agent import SelectAgentCommand
+from myjarvis.application.queries.get_agent import GetAgentQuery
+from myjarvis.application.queries.get_user_agents import GetUserAgentsQuery
+from myjarvis.application.queries.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+)
+from myjarvis.domain.exceptions.domain_exceptions import (
+    AgentNotFoundException,
+    InvalidActionException,
+    NodeNotFoundException,
+    UserNotFoundException,
+)
+from myjarvis.presentation.api.dependencies import (
+    AttachNodeHandlerDep,
+    CurrentUserDep,
+    FieldsDep,
+    GetAgentHandlerDep,
+    GetUserAgentsHandlerDep,
+    SelectAgentHandlerDep,
+)
+from myjarvis.presentation.schemas.agent_schemas import AgentPage, AgentRead
+
+router = APIRouter(prefix="/agents", tags=["agents"])
+
+
+@router.get("/", response_model=AgentPage, response_model_exclude_none=True)
+async def list_agents(
+    current_user: CurrentUserDep,
+    handler: GetUserAgentsHandlerDep,
+    fields: FieldsDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+) -> AgentPage:
+    try:
+        query = GetUserAgentsQuery(
+            user_id=current_user["uid"],
+            limit=limit,
+            cursor=cursor,
+            fields=fields,
+        )
+        page = await handler.handle(query)
+    except (ValidationError, InvalidCursorError) as exc:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY, str(exc)
+        ) from exc
+    return AgentPage.model_validate(page)
+
+
+@router.get("/{agent_id}", response_model=AgentRead)
+async def get_agent(
+    agent_id: str,
+    current_user: CurrentUserDep,
+    handler: GetAgentHandlerDep,
+) -> AgentRead:
+    query = GetAgentQuery(agent_id=agent_id, user_id=current_user["uid"])
+    try:
+        agent = await handler.handle(query)
+    except AgentNotFoundException as exc:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(exc)) from exc
+    return AgentRead.model_validate(agent)
+
+
+@router.post("/{agent_id}/nodes/{node_id}")
+async def attach_node(
+    agent_id: str,
+    node_id: str,
+    current_user: CurrentUserDep,
+    handler: AttachNodeHandlerDep,
+) -> dict[str, str]:
+    command = AttachNodeCommand(
+        agent_id=agent_id, node_id=node_id, user_id=current_user["uid"]
+    )
+    try:
+        await handler.handle(command)
+    except (AgentNotFoundException, NodeNotFoundException) as exc:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(exc)) from exc
+    except InvalidActionException as exc:
+        raise HTTPException(status.HTTP_409_CONFLICT, str(exc)) from exc
+    return {"detail": "Node attached."}
+
+
+@router.post("/{agent_id}/select")
+async def select_agent(
+    agent_id: str,
+    current_user: CurrentUserDep,
+    handler: SelectAgentHandlerDep,
+) -> dict[str, str]:
+    command = SelectAgentCommand(
+        agent_id=agent_id, user_id=current_user["uid"]
+    )
+    try:
+        await handler.handle(command)
+    except (UserNotFoundException, AgentNotFoundException) as exc:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(exc)) from exc
+    return {"detail": "Agent selected."}
@@ -1,22 +1,198 @@
 """
-This module will contain the API endpoints for interacting with AI agents.
+This module contains the API endpoints for interacting with AI agents.
 
-It will provide a way for users to send messages to their AI agents and receive
+It provides a way for users to send messages to their AI agents and receive
 responses. This is the core interactive part of the application.
 
-Implementation Details:
-- Create a FastAPI `APIRouter` for chat.
-- Implement the following endpoint:
-  - `POST /chat/{agent_id}`: Send a message to an AI agent.
-    - Input: `agent_id` path parameter and a `ChatMessage` schema containing
-      the message content.
-    - Output: A `ChatMessage` schema containing the agent's response.
-    - This endpoint will call the `SendMessageHandler` from the application
-      layer.
-    - It should handle both regular and streaming responses. For streaming,
-      a WebSocket or Server-Sent Events (SSE) endpoint could be used.
-      - `POST /chat/{agent_id}/stream`: For streaming responses.
-- Use the dependency injection system to get the `SendMessageHandler`.
-- Use the schemas from `src/myjarvis/presentation/schemas/chat_schemas.py` for
-  request and response validation.
+Endpoints:
+- `POST /chat/{agent_id}`: Send a message and wait for the complete reply.
+  If the LLM provider's rate limit does not let the request through in
+  time, the endpoint answers 503 with a `Retry-After` header. If the agent
+  runs a long node command as a background job, the endpoint answers 202
+  with a `ChatTurnPending` and the `Location` of the turn to poll.
+- `GET /chat/{agent_id}/turns/{turn_id}`: Poll a pending turn. The request
+  waits up to `wait` seconds (at most `chat_turn_max_wait_seconds`) for the
+  turn's jobs, then answers 200 with the reply, or 202 with the turn still
+  pending.
+- `POST /chat/{agent_id}/stream`: Send a message and receive the reply as
+  Server-Sent Events while the LLM is generating it. Every text fragment is
+  sent as a `message` event carrying a `ChatStreamChunk`; the stream ends
+  with a `done` event, or with an `error` event if generation fails.
+
+With the agent worker tier enabled, both `POST` endpoints run the turn on
+the worker processes (`AgentTurnClient`) and relay the reply; a turn the
+tier fails to run answers 503.
 """
+
+import logging
+import math
+from typing import AsyncIterator
+
+from fastapi import (
+    APIRouter,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    status,
+)
+from fastapi.responses import StreamingResponse
+
+from config.settings import get_settings
+from myjarvis.application.commands.resume_turn import ResumeTurnCommand
+from myjarvis.application.commands.send_message import SendMessageCommand
+from myjarvis.domain.exceptions.domain_exceptions import (
+    AgentNotFoundException,
+    InvalidActionException,
+    TurnNotFoundException,
+)
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.domain.value_objects.suspended_turn import SuspendedTurn
+from myjarvis.infrastructure.jobs.agent_turns import AgentTurnError
+from myjarvis.infrastructure.llm.scheduler import LlmOverloadedError
+from myjarvis.presentation.api.dependencies import (
+    AgentTurnClientDep,
+    CurrentUserDep,
+    SendMessageHandlerDep,
+)
+from myjarvis.presentation.schemas.chat_schemas import (
+    ChatMessageCreate,
+    ChatMessageRead,
+    ChatStreamChunk,
+    ChatTurnPending,
+)
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/chat", tags=["chat"])
+
+
+@router.post("/{agent_id}", response_model=ChatMessageRead | ChatTurnPending)
+async def send_message(
+    agent_id: str,
+    message: ChatMessageCreate,
+    current_user: CurrentUserDep,
+    handler: SendMessageHandlerDep,
+    agent_turns: AgentTurnClientDep,
+    request: Request,
+    response: Response,
+) -> ChatMessageRead | ChatTurnPending:
+    command = SendMessageCommand(
+        agent_id=agent_id,
+        user_id=current_user["uid"],
+        message_text=message.content,
+    )
+    try:
+        reply = await (agent_turns or handler).handle(command)
+    except AgentNotFoundException as exc:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(exc)) from exc
+    except AgentTurnError as exc:
+        raise HTTPException(
+            status.HTTP_503_SERVICE_UNAVAILABLE, str(exc)
+        ) from exc
+    except LlmOverloadedError as exc:
+        raise _overloaded(exc) from exc
+    return _to_response(request, response, agent_id, reply)
+
+
+@router.get(
+    "/{agent_id}/turns/{turn_id}",
+    response_model=ChatMessageRead | ChatTurnPending,
+)
+async def get_turn(
+    agent_id: str,
+    turn_id: str,
+    current_user: CurrentUserDep,
+    handler: SendMessageHandlerDep,
+    request: Request,
+    response: Response,
+    wait: float = Query(default=0.0, ge=0.0),
+) -> ChatMessageRead | ChatTurnPending:
+    command = ResumeTurnCommand(
+        agent_id=agent_id,
+        user_id=current_user["uid"],
+        turn_id=turn_id,
+        wait_seconds=min(wait, get_settings().chat_turn_max_wait_seconds),
+    )
+    try:
+        reply = await handler.resume(command)
+    except (AgentNotFoundException, TurnNotFoundException) as exc:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(exc)) from exc
+    except InvalidActionException as exc:
+        raise HTTPException(status.HTTP_409_CONFLICT, str(exc)) from exc
+    except LlmOverloadedError as exc:
+        raise _overloaded(exc) from exc
+    return _to_response(request, response, agent_id, reply)
+
+
+@router.post("/{agent_id}/stream")
+async def stream_message(
+    agent_id: str,
+    message: ChatMessageCreate,
+    current_user: CurrentUserDep,
+    handler: SendMessageHandlerDep,
+    agent_turns: AgentTurnClientDep,
+) -> StreamingResponse:
+    command = SendMessageCommand(
+        agent_id=agent_id,
+        user_id=current_user["uid"],
+        message_text=message.content,
+    )
+    try:
+        chunks = await (agent_turns or handler).stream(command)
+    except AgentNotFoundException as exc:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, str(exc)) from exc
+    except AgentTurnError as exc:
+        raise HTTPException(
+            status.HTTP_503_SERVICE_UNAVAILABLE, str(exc)
+        ) from exc
+    return StreamingResponse(
+        _to_server_sent_events(chunks),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+def _to_response(
+    request: Request,
+    response: Response,
+    agent_id: str,
+    reply: Message | SuspendedTurn,
+) -> ChatMessageRead | ChatTurnPending:
+    if isinstance(reply, SuspendedTurn):
+        response.status_code = status.HTTP_202_ACCEPTED
+        response.headers["Location"] = str(
+            request.url_for(
+                "get_turn", agent_id=agent_id, turn_id=reply.turn_id
+            )
+        )
+        return ChatTurnPending(turn_id=reply.turn_id)
+    return ChatMessageRead(content=reply.content, sender=reply.sender.value)
+
+
+def _overloaded(exc: LlmOverloadedError) -> HTTPException:
+    return HTTPException(
+        status.HTTP_503_SERVICE_UNAVAILABLE,
+        str(exc),
+        headers={"Retry-After": str(max(1, math.ceil(exc.retry_after)))},
+    )
+
+
+async def _to_server_sent_events(
+    chunks: AsyncIterator[str],
+) -> AsyncIterator[str]:
+    """
+    Encode reply fragments as Server-Sent Events.
+
+    Errors raised once the response has started cannot change the status
+    code any more, so they are reported to the client as an `error` event.
+    """
+    try:
+        async for chunk in chunks:
+            payload = ChatStreamChunk(content=chunk).model_dump_json()
+            yield f"event: message\ndata: {payload}\n\n"
+    except Exception:
+        logger.exception("Streaming the agent reply failed")
+        yield "event: error\ndata: {}\n\n"
+        return
+    yield "event: done\ndata: {}\n\n"
@@ -1,20 +1,51 @@
 """
-This module will contain the API endpoints for managing nodes.
+This module contains the API endpoints for managing nodes.
 
 Nodes are the services that can be attached to AI agents, such as Google Docs,
-Email, Calendar, etc. This module will provide a way to list available nodes.
+Email, Calendar, etc. This module provides a way to list available nodes.
 Direct management of nodes (creation, update, deletion) might be an
 administrative task and not exposed to regular users.
 
 Implementation Details:
-- Create a FastAPI `APIRouter` for nodes.
-- Implement the following endpoint:
-  - `GET /nodes/`: Get a list of all available nodes in the system.
-    - Output: A list of `NodeRead` schemas.
-    - This will likely call a `GetAllNodesHandler` or a similar query handler
-      in the application layer, which needs to be created. This handler will
-      retrieve all available node types from a registry or the database.
-- Use the dependency injection system to get the required handlers.
-- Use the schemas from `src/myjarvis/presentation/schemas/node_schemas.py` for
-  response validation.
+- `GET /nodes/`: Get the nodes available in the system, one page at a time.
+  - Input: `limit`, `cursor` (from the previous page) and `fields`
+    (comma-separated projection) query parameters.
+  - Output: `NodePage` schema.
+  - It calls the `GetNodesHandler` from the application layer.
 """
+
+from fastapi import APIRouter, HTTPException, Query, status
+from pydantic import ValidationError
+
+from myjarvis.application.queries.get_nodes import GetNodesQuery
+from myjarvis.application.queries.pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+)
+from myjarvis.presentation.api.dependencies import (
+    CurrentUserDep,
+    FieldsDep,
+    GetNodesHandlerDep,
+)
+from myjarvis.presentation.schemas.node_schemas import NodePage
+
+router = APIRouter(prefix="/nodes", tags=["nodes"])
+
+
+@router.get("/", response_model=NodePage, response_model_exclude_none=True)
+async def list_nodes(
+    current_user: CurrentUserDep,
+    handler: GetNodesHandlerDep,
+    fields: FieldsDep,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = None,
+) -> NodePage:
+    try:
+        query = GetNodesQuery(limit=limit, cursor=cursor, fields=fields)
+        page = await handler.handle(query)
+    except (ValidationError, InvalidCursorError) as exc:
+        raise HTTPException(
+            status.HTTP_422_UNPROCESSABLE_ENTITY, str(exc)
+        ) from exc
+    return NodePage.model_validate(page)
@@ -0,0 +1,43 @@
+"""
+This module contains the API endpoint exposing the service statistics.
+
+Implementation Details:
+- `GET /stats/`: Get the counters of the process serving the request.
+  - Output: `StatsRead` schema.
+  - Reports the chat cache counters and, when `llm_fallback_models` is
+    configured, the hedge and fallback counters of the LLM router.
+  - Requires an authenticated user. The counters describe the service, not
+    the user's data.
+"""
+
+from fastapi import APIRouter
+
+from myjarvis.infrastructure.cache.tiered_cache import TieredRedisCache
+from myjarvis.presentation.api.dependencies import (
+    ChatCacheDep,
+    CurrentUserDep,
+    LlmRouterDep,
+)
+from myjarvis.presentation.schemas.stats_schemas import (
+    ChatCacheStatsRead,
+    LlmRoutingStatsRead,
+    StatsRead,
+)
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("/", response_model=StatsRead)
+async def get_stats(
+    current_user: CurrentUserDep,
+    chat_cache: ChatCacheDep,
+    llm_router: LlmRouterDep,
+) -> StatsRead:
+    stats = StatsRead()
+    if isinstance(chat_cache, TieredRedisCache):
+        stats.chat_cache = ChatCacheStatsRead.model_validate(chat_cache.stats)
+    if llm_router is not None:
+        stats.llm_routing = LlmRoutingStatsRead.model_validate(
+            llm_router.stats
+        )
+    return stats
@@ -0,0 +1,166 @@
+"""
+This module contains the webhook endpoint of the Telegram bot.
+
+Endpoints:
+- `POST /telegram/webhook`: Receive an update from Telegram. The update is
+  queued on the `TelegramBot` stored on `app.state.telegram_bot` and the
+  request is answered at once; the agent's reply is sent back through the Bot
+  API when it is ready. If too many messages are pending, the endpoint
+  answers 503 and Telegram delivers the update again later.
+
+Telegram authenticates itself with the secret token registered with the
+webhook, sent in the `X-Telegram-Bot-Api-Secret-Token` header.
+
+`create_message_handler` builds the function the bot's workers call for each
+message. It runs the chat turn with `SendMessageHandler`, in a database
+session of its own, outside of any HTTP request, or on the agent worker tier
+(`AgentTurnClient`) when it is enabled. The sender is mapped to their
+user and active agent by the `TelegramIdentityService` stored on
+`app.state.telegram_identities`, which queries the database only for accounts
+it has not cached. A turn suspended by background jobs is resumed once they
+complete, each attempt in a session of its own, so no database transaction
+stays open while the jobs run.
+"""
+
+import hmac
+import logging
+from contextlib import asynccontextmanager
+from typing import Annotated, Any
+
+from fastapi import APIRouter, FastAPI, Header, HTTPException, Request, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from config.settings import get_settings
+from myjarvis.application.commands.resume_turn import ResumeTurnCommand
+from myjarvis.application.commands.send_message import SendMessageCommand
+from myjarvis.application.handlers.command_handlers import SendMessageHandler
+from myjarvis.domain.exceptions.domain_exceptions import (
+    AgentNotFoundException,
+    InvalidActionException,
+    TurnNotFoundException,
+)
+from myjarvis.domain.value_objects.message import Message
+from myjarvis.domain.value_objects.suspended_turn import SuspendedTurn
+from myjarvis.infrastructure.jobs.agent_turns import AgentTurnError
+from myjarvis.infrastructure.database.session import get_db_session
+from myjarvis.infrastructure.external.telegram_bot import (
+    MessageHandler,
+    TelegramMessage,
+)
+from myjarvis.infrastructure.llm.scheduler import LlmOverloadedError
+from myjarvis.presentation.api.dependencies import (
+    get_agent_repository,
+    get_agent_service,
+    get_chat_context_repository,
+    get_node_repository,
+    get_send_message_handler,
+    get_user_repository,
+)
+
+logger = logging.getLogger(__name__)
+
+UNKNOWN_USER_REPLY = "This Telegram account is not linked to a user."
+NO_AGENT_REPLY = "Select an agent to chat with first."
+BUSY_REPLY = "Too many requests right now, please try again in a minute."
+FAILED_REPLY = "Your message could not be answered, please send it again."
+
+router = APIRouter(prefix="/telegram", tags=["telegram"])
+
+
+@router.post("/webhook")
+async def webhook(
+    request: Request,
+    update: dict[str, Any],
+    secret_token: Annotated[
+        str | None, Header(alias="X-Telegram-Bot-Api-Secret-Token")
+    ] = None,
+) -> dict[str, bool]:
+    bot = getattr(request.app.state, "telegram_bot", None)
+    if bot is None:
+        raise HTTPException(status.HTTP_404_NOT_FOUND, "Not Found")
+    expected = get_settings().telegram_webhook_secret
+    if expected and not hmac.compare_digest(secret_token or "", expected):
+        raise HTTPException(status.HTTP_401_UNAUTHORIZED, "Invalid secret")
+    if not bot.submit(update):
+        raise HTTPException(
+            status.HTTP_503_SERVICE_UNAVAILABLE,
+            "Too many pending updates",
+            headers={"Retry-After": "5"},
+        )
+    return {"ok": True}
+
+
+def create_message_handler(app: FastAPI) -> MessageHandler:
+    """
+    Build the function answering a Telegram message with the agent's reply.
+
+    Args:
+        app: The application holding the process-wide resources.
+    """
+    session_scope = asynccontextmanager(get_db_session)
+
+    def send_message_handler(session: AsyncSession) -> SendMessageHandler:
+        return get_send_message_handler(
+            agent_repository=get_agent_repository(session),
+            chat_repository=get_chat_context_repository(session),
+            chat_cache=app.state.chat_cache,
+            agent_service=get_agent_service(
+                app.state.tool_executor, app.state.response_cache
+            ),
+            node_repository=get_node_repository(session),
+            node_service=app.state.node_service,
+            turn_store=app.state.turn_store,
+        )
+
+    async def send(command: SendMessageCommand) -> Message | SuspendedTurn:
+        if app.state.agent_turns is not None:
+            return await app.state.agent_turns.handle(command)
+        async with session_scope() as session:
+            return await send_message_handler(session).handle(command)
+
+    async def handle(message: TelegramMessage) -> str | None:
+        identities = app.state.telegram_identities
+        async with session_scope() as session:
+            identity = await identities.resolve(
+                message.telegram_user_id, get_user_repository(session)
+            )
+        if identity is None:
+            return UNKNOWN_USER_REPLY
+        if identity.agent_id is None:
+            return NO_AGENT_REPLY
+        command = SendMessageCommand(
+            agent_id=str(identity.agent_id),
+            user_id=str(identity.user_id),
+            message_text=message.text,
+        )
+        try:
+            reply = await send(command)
+        except AgentNotFoundException:
+            # The active agent was deleted, possibly after it was cached.
+            identities.invalidate(message.telegram_user_id)
+            return NO_AGENT_REPLY
+        except LlmOverloadedError:
+            return BUSY_REPLY
+        except AgentTurnError:
+            return FAILED_REPLY
+        while isinstance(reply, SuspendedTurn):
+            resume = ResumeTurnCommand(
+                agent_id=command.agent_id,
+                user_id=command.user_id,
+                turn_id=reply.turn_id,
+                wait_seconds=get_settings().chat_turn_max_wait_seconds,
+            )
+            async with session_scope() as session:
+                try:
+                    reply = await send_message_handler(session).resume(resume)
+                except (
+                    AgentNotFoundException,
+                    InvalidActionException,
+                    TurnNotFoundException,
+                ):
+                    return FAILED_REPLY
+                except LlmOverloadedError:
+                    return BUSY_REPLY
+        return reply.content
+
+    return handle
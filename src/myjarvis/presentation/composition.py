@@ -0,0 +1,246 @@
+"""
+This module is the composition root of the MyJarvis processes.
+
+The API process and the worker processes run the same chat turns with the
+same process-wide resources. This module creates them from the settings and
+wires the infrastructure into the application and domain services, so that
+both entry points (`main.py` and `worker.py`) and the API's dependency
+providers share one definition, and neither entry point imports the other.
+It belongs to the outermost layer: the application and domain layers only
+see the interfaces the resources implement.
+
+Implementation details:
+- `create_chat_services` creates the process-wide resources of the chat
+  turns: the chat context cache, the node registry and service, the
+  tool-call executor, the reply cache, the job queue and the store of the
+  suspended turns. The agents' toolsets are cached per process, but their
+  invalidations by `AttachNodeHandler` reach every process.
+- `create_agent_service` builds the `AgentService` of a turn around those
+  resources; `create_handler_scope` builds the `SendMessageHandler` of a
+  turn run outside of a request, bound to a database session of its own.
+- `create_job_handlers` maps the background jobs to the functions running
+  them.
+"""
+
+from contextlib import AbstractAsyncContextManager, asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable
+
+from redis.asyncio import Redis
+
+from config.settings import get_settings
+from myjarvis.application.handlers.command_handlers import SendMessageHandler
+from myjarvis.domain.services.agent_service import AgentService
+from myjarvis.domain.services.context_window_service import (
+    ContextWindowService,
+)
+from myjarvis.domain.services.node_service import NodeService
+from myjarvis.domain.services.tool_executor import (
+    NODE_COMMAND_JOB,
+    ToolExecutor,
+)
+from myjarvis.infrastructure.cache.broadcast_cache import BroadcastLocalCache
+from myjarvis.infrastructure.cache.node_result_cache import NodeResultCache
+from myjarvis.infrastructure.cache.response_cache import ResponseCache
+from myjarvis.infrastructure.cache.tiered_cache import TieredRedisCache
+from myjarvis.infrastructure.database.repositories.sqlalchemy_agent_repository import (  # noqa: E501
+    SQLAlchemyAgentRepository,
+)
+from myjarvis.infrastructure.database.repositories.sqlalchemy_chat_context_repository import (  # noqa: E501
+    SQLAlchemyChatContextRepository,
+)
+from myjarvis.infrastructure.database.repositories.sqlalchemy_node_repository import (  # noqa: E501
+    SQLAlchemyNodeRepository,
+)
+from myjarvis.infrastructure.database.session import get_db_session
+from myjarvis.infrastructure.jobs.job_queue import RedisJobQueue
+from myjarvis.infrastructure.jobs.job_worker import JobHandler
+from myjarvis.infrastructure.jobs.turn_store import SuspendedTurnStore
+from myjarvis.infrastructure.llm.llm_factory import create_embedder, create_llm
+from myjarvis.infrastructure.llm.summarizer import LlmSummarizer
+from myjarvis.infrastructure.llm.token_counter import (
+    get_context_window_policy,
+)
+from myjarvis.infrastructure.nodes.node_registry import NodeTypeRegistry
+
+TOOLSET_CHANNEL = "toolset:invalidate"
+
+
+@dataclass(slots=True)
+class ChatServices:
+    """
+    The process-wide resources of the chat turns, created alike by the API
+    and by the workers.
+
+    Attributes:
+        chat_cache: Cache of the chat contexts; started by `start`.
+        node_registry: The node implementations; its thread pool is shut
+            down by `close`.
+        node_service: Access to the node types and the agents' toolsets.
+        toolset_cache: Cache of the agents' toolsets, shared by all processes
+            for its invalidations; started by `start`.
+        tool_executor: Executor of the tool calls.
+        response_cache: Cache of the replies, if enabled.
+        job_queue: Queue of the background jobs, if enabled.
+        turn_store: Storage of the suspended turns, if jobs are enabled.
+    """
+
+    chat_cache: TieredRedisCache
+    node_registry: NodeTypeRegistry
+    node_service: NodeService
+    toolset_cache: BroadcastLocalCache
+    tool_executor: ToolExecutor
+    response_cache: ResponseCache | None
+    job_queue: RedisJobQueue | None
+    turn_store: SuspendedTurnStore | None
+
+    async def start(self) -> None:
+        await self.chat_cache.start()
+        await self.toolset_cache.start()
+
+    async def close(self) -> None:
+        await self.toolset_cache.stop()
+        await self.chat_cache.stop()
+        self.node_registry.close()
+
+
+def create_chat_services(redis: Redis) -> ChatServices:
+    """
+    Create the resources of the chat turns from the settings.
+
+    Args:
+        redis: The Redis client of the process.
+    """
+    settings = get_settings()
+    job_queue = turn_store = None
+    if settings.jobs_enabled:
+        job_queue = RedisJobQueue(
+            redis,
+            result_ttl_seconds=settings.jobs_result_ttl_seconds,
+            lease_seconds=settings.jobs_lease_seconds,
+            max_attempts=settings.jobs_max_attempts,
+            max_wait_seconds=settings.jobs_max_wait_seconds,
+        )
+        turn_store = SuspendedTurnStore(
+            redis, ttl_seconds=settings.jobs_result_ttl_seconds
+        )
+    node_registry = NodeTypeRegistry(sync_workers=settings.tool_sync_workers)
+    toolset_cache = BroadcastLocalCache(
+        redis,
+        TOOLSET_CHANNEL,
+        max_entries=4096,
+        max_bytes=4096,
+        ttl_seconds=3600,
+    )
+    response_cache = None
+    if settings.response_cache_enabled:
+        embedding_model = settings.response_cache_embedding_model
+        response_cache = ResponseCache(
+            redis,
+            ttl_seconds=settings.response_cache_ttl_seconds,
+            history_messages=settings.response_cache_history_messages,
+            local_max_entries=settings.response_cache_local_max_entries,
+            local_max_bytes=settings.response_cache_local_max_bytes,
+            embedder=(
+                create_embedder(embedding_model) if embedding_model else None
+            ),
+            similarity_threshold=settings.response_cache_similarity_threshold,
+        )
+    return ChatServices(
+        chat_cache=TieredRedisCache(
+            redis,
+            max_messages=settings.chat_history_window,
+            local_max_entries=settings.chat_cache_local_max_entries,
+            local_max_bytes=settings.chat_cache_local_max_bytes,
+            local_ttl_seconds=settings.chat_cache_local_ttl_seconds,
+        ),
+        node_registry=node_registry,
+        node_service=NodeService(node_registry, toolset_cache),
+        toolset_cache=toolset_cache,
+        tool_executor=ToolExecutor(
+            max_concurrency=settings.tool_max_concurrency,
+            default_timeout=settings.tool_timeout_seconds,
+            result_cache=NodeResultCache(
+                redis,
+                local_max_entries=settings.node_cache_local_max_entries,
+                local_max_bytes=settings.node_cache_local_max_bytes,
+            ),
+            job_queue=job_queue,
+            job_timeout=settings.jobs_timeout_seconds,
+            job_idempotency_seconds=settings.jobs_idempotency_seconds,
+        ),
+        response_cache=response_cache,
+        job_queue=job_queue,
+        turn_store=turn_store,
+    )
+
+
+def create_agent_service(
+    tool_executor: ToolExecutor, response_cache: ResponseCache | None
+) -> AgentService:
+    """
+    Create the `AgentService` of a chat turn.
+
+    Args:
+        tool_executor: Executor of the tool calls of the process.
+        response_cache: Cache of the replies of the process, if enabled.
+    """
+    settings = get_settings()
+    return AgentService(
+        llm_factory=create_llm,
+        context_window=ContextWindowService(
+            policy_factory=get_context_window_policy,
+            summarizer=LlmSummarizer(
+                create_llm, settings.chat_summary_llm_model
+            ),
+        ),
+        tool_executor=tool_executor,
+        max_tool_rounds=settings.tool_max_rounds,
+        response_cache=response_cache,
+    )
+
+
+def create_job_handlers(
+    node_service: NodeService, tool_executor: ToolExecutor
+) -> dict[str, JobHandler]:
+    """
+    Build the handlers of the background jobs, by job name.
+
+    Args:
+        node_service: Registry providing the node addressed by a job.
+        tool_executor: Executor running the node commands.
+    """
+
+    async def run_node_command(payload: dict[str, Any]) -> dict[str, Any]:
+        node = node_service.get_node(payload["call"]["node"])
+        return await tool_executor.run_job(payload, node)
+
+    return {NODE_COMMAND_JOB: run_node_command}
+
+
+def create_handler_scope(
+    services: ChatServices,
+) -> Callable[[], AbstractAsyncContextManager[SendMessageHandler]]:
+    """
+    Build the factory of the `SendMessageHandler` of one agent turn, bound
+    to a database session of its own.
+    """
+    session_scope = asynccontextmanager(get_db_session)
+
+    @asynccontextmanager
+    async def handler_scope() -> AsyncIterator[SendMessageHandler]:
+        async with session_scope() as session:
+            yield SendMessageHandler(
+                agent_repository=SQLAlchemyAgentRepository(session),
+                chat_repository=SQLAlchemyChatContextRepository(session),
+                chat_cache=services.chat_cache,
+                agent_service=create_agent_service(
+                    services.tool_executor, services.response_cache
+                ),
+                history_window=get_settings().chat_history_window,
+                node_repository=SQLAlchemyNodeRepository(session),
+                node_service=services.node_service,
+                turn_store=services.turn_store,
+            )
+
+    return handler_scope
@@ -1,39 +1,71 @@
 """
-This module will implement the authentication middleware.
+This module implements the authentication middleware.
 
 The authentication middleware is responsible for verifying the user's identity
-before allowing them to access protected endpoints. It will inspect the request
-for authentication credentials, such as a JWT token, and validate them.
+before allowing them to access protected endpoints. It inspects the request for
+a Firebase ID token and validates it with the `FirebaseAuthService` stored on
+`app.state.auth_service`.
 
 Implementation Details:
-- The middleware will be implemented as a FastAPI middleware function or class.
-- It will extract the authentication token from the `Authorization` header.
-- The token will be decoded and validated. Initially, this will be integrated
-  with Firebase Auth.
-- If the token is valid, the middleware will extract the user information
-  (e.g., user ID) and attach it to the request state (`request.state.user`).
-  This will make the user information available to the dependency injection
-  system and the route handlers.
-- If the token is invalid or missing, the middleware will return a 401
-  Unauthorized or 403 Forbidden response.
-- A dependency will be created (e.g., `get_current_user`) that reads the user
-  from the request state, ensuring that the user is authenticated for protected
-  routes.
-
-Example:
-    from fastapi import Request, HTTPException
-    from starlette.middleware.base import BaseHTTPMiddleware
-    from myjarvis.infrastructure.external.firebase_auth import verify_firebase_token
-
-    class AuthMiddleware(BaseHTTPMiddleware):
-        async def dispatch(self, request: Request, call_next):
-            auth_header = request.headers.get("Authorization")
-            if auth_header and auth_header.startswith("Bearer "):
-                token = auth_header.split(" ")[1]
-                user_data = verify_firebase_token(token)
-                if user_data:
-                    request.state.user = user_data
-                    response = await call_next(request)
-                    return response
-            raise HTTPException(status_code=401, detail="Not authenticated")
+- The middleware is a plain ASGI application wrapping the app, rather than a
+  Starlette `BaseHTTPMiddleware`: it neither runs the endpoint in a separate
+  task nor re-wraps the response, so it adds no per-request overhead beyond
+  the token check, and streamed (SSE) responses reach the client exactly as
+  the endpoint sends them.
+- The token is read from the `Authorization: Bearer <token>` header of the
+  ASGI scope.
+- If the token is valid, its claims (including the user's `uid`) are put into
+  `scope["state"]["user"]`, where they are visible as `request.state.user` to
+  the `get_current_user` dependency.
+- If the token is invalid or expired, the middleware responds with 401
+  Unauthorized.
+- Requests without a token pass through unauthenticated: public routes (e.g.
+  the OpenAPI docs) keep working, and protected routes are rejected by
+  `get_current_user`.
 """
+
+from fastapi import status
+from fastapi.responses import JSONResponse
+from starlette.types import ASGIApp, Receive, Scope, Send
+
+from myjarvis.infrastructure.external.firebase_auth import InvalidTokenError
+
+
+class AuthMiddleware:
+    """
+    Authenticates HTTP requests carrying a Firebase ID token.
+
+    Args:
+        app: The ASGI application to wrap.
+    """
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] == "http":
+            token = self._bearer_token(scope)
+            if token is not None:
+                auth_service = scope["app"].state.auth_service
+                try:
+                    user = await auth_service.verify_token(token)
+                except InvalidTokenError as exc:
+                    response = JSONResponse(
+                        {"detail": str(exc)},
+                        status_code=status.HTTP_401_UNAUTHORIZED,
+                        headers={"WWW-Authenticate": "Bearer"},
+                    )
+                    await response(scope, receive, send)
+                    return
+                scope.setdefault("state", {})["user"] = user
+        await self.app(scope, receive, send)
+
+    @staticmethod
+    def _bearer_token(scope: Scope) -> str | None:
+        for name, value in scope["headers"]:
+            if name == b"authorization":
+                scheme, _, token = value.decode("latin-1").partition(" ")
+                if scheme.lower() == "bearer" and token:
+                    return token
+                return None
+        return None
@@ -1,23 +1,43 @@
 """
-This module will contain the Pydantic schemas for chat-related data.
+This module contains the Pydantic schemas for chat-related data.
 
-These schemas will define the structure of messages sent between the user and
+These schemas define the structure of messages sent between the user and
 the AI agents.
+"""
 
-Implementation Details:
-- Create a `ChatMessageCreate` schema for the user's incoming message.
-  - It should contain the message `content` (string).
-- Create a `ChatMessageRead` schema for the agent's response.
-  - It should contain the `content` of the response and could also include
-    metadata, such as the `sender` (`user` or `agent`).
+from pydantic import BaseModel, Field
 
-Example:
-    from pydantic import BaseModel, Field
 
-    class ChatMessageCreate(BaseModel):
-        content: str = Field(..., min_length=1)
+class ChatMessageCreate(BaseModel):
+    """
+    A message sent by the user to an agent.
+    """
 
-    class ChatMessageRead(BaseModel):
-        content: str
-        sender: str # "user" or "agent"
-"""
+    content: str = Field(..., min_length=1)
+
+
+class ChatMessageRead(BaseModel):
+    """
+    A message in a conversation, as returned by the API.
+    """
+
+    content: str
+    sender: str  # "user" or "agent"
+
+
+class ChatTurnPending(BaseModel):
+    """
+    A reply that is not ready yet: the agent is waiting for background jobs.
+    The reply is polled at `GET /chat/{agent_id}/turns/{turn_id}`.
+    """
+
+    turn_id: str
+    status: str = "pending"
+
+
+class ChatStreamChunk(BaseModel):
+    """
+    A fragment of the agent's reply, sent as one Server-Sent Event.
+    """
+
+    content: str
@@ -1,26 +1,38 @@
 """
-This module will contain the Pydantic schemas for node-related data.
+This module contains the Pydantic schemas for node-related data.
 
-These schemas will be used to represent nodes in API responses, providing clients
+These schemas are used to represent nodes in API responses, providing clients
 with information about the available services that can be attached to agents.
 
-Implementation Details:
-- Create a `NodeRead` schema for representing nodes.
-  - It will include fields like `id`, `name`, `description`, `node_type`, and
-    a list of `commands` that the node can execute.
-  - This schema will be used when listing all available nodes.
-
-Example:
-    from pydantic import BaseModel, Field
-    from uuid import UUID
-
-    class NodeRead(BaseModel):
-        id: UUID
-        name: str = Field(..., min_length=1, max_length=100)
-        description: str
-        node_type: str
-        commands: list[str]
-
-        class Config:
-            from_attributes = True
+List endpoints accept a `fields=` projection; the fields left out are omitted
+from the response.
 """
+
+from uuid import UUID
+
+from pydantic import BaseModel, ConfigDict
+
+
+class NodeRead(BaseModel):
+    """
+    A node, as returned by the API.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    id: UUID
+    name: str
+    description: str | None = None
+    node_type: str | None = None
+    available_commands: list[str] | None = None
+
+
+class NodePage(BaseModel):
+    """
+    One page of the node catalog. `next_cursor` is absent on the last page.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    items: list[NodeRead]
+    next_cursor: str | None = None
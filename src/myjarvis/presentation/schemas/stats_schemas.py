@@ -0,0 +1,50 @@
+"""
+This module contains the Pydantic schemas of the service statistics.
+
+The statistics are counters of the process answering the request: with
+several API workers, each reports its own.
+"""
+
+from pydantic import BaseModel, ConfigDict
+
+
+class ChatCacheStatsRead(BaseModel):
+    """
+    Hit and miss counters of both tiers of the chat context cache.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    local_hits: int
+    local_misses: int
+    redis_hits: int
+    redis_misses: int
+    local_evictions: int
+    invalidations: int
+    local_entries: int
+    local_bytes: int
+
+
+class LlmRoutingStatsRead(BaseModel):
+    """
+    Counters of the requests routed across two LLM providers: hedged
+    requests, hedges won by the secondary, fallbacks and circuit openings.
+    """
+
+    model_config = ConfigDict(from_attributes=True)
+
+    requests: int
+    hedges: int
+    hedge_wins: int
+    fallbacks: int
+    circuit_opens: int
+
+
+class StatsRead(BaseModel):
+    """
+    Statistics of the process, by component. A component absent from the
+    configuration is null.
+    """
+
+    chat_cache: ChatCacheStatsRead | None = None
+    llm_routing: LlmRoutingStatsRead | None = None
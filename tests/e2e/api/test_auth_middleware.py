@@ -0,0 +1,90 @@
+"""
+The authentication middleware in front of a small app, with a fake token
+verifier.
+"""
+
+from fastapi import FastAPI, Request, WebSocket
+from fastapi.testclient import TestClient
+
+from myjarvis.infrastructure.external.firebase_auth import InvalidTokenError
+from myjarvis.presentation.middleware.auth_middleware import AuthMiddleware
+
+
+class FakeAuthService:
+    """Accepts the token "valid"; records the tokens verified."""
+
+    def __init__(self):
+        self.verified: list[str] = []
+
+    async def verify_token(self, token: str) -> dict:
+        self.verified.append(token)
+        if token != "valid":
+            raise InvalidTokenError("Invalid or expired token: bad signature")
+        return {"uid": "alice"}
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.add_middleware(AuthMiddleware)
+    app.state.auth_service = FakeAuthService()
+
+    @app.get("/whoami")
+    async def whoami(request: Request) -> dict:
+        return {"user": getattr(request.state, "user", None)}
+
+    @app.websocket("/ws")
+    async def echo(websocket: WebSocket) -> None:
+        await websocket.accept()
+        await websocket.send_text(await websocket.receive_text())
+        await websocket.close()
+
+    return TestClient(app)
+
+
+def test_valid_token_sets_the_user():
+    client = _client()
+
+    response = client.get("/whoami", headers={"Authorization": "Bearer valid"})
+
+    assert response.status_code == 200
+    assert response.json() == {"user": {"uid": "alice"}}
+
+
+def test_invalid_token_is_rejected_with_401():
+    client = _client()
+
+    response = client.get(
+        "/whoami", headers={"Authorization": "Bearer forged"}
+    )
+
+    assert response.status_code == 401
+    assert response.json() == {
+        "detail": "Invalid or expired token: bad signature"
+    }
+    assert response.headers["WWW-Authenticate"] == "Bearer"
+
+
+def test_requests_without_a_bearer_token_pass_unauthenticated():
+    client = _client()
+
+    anonymous = client.get("/whoami")
+    basic = client.get("/whoami", headers={"Authorization": "Basic abc"})
+
+    assert anonymous.json() == basic.json() == {"user": None}
+    assert client.app.state.auth_service.verified == []
+
+
+def test_non_http_scopes_pass_through():
+    client = _client()
+
+    # The lifespan and websocket scopes are not authenticated, even with an
+    # invalid token.
+    with client:
+        with client.websocket_connect(
+            "/ws", headers={"Authorization": "Bearer forged"}
+        ) as websocket:
+            websocket.send_text("hello")
+            echoed = websocket.receive_text()
+
+    assert echoed == "hello"
+    assert client.app.state.auth_service.verified == []
@@ -0,0 +1,126 @@
+"""
+The paginated agent and node lists of the API: cursors, their validation and
+the `fields` projection.
+"""
+
+from datetime import datetime, timezone
+from uuid import UUID
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from myjarvis.application.dto.agent_dto import AgentDTO
+from myjarvis.application.handlers.query_handlers import (
+    GetNodesHandler,
+    GetUserAgentsHandler,
+)
+from myjarvis.presentation.api.dependencies import (
+    get_current_user,
+    get_nodes_handler,
+    get_user_agents_handler,
+)
+from myjarvis.presentation.api.v1 import agents, nodes
+
+_CREATED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+class FakeAgentReadModel:
+    """Three agents created at the same time, ordered by id."""
+
+    def __init__(self):
+        self.agents = [
+            AgentDTO(
+                id=UUID(int=index),
+                created_at=_CREATED_AT,
+                name=f"agent {index}",
+                base_prompt="Be brief.",
+                llm_model="fake",
+                attached_nodes=[],
+            )
+            for index in range(1, 4)
+        ]
+
+    async def get_agents_of_user(self, user_id, limit, after, fields):
+        agents = [
+            agent
+            for agent in self.agents
+            if after is None or (agent.created_at, agent.id) > after
+        ]
+        return [
+            (
+                agent
+                if fields is None
+                else AgentDTO(
+                    **agent.model_dump(include=fields | {"id", "created_at"})
+                )
+            )
+            for agent in agents[:limit]
+        ]
+
+
+class FakeNodeReadModel:
+    """No nodes at all."""
+
+    async def list_nodes(self, limit, after, fields):
+        return []
+
+
+def _client() -> TestClient:
+    app = FastAPI()
+    app.include_router(agents.router, prefix="/api/v1")
+    app.include_router(nodes.router, prefix="/api/v1")
+    app.dependency_overrides[get_current_user] = lambda: {"uid": "user"}
+    app.dependency_overrides[get_user_agents_handler] = (
+        lambda: GetUserAgentsHandler(FakeAgentReadModel())
+    )
+    app.dependency_overrides[get_nodes_handler] = lambda: GetNodesHandler(
+        FakeNodeReadModel()
+    )
+    return TestClient(app)
+
+
+def test_agents_are_listed_page_by_page():
+    client = _client()
+
+    first = client.get("/api/v1/agents/", params={"limit": 2}).json()
+    second = client.get(
+        "/api/v1/agents/",
+        params={"limit": 2, "cursor": first["next_cursor"]},
+    ).json()
+
+    assert [agent["name"] for agent in first["items"]] == [
+        "agent 1",
+        "agent 2",
+    ]
+    assert [agent["name"] for agent in second["items"]] == ["agent 3"]
+    assert "next_cursor" not in second
+
+
+def test_only_the_projected_fields_are_returned():
+    client = _client()
+
+    response = client.get("/api/v1/agents/", params={"fields": "name"})
+
+    assert response.status_code == 200
+    assert {key for agent in response.json()["items"] for key in agent} == {
+        "id",
+        "created_at",
+        "name",
+    }
+
+
+def test_invalid_cursors_are_rejected_with_422():
+    client = _client()
+
+    agent_list = client.get("/api/v1/agents/", params={"cursor": "garbage!"})
+    node_list = client.get("/api/v1/nodes/", params={"cursor": "garbage!"})
+
+    assert agent_list.status_code == node_list.status_code == 422
+    assert "Invalid cursor" in agent_list.json()["detail"]
+
+
+def test_unknown_fields_are_rejected_with_422():
+    response = _client().get("/api/v1/agents/", params={"fields": "secret"})
+
+    assert response.status_code == 422
+    assert "Unknown fields: secret" in response.json()["detail"]
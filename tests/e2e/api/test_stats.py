@@ -0,0 +1,61 @@
+import fakeredis
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from myjarvis.infrastructure.cache.tiered_cache import TieredRedisCache
+from myjarvis.infrastructure.llm.routing_llm import LlmRouter
+from myjarvis.presentation.api.dependencies import (
+    get_current_user,
+    get_llm_router,
+)
+from myjarvis.presentation.api.v1 import stats
+
+
+def _client(
+    authenticated: bool = True, router: LlmRouter | None = None
+) -> TestClient:
+    app = FastAPI()
+    app.include_router(stats.router, prefix="/api/v1")
+    app.state.chat_cache = TieredRedisCache(fakeredis.FakeAsyncRedis())
+    app.dependency_overrides[get_llm_router] = lambda: router
+    if authenticated:
+        app.dependency_overrides[get_current_user] = lambda: {"uid": "user"}
+    return TestClient(app)
+
+
+def test_stats_report_the_chat_cache_counters():
+    response = _client().get("/api/v1/stats/")
+
+    assert response.status_code == 200
+    assert response.json()["chat_cache"] == {
+        "local_hits": 0,
+        "local_misses": 0,
+        "redis_hits": 0,
+        "redis_misses": 0,
+        "local_evictions": 0,
+        "invalidations": 0,
+        "local_entries": 0,
+        "local_bytes": 0,
+    }
+    assert response.json()["llm_routing"] is None
+
+
+def test_stats_report_the_llm_routing_counters():
+    router = LlmRouter()
+    router.count(requests=3, hedges=2, hedge_wins=1, fallbacks=1)
+
+    response = _client(router=router).get("/api/v1/stats/")
+
+    assert response.json()["llm_routing"] == {
+        "requests": 3,
+        "hedges": 2,
+        "hedge_wins": 1,
+        "fallbacks": 1,
+        "circuit_opens": 0,
+    }
+
+
+def test_stats_require_authentication():
+    assert (
+        _client(authenticated=False).get("/api/v1/stats/").status_code == 401
+    )
@@ -0,0 +1,97 @@
+"""
+The agent read path issues a fixed number of SQL statements, however many
+agents and attached nodes it returns.
+"""
+
+import asyncio
+
+import pytest
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from myjarvis.application.handlers.query_handlers import (
+    GetAgentHandler,
+    GetUserAgentsHandler,
+)
+from myjarvis.application.queries.get_agent import GetAgentQuery
+from myjarvis.application.queries.get_user_agents import GetUserAgentsQuery
+from myjarvis.application.queries.pagination import MAX_PAGE_SIZE
+from myjarvis.domain.services.node_service import NodeService
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.node_id import NodeId
+from myjarvis.infrastructure.cache.local_cache import LruTtlCache
+from myjarvis.infrastructure.database.models.agent_model import AgentModel
+from myjarvis.infrastructure.database.models.node_model import NodeModel
+from myjarvis.infrastructure.database.models.user_model import UserModel
+from myjarvis.infrastructure.database.read_models.sqlalchemy_agent_read_model import (  # noqa: E501
+    SQLAlchemyAgentReadModel,
+)
+from myjarvis.infrastructure.nodes.node_registry import NodeTypeRegistry
+
+# One query for the agents, one for the nodes of all of them.
+_LIST_STATEMENTS = 2
+_GET_STATEMENTS = 2
+
+
+@pytest.mark.parametrize("agent_count", [1, 10, MAX_PAGE_SIZE])
+def test_statement_count_does_not_grow_with_agents(create_engine, agent_count):
+    node_service = NodeService(
+        NodeTypeRegistry(),
+        LruTtlCache(max_entries=16, max_bytes=16, ttl_seconds=60),
+    )
+
+    async def scenario():
+        engine = await create_engine()
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        async with sessions.begin() as session:
+            nodes = [
+                NodeModel(
+                    node_id=NodeId.generate().value,
+                    name=node_type,
+                    node_type=node_type,
+                )
+                for node_type in node_service.get_available_node_types()
+            ]
+            session.add_all(nodes)
+            session.add(UserModel(user_id="user", email="user@test"))
+            session.add_all(
+                AgentModel(
+                    agent_id=AgentId.generate().value,
+                    user_id="user",
+                    name=f"agent {index}",
+                    llm_model="fake",
+                    nodes=nodes,
+                )
+                for index in range(agent_count)
+            )
+
+        statements = []
+        event.listen(
+            engine.sync_engine,
+            "before_cursor_execute",
+            lambda *args: statements.append(args[2]),
+        )
+        async with sessions() as session:
+            read_model = SQLAlchemyAgentReadModel(
+                session, node_service.get_command_names
+            )
+            page = await GetUserAgentsHandler(read_model).handle(
+                GetUserAgentsQuery(user_id="user", limit=MAX_PAGE_SIZE)
+            )
+            list_statements = len(statements)
+            statements.clear()
+            await GetAgentHandler(read_model).handle(
+                GetAgentQuery(agent_id=str(page.items[-1].id), user_id="user")
+            )
+            get_statements = len(statements)
+        await engine.dispose()
+        return page.items, len(nodes), list_statements, get_statements
+
+    agents, node_count, list_statements, get_statements = asyncio.run(
+        scenario()
+    )
+
+    assert len(agents) == agent_count
+    assert all(len(agent.attached_nodes) == node_count for agent in agents)
+    assert list_statements == _LIST_STATEMENTS
+    assert get_statements == _GET_STATEMENTS
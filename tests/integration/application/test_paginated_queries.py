@@ -0,0 +1,184 @@
+"""
+Keyset pagination of the agent and node lists, with ties on the leading sort
+column, and the projection of their fields.
+"""
+
+import asyncio
+from datetime import datetime, timezone
+
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from myjarvis.application.handlers.query_handlers import (
+    GetNodesHandler,
+    GetUserAgentsHandler,
+)
+from myjarvis.application.queries.get_nodes import GetNodesQuery
+from myjarvis.application.queries.get_user_agents import GetUserAgentsQuery
+from myjarvis.application.queries.pagination import InvalidCursorError
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.node_id import NodeId
+from myjarvis.infrastructure.database.models.agent_model import AgentModel
+from myjarvis.infrastructure.database.models.node_model import NodeModel
+from myjarvis.infrastructure.database.models.user_model import UserModel
+from myjarvis.infrastructure.database.read_models.sqlalchemy_agent_read_model import (  # noqa: E501
+    SQLAlchemyAgentReadModel,
+)
+from myjarvis.infrastructure.database.read_models.sqlalchemy_node_read_model import (  # noqa: E501
+    SQLAlchemyNodeReadModel,
+)
+
+_CREATED_AT = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _command_names(node_type: str) -> list[str]:
+    return [f"{node_type}_command"]
+
+
+async def _seed(create_engine, agents: int, nodes: int):
+    engine = await create_engine()
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    async with sessions.begin() as session:
+        session.add(UserModel(user_id="user", email="user@test"))
+        session.add(UserModel(user_id="other", email="other@test"))
+        # Every agent shares its creation time and every node its name.
+        session.add_all(
+            AgentModel(
+                agent_id=AgentId.generate().value,
+                user_id="user",
+                name=f"agent {index}",
+                base_prompt="Be brief.",
+                llm_model="fake",
+                created_at=_CREATED_AT,
+            )
+            for index in range(agents)
+        )
+        session.add(
+            AgentModel(
+                agent_id=AgentId.generate().value,
+                user_id="other",
+                name="someone else's agent",
+                llm_model="fake",
+                created_at=_CREATED_AT,
+            )
+        )
+        session.add_all(
+            NodeModel(
+                node_id=NodeId.generate().value,
+                name="Same name",
+                node_type="echo",
+            )
+            for _ in range(nodes)
+        )
+    return engine, sessions
+
+
+async def _all_pages(handler, query_type, limit: int, **kwargs) -> list:
+    pages = []
+    cursor = None
+    while True:
+        page = await handler.handle(
+            query_type(limit=limit, cursor=cursor, **kwargs)
+        )
+        pages.append(page.items)
+        cursor = page.next_cursor
+        if cursor is None:
+            return pages
+
+
+@pytest.mark.parametrize("limit", [1, 3, 7])
+def test_agents_sharing_a_creation_time_are_listed_once(create_engine, limit):
+    async def scenario():
+        engine, sessions = await _seed(create_engine, agents=7, nodes=0)
+        async with sessions() as session:
+            handler = GetUserAgentsHandler(
+                SQLAlchemyAgentReadModel(session, _command_names)
+            )
+            pages = await _all_pages(
+                handler, GetUserAgentsQuery, limit, user_id="user"
+            )
+        await engine.dispose()
+        return pages
+
+    pages = asyncio.run(scenario())
+
+    agents = [agent for page in pages for agent in page]
+    assert all(len(page) <= limit for page in pages)
+    assert len(agents) == len({agent.id for agent in agents}) == 7
+    assert {agent.name for agent in agents} == {
+        f"agent {index}" for index in range(7)
+    }
+    assert [agent.id for agent in agents] == sorted(
+        agent.id for agent in agents
+    )
+
+
+@pytest.mark.parametrize("limit", [1, 2, 5])
+def test_nodes_sharing_a_name_are_listed_once(create_engine, limit):
+    async def scenario():
+        engine, sessions = await _seed(create_engine, agents=0, nodes=5)
+        async with sessions() as session:
+            handler = GetNodesHandler(
+                SQLAlchemyNodeReadModel(session, _command_names)
+            )
+            pages = await _all_pages(handler, GetNodesQuery, limit)
+        await engine.dispose()
+        return pages
+
+    pages = asyncio.run(scenario())
+
+    nodes = [node for page in pages for node in page]
+    assert all(len(page) <= limit for page in pages)
+    assert len(nodes) == len({node.id for node in nodes}) == 5
+
+
+def test_projected_fields_are_the_only_ones_loaded(create_engine):
+    async def scenario():
+        engine, sessions = await _seed(create_engine, agents=2, nodes=2)
+        async with sessions() as session:
+            agents = await GetUserAgentsHandler(
+                SQLAlchemyAgentReadModel(session, _command_names)
+            ).handle(
+                GetUserAgentsQuery(user_id="user", fields=frozenset({"name"}))
+            )
+            nodes = await GetNodesHandler(
+                SQLAlchemyNodeReadModel(session, _command_names)
+            ).handle(GetNodesQuery(fields=frozenset({"available_commands"})))
+        await engine.dispose()
+        return agents.items, nodes.items
+
+    agents, nodes = asyncio.run(scenario())
+
+    for agent in agents:
+        assert agent.name.startswith("agent ")
+        assert agent.id and agent.created_at
+        assert agent.base_prompt is agent.llm_model is None
+        assert agent.attached_nodes is None
+    for node in nodes:
+        assert node.available_commands == ["echo_command"]
+        assert node.description is node.node_type is None
+
+
+@pytest.mark.parametrize(
+    "cursor",
+    [
+        "not base64!",
+        # Valid base64 of valid JSON, but not a sort key.
+        "eyJhIjoxfQ",
+        # ["yesterday", "not-a-uuid"]
+        "WyJ5ZXN0ZXJkYXkiLCJub3QtYS11dWlkIl0",
+    ],
+)
+def test_malformed_cursors_are_rejected(create_engine, cursor):
+    async def scenario():
+        engine, sessions = await _seed(create_engine, agents=1, nodes=0)
+        try:
+            async with sessions() as session:
+                await GetUserAgentsHandler(
+                    SQLAlchemyAgentReadModel(session, _command_names)
+                ).handle(GetUserAgentsQuery(user_id="user", cursor=cursor))
+        finally:
+            await engine.dispose()
+
+    with pytest.raises(InvalidCursorError):
+        asyncio.run(scenario())
@@ -0,0 +1,28 @@
+import pytest
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from myjarvis.infrastructure.database.models import (  # noqa: F401
+    agent_model,
+    chat_context_model,
+    node_model,
+    user_model,
+)
+from myjarvis.infrastructure.database.models.base import Base
+
+
+@pytest.fixture
+def create_engine(tmp_path):
+    """
+    Return a coroutine function creating an engine on a new SQLite database
+    with the application's tables.
+    """
+
+    async def create() -> AsyncEngine:
+        engine = create_async_engine(
+            f"sqlite+aiosqlite:///{tmp_path / 'test.db'}"
+        )
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        return engine
+
+    return create
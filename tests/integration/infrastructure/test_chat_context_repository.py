@@ -0,0 +1,66 @@
+import asyncio
+
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.infrastructure.database.repositories.sqlalchemy_chat_context_repository import (  # noqa: E501
+    SQLAlchemyChatContextRepository,
+)
+
+
+def _turn(context: ChatContext, text: str) -> None:
+    context.add_message(Message(content=text, sender=Sender.USER))
+    context.add_message(Message(content=f"re: {text}", sender=Sender.AGENT))
+
+
+def test_concurrent_appends_do_not_collide(create_engine):
+    async def scenario():
+        engine = await create_engine()
+        sessions = async_sessionmaker(engine, expire_on_commit=False)
+        agent_id = AgentId.generate()
+        async with sessions.begin() as session:
+            context = ChatContext(agent_id=agent_id)
+            _turn(context, "hello")
+            await SQLAlchemyChatContextRepository(session).append(context)
+
+        # Both turns load the conversation before either appends.
+        loaded = []
+        for _ in range(3):
+            async with sessions() as session:
+                repository = SQLAlchemyChatContextRepository(session)
+                loaded.append(await repository.get_by_agent_id(agent_id))
+
+        async def append(context: ChatContext, text: str) -> None:
+            _turn(context, text)
+            async with sessions.begin() as session:
+                await SQLAlchemyChatContextRepository(session).append(context)
+
+        await asyncio.gather(
+            *(
+                append(context, f"turn {index}")
+                for index, context in enumerate(loaded)
+            )
+        )
+        async with sessions() as session:
+            stored = await SQLAlchemyChatContextRepository(
+                session
+            ).get_by_agent_id(agent_id)
+        await engine.dispose()
+        return loaded, stored
+
+    loaded, stored = asyncio.run(scenario())
+
+    contents = [message.content for message in stored.messages]
+    assert len(contents) == 8
+    assert contents[:2] == ["hello", "re: hello"]
+    for index in range(3):
+        position = contents.index(f"turn {index}")
+        assert contents[position + 1] == f"re: turn {index}"
+    # Every context caught up with the turns stored before its own.
+    for context in loaded:
+        assert [message.content for message in context.messages] == contents[
+            : len(context.messages)
+        ]
+        assert context.next_sequence == len(context.messages)
@@ -0,0 +1,184 @@
+"""
+Offline verification of Firebase ID tokens against a fake certificate
+endpoint: certificate refresh, the claims cache and rejected tokens.
+"""
+
+import asyncio
+import datetime
+import time
+
+import httpx
+import pytest
+from cryptography import x509
+from cryptography.hazmat.primitives import hashes, serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from cryptography.x509.oid import NameOID
+from google.auth import crypt, jwt
+
+from myjarvis.infrastructure.external.firebase_auth import (
+    FirebaseAuthService,
+    InvalidTokenError,
+)
+
+_PROJECT = "my-jarvis"
+_CERTS_URL = "https://certs.test/firebase"
+
+
+class SigningKey:
+    """An RSA key and the self-signed certificate Google would publish."""
+
+    def __init__(self, key_id: str):
+        self.key_id = key_id
+        self.private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+        name = x509.Name([x509.NameAttribute(NameOID.COMMON_NAME, key_id)])
+        now = datetime.datetime.now(datetime.timezone.utc)
+        self.certificate = (
+            x509.CertificateBuilder()
+            .subject_name(name)
+            .issuer_name(name)
+            .public_key(self.private_key.public_key())
+            .serial_number(x509.random_serial_number())
+            .not_valid_before(now - datetime.timedelta(days=1))
+            .not_valid_after(now + datetime.timedelta(days=1))
+            .sign(self.private_key, hashes.SHA256())
+            .public_bytes(serialization.Encoding.PEM)
+            .decode()
+        )
+
+    def token(self, **claims) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": f"https://securetoken.google.com/{_PROJECT}",
+            "aud": _PROJECT,
+            "sub": "alice",
+            "iat": now,
+            "exp": now + 3600,
+            **claims,
+        }
+        pem = self.private_key.private_bytes(
+            serialization.Encoding.PEM,
+            serialization.PrivateFormat.PKCS8,
+            serialization.NoEncryption(),
+        )
+        signer = crypt.RSASigner.from_string(pem, key_id=self.key_id)
+        return jwt.encode(signer, payload).decode()
+
+
+class FakeCertsEndpoint:
+    """Serves the certificates of the current keys, counting the fetches."""
+
+    def __init__(self, *keys: SigningKey, max_age: int = 3600):
+        self.keys = list(keys)
+        self.max_age = max_age
+        self.fetches = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.fetches += 1
+        return httpx.Response(
+            200,
+            headers={"Cache-Control": f"public, max-age={self.max_age}"},
+            json={key.key_id: key.certificate for key in self.keys},
+        )
+
+
+@pytest.fixture(scope="module")
+def keys() -> tuple[SigningKey, SigningKey]:
+    return SigningKey("key-1"), SigningKey("key-2")
+
+
+def _service(endpoint: FakeCertsEndpoint, **kwargs) -> FirebaseAuthService:
+    return FirebaseAuthService(
+        _PROJECT,
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(endpoint)),
+        certs_url=_CERTS_URL,
+        **kwargs,
+    )
+
+
+def _verify(service: FirebaseAuthService, *tokens: str) -> list:
+    async def run():
+        await service.start()
+        try:
+            results = []
+            for token in tokens:
+                try:
+                    results.append(await service.verify_token(token))
+                except InvalidTokenError as exc:
+                    results.append(exc)
+            return results
+        finally:
+            await service.stop()
+
+    return asyncio.run(run())
+
+
+def test_repeated_tokens_are_served_from_the_claims_cache(keys):
+    endpoint = FakeCertsEndpoint(keys[0])
+    service = _service(endpoint)
+    token = keys[0].token()
+
+    first, second = _verify(service, token, token)
+
+    assert first["uid"] == second["uid"] == "alice"
+    assert service.stats.hits == 1
+    assert service.stats.misses == 1
+    assert endpoint.fetches == 1
+
+
+def test_certs_are_refreshed_when_their_max_age_runs_out(keys):
+    endpoint = FakeCertsEndpoint(keys[0], max_age=1)
+    service = _service(
+        endpoint, refresh_margin_seconds=0.0, retry_seconds=0.05
+    )
+
+    async def run():
+        await service.start()
+        try:
+            # Google publishes the next key before signing with it.
+            endpoint.keys.append(keys[1])
+            for _ in range(300):
+                if endpoint.fetches >= 2:
+                    break
+                await asyncio.sleep(0.01)
+            fetches = endpoint.fetches
+            claims = await service.verify_token(keys[1].token())
+            return fetches, claims, endpoint.fetches
+        finally:
+            await service.stop()
+
+    fetches, claims, fetches_after = asyncio.run(run())
+
+    assert fetches == 2
+    assert claims["uid"] == "alice"
+    # The new key was known: verifying did not fetch the certs again.
+    assert fetches_after == 2
+
+
+def test_expired_tokens_are_rejected(keys):
+    endpoint = FakeCertsEndpoint(keys[0])
+    service = _service(endpoint)
+    past = int(time.time()) - 7200
+    token = keys[0].token(iat=past, exp=past + 3600)
+
+    results = _verify(service, token, token)
+
+    assert all(isinstance(result, InvalidTokenError) for result in results)
+    # A rejected token is not cached: it is rejected again.
+    assert service.stats.hits == 0
+
+
+def test_tokens_not_signed_by_the_published_key_are_rejected(keys):
+    endpoint = FakeCertsEndpoint(keys[0])
+    service = _service(endpoint, retry_seconds=60.0)
+    forged = SigningKey("key-1").token()
+    unknown = keys[1].token()
+    other_project = keys[0].token(aud="other-project")
+
+    results = _verify(service, forged, unknown, other_project)
+
+    assert all(isinstance(result, InvalidTokenError) for result in results)
+    assert "Unknown signing key" in str(results[1])
+    # An unknown key id is looked up at most once per `retry_seconds`.
+    assert endpoint.fetches == 1
@@ -0,0 +1,175 @@
+"""
+The ingestion pipeline on the deterministic local embedder, and the vector
+store node's background 'ingest' command run by a job worker.
+"""
+
+import asyncio
+
+import fakeredis
+
+from myjarvis.domain.interfaces.node import current_agent_id
+from myjarvis.domain.services.tool_executor import (
+    NODE_COMMAND_JOB,
+    ToolExecutor,
+)
+from myjarvis.domain.value_objects.tool_call import ToolCall
+from myjarvis.infrastructure.jobs.job_queue import RedisJobQueue
+from myjarvis.infrastructure.jobs.job_worker import JobWorker
+from myjarvis.infrastructure.llm.embedder import HashingEmbedder
+from myjarvis.infrastructure.nodes.vector_store_node import VectorStoreNode
+from myjarvis.infrastructure.vector_store.embedding_cache import (
+    EmbeddingCache,
+)
+from myjarvis.infrastructure.vector_store.ingestion import (
+    IngestionPipeline,
+    SourceDocument,
+)
+from myjarvis.infrastructure.vector_store.vector_store import VectorStore
+
+
+class RecordingEmbedder(HashingEmbedder):
+    """Embeds like the HashingEmbedder; records the batches it is sent."""
+
+    def __init__(self):
+        super().__init__(dimensions=64)
+        self.batches: list[list[str]] = []
+
+    async def embed(self, texts: list[str]) -> list[list[float]]:
+        self.batches.append(list(texts))
+        await asyncio.sleep(0)
+        return await super().embed(texts)
+
+
+def _document(index: int, paragraphs: int = 3) -> SourceDocument:
+    return SourceDocument(
+        id=f"doc-{index}",
+        text="\n\n".join(
+            f"Paragraph {part} of document {index}."
+            for part in range(paragraphs)
+        ),
+    )
+
+
+def _pipeline(tmp_path, embedder: RecordingEmbedder, **kwargs):
+    store = VectorStore(tmp_path / "vectors")
+    cache = EmbeddingCache(tmp_path / "embeddings", embedder.model)
+    # Chunks of one paragraph each.
+    options = {"chunk_chars": 40, "overlap_chars": 0, **kwargs}
+    return IngestionPipeline(embedder, store, cache, **options), store, cache
+
+
+def test_chunks_are_embedded_in_batches(tmp_path):
+    embedder = RecordingEmbedder()
+    pipeline, store, _ = _pipeline(
+        tmp_path, embedder, batch_size=4, max_concurrency=2
+    )
+
+    stats = asyncio.run(
+        pipeline.ingest("agent", (_document(index) for index in range(5)))
+    )
+
+    assert stats.documents == 5
+    assert stats.chunks == stats.embedded == stats.written == 15
+    assert stats.batches == len(embedder.batches) == 4
+    assert [len(batch) for batch in embedder.batches] == [4, 4, 4, 3]
+    assert len(store.collection("agent")) == 15
+
+
+def test_repeated_chunks_are_embedded_once(tmp_path):
+    embedder = RecordingEmbedder()
+    pipeline, store, _ = _pipeline(tmp_path, embedder, batch_size=8)
+    signature = "Best regards, Alice."
+    documents = [
+        SourceDocument(
+            id=f"email-{index}",
+            text=f"Note {index} about the invoices.\n\n{signature}",
+        )
+        for index in range(3)
+    ]
+
+    stats = asyncio.run(pipeline.ingest("agent", documents))
+
+    texts = [text for batch in embedder.batches for text in batch]
+    assert texts.count(signature) == 1
+    assert stats.duplicates == 2
+    assert stats.written == 6
+    assert len(store.collection("agent")) == 6
+
+
+def test_cached_embeddings_are_reused_after_a_reopen(tmp_path):
+    embedder = RecordingEmbedder()
+    pipeline, _, cache = _pipeline(tmp_path, embedder)
+    documents = [_document(index) for index in range(2)]
+    asyncio.run(pipeline.ingest("first", documents))
+    cache.close()
+    embedder.batches.clear()
+
+    pipeline, store, reopened = _pipeline(tmp_path, embedder)
+    stats = asyncio.run(pipeline.ingest("second", documents))
+
+    assert len(reopened) == 6
+    assert embedder.batches == []
+    assert stats.cache_hits == stats.written == 6
+    assert len(store.collection("second")) == 6
+
+
+def test_shorter_document_replaces_its_stale_chunks(tmp_path):
+    embedder = RecordingEmbedder()
+    pipeline, store, _ = _pipeline(tmp_path, embedder)
+
+    asyncio.run(pipeline.ingest("agent", [_document(0, paragraphs=4)]))
+    stats = asyncio.run(pipeline.ingest("agent", [_document(0, paragraphs=2)]))
+
+    collection = store.collection("agent")
+    assert stats.deleted == 2
+    assert len(collection) == 2
+    assert "doc-0#1" in collection and "doc-0#2" not in collection
+
+
+def test_ingest_command_runs_as_a_background_job(tmp_path):
+    embedder = RecordingEmbedder()
+    pipeline, store, _ = _pipeline(tmp_path, embedder)
+    node = VectorStoreNode(store=store, embedder=embedder, pipeline=pipeline)
+    call = ToolCall(
+        call_id="call-0",
+        node="vector_store",
+        command="ingest",
+        params={
+            "documents": [{"id": "doc-0", "text": _document(0).text}],
+        },
+    )
+
+    async def scenario():
+        redis = fakeredis.aioredis.FakeRedis(server=fakeredis.FakeServer())
+        queue = RedisJobQueue(redis)
+        executor = ToolExecutor(job_queue=queue)
+
+        async def run_node_command(payload):
+            return await executor.run_job(payload, node)
+
+        worker = JobWorker(
+            queue,
+            {NODE_COMMAND_JOB: run_node_command},
+            claim_timeout=0.05,
+        )
+        await worker.start()
+        token = current_agent_id.set("agent")
+        try:
+            pending = await executor.execute(
+                [call], {"vector_store": node}, user_id="alice"
+            )
+            results = await executor.collect(pending, 5.0)
+            matches = await node.execute_command(
+                "query", {"text": "Paragraph 1 of document 0.", "top_k": 1}
+            )
+        finally:
+            current_agent_id.reset(token)
+            await worker.stop()
+            await redis.aclose()
+        return pending, results, matches
+
+    pending, results, matches = asyncio.run(scenario())
+
+    assert pending[0].is_pending
+    assert results[0].output == {"chunks": 3, "embedded": 3}
+    assert matches["matches"][0]["id"] == "doc-0#1"
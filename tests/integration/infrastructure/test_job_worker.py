@@ -0,0 +1,205 @@
+"""
+Background node commands run end to end by in-process job workers, on a
+fake Redis.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+import fakeredis
+
+from myjarvis.presentation.composition import create_job_handlers
+from myjarvis.domain.interfaces.jobs import JobStatus
+from myjarvis.domain.services.node_service import NodeService
+from myjarvis.domain.services.tool_executor import ToolExecutor
+from myjarvis.domain.value_objects.tool_call import ToolCall
+from myjarvis.infrastructure.cache.local_cache import LruTtlCache
+from myjarvis.infrastructure.jobs.job_queue import RedisJobQueue
+from myjarvis.infrastructure.jobs.job_worker import JobWorker
+from myjarvis.infrastructure.nodes.base_node import AsyncBaseNode
+from myjarvis.infrastructure.nodes.node_registry import NodeTypeRegistry
+
+
+class MailboxNode(AsyncBaseNode):
+    """Searches slowly in the background, counting the searches run."""
+
+    background_commands = frozenset({"search", "fail"})
+
+    def __init__(self):
+        self.runs = 0
+        self.started = asyncio.Event()
+
+    async def execute_command(
+        self, command: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        self.runs += 1
+        self.started.set()
+        await asyncio.sleep(params.get("seconds", 0.0))
+        if command == "fail":
+            raise RuntimeError("mailbox unavailable")
+        return {"found": params["query"]}
+
+    def get_available_commands(self) -> list[str]:
+        return ["search", "fail"]
+
+
+def _call(index: int, command: str = "search", **params: Any) -> ToolCall:
+    return ToolCall(
+        call_id=f"call-{index}",
+        node="mailbox",
+        command=command,
+        params={"query": "invoices", **params},
+    )
+
+
+class _Setup:
+    def __init__(self, **queue: Any):
+        self.redis = fakeredis.aioredis.FakeRedis(
+            server=fakeredis.FakeServer()
+        )
+        self.queue = RedisJobQueue(self.redis, **queue)
+        self.registry = NodeTypeRegistry({"mailbox": MailboxNode})
+        self.node_service = NodeService(
+            self.registry,
+            LruTtlCache(max_entries=16, max_bytes=16, ttl_seconds=60),
+        )
+        self.executor = ToolExecutor(job_queue=self.queue)
+        self.node = self.node_service.get_node("mailbox")
+
+    def worker(self, **kwargs: Any) -> JobWorker:
+        return JobWorker(
+            self.queue,
+            create_job_handlers(self.node_service, self.executor),
+            claim_timeout=0.05,
+            **kwargs,
+        )
+
+    async def close(self) -> None:
+        self.registry.close()
+        await self.redis.aclose()
+
+
+def test_background_commands_are_run_by_the_worker():
+    async def scenario():
+        setup = _Setup()
+        worker = setup.worker(concurrency=2)
+        await worker.start()
+        try:
+            pending = await setup.executor.execute(
+                [_call(0), _call(1, query="receipts")],
+                {"mailbox": setup.node},
+            )
+            results = await setup.executor.collect(pending, 5.0)
+        finally:
+            await worker.stop()
+            await setup.close()
+        return pending, results
+
+    pending, results = asyncio.run(scenario())
+
+    assert all(result.is_pending for result in pending)
+    assert [result.output for result in results] == [
+        {"found": "invoices"},
+        {"found": "receipts"},
+    ]
+    assert not any(result.is_pending for result in results)
+
+
+def test_identical_commands_share_one_job():
+    async def scenario():
+        setup = _Setup()
+        worker = setup.worker()
+        await worker.start()
+        try:
+            first = await setup.executor.execute(
+                [_call(0)], {"mailbox": setup.node}
+            )
+            # A retried turn asks for the same search again.
+            second = await setup.executor.execute(
+                [_call(1)], {"mailbox": setup.node}
+            )
+            results = await setup.executor.collect(first + second, 5.0)
+        finally:
+            await worker.stop()
+            await setup.close()
+        return first, second, results, setup.node
+
+    first, second, results, node = asyncio.run(scenario())
+
+    assert first[0].job_id == second[0].job_id
+    assert [result.call_id for result in results] == ["call-0", "call-1"]
+    assert [result.output for result in results] == [{"found": "invoices"}] * 2
+    assert node.runs == 1
+
+
+def test_failing_commands_yield_error_results():
+    async def scenario():
+        setup = _Setup()
+        worker = setup.worker()
+        await worker.start()
+        try:
+            pending = await setup.executor.execute(
+                [_call(0, command="fail")], {"mailbox": setup.node}
+            )
+            results = await setup.executor.collect(pending, 5.0)
+            job = await setup.queue.get(pending[0].job_id)
+        finally:
+            await worker.stop()
+            await setup.close()
+        return results, job
+
+    results, job = asyncio.run(scenario())
+
+    assert results[0].error == "mailbox unavailable"
+    # The command failed, not the job: its error is the job's result.
+    assert job.status is JobStatus.SUCCEEDED
+
+
+def test_jobs_of_a_stopped_worker_are_run_again():
+    async def scenario():
+        setup = _Setup(lease_seconds=0.3)
+        crashed = setup.worker()
+        await crashed.start()
+        try:
+            pending = await setup.executor.execute(
+                [_call(0, seconds=0.2)], {"mailbox": setup.node}
+            )
+            await asyncio.wait_for(setup.node.started.wait(), 5.0)
+            await crashed.stop()
+            # Another worker takes the job over once its lease expires.
+            await asyncio.sleep(0.35)
+            worker = setup.worker(requeue_interval=0.05)
+            await worker.start()
+            results = await setup.executor.collect(pending, 5.0)
+            await worker.stop()
+            job = await setup.queue.get(pending[0].job_id)
+        finally:
+            await setup.close()
+        return results, job, setup.node
+
+    results, job, node = asyncio.run(scenario())
+
+    assert results[0].output == {"found": "invoices"}
+    assert job.attempts == 2
+    assert node.runs == 2
+
+
+def test_waiting_without_a_worker_gives_up():
+    async def scenario():
+        setup = _Setup(max_wait_seconds=0.2)
+        try:
+            pending = await setup.executor.execute(
+                [_call(0)], {"mailbox": setup.node}
+            )
+            started = time.perf_counter()
+            results = await setup.executor.collect(pending, None)
+            elapsed = time.perf_counter() - started
+        finally:
+            await setup.close()
+        return results, elapsed
+
+    results, elapsed = asyncio.run(scenario())
+
+    assert 0.2 <= elapsed < 1.0
+    assert results[0].error == "The background job did not finish."
@@ -0,0 +1,134 @@
+"""
+The page reader against a fake web server, and its guard against requests
+to the internal network.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from myjarvis.infrastructure.external.page_reader import (
+    PageReader,
+    UnsafeUrlError,
+    resolve_host,
+)
+
+_HOSTS = {
+    "pages.test": ["93.184.215.14"],
+    "intranet.test": ["10.0.0.8"],
+    "mixed.test": ["93.184.215.14", "192.168.1.1"],
+}
+
+
+async def _resolve(host: str, port: int) -> list[str]:
+    try:
+        return _HOSTS[host]
+    except KeyError:
+        raise OSError("Name or service not known") from None
+
+
+class FakeWeb:
+    """Serves pages and redirects, recording the URLs requested."""
+
+    def __init__(self, redirects: dict[str, str] | None = None):
+        self.redirects = redirects or {}
+        self.requested: list[str] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        url = str(request.url)
+        self.requested.append(url)
+        if url in self.redirects:
+            return httpx.Response(
+                302, headers={"Location": self.redirects[url]}
+            )
+        return httpx.Response(
+            200,
+            headers={"Content-Type": "text/html"},
+            text=f"<title>Page</title><main>Read from {url}</main>",
+        )
+
+
+def _read(web: FakeWeb, url: str, **kwargs):
+    async def run():
+        client = httpx.AsyncClient(transport=httpx.MockTransport(web))
+        reader = PageReader(client, **{"resolver": _resolve, **kwargs})
+        try:
+            return await reader.read(url, 100)
+        finally:
+            await client.aclose()
+
+    return asyncio.run(run())
+
+
+def test_redirects_to_public_hosts_are_followed():
+    web = FakeWeb({"http://pages.test/old": "https://pages.test/new"})
+
+    page = _read(web, "http://pages.test/old")
+
+    assert page.url == "https://pages.test/new"
+    assert page.text == "Read from https://pages.test/new"
+    assert web.requested == ["http://pages.test/old", "https://pages.test/new"]
+
+
+@pytest.mark.parametrize(
+    "url",
+    [
+        "http://127.0.0.1/admin",
+        "http://[::1]/admin",
+        "http://10.1.2.3/",
+        "http://172.16.0.1/",
+        "http://192.168.0.10/",
+        "http://169.254.169.254/latest/meta-data/",
+        "http://[fe80::1]/",
+        "http://[::ffff:127.0.0.1]/",
+        "http://0.0.0.0/",
+        "http://240.0.0.1/",
+        "http://intranet.test/",
+        "http://mixed.test/",
+    ],
+)
+def test_non_global_hosts_are_rejected(url):
+    web = FakeWeb()
+
+    with pytest.raises(UnsafeUrlError):
+        _read(web, url)
+    assert web.requested == []
+
+
+def test_redirects_to_the_internal_network_are_rejected():
+    web = FakeWeb(
+        {
+            "http://pages.test/a": "http://pages.test/b",
+            "http://pages.test/b": "http://169.254.169.254/latest/",
+        }
+    )
+
+    with pytest.raises(UnsafeUrlError):
+        _read(web, "http://pages.test/a")
+    assert web.requested == ["http://pages.test/a", "http://pages.test/b"]
+
+
+def test_localhost_is_rejected_by_the_system_resolver():
+    web = FakeWeb()
+
+    with pytest.raises(UnsafeUrlError):
+        _read(web, "http://localhost:8000/", resolver=resolve_host)
+    assert web.requested == []
+
+
+def test_unresolvable_hosts_fail_to_connect():
+    with pytest.raises(httpx.ConnectError):
+        _read(FakeWeb(), "http://missing.test/")
+
+
+def test_redirect_loops_are_cut():
+    web = FakeWeb(
+        {
+            "http://pages.test/a": "http://pages.test/b",
+            "http://pages.test/b": "http://pages.test/a",
+        }
+    )
+
+    with pytest.raises(httpx.TooManyRedirects):
+        _read(web, "http://pages.test/a")
@@ -0,0 +1,125 @@
+import asyncio
+
+import fakeredis
+
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.infrastructure.cache.redis_cache import RedisCache
+
+
+def _add(context: ChatContext, count: int) -> None:
+    for _ in range(count):
+        index = context.next_sequence
+        context.add_message(Message(content=str(index), sender=Sender.USER))
+
+
+def test_log_is_trimmed_to_the_window():
+    async def scenario():
+        client = fakeredis.FakeAsyncRedis()
+        cache = RedisCache(client, max_messages=4)
+        context = ChatContext(agent_id=AgentId.generate())
+        for _ in range(5):
+            _add(context, 3)
+            await cache.set_chat_context(context)
+            context.mark_persisted()
+        agent_id = str(context.agent_id)
+        length = await client.llen(f"chat_context:{agent_id}:messages")
+        loaded = await cache.get_chat_context(agent_id, tail=4)
+        _add(loaded, 2)
+        await cache.set_chat_context(loaded)
+        reloaded = await cache.get_chat_context(agent_id)
+        return length, loaded, reloaded
+
+    length, loaded, reloaded = asyncio.run(scenario())
+
+    assert length == 4
+    assert loaded.first_sequence == 11
+    assert [message.content for message in reloaded.messages] == [
+        "13",
+        "14",
+        "15",
+        "16",
+    ]
+    assert reloaded.first_sequence == 13
+
+
+def test_log_not_continued_by_the_context_is_rewritten():
+    async def scenario():
+        cache = RedisCache(fakeredis.FakeAsyncRedis(), max_messages=10)
+        context = ChatContext(agent_id=AgentId.generate())
+        _add(context, 2)
+        await cache.set_chat_context(context)
+        context.mark_persisted()
+        agent_id = str(context.agent_id)
+        first = await cache.get_chat_context(agent_id)
+        second = await cache.get_chat_context(agent_id)
+        _add(first, 1)
+        await cache.set_chat_context(first)
+        _add(second, 2)
+        await cache.set_chat_context(second)
+        return second, await cache.get_chat_context(agent_id)
+
+    second, stored = asyncio.run(scenario())
+
+    assert stored.messages == second.messages
+    assert stored.first_sequence == 0
+
+
+def test_log_whose_metadata_expired_is_rewritten():
+    async def scenario():
+        client = fakeredis.FakeAsyncRedis()
+        cache = RedisCache(client, max_messages=10)
+        context = ChatContext(agent_id=AgentId.generate())
+        _add(context, 2)
+        await cache.set_chat_context(context)
+        context.mark_persisted()
+        agent_id = str(context.agent_id)
+        # The metadata expires before the messages do.
+        await client.delete(f"chat_context:{agent_id}")
+        _add(context, 1)
+        await cache.set_chat_context(context)
+        meta = await client.hgetall(f"chat_context:{agent_id}")
+        return context, meta, await cache.get_chat_context(agent_id)
+
+    context, meta, stored = asyncio.run(scenario())
+
+    assert meta[b"context_id"].decode() == str(context.context_id)
+    assert stored.messages == context.messages
+    assert stored.first_sequence == 0
+
+
+def test_log_written_meanwhile_is_rewritten():
+    async def scenario():
+        client = fakeredis.FakeAsyncRedis()
+        cache = RedisCache(client, max_messages=10)
+        context = ChatContext(agent_id=AgentId.generate())
+        _add(context, 2)
+        await cache.set_chat_context(context)
+        context.mark_persisted()
+        agent_id = str(context.agent_id)
+        messages_key = f"chat_context:{agent_id}:messages"
+        pipeline = client.pipeline
+
+        def interrupted_pipeline(*args, **kwargs):
+            # Another process appends between the check and the append.
+            pipe = pipeline(*args, **kwargs)
+            hmget = pipe.hmget
+
+            async def hmget_then_write(*fields):
+                values = await hmget(*fields)
+                await client.rpush(messages_key, "{}")
+                return values
+
+            pipe.hmget = hmget_then_write
+            client.pipeline = pipeline
+            return pipe
+
+        _add(context, 1)
+        client.pipeline = interrupted_pipeline
+        await cache.set_chat_context(context)
+        return context, await cache.get_chat_context(agent_id)
+
+    context, stored = asyncio.run(scenario())
+
+    assert stored.messages == context.messages
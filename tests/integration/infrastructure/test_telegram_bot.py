@@ -0,0 +1,171 @@
+"""
+The Telegram bot against a fake Bot API server.
+"""
+
+import asyncio
+import json
+import time
+
+import httpx
+
+from myjarvis.infrastructure.external.telegram_bot import (
+    MAX_MESSAGE_LENGTH,
+    TelegramBot,
+    TelegramMessage,
+)
+
+_TOKEN = "123:secret"
+
+
+class FakeBotApi:
+    """Records the Bot API calls of the bot, by method."""
+
+    def __init__(self):
+        self.calls: list[tuple[str, dict]] = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        prefix = f"/bot{_TOKEN}/"
+        if not request.url.path.startswith(prefix):
+            return httpx.Response(404, json={"ok": False})
+        method = request.url.path.removeprefix(prefix)
+        self.calls.append((method, json.loads(request.content)))
+        return httpx.Response(200, json={"ok": True, "result": True})
+
+    def sent(self, chat_id: int) -> list[str]:
+        return [
+            payload["text"]
+            for method, payload in self.calls
+            if method == "sendMessage" and payload["chat_id"] == chat_id
+        ]
+
+
+def _update(update_id: int, chat_id: int, text: str) -> dict:
+    return {
+        "update_id": update_id,
+        "message": {
+            "chat": {"id": chat_id},
+            "from": {"id": chat_id},
+            "text": text,
+        },
+    }
+
+
+def _bot(api: FakeBotApi, on_message, **kwargs) -> TelegramBot:
+    client = httpx.AsyncClient(transport=httpx.MockTransport(api))
+    return TelegramBot(
+        _TOKEN,
+        on_message,
+        api_url="https://telegram.test",
+        http_client=client,
+        **kwargs,
+    )
+
+
+async def _drain(bot: TelegramBot, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while bot.pending and time.monotonic() < deadline:
+        await asyncio.sleep(0.01)
+
+
+def test_replies_keep_the_order_of_each_chat():
+    api = FakeBotApi()
+
+    async def echo(message: TelegramMessage) -> str:
+        # Later messages finish sooner if they were run out of order.
+        await asyncio.sleep(0.05 / int(message.text.split()[1]))
+        return message.text
+
+    async def scenario():
+        bot = _bot(api, echo, workers=8)
+        await bot.start()
+        update_id = 0
+        for index in range(1, 6):
+            for chat_id in (1, 2, 3):
+                update_id += 1
+                assert bot.submit(_update(update_id, chat_id, f"m {index}"))
+        await _drain(bot)
+        await bot.stop()
+
+    asyncio.run(scenario())
+
+    for chat_id in (1, 2, 3):
+        assert api.sent(chat_id) == [f"m {index}" for index in range(1, 6)]
+
+
+def test_chats_are_processed_in_parallel():
+    api = FakeBotApi()
+
+    async def slow(message: TelegramMessage) -> str:
+        await asyncio.sleep(0.2)
+        return "done"
+
+    async def scenario():
+        bot = _bot(api, slow, workers=4)
+        await bot.start()
+        started = time.perf_counter()
+        for chat_id in range(4):
+            bot.submit(_update(chat_id, chat_id, "hi"))
+        await _drain(bot)
+        elapsed = time.perf_counter() - started
+        await bot.stop()
+        return elapsed
+
+    elapsed = asyncio.run(scenario())
+
+    assert elapsed < 0.6
+    assert len(api.calls) == 4
+
+
+def test_updates_beyond_max_pending_are_refused():
+    api = FakeBotApi()
+    release = None
+
+    async def blocked(message: TelegramMessage) -> None:
+        await release.wait()
+
+    async def scenario():
+        nonlocal release
+        release = asyncio.Event()
+        bot = _bot(api, blocked, workers=2, max_pending=3)
+        await bot.start()
+        accepted = [bot.submit(_update(i, i, "hi")) for i in range(5)]
+        # Updates without a text message are accepted and ignored.
+        ignored = bot.submit({"update_id": 99, "edited_message": {}})
+        release.set()
+        await _drain(bot)
+        await bot.stop()
+        return accepted, ignored
+
+    accepted, ignored = asyncio.run(scenario())
+
+    assert accepted == [True, True, True, False, False]
+    assert ignored
+    assert api.calls == []
+
+
+def test_long_replies_are_split_and_webhook_is_registered():
+    api = FakeBotApi()
+    reply = "x" * (MAX_MESSAGE_LENGTH * 2 + 10)
+
+    async def long(message: TelegramMessage) -> str:
+        return reply
+
+    async def scenario():
+        bot = _bot(api, long)
+        await bot.set_webhook("https://bot.test/hook", secret_token="s3cret")
+        await bot.start()
+        bot.submit(_update(1, 7, "hi"))
+        await _drain(bot)
+        await bot.stop()
+
+    asyncio.run(scenario())
+
+    method, payload = api.calls[0]
+    assert method == "setWebhook"
+    assert payload["url"] == "https://bot.test/hook"
+    assert payload["secret_token"] == "s3cret"
+    assert [len(text) for text in api.sent(7)] == [
+        MAX_MESSAGE_LENGTH,
+        MAX_MESSAGE_LENGTH,
+        10,
+    ]
@@ -0,0 +1,166 @@
+"""
+The Telegram identities cached by two API workers sharing their
+invalidations over a fake Redis server.
+"""
+
+import asyncio
+
+import fakeredis
+import pytest
+
+from myjarvis.application.commands.select_agent import SelectAgentCommand
+from myjarvis.application.handlers.command_handlers import SelectAgentHandler
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.entities.user import User
+from myjarvis.domain.services.telegram_identity_service import (
+    TelegramIdentityService,
+)
+from myjarvis.domain.value_objects.user_id import UserId
+from myjarvis.infrastructure.cache import broadcast_cache
+from myjarvis.infrastructure.cache.broadcast_cache import BroadcastLocalCache
+
+_CHANNEL = "telegram_identity:invalidate"
+_TELEGRAM_ID = 4242
+
+
+class FakeUsers:
+    """Holds the users in memory; counts the lookups by Telegram account."""
+
+    def __init__(self, *users: User):
+        self.users = {user.user_id: user for user in users}
+        self.telegram_lookups = 0
+
+    async def get_by_id(self, user_id: UserId) -> User | None:
+        return self.users.get(user_id)
+
+    async def get_by_telegram_id(self, telegram_id: int) -> User | None:
+        self.telegram_lookups += 1
+        return next(
+            (
+                user
+                for user in self.users.values()
+                if user.telegram_id == telegram_id
+            ),
+            None,
+        )
+
+    async def update(self, user: User) -> None:
+        self.users[user.user_id] = user
+
+
+class FakeAgents:
+    """Holds the agents in memory."""
+
+    def __init__(self, *agents: AIAgent):
+        self.agents = {agent.agent_id: agent for agent in agents}
+
+    async def get_by_id(self, agent_id) -> AIAgent | None:
+        return self.agents.get(agent_id)
+
+
+def _agent(user: User, name: str) -> AIAgent:
+    return AIAgent(user_id=user.user_id, name=name, llm_model="fake")
+
+
+def _cache(server: fakeredis.FakeServer) -> BroadcastLocalCache:
+    return BroadcastLocalCache(
+        fakeredis.FakeAsyncRedis(server=server, max_connections=100),
+        _CHANNEL,
+        max_entries=100,
+        max_bytes=100,
+        ttl_seconds=300.0,
+        parse_key=int,
+    )
+
+
+async def _subscribed(client, count: int) -> None:
+    for _ in range(200):
+        channels = dict(await client.pubsub_numsub(_CHANNEL))
+        if channels.get(_CHANNEL.encode(), 0) >= count:
+            # Let the listeners clear their cache after subscribing.
+            await asyncio.sleep(0.01)
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError("The caches did not subscribe.")
+
+
+async def _invalidated(cache: BroadcastLocalCache, count: int) -> None:
+    for _ in range(200):
+        if cache.invalidations >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError("The invalidation was not received.")
+
+
+@pytest.fixture(autouse=True)
+def _fast_listener(monkeypatch):
+    monkeypatch.setattr(broadcast_cache, "_LISTEN_TIMEOUT_SECONDS", 0.05)
+
+
+def test_cached_identities_are_resolved_without_the_database():
+    user = User(
+        user_id=UserId(value="alice"),
+        email="alice@example.com",
+        telegram_id=_TELEGRAM_ID,
+    )
+    users = FakeUsers(user)
+    service = TelegramIdentityService(_cache(fakeredis.FakeServer()))
+
+    async def scenario():
+        first = await service.resolve(_TELEGRAM_ID, users)
+        second = await service.resolve(_TELEGRAM_ID, users)
+        stranger = await service.resolve(7, users)
+        await service.resolve(7, users)
+        return first, second, stranger
+
+    first, second, stranger = asyncio.run(scenario())
+
+    assert first == second
+    assert first.user_id == user.user_id
+    assert stranger is None
+    # One lookup for the user and one for the stranger.
+    assert users.telegram_lookups == 2
+
+
+def test_selecting_an_agent_invalidates_every_worker():
+    user = User(
+        user_id=UserId(value="alice"),
+        email="alice@example.com",
+        telegram_id=_TELEGRAM_ID,
+    )
+    first_agent, second_agent = _agent(user, "first"), _agent(user, "second")
+    user.select_agent(first_agent)
+    users = FakeUsers(user)
+    agents = FakeAgents(first_agent, second_agent)
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+        api_cache, other_cache = _cache(server), _cache(server)
+        await api_cache.start()
+        await other_cache.start()
+        await _subscribed(api_cache._client, 2)
+        api = TelegramIdentityService(api_cache)
+        other = TelegramIdentityService(other_cache)
+        await api.resolve(_TELEGRAM_ID, users)
+        before = await other.resolve(_TELEGRAM_ID, users)
+        await SelectAgentHandler(users, agents, api).handle(
+            SelectAgentCommand(
+                agent_id=str(second_agent.agent_id),
+                user_id=user.user_id.value,
+            )
+        )
+        await _invalidated(other_cache, 1)
+        after = await other.resolve(_TELEGRAM_ID, users)
+        await api.resolve(_TELEGRAM_ID, users)
+        await api_cache.stop()
+        await other_cache.stop()
+        return before, after, api_cache.invalidations
+
+    before, after, own_invalidations = asyncio.run(scenario())
+
+    assert before.agent_id == first_agent.agent_id
+    assert after.agent_id == second_agent.agent_id
+    # Both workers loaded the identity before and after the selection.
+    assert users.telegram_lookups == 4
+    # A worker ignores its own announcements.
+    assert own_invalidations == 0
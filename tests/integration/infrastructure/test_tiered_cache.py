@@ -0,0 +1,143 @@
+import asyncio
+
+import fakeredis
+import pytest
+
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.infrastructure.cache import tiered_cache
+from myjarvis.infrastructure.cache.tiered_cache import (
+    INVALIDATION_CHANNEL,
+    TieredRedisCache,
+)
+
+
+def _context(*contents: str) -> ChatContext:
+    context = ChatContext(agent_id=AgentId.generate())
+    for content in contents:
+        context.add_message(Message(content=content, sender=Sender.USER))
+    return context
+
+
+async def _subscribed(client, count: int) -> None:
+    for _ in range(200):
+        channels = dict(await client.pubsub_numsub(INVALIDATION_CHANNEL))
+        if channels.get(INVALIDATION_CHANNEL.encode(), 0) >= count:
+            # Let the listeners clear their tier after subscribing.
+            await asyncio.sleep(0.01)
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError("The caches did not subscribe.")
+
+
+async def _invalidated(cache: TieredRedisCache, count: int) -> None:
+    for _ in range(200):
+        if cache.stats.invalidations >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError("The invalidation was not received.")
+
+
+def _client(server: fakeredis.FakeServer) -> fakeredis.FakeAsyncRedis:
+    return fakeredis.FakeAsyncRedis(server=server, max_connections=100)
+
+
+def test_local_tier_answers_repeated_reads():
+    async def scenario():
+        cache = TieredRedisCache(_client(fakeredis.FakeServer()))
+        context = _context("hello")
+        await cache.set_chat_context(context)
+        first = await cache.get_chat_context(str(context.agent_id))
+        second = await cache.get_chat_context(str(context.agent_id), tail=1)
+        return first, second, cache.stats
+
+    first, second, stats = asyncio.run(scenario())
+
+    assert [message.content for message in first.messages] == ["hello"]
+    assert second.messages == first.messages
+    assert stats.local_hits == 2
+    assert stats.redis_hits == 0
+    assert stats.local_entries == 1
+
+
+@pytest.fixture(autouse=True)
+def _fast_listener(monkeypatch):
+    monkeypatch.setattr(tiered_cache, "_LISTEN_TIMEOUT_SECONDS", 0.05)
+
+
+def test_writes_invalidate_the_other_instances():
+    async def scenario():
+        server = fakeredis.FakeServer()
+        writer = TieredRedisCache(_client(server))
+        reader = TieredRedisCache(_client(server))
+        await writer.start()
+        await reader.start()
+        await _subscribed(writer._client, 2)
+        context = _context("hello")
+        agent_id = str(context.agent_id)
+        await writer.set_chat_context(context)
+        await _invalidated(reader, 1)
+        await reader.get_chat_context(agent_id)
+        context.mark_persisted()
+        context.add_message(Message(content="again", sender=Sender.USER))
+        await writer.set_chat_context(context)
+        await _invalidated(reader, 2)
+        updated = await reader.get_chat_context(agent_id)
+        await writer.stop()
+        await reader.stop()
+        return updated, reader.stats, writer.stats
+
+    updated, reader_stats, writer_stats = asyncio.run(scenario())
+
+    assert [message.content for message in updated.messages] == [
+        "hello",
+        "again",
+    ]
+    assert reader_stats.invalidations == 2
+    assert reader_stats.redis_hits == 2
+    # An instance ignores its own announcements.
+    assert writer_stats.invalidations == 0
+
+
+def test_local_tier_is_cleared_when_resubscribing(monkeypatch):
+    monkeypatch.setattr(tiered_cache, "_RESUBSCRIBE_DELAY_SECONDS", 0.05)
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+        cache = TieredRedisCache(_client(server))
+        await cache.start()
+        await _subscribed(cache._client, 1)
+        context = _context("hello")
+        await cache.set_chat_context(context)
+        cached = cache.stats.local_entries
+        # The connection drops: invalidations may be missed from now on.
+        server.connected = False
+        await asyncio.sleep(0.02)
+        cleared = cache.stats.local_entries
+        server.connected = True
+        await _subscribed(cache._client, 1)
+        await cache.stop()
+        return cached, cleared
+
+    cached, cleared = asyncio.run(scenario())
+
+    assert cached == 1
+    assert cleared == 0
+
+
+@pytest.mark.parametrize("tail", [None, 1])
+def test_partial_local_copy_does_not_answer_full_reads(tail):
+    async def scenario():
+        cache = TieredRedisCache(_client(fakeredis.FakeServer()))
+        context = _context("one", "two")
+        await cache.set_chat_context(context)
+        context.mark_persisted()
+        agent_id = str(context.agent_id)
+        cache._local.set(agent_id, context.tail(1), 1)
+        await cache.get_chat_context(agent_id, tail=tail)
+        return cache.stats
+
+    stats = asyncio.run(scenario())
+
+    assert stats.redis_hits == (1 if tail is None else 0)
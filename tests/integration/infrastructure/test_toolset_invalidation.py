@@ -0,0 +1,142 @@
+"""
+The agents' toolsets cached by two processes sharing their invalidations
+over a fake Redis server.
+"""
+
+import asyncio
+from typing import Any, Dict
+
+import fakeredis
+import pytest
+
+from myjarvis.application.commands.attach_node import AttachNodeCommand
+from myjarvis.application.handlers.command_handlers import AttachNodeHandler
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.entities.node import Node
+from myjarvis.domain.services.node_service import NodeService
+from myjarvis.domain.value_objects.user_id import UserId
+from myjarvis.infrastructure.cache import broadcast_cache
+from myjarvis.infrastructure.cache.broadcast_cache import BroadcastLocalCache
+from myjarvis.infrastructure.nodes.base_node import AsyncBaseNode
+from myjarvis.infrastructure.nodes.node_registry import NodeTypeRegistry
+from myjarvis.presentation.composition import TOOLSET_CHANNEL
+
+
+class EchoNode(AsyncBaseNode):
+    """Echoes the parameters of its only command."""
+
+    async def execute_command(
+        self, command: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        return params
+
+    def get_available_commands(self) -> list[str]:
+        return ["echo"]
+
+
+class FakeAgents:
+    """Holds the agents in memory."""
+
+    def __init__(self, *agents: AIAgent):
+        self.agents = {agent.agent_id: agent for agent in agents}
+
+    async def get_by_id(self, agent_id) -> AIAgent | None:
+        return self.agents.get(agent_id)
+
+    async def update(self, agent: AIAgent) -> None:
+        self.agents[agent.agent_id] = agent
+
+
+class FakeNodes:
+    """Holds the nodes in memory; counts the loads of agents' nodes."""
+
+    def __init__(self, *nodes: Node):
+        self.nodes = {node.node_id: node for node in nodes}
+        self.loads = 0
+
+    async def get_by_id(self, node_id) -> Node | None:
+        return self.nodes.get(node_id)
+
+    async def get_by_ids(self, node_ids) -> list[Node]:
+        self.loads += 1
+        return [self.nodes[node_id] for node_id in node_ids]
+
+
+def _process(
+    server: fakeredis.FakeServer,
+) -> tuple[NodeService, BroadcastLocalCache]:
+    cache = BroadcastLocalCache(
+        fakeredis.FakeAsyncRedis(server=server, max_connections=100),
+        TOOLSET_CHANNEL,
+        max_entries=16,
+        max_bytes=16,
+        ttl_seconds=60,
+    )
+    return NodeService(NodeTypeRegistry({"echo": EchoNode}), cache), cache
+
+
+async def _subscribed(client, count: int) -> None:
+    for _ in range(200):
+        channels = dict(await client.pubsub_numsub(TOOLSET_CHANNEL))
+        if channels.get(TOOLSET_CHANNEL.encode(), 0) >= count:
+            # Let the listeners clear their cache after subscribing.
+            await asyncio.sleep(0.01)
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError("The caches did not subscribe.")
+
+
+async def _invalidated(cache: BroadcastLocalCache, count: int) -> None:
+    for _ in range(200):
+        if cache.invalidations >= count:
+            return
+        await asyncio.sleep(0.01)
+    raise TimeoutError("The invalidation was not received.")
+
+
+@pytest.fixture(autouse=True)
+def _fast_listener(monkeypatch):
+    monkeypatch.setattr(broadcast_cache, "_LISTEN_TIMEOUT_SECONDS", 0.05)
+
+
+def test_attaching_a_node_invalidates_every_process():
+    user_id = UserId(value="alice")
+    first = Node(name="One", node_type="echo")
+    second = Node(name="Two", node_type="echo")
+    agent = AIAgent(user_id=user_id, name="agent", llm_model="fake")
+    agent.attach_node(first.node_id)
+    agents = FakeAgents(agent)
+    nodes = FakeNodes(first, second)
+    key = str(agent.agent_id)
+
+    async def scenario():
+        server = fakeredis.FakeServer()
+        api, api_cache = _process(server)
+        worker, worker_cache = _process(server)
+        await api_cache.start()
+        await worker_cache.start()
+        await _subscribed(api_cache._client, 2)
+        await api.get_toolset(agent, nodes)
+        await worker.get_toolset(agent, nodes)
+        await worker.get_toolset(agent, nodes)
+        loads_before = nodes.loads
+        await AttachNodeHandler(agents, nodes, api).handle(
+            AttachNodeCommand(
+                agent_id=key,
+                node_id=str(second.node_id),
+                user_id=user_id.value,
+            )
+        )
+        await _invalidated(worker_cache, 1)
+        dropped = worker_cache.get(key) is None
+        await api_cache.stop()
+        await worker_cache.stop()
+        return loads_before, dropped, api_cache.invalidations
+
+    loads_before, dropped, own_invalidations = asyncio.run(scenario())
+
+    # One load per process; the second turn of the worker is served cached.
+    assert loads_before == 2
+    assert dropped
+    # A process ignores its own announcements.
+    assert own_invalidations == 0
@@ -0,0 +1,167 @@
+"""
+The vector store node and the memory-mapped collections behind it: round
+trips, isolation of the agents' namespaces, persistence across a reopen and
+the recall of the IVF index.
+"""
+
+import asyncio
+
+import numpy as np
+import pytest
+
+from myjarvis.domain.interfaces.node import current_agent_id
+from myjarvis.infrastructure.llm.embedder import HashingEmbedder
+from myjarvis.infrastructure.nodes.vector_store_node import VectorStoreNode
+from myjarvis.infrastructure.vector_store.vector_store import (
+    VectorRecord,
+    VectorStore,
+)
+
+_TEXTS = {
+    "hours": "Our shop opens at nine and closes at five.",
+    "shipping": "We ship parcels to Canada within a week.",
+    "refunds": "Refunds are paid back within fourteen days.",
+}
+
+
+def _run(node: VectorStoreNode, agent_id: str | None, command: str, **params):
+    async def run():
+        token = current_agent_id.set(agent_id)
+        try:
+            return await node.execute_command(command, params)
+        finally:
+            current_agent_id.reset(token)
+
+    return asyncio.run(run())
+
+
+def _node(root) -> VectorStoreNode:
+    return VectorStoreNode(
+        store=VectorStore(root), embedder=HashingEmbedder(dimensions=64)
+    )
+
+
+def _upsert(node: VectorStoreNode, agent_id: str, **texts: str) -> dict:
+    return _run(
+        node,
+        agent_id,
+        "upsert",
+        documents=[
+            {"id": key, "text": text, "metadata": {"topic": key}}
+            for key, text in texts.items()
+        ],
+    )
+
+
+def _best(node: VectorStoreNode, agent_id: str, text: str) -> list[str]:
+    response = _run(node, agent_id, "query", text=text, top_k=3)
+    return [match["id"] for match in response["matches"]]
+
+
+def test_upserted_texts_are_queried_and_deleted(tmp_path):
+    node = _node(tmp_path)
+
+    upserted = _upsert(node, "agent", **_TEXTS)
+    response = _run(node, "agent", "query", text=_TEXTS["shipping"], top_k=1)
+    deleted = _run(node, "agent", "delete", ids=["shipping", "unknown"])
+
+    assert upserted == {"upserted": 3}
+    (match,) = response["matches"]
+    assert match["id"] == "shipping"
+    assert match["score"] == pytest.approx(1.0)
+    assert match["text"] == _TEXTS["shipping"]
+    assert match["metadata"] == {"topic": "shipping"}
+    assert deleted == {"deleted": 1}
+    assert "shipping" not in _best(node, "agent", _TEXTS["shipping"])
+
+
+def test_upserting_an_id_again_replaces_its_text(tmp_path):
+    node = _node(tmp_path)
+    _upsert(node, "agent", **_TEXTS)
+
+    _upsert(node, "agent", hours="We are closed on Sundays.")
+
+    response = _run(node, "agent", "query", text="closed Sundays", top_k=3)
+    assert [match["text"] for match in response["matches"]].count(
+        "We are closed on Sundays."
+    ) == 1
+    assert len(node.store.collection("agent")) == 3
+
+
+def test_agents_only_see_their_own_texts(tmp_path):
+    node = _node(tmp_path)
+    _upsert(node, "first", hours=_TEXTS["hours"])
+    _upsert(node, "second", refunds=_TEXTS["refunds"])
+
+    assert _best(node, "first", _TEXTS["refunds"]) == ["hours"]
+    assert _best(node, "second", _TEXTS["hours"]) == ["refunds"]
+    assert _run(node, "second", "delete", ids=["hours"]) == {"deleted": 0}
+    assert _best(node, "first", _TEXTS["hours"]) == ["hours"]
+
+
+def test_commands_outside_of_an_agent_are_rejected(tmp_path):
+    with pytest.raises(ValueError, match="only available to agents"):
+        _run(_node(tmp_path), None, "query", text="hours")
+
+
+def test_texts_persist_across_a_reopen(tmp_path):
+    node = _node(tmp_path)
+    _upsert(node, "agent", **_TEXTS)
+    _upsert(node, "agent", hours="We are closed on Sundays.")
+    _run(node, "agent", "delete", ids=["refunds"])
+    node.store.close()
+
+    reopened = _node(tmp_path)
+    response = _run(reopened, "agent", "query", text="closed Sundays", top_k=3)
+
+    assert {match["id"]: match["text"] for match in response["matches"]} == {
+        "hours": "We are closed on Sundays.",
+        "shipping": _TEXTS["shipping"],
+    }
+    assert _best(reopened, "other", _TEXTS["hours"]) == []
+
+
+def _clustered_vectors(count: int, dimensions: int = 32) -> np.ndarray:
+    random = np.random.default_rng(1)
+    centers = random.normal(size=(16, dimensions))
+    labels = random.integers(0, len(centers), size=count)
+    return centers[labels] + 0.3 * random.normal(size=(count, dimensions))
+
+
+def test_index_recall_survives_deletes_and_a_reopen(tmp_path):
+    vectors = _clustered_vectors(2000)
+    queries = _clustered_vectors(2050)[2000:]
+    store = VectorStore(tmp_path, nprobe=4, train_size=500)
+    collection = store.collection("agent")
+    # Inserted in batches, so the index is trained, then grown and retrained.
+    for start in range(0, len(vectors), 250):
+        collection.upsert(
+            [
+                VectorRecord(id=f"v{row}", vector=vectors[row])
+                for row in range(start, start + 250)
+            ]
+        )
+    collection.delete([f"v{row}" for row in range(0, 2000, 10)])
+
+    def recall(collection) -> float:
+        found = 0
+        for query in queries:
+            approximate = {match.id for match in collection.query(query, 10)}
+            found += len(approximate & set(collection.exact_query(query, 10)))
+        return found / (10 * len(queries))
+
+    before = recall(collection)
+    deleted_found = any(
+        int(match.id[1:]) % 10 == 0
+        for query in queries
+        for match in collection.query(query, 10)
+    )
+    store.close()
+    reopened = VectorStore(tmp_path, nprobe=4, train_size=500).collection(
+        "agent"
+    )
+
+    assert len(reopened) == 1800
+    assert before >= 0.9
+    assert recall(reopened) >= 0.9
+    assert not deleted_found
@@ -0,0 +1,145 @@
+import asyncio
+from dataclasses import dataclass, field
+
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.services.context_window_service import (
+    ContextWindowService,
+)
+from myjarvis.domain.value_objects.agent_id import AgentId
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.domain.value_objects.user_id import UserId
+
+
+class WordCounter:
+    """One token per word, and one per message for its formatting."""
+
+    def count(self, text: str) -> int:
+        return len(text.split())
+
+    def count_message(self, message: Message) -> int:
+        return self.count(message.content) + 1
+
+
+@dataclass
+class Policy:
+    max_tokens: int
+    summary_max_tokens: int = 0
+    token_counter: WordCounter = field(default_factory=WordCounter)
+
+
+class RecordingSummarizer:
+    def __init__(self):
+        self.calls: list[tuple[str, list[str]]] = []
+
+    async def summarize(
+        self, agent_llm_model, previous_summary, messages, max_tokens
+    ) -> str:
+        self.calls.append(
+            (previous_summary, [message.content for message in messages])
+        )
+        return f"summary of {len(messages)}"
+
+
+def _agent() -> AIAgent:
+    return AIAgent(
+        user_id=UserId(value="user"),
+        name="agent",
+        base_prompt="be brief",
+        llm_model="fake",
+    )
+
+
+def _context(*messages: tuple[Sender, str]) -> ChatContext:
+    context = ChatContext(agent_id=AgentId.generate())
+    for sender, content in messages:
+        context.add_message(Message(content=content, sender=sender))
+    context.mark_persisted()
+    return context
+
+
+def _select(policy, context, summarizer=None, message="next question"):
+    service = ContextWindowService(lambda model: policy, summarizer)
+    history = asyncio.run(
+        service.select_history(
+            _agent(), context, Message(content=message, sender=Sender.USER)
+        )
+    )
+    return [message.content for message in history]
+
+
+USER, AGENT = Sender.USER, Sender.AGENT
+
+
+def test_keeps_the_newest_messages_that_fit():
+    context = _context(
+        (USER, "a b"), (AGENT, "c"), (USER, "d e"), (AGENT, "f")
+    )
+
+    # The prompt (2 tokens) and the message (3) leave 5 tokens of history.
+    assert _select(Policy(max_tokens=10), context) == ["d e", "f"]
+    assert _select(Policy(max_tokens=15), context) == ["a b", "c", "d e", "f"]
+
+
+def test_negative_budget_sends_no_history_and_summarizes_it():
+    context = _context((USER, "a b"), (AGENT, "c d"))
+    summarizer = RecordingSummarizer()
+
+    history = _select(
+        Policy(max_tokens=4, summary_max_tokens=2), context, summarizer
+    )
+
+    assert history == []
+    assert summarizer.calls == [("", ["a b", "c d"])]
+    assert context.summary == "summary of 2"
+    assert context.summarized_through == 2
+
+
+def test_message_larger_than_the_budget_evicts_it_and_older_ones():
+    context = _context(
+        (USER, "short"),
+        (AGENT, "a very long answer of many many words"),
+        (USER, "tiny"),
+    )
+
+    # The newest message fits; the long one stops the selection, so the
+    # older, short message is not sent either.
+    assert _select(Policy(max_tokens=10), context) == ["tiny"]
+
+
+def test_single_message_larger_than_the_budget_is_not_sent():
+    context = _context((USER, "a very long question of many many words"))
+    summarizer = RecordingSummarizer()
+
+    assert _select(Policy(max_tokens=8), context, summarizer) == []
+    assert summarizer.calls == [
+        ("", ["a very long question of many many words"])
+    ]
+
+
+def test_leading_agent_messages_are_skipped():
+    context = _context(
+        (USER, "one two three four"),
+        (AGENT, "answer"),
+        (AGENT, "more"),
+        (USER, "again"),
+    )
+    summarizer = RecordingSummarizer()
+
+    # The budget fits the last three messages, two of them from the agent.
+    history = _select(Policy(max_tokens=11), context, summarizer)
+
+    assert history == ["again"]
+    assert summarizer.calls == [("", ["one two three four", "answer", "more"])]
+    assert context.summarized_through == 3
+
+
+def test_summarized_messages_are_not_selected_again():
+    context = _context((USER, "a"), (AGENT, "b"), (USER, "c"))
+    context.update_summary("earlier", 2)
+    summarizer = RecordingSummarizer()
+
+    history = _select(Policy(max_tokens=100), context, summarizer)
+
+    assert history == ["c"]
+    assert summarizer.calls == []
@@ -0,0 +1,124 @@
+import asyncio
+import time
+from typing import Any, Dict
+
+from myjarvis.domain.services.tool_executor import ToolExecutor
+from myjarvis.domain.value_objects.tool_call import ToolCall
+from myjarvis.infrastructure.nodes.base_node import AsyncBaseNode
+
+
+class SlowNode(AsyncBaseNode):
+    """Sleeps `params['seconds']`, then echoes the parameters."""
+
+    def __init__(self, timeout_seconds: float | None = None):
+        self.timeout_seconds = timeout_seconds
+        self.running = 0
+        self.max_running = 0
+
+    async def execute_command(
+        self, command: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        if command == "fail":
+            raise RuntimeError("node failure")
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(params["seconds"])
+        finally:
+            self.running -= 1
+        return {"echo": params}
+
+
+def _call(index: int, seconds: float, command: str = "sleep") -> ToolCall:
+    return ToolCall(
+        call_id=f"call-{index}",
+        node="slow",
+        command=command,
+        params={"seconds": seconds, "index": index},
+    )
+
+
+def _execute(executor: ToolExecutor, calls: list[ToolCall], node: SlowNode):
+    async def run():
+        started = time.perf_counter()
+        results = await executor.execute(calls, {"slow": node})
+        return results, time.perf_counter() - started
+
+    return asyncio.run(run())
+
+
+def test_calls_run_in_parallel():
+    node = SlowNode()
+    calls = [_call(index, 0.2) for index in range(4)]
+
+    results, elapsed = _execute(ToolExecutor(max_concurrency=8), calls, node)
+
+    assert elapsed < 0.4
+    assert node.max_running == 4
+    assert [result.call_id for result in results] == [
+        call.call_id for call in calls
+    ]
+    assert [result.output["echo"]["index"] for result in results] == [
+        0,
+        1,
+        2,
+        3,
+    ]
+
+
+def test_results_keep_the_order_of_the_calls():
+    node = SlowNode()
+    calls = [_call(0, 0.15), _call(1, 0.0), _call(2, 0.05)]
+
+    results, _ = _execute(ToolExecutor(), calls, node)
+
+    assert [result.call_id for result in results] == [
+        "call-0",
+        "call-1",
+        "call-2",
+    ]
+
+
+def test_concurrency_is_capped():
+    node = SlowNode()
+    calls = [_call(index, 0.1) for index in range(4)]
+
+    _, elapsed = _execute(ToolExecutor(max_concurrency=2), calls, node)
+
+    assert node.max_running == 2
+    assert elapsed >= 0.2
+
+
+def test_timeout_produces_an_error_result():
+    node = SlowNode(timeout_seconds=0.05)
+    calls = [_call(0, 5.0), _call(1, 0.0)]
+
+    results, elapsed = _execute(ToolExecutor(), calls, node)
+
+    assert elapsed < 1.0
+    assert results[0].is_error
+    assert results[0].error == "Command timed out after 0.05 seconds."
+    assert results[0].payload() == {"error": results[0].error}
+    assert not results[1].is_error
+
+
+def test_default_timeout_applies_to_nodes_without_one():
+    results, _ = _execute(
+        ToolExecutor(default_timeout=0.05), [_call(0, 5.0)], SlowNode()
+    )
+
+    assert results[0].error == "Command timed out after 0.05 seconds."
+
+
+def test_failures_and_unknown_nodes_produce_error_results():
+    calls = [
+        _call(0, 0.0, command="fail"),
+        ToolCall(call_id="call-1", node="missing", command="sleep"),
+        _call(2, 0.0),
+    ]
+
+    results, _ = _execute(ToolExecutor(), calls, SlowNode())
+
+    assert results[0].error == "node failure"
+    assert results[1].error == "Unknown node 'missing'."
+    assert results[2].output == {"echo": {"seconds": 0.0, "index": 2}}
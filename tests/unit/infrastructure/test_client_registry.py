@@ -0,0 +1,89 @@
+import asyncio
+import importlib.util
+
+from config.settings import Settings
+from myjarvis.infrastructure.llm.client_registry import LlmClientRegistry
+
+
+def test_http2_is_disabled_by_default():
+    assert Settings().llm_http2 is False
+
+
+def test_http2_falls_back_to_http1_without_h2(monkeypatch):
+    find_spec = importlib.util.find_spec
+    monkeypatch.setattr(
+        importlib.util,
+        "find_spec",
+        lambda name, *args: None if name == "h2" else find_spec(name, *args),
+    )
+    registry = LlmClientRegistry(Settings(llm_http2=True))
+
+    client = registry.http_client("openai")
+
+    assert client is registry.http_client("openai")
+    asyncio.run(client.aclose())
+
+
+def _pool_limits(client) -> tuple:
+    # httpx does not expose the limits of the pool of a client.
+    pool = client._transport._pool
+    return (
+        pool._max_connections,
+        pool._max_keepalive_connections,
+        pool._keepalive_expiry,
+    )
+
+
+def test_each_provider_has_one_shared_pool():
+    registry = LlmClientRegistry(Settings())
+
+    openai = registry.http_client("openai")
+    anthropic = registry.http_client("anthropic")
+    first_key = registry.openai_client("key-1")
+    second_key = registry.openai_client("key-2")
+
+    assert registry.http_client("openai") is openai
+    assert anthropic is not openai
+    assert registry.openai_client("key-1") is first_key
+    # The SDK clients of every API key share the provider's connections.
+    assert first_key._client is second_key._client is openai
+    asyncio.run(registry.aclose())
+
+
+def test_pools_and_schedulers_use_the_provider_limits():
+    registry = LlmClientRegistry(
+        Settings(
+            llm_max_connections=8,
+            llm_max_keepalive_connections=2,
+            llm_keepalive_expiry_seconds=5.0,
+            llm_max_concurrency={"openai": 4},
+        )
+    )
+
+    openai = registry.http_client("openai")
+    gemini = registry.http_client("gemini")
+
+    assert _pool_limits(openai) == _pool_limits(gemini) == (8, 2, 5.0)
+    assert registry.scheduler("openai").max_concurrency == 4
+    # Without a limit of its own, a provider is capped at its pool size.
+    assert registry.scheduler("gemini").max_concurrency == 8
+    assert registry.scheduler("openai") is registry.scheduler("openai")
+    asyncio.run(registry.aclose())
+
+
+def test_aclose_closes_every_client():
+    registry = LlmClientRegistry(Settings())
+    clients = [
+        registry.http_client(provider)
+        for provider in ("openai", "anthropic", "gemini")
+    ]
+    sdk_client = registry.openai_client("key")
+
+    asyncio.run(registry.aclose())
+
+    assert all(client.is_closed for client in clients)
+    # Clients requested afterwards get a new pool.
+    reopened = registry.http_client("openai")
+    assert not reopened.is_closed
+    assert registry.openai_client("key") is not sdk_client
+    asyncio.run(registry.aclose())
@@ -0,0 +1,217 @@
+"""
+The LLM scheduler against a stub provider answering 429 Too Many Requests.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from myjarvis.infrastructure.llm.scheduler import (
+    LlmOverloadedError,
+    LlmScheduler,
+    llm_caller,
+)
+
+
+class RateLimitError(Exception):
+    """A 429 raised the way the provider SDKs do."""
+
+    def __init__(self, response: httpx.Response):
+        super().__init__("rate limited")
+        self.status_code = response.status_code
+        self.response = response
+
+
+class StubProvider:
+    """
+    Rejects the first `rejections` requests with 429, then answers after
+    `latency` seconds, recording when and for whom each request arrived.
+    """
+
+    def __init__(
+        self,
+        rejections: int = 0,
+        retry_after: str | None = None,
+        latency: float = 0.0,
+    ):
+        self.rejections = rejections
+        self.retry_after = retry_after
+        self.latency = latency
+        self.arrivals: list[tuple[float, str]] = []
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        now = asyncio.get_running_loop().time()
+        self.arrivals.append((now, request.headers["x-caller"]))
+        if self.rejections:
+            self.rejections -= 1
+            headers = {}
+            if self.retry_after is not None:
+                headers["retry-after"] = self.retry_after
+            return httpx.Response(429, headers=headers)
+        await asyncio.sleep(self.latency)
+        return httpx.Response(200, json={"reply": "ok"})
+
+
+def _client(stub: StubProvider, scheduler: LlmScheduler) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url="https://llm.test",
+        transport=httpx.MockTransport(stub),
+        event_hooks={"response": [scheduler.observe_response]},
+    )
+
+
+async def _send(
+    client: httpx.AsyncClient, scheduler: LlmScheduler, caller: str = "user"
+) -> dict:
+    llm_caller.set(caller)
+
+    async def send() -> dict:
+        response = await client.post("/chat", headers={"x-caller": caller})
+        if response.status_code == 429:
+            raise RateLimitError(response)
+        return response.json()
+
+    return await scheduler.run(send, tokens=10)
+
+
+def test_retry_after_is_honoured():
+    stub = StubProvider(rejections=1, retry_after="0.3")
+    scheduler = LlmScheduler("stub", queue_timeout=5.0)
+
+    async def scenario():
+        async with _client(stub, scheduler) as client:
+            return await _send(client, scheduler)
+
+    assert asyncio.run(scenario()) == {"reply": "ok"}
+    (rejected, _), (retried, _) = stub.arrivals
+    assert retried - rejected >= 0.3
+
+
+def test_requests_wait_while_the_provider_is_paused():
+    stub = StubProvider(rejections=1, retry_after="0.3")
+    scheduler = LlmScheduler("stub", queue_timeout=5.0)
+
+    async def scenario():
+        async with _client(stub, scheduler) as client:
+            first = asyncio.create_task(_send(client, scheduler))
+            await asyncio.sleep(0.05)
+            # Sent during the pause: held back instead of hitting the 429.
+            await _send(client, scheduler, caller="other")
+            await first
+
+    asyncio.run(scenario())
+
+    started = stub.arrivals[0][0]
+    assert len(stub.arrivals) == 3
+    assert all(at - started >= 0.3 for at, _ in stub.arrivals[1:])
+
+
+def test_429_without_retry_after_is_retried_with_backoff():
+    stub = StubProvider(rejections=2)
+    scheduler = LlmScheduler("stub", backoff_base=0.05, queue_timeout=5.0)
+
+    async def scenario():
+        async with _client(stub, scheduler) as client:
+            return await _send(client, scheduler)
+
+    assert asyncio.run(scenario()) == {"reply": "ok"}
+    times = [at for at, _ in stub.arrivals]
+    assert len(times) == 3
+    # The backoff doubles with every retry.
+    assert times[1] - times[0] >= 0.05
+    assert times[2] - times[1] >= 0.1
+
+
+def test_persistent_429_raises_overloaded():
+    stub = StubProvider(rejections=100)
+    scheduler = LlmScheduler(
+        "stub", max_retries=2, backoff_base=0.01, queue_timeout=5.0
+    )
+
+    async def scenario():
+        async with _client(stub, scheduler) as client:
+            await _send(client, scheduler)
+
+    with pytest.raises(LlmOverloadedError):
+        asyncio.run(scenario())
+    assert len(stub.arrivals) == 3
+
+
+def test_retry_after_beyond_the_deadline_raises_at_once():
+    stub = StubProvider(rejections=1, retry_after="60")
+    scheduler = LlmScheduler("stub", queue_timeout=1.0)
+
+    async def scenario():
+        async with _client(stub, scheduler) as client:
+            await _send(client, scheduler)
+
+    with pytest.raises(LlmOverloadedError) as error:
+        asyncio.run(scenario())
+    assert error.value.retry_after >= 60
+
+
+def test_flooding_caller_does_not_starve_the_others():
+    stub = StubProvider(latency=0.01)
+    scheduler = LlmScheduler("stub", max_concurrency=1, queue_timeout=10.0)
+
+    async def scenario():
+        async with _client(stub, scheduler) as client:
+            flood = [
+                asyncio.create_task(_send(client, scheduler, "flood"))
+                for _ in range(20)
+            ]
+            await asyncio.sleep(0)
+            other = asyncio.create_task(_send(client, scheduler, "other"))
+            await asyncio.gather(*flood, other)
+
+    asyncio.run(scenario())
+
+    callers = [caller for _, caller in stub.arrivals]
+    assert len(callers) == 21
+    # The callers take turns: the other caller's request is not sent after
+    # the whole flood.
+    assert callers.index("other") <= 2
+
+
+def test_abandoned_requests_leave_the_queue():
+    stub = StubProvider(latency=0.3)
+    scheduler = LlmScheduler("stub", max_concurrency=1, queue_timeout=0.1)
+
+    async def scenario():
+        async with _client(stub, scheduler) as client:
+            busy = asyncio.create_task(_send(client, scheduler, "busy"))
+            await asyncio.sleep(0)
+            cancelled = [
+                asyncio.create_task(_send(client, scheduler, "cancelled"))
+                for _ in range(3)
+            ]
+            timed_out = [
+                asyncio.create_task(_send(client, scheduler, "timed_out"))
+                for _ in range(3)
+            ]
+            await asyncio.sleep(0)
+            queued = scheduler.queued
+            for task in cancelled:
+                task.cancel()
+            results = await asyncio.gather(
+                *cancelled, *timed_out, return_exceptions=True
+            )
+            abandoned = scheduler.queued
+            await busy
+            reply = await _send(client, scheduler, "later")
+            return queued, results, abandoned, reply
+
+    queued, results, abandoned, reply = asyncio.run(scenario())
+
+    assert queued == 6
+    assert all(
+        isinstance(result, asyncio.CancelledError) for result in results[:3]
+    )
+    assert all(
+        isinstance(result, LlmOverloadedError) for result in results[3:]
+    )
+    assert abandoned == 0
+    assert reply == {"reply": "ok"}
+    assert scheduler.queued == scheduler.in_flight == 0
+    assert [caller for _, caller in stub.arrivals] == ["busy", "later"]
@@ -0,0 +1,68 @@
+import asyncio
+import threading
+import time
+from typing import Any, Dict, List
+
+import pytest
+
+from myjarvis.infrastructure.nodes.base_node import BaseNode
+from myjarvis.infrastructure.nodes.node_registry import NodeTypeRegistry
+from myjarvis.infrastructure.nodes.sync_adapter import SyncNodeAdapter
+
+
+class BlockingNode(BaseNode):
+    """Blocks its thread for `params['seconds']`."""
+
+    def execute_command(
+        self, command: str, params: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        time.sleep(params["seconds"])
+        return {"thread": threading.current_thread().name}
+
+    def get_available_commands(self) -> List[str]:
+        return ["block"]
+
+
+def test_sync_nodes_run_on_the_thread_pool():
+    registry = NodeTypeRegistry({"blocking": BlockingNode}, sync_workers=2)
+    node = registry.get_node("blocking")
+
+    async def run():
+        ticks = 0
+
+        async def tick():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0.01)
+
+        ticker = asyncio.create_task(tick())
+        result = await node.execute_command("block", {"seconds": 0.2})
+        ticker.cancel()
+        return result, ticks
+
+    try:
+        result, ticks = asyncio.run(run())
+    finally:
+        registry.close()
+
+    assert isinstance(node, SyncNodeAdapter)
+    assert registry.get_node("blocking") is node
+    assert result["thread"].startswith("node")
+    # The event loop kept running while the node blocked.
+    assert ticks >= 5
+
+
+def test_unknown_node_type_raises_key_error():
+    registry = NodeTypeRegistry({})
+
+    with pytest.raises(KeyError):
+        registry.get_node("missing")
+    registry.close()
+
+
+def test_only_implemented_nodes_are_registered_by_default():
+    registry = NodeTypeRegistry()
+
+    assert registry.get_node_types() == ["search", "vector_store"]
+    registry.close()
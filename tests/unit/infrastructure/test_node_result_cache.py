@@ -0,0 +1,114 @@
+"""
+The node result cache: single flight, expiry, scopes and the copies it
+hands out.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict
+
+from myjarvis.domain.interfaces.node import CommandCachePolicy
+from myjarvis.infrastructure.cache.node_result_cache import NodeResultCache
+
+_SHARED = CommandCachePolicy(ttl_seconds=60.0, shared=True)
+_PRIVATE = CommandCachePolicy(ttl_seconds=60.0)
+
+
+class CountingCommand:
+    """Returns a new result after `seconds`; counts its executions."""
+
+    def __init__(self, seconds: float = 0.0):
+        self.seconds = seconds
+        self.executions = 0
+
+    async def __call__(self) -> Dict[str, Any]:
+        self.executions += 1
+        await asyncio.sleep(self.seconds)
+        return {"execution": self.executions, "items": ["a", "b"]}
+
+
+def _get(
+    cache: NodeResultCache,
+    command: CountingCommand,
+    policy: CommandCachePolicy = _SHARED,
+    user_id: str | None = "alice",
+    query: str = "python",
+) -> Dict[str, Any]:
+    return asyncio.run(
+        cache.get_or_execute(
+            "search", "search", {"query": query}, policy, user_id, command
+        )
+    )
+
+
+def test_concurrent_identical_calls_execute_once():
+    cache = NodeResultCache()
+    command = CountingCommand(seconds=0.1)
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                cache.get_or_execute(
+                    "search",
+                    "search",
+                    {"query": "python"},
+                    _SHARED,
+                    f"user-{index}",
+                    command,
+                )
+                for index in range(10)
+            )
+        )
+
+    results = asyncio.run(run())
+
+    assert command.executions == 1
+    assert all(result["execution"] == 1 for result in results)
+
+
+def test_results_expire_after_the_policy_ttl():
+    cache = NodeResultCache()
+    command = CountingCommand()
+    policy = CommandCachePolicy(ttl_seconds=0.1, shared=True)
+
+    _get(cache, command, policy)
+    _get(cache, command, policy)
+    time.sleep(0.15)
+    result = _get(cache, command, policy)
+
+    assert command.executions == 2
+    assert result["execution"] == 2
+
+
+def test_private_results_are_cached_per_user():
+    cache = NodeResultCache()
+    command = CountingCommand()
+
+    _get(cache, command, _PRIVATE, user_id="alice")
+    _get(cache, command, _PRIVATE, user_id="alice")
+    _get(cache, command, _PRIVATE, user_id="bob")
+    _get(cache, command, _PRIVATE, user_id=None)
+
+    assert command.executions == 3
+
+
+def test_shared_results_are_cached_once_for_everybody():
+    cache = NodeResultCache()
+    command = CountingCommand()
+
+    _get(cache, command, user_id="alice")
+    _get(cache, command, user_id="bob")
+    _get(cache, command, user_id=None)
+
+    assert command.executions == 1
+
+
+def test_callers_receive_their_own_copy():
+    cache = NodeResultCache()
+    command = CountingCommand()
+
+    first = _get(cache, command)
+    first["items"].append("changed")
+    second = _get(cache, command)
+
+    assert second == {"execution": 1, "items": ["a", "b"]}
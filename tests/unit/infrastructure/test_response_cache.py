@@ -0,0 +1,178 @@
+"""
+The reply cache: its exact and similarity tiers, and its use by the
+`AgentService` for the agents opting in.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator
+
+from myjarvis.domain.entities.ai_agent import AIAgent
+from myjarvis.domain.entities.chat_context import ChatContext
+from myjarvis.domain.services.agent_service import AgentService
+from myjarvis.domain.value_objects.message import Message, Sender
+from myjarvis.domain.value_objects.user_id import UserId
+from myjarvis.infrastructure.cache.response_cache import ResponseCache
+from myjarvis.infrastructure.llm.embedder import HashingEmbedder
+from myjarvis.infrastructure.llm.fake_llm import FakeLlm
+
+
+class CountingLlm(FakeLlm):
+    """Replies with a fixed text; counts the replies it generates."""
+
+    def __init__(self, reply: str = "We open at 9."):
+        super().__init__(reply=reply)
+        self.calls = 0
+
+    async def stream_response(
+        self, prompt: str, history: list[Message] | None = None, **kwargs: Any
+    ) -> AsyncIterator[str]:
+        self.calls += 1
+        async for chunk in super().stream_response(prompt, history, **kwargs):
+            yield chunk
+
+
+class NoTools:
+    """A toolset offering the LLM no tools."""
+
+    nodes: dict = {}
+
+    def tools_for(self, llm: Any) -> list:
+        return []
+
+
+def _agent(**fields: Any) -> AIAgent:
+    return AIAgent(
+        user_id=UserId(value="user"),
+        name="faq",
+        base_prompt="You answer questions about our shop.",
+        llm_model="fake",
+        **{"cache_replies": True, **fields},
+    )
+
+
+def _ask(
+    service: AgentService,
+    agent: AIAgent,
+    text: str,
+    toolset: Any = None,
+) -> str:
+    async def run():
+        reply = await service.process_message(
+            agent,
+            ChatContext(agent_id=agent.agent_id),
+            Message(content=text, sender=Sender.USER),
+            toolset,
+        )
+        return reply.content
+
+    return asyncio.run(run())
+
+
+def _lookup(cache: ResponseCache, message: str, prompt: str = "FAQ"):
+    return asyncio.run(
+        cache.get(cache.key("agent", "fake", prompt, [], message))
+    )
+
+
+def _store(cache: ResponseCache, message: str, reply: str) -> None:
+    async def run():
+        key = cache.key("agent", "fake", "FAQ", [], message)
+        # The similarity tier records the vector computed by a lookup.
+        await cache.get(key)
+        await cache.set(key, reply)
+
+    asyncio.run(run())
+
+
+def test_exact_tier_ignores_case_and_whitespace():
+    cache = ResponseCache()
+    _store(cache, "What are your opening hours?", "From 9 to 5.")
+
+    assert _lookup(cache, "  what are your\nopening HOURS? ") == "From 9 to 5."
+    assert _lookup(cache, "Where is your shop?") is None
+    assert cache.stats.hits == 1
+    assert cache.stats.similar_hits == 0
+
+
+def test_similarity_tier_reuses_replies_above_the_threshold():
+    cache = ResponseCache(embedder=HashingEmbedder(), similarity_threshold=0.8)
+    _store(cache, "What are your opening hours?", "From 9 to 5.")
+
+    # The same words in another order embed to the same vector.
+    assert _lookup(cache, "Your opening hours, what are?") == "From 9 to 5."
+    assert _lookup(cache, "Do you ship to Canada?") is None
+    assert cache.stats.similar_hits == 1
+
+
+def test_similarity_tier_is_scoped_to_the_situation():
+    cache = ResponseCache(embedder=HashingEmbedder(), similarity_threshold=0.8)
+    _store(cache, "What are your opening hours?", "From 9 to 5.")
+
+    assert _lookup(cache, "What are your opening hours?", "Other") is None
+
+
+def test_changing_the_prompt_invalidates_the_replies():
+    llm = CountingLlm()
+    service = AgentService(
+        llm_factory=lambda _: llm, response_cache=ResponseCache()
+    )
+    agent = _agent()
+
+    _ask(service, agent, "When do you open?")
+    _ask(service, agent, "When do you open?")
+    agent.update_prompt("You answer questions about our new shop.")
+    _ask(service, agent, "When do you open?")
+
+    assert llm.calls == 2
+
+
+def test_replies_of_agents_not_opting_in_are_not_cached():
+    llm = CountingLlm()
+    service = AgentService(
+        llm_factory=lambda _: llm, response_cache=ResponseCache()
+    )
+    agent = _agent(cache_replies=False)
+
+    _ask(service, agent, "When do you open?")
+    _ask(service, agent, "When do you open?")
+
+    assert llm.calls == 2
+
+
+def test_turns_with_tools_bypass_the_cache():
+    llm = CountingLlm()
+    cache = ResponseCache()
+    service = AgentService(llm_factory=lambda _: llm, response_cache=cache)
+    agent = _agent()
+
+    _ask(service, agent, "When do you open?", NoTools())
+    _ask(service, agent, "When do you open?", NoTools())
+
+    assert llm.calls == 2
+    assert cache.stats.hits == cache.stats.misses == 0
+
+
+def test_identical_questions_in_flight_call_the_llm_once():
+    llm = CountingLlm()
+    llm.first_token_delay = 0.05
+    service = AgentService(
+        llm_factory=lambda _: llm, response_cache=ResponseCache()
+    )
+    agent = _agent()
+
+    async def run():
+        return await asyncio.gather(
+            *(
+                service.process_message(
+                    agent,
+                    ChatContext(agent_id=agent.agent_id),
+                    Message(content="When do you open?", sender=Sender.USER),
+                )
+                for _ in range(5)
+            )
+        )
+
+    replies = asyncio.run(run())
+
+    assert llm.calls == 1
+    assert {reply.content for reply in replies} == {"We open at 9."}
@@ -0,0 +1,130 @@
+"""
+Hedging, fallback and circuit breaking of the RoutingLlm, with fake
+providers injecting latency and failures.
+"""
+
+import asyncio
+from typing import Any, AsyncIterator
+
+import pytest
+
+from myjarvis.infrastructure.llm.base_llm import BaseLlm
+from myjarvis.infrastructure.llm.routing_llm import LlmRouter, RoutingLlm
+from myjarvis.infrastructure.llm.scheduler import LlmOverloadedError
+
+
+class LatencyLlm(BaseLlm):
+    """Answers with its provider name after `latency` seconds."""
+
+    def __init__(self, provider: str, latency: float = 0.0):
+        self.provider = provider
+        self.latency = latency
+        self.failing = False
+        self.calls = 0
+        self.cancelled = 0
+
+    async def generate_response(
+        self, prompt: str, history: Any = None, **kwargs: Any
+    ) -> str:
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.latency)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.failing:
+            raise RuntimeError(f"{self.provider} is down")
+        return self.provider
+
+    async def stream_response(
+        self, prompt: str, history: Any = None, **kwargs: Any
+    ) -> AsyncIterator[str]:
+        yield await self.generate_response(prompt, history, **kwargs)
+
+
+def _routing(
+    primary: LatencyLlm, secondary: LatencyLlm, **router: Any
+) -> tuple[RoutingLlm, LlmRouter]:
+    router = LlmRouter(**{"hedge_delay": 0.05, **router})
+    return RoutingLlm(primary, secondary, router, "primary-model"), router
+
+
+def _ask(llm: RoutingLlm, times: int = 1) -> list[str]:
+    async def run():
+        return [await llm.generate_response("hi") for _ in range(times)]
+
+    return asyncio.run(run())
+
+
+def test_fast_primary_is_not_hedged():
+    primary, secondary = LatencyLlm("a", 0.0), LatencyLlm("b", 0.0)
+    llm, router = _routing(primary, secondary)
+
+    assert _ask(llm, 3) == ["a", "a", "a"]
+    assert router.stats.requests == 3
+    assert router.stats.hedges == 0
+    assert secondary.calls == 0
+
+
+def test_slow_primary_is_hedged_and_the_secondary_wins():
+    primary, secondary = LatencyLlm("a", 1.0), LatencyLlm("b", 0.01)
+    llm, router = _routing(primary, secondary)
+
+    assert _ask(llm) == ["b"]
+    assert router.stats.hedges == 1
+    assert router.stats.hedge_wins == 1
+    # The losing request was cancelled.
+    assert primary.cancelled == 1
+
+
+def test_hedge_delay_follows_the_primary_latency():
+    primary, secondary = LatencyLlm("a", 0.02), LatencyLlm("b", 0.0)
+    llm, router = _routing(primary, secondary, hedge_delay=0.5)
+    # Enough samples of a fast primary lower the hedge delay to its p95.
+    _ask(llm, 20)
+    assert router.hedge_after("primary-model", "generate_response") < 0.1
+
+    primary.latency = 0.5
+    assert _ask(llm) == ["b"]
+    assert router.stats.hedges == 1
+
+
+def test_failing_primary_falls_back_to_the_secondary():
+    primary, secondary = LatencyLlm("a"), LatencyLlm("b")
+    primary.failing = True
+    llm, router = _routing(primary, secondary)
+
+    assert _ask(llm) == ["b"]
+    assert router.stats.fallbacks == 1
+    assert router.stats.hedges == 0
+
+
+def test_open_circuit_skips_the_primary():
+    primary, secondary = LatencyLlm("a"), LatencyLlm("b")
+    primary.failing = True
+    llm, router = _routing(
+        primary, secondary, failure_threshold=2, reset_timeout=60
+    )
+
+    assert _ask(llm, 4) == ["b"] * 4
+    assert router.stats.circuit_opens == 1
+    assert router.stats.fallbacks == 4
+    # Once open, the circuit keeps requests away from the primary.
+    assert primary.calls == 2
+
+
+def test_both_circuits_open_raise_overloaded():
+    primary, secondary = LatencyLlm("a"), LatencyLlm("b")
+    primary.failing = secondary.failing = True
+    llm, router = _routing(
+        primary, secondary, failure_threshold=1, reset_timeout=60
+    )
+
+    async def run():
+        with pytest.raises(RuntimeError):
+            await llm.generate_response("hi")
+        await llm.generate_response("hi")
+
+    with pytest.raises(LlmOverloadedError):
+        asyncio.run(run())
+    assert router.stats.circuit_opens == 2
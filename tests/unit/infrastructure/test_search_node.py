@@ -0,0 +1,142 @@
+"""
+The `search_many` command of the search node, against a fake provider.
+"""
+
+import asyncio
+import time
+
+import pytest
+
+from myjarvis.infrastructure.external.web_search import (
+    RRF_K,
+    BaseSearchProvider,
+    SearchResult,
+)
+from myjarvis.infrastructure.nodes.search_node import SearchNode
+
+
+def _page(name: str, url: str | None = None) -> SearchResult:
+    return SearchResult(
+        title=f"Page {name}",
+        url=url or f"https://example.com/{name}",
+        snippet=f"About {name}.",
+    )
+
+
+class ScriptedProvider(BaseSearchProvider):
+    """
+    Answers every query with its scripted ranking, or raises its scripted
+    exception, after `latency` seconds; records the queries searched.
+    """
+
+    def __init__(
+        self,
+        rankings: dict[str, list[SearchResult] | Exception],
+        latency: float = 0.0,
+    ):
+        self.rankings = rankings
+        self.latency = latency
+        self.queries: list[str] = []
+
+    async def search(self, query: str, max_results: int) -> list[SearchResult]:
+        self.queries.append(query)
+        await asyncio.sleep(self.latency)
+        ranking = self.rankings[query]
+        if isinstance(ranking, Exception):
+            raise ranking
+        return ranking[:max_results]
+
+
+def _search_many(provider: ScriptedProvider, **params) -> dict:
+    node = SearchNode(provider=provider)
+    return asyncio.run(node.execute_command("search_many", params))
+
+
+def test_duplicate_queries_are_searched_once():
+    provider = ScriptedProvider(
+        {"Python asyncio": [_page("a")], "redis": [_page("b")]}
+    )
+
+    response = _search_many(
+        provider, queries=["Python asyncio", " python   ASYNCIO", "redis"]
+    )
+
+    assert sorted(provider.queries) == ["Python asyncio", "redis"]
+    assert [result["queries"] for result in response["results"]] == [
+        ["Python asyncio"],
+        ["redis"],
+    ]
+    assert "errors" not in response
+
+
+def test_queries_are_searched_concurrently():
+    provider = ScriptedProvider(
+        {query: [_page(query)] for query in ("a", "b", "c")}, latency=0.2
+    )
+
+    started = time.perf_counter()
+    response = _search_many(provider, queries=["a", "b", "c"])
+
+    assert time.perf_counter() - started < 0.4
+    assert len(response["results"]) == 3
+
+
+def test_results_are_merged_by_reciprocal_rank_fusion():
+    provider = ScriptedProvider(
+        {
+            "first": [_page("a"), _page("b"), _page("c")],
+            # The same pages, under URLs differing by tracking parameters,
+            # letter case or a trailing slash.
+            "second": [
+                _page("c", "https://Example.com/c?utm_source=feed"),
+                _page("b", "https://www.example.com/b/"),
+            ],
+        }
+    )
+
+    response = _search_many(provider, queries=["first", "second"])
+
+    results = response["results"]
+    # c: 1/(k+3) + 1/(k+1); b: 2/(k+2); a: 1/(k+1).
+    assert [result["url"] for result in results] == [
+        "https://Example.com/c?utm_source=feed",
+        "https://example.com/b",
+        "https://example.com/a",
+    ]
+    assert results[0]["score"] == round(1 / (RRF_K + 3) + 1 / (RRF_K + 1), 6)
+    assert results[1]["score"] == round(2 / (RRF_K + 2), 6)
+    assert results[2]["score"] == round(1 / (RRF_K + 1), 6)
+    assert [result["queries"] for result in results] == [
+        ["first", "second"],
+        ["first", "second"],
+        ["first"],
+    ]
+
+
+def test_failed_queries_are_reported_with_the_other_results():
+    provider = ScriptedProvider(
+        {
+            "works": [_page("a"), _page("b")],
+            "broken": RuntimeError("Search provider unavailable."),
+        }
+    )
+
+    response = _search_many(provider, queries=["works", "broken"])
+
+    assert [result["url"] for result in response["results"]] == [
+        "https://example.com/a",
+        "https://example.com/b",
+    ]
+    assert response["errors"] == {"broken": "Search provider unavailable."}
+
+
+def test_command_fails_when_every_query_fails():
+    provider = ScriptedProvider(
+        {
+            "one": RuntimeError("Search provider unavailable."),
+            "two": RuntimeError("Search provider unavailable."),
+        }
+    )
+
+    with pytest.raises(RuntimeError, match="unavailable"):
+        _search_many(provider, queries=["one", "two"])
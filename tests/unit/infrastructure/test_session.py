@@ -0,0 +1,24 @@
+import asyncio
+
+from sqlalchemy import text
+
+from config.settings import get_settings
+from myjarvis.infrastructure.database import session
+
+
+def test_engines_are_created_on_first_session(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite+aiosqlite:///:memory:")
+    get_settings.cache_clear()
+    assert session._engines is None
+
+    async def scenario():
+        async for db in session.get_db_session():
+            assert (await db.execute(text("SELECT 1"))).scalar() == 1
+        assert session._engines is not None
+        await session.dispose_engines()
+
+    try:
+        asyncio.run(scenario())
+    finally:
+        get_settings.cache_clear()
+    assert session._engines is None
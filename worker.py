@@ -0,0 +1,128 @@
+"""
+Entry point of the MyJarvis workers.
+
+Runs, until interrupted, the work the API hands off to worker processes:
+- the background jobs queued by the API (see `RedisJobQueue`), currently the
+  long-running node commands (`node_command` jobs), when `jobs_enabled` is
+  set; `--concurrency` jobs at once;
+- the chat turns of the agent worker tier (see `AgentTurnClient`), when
+  `agent_workers_enabled` is set; `--agent-concurrency` turns at once.
+
+Every process creates its own Redis client, database engine, node registry,
+caches and tool-call executor. Start about one process per core.
+
+Usage:
+    PYTHONPATH=src:. python worker.py --processes 4 --concurrency 8
+"""
+
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import signal
+
+from redis.asyncio import Redis
+
+from config.settings import get_settings
+from myjarvis.presentation.composition import (
+    create_chat_services,
+    create_handler_scope,
+    create_job_handlers,
+)
+from myjarvis.infrastructure.database.session import dispose_engines
+from myjarvis.infrastructure.jobs.agent_turns import (
+    AGENT_TURN_JOB,
+    AgentTurnRunner,
+    create_agent_turn_queue,
+)
+from myjarvis.infrastructure.jobs.job_worker import JobWorker
+from myjarvis.infrastructure.llm.client_registry import close_client_registry
+
+logger = logging.getLogger(__name__)
+
+
+async def run(concurrency: int, agent_concurrency: int) -> None:
+    """
+    Run jobs and agent turns until the process is interrupted or
+    terminated.
+    """
+    settings = get_settings()
+    redis = Redis.from_url(settings.redis_url)
+    services = create_chat_services(redis)
+    workers = []
+    if services.job_queue is not None and concurrency:
+        workers.append(
+            JobWorker(
+                services.job_queue,
+                create_job_handlers(
+                    services.node_service, services.tool_executor
+                ),
+                concurrency=concurrency,
+            )
+        )
+    if settings.agent_workers_enabled and agent_concurrency:
+        timeout = settings.agent_turn_timeout_seconds
+        workers.append(
+            JobWorker(
+                create_agent_turn_queue(redis, timeout),
+                {
+                    AGENT_TURN_JOB: AgentTurnRunner(
+                        redis, create_handler_scope(services), timeout
+                    )
+                },
+                concurrency=agent_concurrency,
+            )
+        )
+    if not workers:
+        logger.warning("Neither jobs nor agent workers are enabled")
+    stopped = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for signum in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(signum, stopped.set)
+    await services.start()
+    for worker in workers:
+        await worker.start()
+    try:
+        await stopped.wait()
+    finally:
+        for worker in workers:
+            await worker.stop()
+        await services.close()
+        await close_client_registry()
+        await dispose_engines()
+        await redis.aclose()
+
+
+def _main(concurrency: int, agent_concurrency: int) -> None:
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(run(concurrency, agent_concurrency))
+
+
+if __name__ == "__main__":
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--processes", type=int, default=1)
+    parser.add_argument(
+        "--concurrency", type=int, default=settings.jobs_worker_concurrency
+    )
+    parser.add_argument(
+        "--agent-concurrency",
+        type=int,
+        default=settings.agent_worker_concurrency,
+    )
+    args = parser.parse_args()
+    processes = [
+        multiprocessing.Process(
+            target=_main, args=(args.concurrency, args.agent_concurrency)
+        )
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    try:
+        for process in processes:
+            process.join()
+    except KeyboardInterrupt:
+        # The workers got the interrupt too and are stopping.
+        for process in processes:
+            process.join()